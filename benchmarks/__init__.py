@@ -0,0 +1,3 @@
+"""
+Performance benchmarks for Bezier Builder, see bench.py.
+"""
@@ -0,0 +1,469 @@
+"""
+Benchmark suite for parsing, serializing and geometry operations.
+
+Each case is run on synthetic inputs of every requested size and reports
+throughput (segments per second), latency percentiles over repeated runs and
+peak traced memory. Results are saved as JSON so runs can be compared.
+
+Usage:
+    python -m benchmarks.bench --sizes 1000 10000 --output results.json
+    python -m benchmarks.bench --filter parse --compare results.json
+"""
+
+import argparse
+import atexit
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from bezier_builder import binary, offset
+from bezier_builder.anchor_point import AnchorPoint
+from bezier_builder.arc_length import ArcLengthTable
+from bezier_builder.bezier_path import BezierPath, BezierShape
+from bezier_builder.intersection import intersections
+from bezier_builder.library import ShapeLibrary, write_library
+from bezier_builder.parse_cache import ParseCache
+from bezier_builder.stroke import StrokeFitter
+from bezier_builder.svg_converter import parse_path_string, create_path_string, parse_svg_file, iter_svg_file, parse_svg_instances
+from bezier_builder.vector import Vector, Vec2
+from benchmarks.generators import SEGMENT_KINDS, path_data, svg_document, svg_symbol_document
+
+# Registered cases as name -> setup(size) returning (function to time, number of segments processed)
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+for kind in SEGMENT_KINDS:
+    @case(f"parse_path_string/svgelements/{kind}")
+    def _(size, kind=kind):
+        d = path_data(kind, size)
+        return (lambda: parse_path_string(d)), size
+
+    @case(f"parse_path_string/fast/{kind}")
+    def _(size, kind=kind):
+        d = path_data(kind, size)
+        return (lambda: parse_path_string(d, fast=True)), size
+
+    @case(f"create_path_string/{kind}")
+    def _(size, kind=kind):
+        shape = parse_path_string(path_data(kind, size), fast=True)
+        return (lambda: create_path_string(shape)), shape.segment_count
+
+
+@case("parse_path_string/cached/cubics")
+def _(size):
+    # The same 100 segment path repeated, as in documents reusing icons or glyphs
+    d = path_data("cubics", 100)
+    repeats = max(1, size // 100)
+
+    def run():
+        cache = ParseCache()
+        for _ in range(repeats):
+            parse_path_string(d, fast=True, cache=cache)
+    return run, 100 * repeats
+
+
+@case("create_path_string/relative/cubics")
+def _(size):
+    shape = parse_path_string(path_data("cubics", size), fast=True)
+    return (lambda: create_path_string(shape, relative=True)), shape.segment_count
+
+
+@case("binary/to_bytes/cubics")
+def _(size):
+    shape = parse_path_string(path_data("cubics", size), fast=True)
+    return (lambda: binary.to_bytes(shape)), shape.segment_count
+
+
+@case("binary/from_bytes/cubics")
+def _(size):
+    shape = parse_path_string(path_data("cubics", size), fast=True)
+    data = binary.to_bytes(shape)
+    return (lambda: binary.from_bytes(data)), shape.segment_count
+
+
+@case("library/getitem")
+def _(size):
+    # Random access to 20 segment shapes of a library holding `size` segments
+    handle, file_path = tempfile.mkstemp(suffix=".bzl")
+    os.close(handle)
+    atexit.register(os.remove, file_path)
+    shape = parse_path_string(path_data("cubics", 20), fast=True)
+    count = write_library(file_path, (shape for _ in range(max(1, size // 20))))
+    library = ShapeLibrary(file_path)
+    indices = np.random.default_rng(0).integers(0, count, 1000).tolist()
+
+    def run():
+        for index in indices:
+            library[index]
+    return run, 20 * len(indices)
+
+
+@case("detect_handle_type/cubics")
+def _(size):
+    path = parse_path_string(path_data("cubics", size), fast=True)[0]
+    anchors = [AnchorPoint._view(path, i) for i in range(len(path))]
+
+    def run():
+        for anchor in anchors:
+            anchor.detect_handle_type()
+    return run, len(anchors)
+
+
+@case("detect_handle_types/cubics")
+def _(size):
+    path = parse_path_string(path_data("cubics", size), fast=True)[0]
+    return path.detect_handle_types, len(path)
+
+
+@case("vector/Vector")
+def _(size):
+    rng = np.random.default_rng(0)
+    pairs = [(Vector(*a), Vector(*b)) for a, b in rng.normal(size=(size, 2, 2)).tolist()]
+
+    def run():
+        for a, b in pairs:
+            a.normalize().magnitude()
+            a.mirrors(b)
+            a.is_continuous_with(b)
+    return run, size
+
+
+@case("vector/Vec2")
+def _(size):
+    rng = np.random.default_rng(0)
+    pairs = [(Vec2(*a), Vec2(*b)) for a, b in rng.normal(size=(size, 2, 2)).tolist()]
+
+    def run():
+        for a, b in pairs:
+            a.normalize().magnitude()
+            a.mirrors(b)
+            a.is_continuous_with(b)
+    return run, size
+
+
+@case("evaluate/cubics")
+def _(size):
+    path = parse_path_string(path_data("cubics", size), fast=True)[0]
+    t = np.linspace(0, path.segment_count, 10 * size)
+    return (lambda: path.evaluate(t)), path.segment_count
+
+
+@case("flatten/cubics")
+def _(size):
+    shape = parse_path_string(path_data("cubics", size), fast=True)
+    return (lambda: shape.flatten(0.1)), shape.segment_count
+
+
+@case("simplify/lines")
+def _(size):
+    path = parse_path_string(path_data("lines", size), fast=True)[0]
+    return (lambda: path.simplify(5.0)), path.segment_count
+
+
+@case("simplify/lines/lines_only")
+def _(size):
+    path = parse_path_string(path_data("lines", size), fast=True)[0]
+    return (lambda: path.simplify(5.0, lines_only=True)), path.segment_count
+
+
+@case("move_handles/cubics")
+def _(size):
+    # Latency of one interactive edit, which shouldn't grow with the path
+    path = parse_path_string(path_data("cubics", size), fast=True)[0]
+    indices = np.arange(0, len(path), max(1, len(path) // 10))[:10]
+    return (lambda: path.move_handles(indices, [0.5, -0.5])), len(indices)
+
+
+@case("transform/cubics")
+def _(size):
+    shape = parse_path_string(path_data("cubics", size), fast=True)
+    matrix = [[0.5, -0.8, 10], [0.8, 0.5, -4]]
+    return (lambda: shape.transform(matrix, in_place=True)), shape.segment_count
+
+
+@case("transform_many/cubics")
+def _(size):
+    # A 100 segment shape instanced enough times to process `size` segments
+    shape = parse_path_string(path_data("cubics", 100), fast=True)
+    angles = np.linspace(0, 2 * np.pi, max(1, size // shape.segment_count))
+    matrices = np.zeros((len(angles), 2, 3))
+    matrices[:, 0, 0] = matrices[:, 1, 1] = np.cos(angles)
+    matrices[:, 1, 0] = np.sin(angles)
+    matrices[:, 0, 1] = -np.sin(angles)
+    matrices[:, :, 2] = angles[:, np.newaxis]
+    return (lambda: shape.transform_many(matrices)), shape.segment_count * len(angles)
+
+
+def _stroke(size: int) -> np.ndarray:
+    """
+    Points of a wavy pen stroke, ten per generated segment.
+    """
+    t = np.linspace(0, size * np.pi / 5, 10 * size)
+    return np.column_stack([t * 20, 50 * np.sin(t) + 5 * np.sin(5 * t)])
+
+
+@case("from_points")
+def _(size):
+    points = _stroke(size)
+    return (lambda: BezierPath.from_points(points, 0.5)), size
+
+
+@case("stroke_fitter")
+def _(size):
+    points = _stroke(size)
+    return (lambda: StrokeFitter(0.5).extend(points)), size
+
+
+@case("self_intersections/cubics")
+def _(size):
+    # The random walk crosses itself a couple of times per segment
+    path = parse_path_string(path_data("cubics", size), fast=True)[0]
+    return path.self_intersections, path.segment_count
+
+
+@case("intersections/waves")
+def _(size):
+    # Two long waves crossing about once every ten segments
+    x = np.arange(size + 1, dtype=np.float64)
+    a = BezierPath.from_arrays(np.column_stack([x, 50 * np.sin(x / 3)]))
+    b = BezierPath.from_arrays(np.column_stack([x, 50 * np.cos(x / 3)]))
+    return (lambda: intersections(a, b)), a.segment_count + b.segment_count
+
+
+@case("combine/tiles")
+def _(size):
+    # Union of unit squares in a grid, every edge but the outer ones shared by two tiles
+    side = max(1, int(np.sqrt(size / 4)))
+    corners = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float64)
+    tiles = [
+        BezierShape([BezierPath.from_arrays(corners + [x, y], is_closed=True)])
+        for x in range(side) for y in range(side)
+        ]
+    return (lambda: BezierShape.combine(tiles)), 4 * len(tiles)
+
+
+@case("contains/cubics")
+def _(size):
+    # As many random points as segments over the bounds of a closed random walk
+    path = parse_path_string(path_data("cubics", size), fast=True)[0]
+    path.is_closed = True
+    shape = BezierShape([path])
+    lower, upper = shape.bounds()
+    points = np.random.default_rng(0).uniform(lower, upper, (size, 2))
+    return (lambda: shape.contains(points)), size
+
+
+@case("nearest/cubics")
+def _(size):
+    path = parse_path_string(path_data("cubics", size), fast=True)[0]
+    lower, upper = path.bounds()
+    points = np.random.default_rng(0).uniform(lower, upper, (size, 2))
+    return (lambda: path.nearest(points)), size
+
+
+@case("offset_contours/cubics")
+def _(size):
+    # Raw offsets and joins only, random walks overlap themselves too much to resolve at scale
+    controls = parse_path_string(path_data("cubics", size), fast=True)[0].segments()
+    return (lambda: offset.offset_contours(controls, False, 2.0, "round", "round", 0.01)), size
+
+
+@case("stroke_to_outline/wave")
+def _(size):
+    # A smooth wave of `size` anchors, stroked and resolved into a single outline
+    x = np.arange(size) * 5.0
+    positions = np.column_stack([x, 40 * np.sin(x / 37) + 10 * np.sin(x / 11)])
+    handles = np.gradient(positions, axis=0) / 3
+    path = BezierPath.from_arrays(positions, -handles, handles, np.full(size, 2))
+    return (lambda: path.stroke_to_outline(4.0, "round", "round", 0.01)), path.segment_count
+
+
+@case("subdivide/cubics")
+def _(size):
+    path = parse_path_string(path_data("cubics", size), fast=True)[0]
+    return (lambda: path.subdivide(4)), size
+
+
+@case("resample/cubics")
+def _(size):
+    path = parse_path_string(path_data("cubics", size), fast=True)[0]
+
+    def run():
+        # A fresh table each run so the lengths are integrated every time
+        path._arc_lengths = ArcLengthTable()
+        path.resample(1.0)
+    return run, path.segment_count
+
+
+def _svg_file(size: int) -> tuple[str, int]:
+    """
+    Write a generated document with about `size` segments to a temporary file.
+    """
+    elements = max(1, size // 20)
+    handle, file_path = tempfile.mkstemp(suffix=".svg")
+    with os.fdopen(handle, "w") as f:
+        f.write(svg_document(elements, segments_per_path=20))
+    atexit.register(os.remove, file_path)
+    segments = sum(shape.segment_count for shape in iter_svg_file(file_path, fast=True))
+    return file_path, segments
+
+
+@case("parse_svg_file")
+def _(size):
+    file_path, segments = _svg_file(size)
+    return (lambda: parse_svg_file(file_path)), segments
+
+
+@case("iter_svg_file/fast")
+def _(size):
+    file_path, segments = _svg_file(size)
+
+    def run():
+        for _ in iter_svg_file(file_path, fast=True):
+            pass
+    return run, segments
+
+
+def _symbol_file(size: int) -> tuple[str, int]:
+    """
+    Write a generated document placing 20 segment symbols about `size` / 20 times to a temporary file.
+    """
+    handle, file_path = tempfile.mkstemp(suffix=".svg")
+    with os.fdopen(handle, "w") as f:
+        f.write(svg_symbol_document(max(1, size // 20), segments_per_path=20))
+    atexit.register(os.remove, file_path)
+    segments = sum(shape.segment_count for shape in iter_svg_file(file_path, fast=True))
+    return file_path, segments
+
+
+@case("iter_svg_file/symbols")
+def _(size):
+    file_path, segments = _symbol_file(size)
+    return (lambda: list(iter_svg_file(file_path, fast=True))), segments
+
+
+@case("parse_svg_instances/symbols")
+def _(size):
+    file_path, segments = _symbol_file(size)
+    return (lambda: parse_svg_instances(file_path, fast=True)), segments
+
+
+def measure(function, segments: int, repeats: int) -> dict:
+    """
+    Time `function` over `repeats` runs after a warm up run, then trace its peak memory in one more run.
+    """
+    function()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = float(np.median(times))
+    return {
+        "segments": segments,
+        "repeats": repeats,
+        "min_s": min(times),
+        "median_s": median,
+        "p90_s": float(np.percentile(times, 90)),
+        "p99_s": float(np.percentile(times, 99)),
+        "segments_per_s": segments / median if median > 0 else float("inf"),
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+            ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def run(sizes, repeats: int, name_filter: str = "") -> list:
+    results = []
+    for name, setup in CASES.items():
+        if name_filter not in name:
+            continue
+        for size in sizes:
+            function, segments = setup(size)
+            result = {"name": name, "size": size, **measure(function, segments, repeats)}
+            results.append(result)
+            print(
+                f"{name:45} {size:>8} {result['segments_per_s']:>14,.0f} seg/s  "
+                f"p50 {result['median_s'] * 1e3:9.3f} ms  p99 {result['p99_s'] * 1e3:9.3f} ms  "
+                f"peak {result['peak_memory_bytes'] / 2 ** 20:8.2f} MiB"
+                )
+    return results
+
+
+def compare(results: list, baseline: list):
+    """
+    Print the change in median time of every case also present in `baseline`.
+    """
+    previous = {(result["name"], result["size"]): result for result in baseline}
+    print("\nChange in median time against baseline:")
+    for result in results:
+        old = previous.get((result["name"], result["size"]))
+        if old is None:
+            continue
+        change = result["median_s"] / old["median_s"] - 1
+        print(f"{result['name']:45} {result['size']:>8} {change:+8.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="numbers of segments per case")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per case and size")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--output", help="save results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    parser.add_argument("--list", action="store_true", help="list the available cases")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return
+
+    results = run(args.sizes, args.repeats, args.filter)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": metadata(), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Synthetic SVG path data and documents of parameterized size for benchmarks.
+
+All generators are seeded so runs compare like with like.
+"""
+
+import numpy as np
+
+SEGMENT_KINDS = ("lines", "cubics", "quadratics", "arcs", "subpaths")
+
+
+def path_data(kind: str, segments: int, seed: int = 0) -> str:
+    """
+    Build a 'd' string with `segments` segments of one kind.
+
+    Args:
+        kind: One of SEGMENT_KINDS. 'subpaths' writes closed 4 segment subpaths
+              mixing lines and cubics.
+        segments: Number of segments to generate.
+        seed: Random seed.
+    """
+    rng = np.random.default_rng(seed)
+    # A random walk keeps coordinates in a realistic range and segments short
+    points = np.cumsum(rng.normal(0, 10, (segments + 1, 2)), axis=0) + 500
+    controls = points[:-1, None, :] + rng.normal(0, 5, (segments, 2, 2))
+    p = points.round(3).tolist()
+    c = controls.round(3).tolist()
+
+    parts = [f"M {p[0][0]},{p[0][1]}"]
+    if kind == "lines":
+        parts += [f"L {x},{y}" for x, y in p[1:]]
+    elif kind == "cubics":
+        parts += [f"C {c1[0]},{c1[1]} {c2[0]},{c2[1]} {x},{y}" for (c1, c2), (x, y) in zip(c, p[1:])]
+    elif kind == "quadratics":
+        parts += [f"Q {q[0]},{q[1]} {x},{y}" for (q, _), (x, y) in zip(c, p[1:])]
+    elif kind == "arcs":
+        radii = rng.uniform(5, 50, (segments, 2)).round(3).tolist()
+        flags = rng.integers(0, 2, (segments, 2)).tolist()
+        parts += [
+            f"A {rx},{ry} {angle} {large} {sweep} {x},{y}"
+            for (rx, ry), angle, (large, sweep), (x, y) in zip(radii, rng.integers(0, 90, segments).tolist(), flags, p[1:])
+        ]
+    elif kind == "subpaths":
+        parts = []
+        for i in range(0, segments, 4):
+            x, y = p[i]
+            parts.append(f"M {x},{y} l 10,0 c 5,0 5,10 0,10 l -10,0 c -5,0 -5,-10 0,-10 Z")
+    else:
+        raise ValueError(f"Invalid segment kind: '{kind}'. Must be one of {', '.join(SEGMENT_KINDS)}.")
+    return " ".join(parts)
+
+
+def svg_document(elements: int, segments_per_path: int = 20, seed: int = 0) -> str:
+    """
+    Build an SVG document in the style of GIS and drawing exports: nested groups
+    with transforms holding a mix of paths, rects, circles and polylines.
+    """
+    rng = np.random.default_rng(seed)
+    lines = [
+        '<svg xmlns="http://www.w3.org/2000/svg" width="1000" height="1000" viewBox="0 0 2000 2000">',
+        '<g transform="translate(10, 10)">',
+    ]
+    for i in range(elements):
+        if i % 100 == 0:
+            if i:
+                lines.append("</g>")
+            lines.append(f'<g transform="rotate({i % 360}) scale(1.01)">')
+        kind = i % 5
+        if kind < 2:
+            d = path_data(SEGMENT_KINDS[i % 4], segments_per_path, seed=seed + i)
+            lines.append(f'<path d="{d}" fill="none" stroke="#000"/>')
+        elif kind == 2:
+            x, y, w, h = rng.uniform(0, 1000, 4).round(2).tolist()
+            lines.append(f'<rect x="{x}" y="{y}" width="{w}" height="{h}"/>')
+        elif kind == 3:
+            x, y, r = rng.uniform(0, 1000, 3).round(2).tolist()
+            lines.append(f'<circle cx="{x}" cy="{y}" r="{r}"/>')
+        else:
+            points = " ".join(f"{x},{y}" for x, y in rng.uniform(0, 1000, (segments_per_path, 2)).round(2).tolist())
+            lines.append(f'<polyline points="{points}"/>')
+    if elements:
+        lines.append("</g>")
+    lines += ["</g>", "</svg>"]
+    return "\n".join(lines)
+
+
+def svg_symbol_document(instances: int, symbols: int = 10, segments_per_path: int = 20, seed: int = 0) -> str:
+    """
+    Build an SVG document in the style of map exports: a few <symbol> definitions
+    placed many times with <use> elements.
+    """
+    rng = np.random.default_rng(seed)
+    lines = ['<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="1000" height="1000">', "<defs>"]
+    for i in range(symbols):
+        d = path_data(SEGMENT_KINDS[i % 4], segments_per_path, seed=seed + i)
+        lines.append(f'<symbol id="symbol{i}"><path d="{d}"/></symbol>')
+    lines.append("</defs>")
+    for i, (x, y, angle) in enumerate(rng.uniform(0, 1000, (instances, 3)).round(2).tolist()):
+        lines.append(f'<use xlink:href="#symbol{i % symbols}" x="{x}" y="{y}" transform="rotate({angle % 360})"/>')
+    lines.append("</svg>")
+    return "\n".join(lines)
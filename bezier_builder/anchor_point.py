@@ -1,83 +1,276 @@
 import numpy as np
-from bezier_builder.vector import Vector
+from bezier_builder.vector import Vector, Vec2
+
+# Handle types are stored as uint8 codes in the backing arrays, indexed into this tuple
+HANDLE_TYPES = ("corner", "aligned", "symmetric")
+CORNER, ALIGNED, SYMMETRIC = range(len(HANDLE_TYPES))
+
+
+def constrained_handles(handles: np.ndarray, opposite: np.ndarray, handle_types: np.ndarray) -> np.ndarray:
+    """
+    Opposite handles of anchors after their other handles were set, following the handle types.
+
+    Aligned anchors keep the length of the opposite handle and point it directly away
+    from the set handle, unless the set handle is zero. Symmetric anchors mirror the
+    set handle and corners are left as they are.
+
+    Args:
+        handles: (K, 2) handles that were set.
+        opposite: (K, 2) current opposite handles.
+        handle_types: Length K handle type codes.
+
+    Returns:
+        (K, 2) new opposite handles.
+    """
+    result = np.array(opposite, dtype=np.float64)
+    lengths = np.hypot(handles[:, 0], handles[:, 1])
+    aligned = (handle_types == ALIGNED) & (lengths > 0)
+    scale = np.hypot(result[aligned, 0], result[aligned, 1]) / lengths[aligned]
+    result[aligned] = -scale[:, np.newaxis] * handles[aligned]
+    symmetric = handle_types == SYMMETRIC
+    result[symmetric] = -handles[symmetric]
+    return result
+
+
+def detect_handle_types(handles_in: np.ndarray, handles_out: np.ndarray, tolerance: float = 1e-6) -> np.ndarray:
+    """
+    Classify anchors by their handles, the bulk form of AnchorPoint.detect_handle_type.
+
+    Handles that mirror each other are symmetric (including two zero handles),
+    handles pointing in opposite directions are aligned and anything else is a corner.
+
+    Args:
+        handles_in: (K, 2) incoming handles.
+        handles_out: (K, 2) outgoing handles.
+        tolerance: Largest length of the sum of the handles, or of their unit directions, still counted as opposite.
+
+    Returns:
+        Length K array of handle type codes.
+    """
+    def unit(handles):
+        lengths = np.hypot(handles[:, 0], handles[:, 1])[:, np.newaxis]
+        return np.divide(handles, lengths, out=np.array(handles, dtype=np.float64), where=lengths != 0)
+
+    directions = unit(handles_in) + unit(handles_out)
+    sums = handles_in + handles_out
+    handle_types = np.full(len(handles_in), CORNER, dtype=np.uint8)
+    handle_types[np.hypot(directions[:, 0], directions[:, 1]) < tolerance] = ALIGNED
+    handle_types[np.hypot(sums[:, 0], sums[:, 1]) < tolerance] = SYMMETRIC
+    return handle_types
+
+
+class _AnchorStore:
+    """
+    Single row backing store for an AnchorPoint that doesn't belong to a path.
+    Uses the same array layout as BezierPath so an AnchorPoint can view either.
+    """
+    __slots__ = ("_positions", "_handles_in", "_handles_out", "_handle_types")
+
+    def __init__(self):
+        self._positions = np.zeros((1, 2), dtype=np.float64)
+        self._handles_in = np.zeros((1, 2), dtype=np.float64)
+        self._handles_out = np.zeros((1, 2), dtype=np.float64)
+        self._handle_types = np.zeros(1, dtype=np.uint8)
+
 
 class AnchorPoint:
-   
+    """
+    Anchor point with an incoming and outgoing handle relative to its position.
+
+    An AnchorPoint is a lightweight view of one row in the arrays of a BezierPath
+    (or of its own single row store when it isn't part of a path), so assignments
+    write straight into the backing arrays and the anchor follows its row when the
+    path's anchors change.
+
+    The vectors returned by `pos`, `handle_in` and `handle_out` view the backing row
+    too, but only until anchors are added to, removed from or reordered in the path,
+    which may reallocate or shift the arrays. Read them again afterwards, or copy
+    them to keep their values.
+    """
+    __slots__ = ("_store", "_index")
+
     def __init__(self, x=0.0, y=0.0):
-      self._handle_type = "corner"
-      self._pos = Vector(x, y) 
-      self._handle_in = Vector() 
-      self._handle_out = Vector()
+        self._store = _AnchorStore()
+        self._index = 0
+        self._store._positions[0] = (x, y)
+
+    @classmethod
+    def _view(cls, store, index: int) -> 'AnchorPoint':
+        """
+        Create an anchor viewing row `index` of an existing store without copying.
+        """
+        anchor = cls.__new__(cls)
+        anchor._store = store
+        anchor._index = index
+        return anchor
+
+    @classmethod
+    def _from_row(cls, pos, handle_in, handle_out, handle_type: int) -> 'AnchorPoint':
+        anchor = cls()
+        anchor._pos = pos
+        anchor._handle_in = handle_in
+        anchor._handle_out = handle_out
+        anchor._store._handle_types[0] = handle_type
+        return anchor
+
+    def __reduce__(self):
+        # Pickle only this anchor's row rather than the whole path it views
+        return (AnchorPoint._from_row, (
+            tuple(self._pos.tolist()), tuple(self._handle_in.tolist()), tuple(self._handle_out.tolist()),
+            int(self._store._handle_types[self._index])
+            ))
+
+    def _bind(self, store, index: int):
+        self._store = store
+        self._index = index
+
+    def _detach(self):
+        """
+        Copy this anchor's row into its own store so it stays valid once its row
+        is removed from a path.
+        """
+        store = _AnchorStore()
+        store._positions[0] = self._store._positions[self._index]
+        store._handles_in[0] = self._store._handles_in[self._index]
+        store._handles_out[0] = self._store._handles_out[self._index]
+        store._handle_types[0] = self._store._handle_types[self._index]
+        self._bind(store, 0)
+
+    def _vec2(self, array: np.ndarray) -> Vec2:
+        """
+        Copy this anchor's row of a backing array into a Vec2 for scalar math.
+        """
+        x, y = array[self._index].tolist()
+        return Vec2(x, y)
+
+    # Private accessors read and write the backing row directly, the public
+    # properties below add type checking and handle constraints on top.
+
+    @property
+    def _pos(self) -> Vector:
+        return self._store._positions[self._index].view(Vector)
+
+    @_pos.setter
+    def _pos(self, pos):
+        self._store._positions[self._index] = pos
+
+    @property
+    def _handle_in(self) -> Vector:
+        return self._store._handles_in[self._index].view(Vector)
+
+    @_handle_in.setter
+    def _handle_in(self, handle_in):
+        self._store._handles_in[self._index] = handle_in
+
+    @property
+    def _handle_out(self) -> Vector:
+        return self._store._handles_out[self._index].view(Vector)
+
+    @_handle_out.setter
+    def _handle_out(self, handle_out):
+        self._store._handles_out[self._index] = handle_out
+
+    @property
+    def _handle_type(self) -> str:
+        return HANDLE_TYPES[self._store._handle_types[self._index]]
+
+    @_handle_type.setter
+    def _handle_type(self, handle_type: str):
+        self._store._handle_types[self._index] = HANDLE_TYPES.index(handle_type)
 
     @property
     def handle_type(self) -> str:
         return self._handle_type
-   
+
     @handle_type.setter
     def handle_type(self, handle_type: str):
-        if handle_type not in ["corner", "aligned", "symmetric"]:
+        if handle_type not in HANDLE_TYPES:
             raise ValueError(f"Invalid handle type: '{handle_type}'. Must be one of 'corner', 'aligned' or 'symmetric'.")
-        
+
         self._handle_type = handle_type
 
-        if self._handle_type == "corner":
+        if handle_type == "corner":
             return
 
         # For aligned and symmetric align self._handle_out direction to self._handle_in
-        direction = -1 * self._handle_in.normalize()
+        handle_in = self._vec2(self._store._handles_in)
+        direction = -1 * handle_in.normalize()
 
         # If handles are symmetric set the length of self_handle_out to the magnitude of self._handle_in
-        magnitude = np.linalg.norm(self._handle_in) if self.handle_type == "symmetric" else np.linalg.norm(self._handle_out)
-        self._handle_out = direction * magnitude
+        magnitude = handle_in.magnitude() if handle_type == "symmetric" else self._vec2(self._store._handles_out).magnitude()
+        out = direction * magnitude
+        self._handle_out = (out.x, out.y)
+
+    def _constrain(self, handles: np.ndarray, opposite: np.ndarray):
+        """
+        Update this anchor's row of `opposite` after its row of `handles` was set, see constrained_handles.
+        """
+        handle_type = self._store._handle_types[self._index]
+        if handle_type == CORNER:
+            return
+        handle = self._vec2(handles)
+        if handle_type == SYMMETRIC:
+            out = -handle
+        else:
+            magnitude = handle.magnitude()
+            if magnitude == 0:
+                return
+            out = handle * (-self._vec2(opposite).magnitude() / magnitude)
+        opposite[self._index] = (out.x, out.y)
 
     @property
     def pos(self) -> Vector:
         return self._pos
-    
+
     @pos.setter
     def pos(self, pos: Vector):
-        if not isinstance(pos, Vector):
-            raise TypeError(f"Invalid type for position. Expected numpy array, got {type(pos)}.")
+        if not isinstance(pos, (Vector, Vec2)):
+            raise TypeError(f"Invalid type for position. Expected Vector or Vec2, got {type(pos)}.")
 
         self._pos = pos
 
     @property
     def handle_in(self) -> Vector:
         return self._handle_in
-    
+
     @handle_in.setter
     def handle_in(self, handle_in: Vector):
-        if not isinstance(handle_in, Vector):
-            raise TypeError(f"Invalid type for position. Expected numpy array, got {type(handle_in)}.")
+        if not isinstance(handle_in, (Vector, Vec2)):
+            raise TypeError(f"Invalid type for position. Expected Vector or Vec2, got {type(handle_in)}.")
 
         self._handle_in = handle_in
+        self._constrain(self._store._handles_in, self._store._handles_out)
 
     @property
     def handle_out(self) -> Vector:
         return self._handle_out
-    
+
     @handle_out.setter
     def handle_out(self, handle_out: Vector):
-        if not isinstance(handle_out, Vector):
-            raise TypeError(f"Invalid type for position. Expected numpy array, got {type(handle_out)}.")
+        if not isinstance(handle_out, (Vector, Vec2)):
+            raise TypeError(f"Invalid type for position. Expected Vector or Vec2, got {type(handle_out)}.")
 
         self._handle_out = handle_out
+        self._constrain(self._store._handles_out, self._store._handles_in)
 
     def detect_handle_type(self):
-        if self.handle_in.mirrors(self.handle_out):
+        handle_in = self._vec2(self._store._handles_in)
+        handle_out = self._vec2(self._store._handles_out)
+        if handle_in.mirrors(handle_out):
             self.handle_type = "symmetric"
-        elif self.handle_in.is_continuous_with(self.handle_out):
+        elif handle_in.is_continuous_with(handle_out):
             self.handle_type = "aligned"
         else:
             self.handle_type = "corner"
 
     def reset_handles(self):
-        self._handle_in = Vector()
-        self._handle_out = Vector()
+        self._handle_in = 0.0
+        self._handle_out = 0.0
 
     def __repr__(self):
-        return (f"AnchorPoint(pos=({str(self._pos[0])}, {str(self._pos[1])}, "
-                f"in=({str(self._handle_in[0])}, {str(self._handle_in[1])}), "
-                f"out=({self._handle_out[0]}, {self._handle_out[1]}), "
+        pos, handle_in, handle_out = self._pos, self._handle_in, self._handle_out
+        return (f"AnchorPoint(pos=({str(pos[0])}, {str(pos[1])}, "
+                f"in=({str(handle_in[0])}, {str(handle_in[1])}), "
+                f"out=({handle_out[0]}, {handle_out[1]}), "
                 f"handle_type='{self._handle_type}' )"
-                )
\ No newline at end of file
+                )
@@ -0,0 +1,185 @@
+"""
+Arc length of cubic bezier segments.
+
+Segment lengths are integrated with composite Gauss-Legendre quadrature over
+(S, 4, 2) control arrays: each segment is split into equal parameter intervals
+and the lengths at the interval knots are kept, so distances can be converted
+back to parameters with a short Newton solve inside a single interval.
+ArcLengthTable caches these knots for a path and only integrates the segments
+whose control points changed since the last update.
+"""
+
+import numpy as np
+
+from bezier_builder import cubic
+
+# Parameter intervals per segment and quadrature nodes and weights on [-1, 1] per interval
+INTERVALS = 8
+_NODES, _WEIGHTS = np.polynomial.legendre.leggauss(8)
+
+# Newton iterations stop once every length is within this fraction of its segment length
+_TOLERANCE = 1e-12
+_MAX_ITERATIONS = 16
+
+
+def speeds(coefficients: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Magnitude of the derivative of segments at local parameters.
+
+    Args:
+        coefficients: (S, 4, 2) power basis coefficients, see cubic.power_coefficients.
+        t: Array of parameters with a leading axis of length S.
+
+    Returns:
+        Array of speeds with the shape of `t`.
+    """
+    extra = (np.newaxis,) * (t.ndim - 1)
+    a, b, c = (coefficients[(slice(None), i) + extra] for i in range(3))
+    t = t[..., np.newaxis]
+    derivative = (3 * a * t + 2 * b) * t + c
+    return np.hypot(derivative[..., 0], derivative[..., 1])
+
+
+def integrate(coefficients: np.ndarray, t0: np.ndarray, t1: np.ndarray) -> np.ndarray:
+    """
+    Arc length of segments between parameters `t0` and `t1` with one Gauss-Legendre rule.
+
+    Args:
+        coefficients: (S, 4, 2) power basis coefficients.
+        t0, t1: Arrays of parameters with a leading axis of length S.
+
+    Returns:
+        Array of lengths with the shape of `t0` and `t1` broadcast together.
+    """
+    t0, t1 = np.broadcast_arrays(t0, t1)
+    half = ((t1 - t0) / 2)[..., np.newaxis]
+    middle = ((t1 + t0) / 2)[..., np.newaxis]
+    return (speeds(coefficients, middle + half * _NODES) @ _WEIGHTS) * half[..., 0]
+
+
+def knot_lengths(controls: np.ndarray) -> np.ndarray:
+    """
+    Cumulative lengths of segments at `INTERVALS` equally spaced parameter intervals.
+
+    Returns:
+        (S, INTERVALS + 1) array, column k is the length from the start to t = k / INTERVALS.
+        The last column is the length of each segment.
+    """
+    knots = np.linspace(0, 1, INTERVALS + 1)
+    pieces = integrate(cubic.power_coefficients(controls), knots[np.newaxis, :-1], knots[np.newaxis, 1:])
+    lengths = np.zeros((len(controls), INTERVALS + 1), dtype=np.float64)
+    np.cumsum(pieces, axis=1, out=lengths[:, 1:])
+    return lengths
+
+
+def segment_lengths(controls: np.ndarray) -> np.ndarray:
+    """
+    Length of each of the (S, 4, 2) segments in `controls`.
+    """
+    return knot_lengths(controls)[:, -1]
+
+
+def parameters_at_lengths(controls: np.ndarray, knots: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Local parameters at which each segment reaches a given length along it.
+
+    The interval holding each length is found from the knot lengths, then refined
+    with Newton's method inside it, falling back to bisection whenever a step
+    leaves the interval.
+
+    Args:
+        controls: (Q, 4, 2) control points, one segment per query.
+        knots: (Q, INTERVALS + 1) knot lengths of those segments, see knot_lengths.
+        lengths: Length Q array of lengths along each segment.
+
+    Returns:
+        Length Q array of parameters in [0, 1].
+    """
+    coefficients = cubic.power_coefficients(controls)
+    rows = np.arange(len(controls))
+    lengths = np.clip(lengths, 0, knots[:, -1])
+    interval = np.minimum(np.sum(knots[:, 1:-1] <= lengths[:, np.newaxis], axis=1), INTERVALS - 1)
+
+    low = interval / INTERVALS
+    high = (interval + 1) / INTERVALS
+    start = low.copy()
+    target = lengths - knots[rows, interval]
+    piece = knots[rows, interval + 1] - knots[rows, interval]
+    fraction = np.divide(target, piece, out=np.zeros(len(rows)), where=piece > 0)
+    t = low + fraction / INTERVALS
+    tolerance = _TOLERANCE * np.maximum(knots[:, -1], 1.0)
+
+    active = rows
+    for _ in range(_MAX_ITERATIONS):
+        error = integrate(coefficients[active], start[active], t[active]) - target[active]
+        converged = np.abs(error) <= tolerance[active]
+        active, error = active[~converged], error[~converged]
+        if len(active) == 0:
+            break
+        low[active] = np.where(error < 0, t[active], low[active])
+        high[active] = np.where(error > 0, t[active], high[active])
+        speed = speeds(coefficients[active], t[active])
+        step = np.divide(error, speed, out=np.full(len(active), np.inf), where=speed > 0)
+        proposed = t[active] - step
+        outside = ~((proposed > low[active]) & (proposed < high[active]))
+        proposed[outside] = (low[active][outside] + high[active][outside]) / 2
+        t[active] = proposed
+    return t
+
+
+class ArcLengthTable:
+    """
+    Cumulative arc length table of a path's segments.
+
+    The table keeps the control points it was computed from, so calling
+    `update` with the current segments only integrates segments that changed
+    or were added.
+    """
+    def __init__(self):
+        self.controls = np.empty((0, 4, 2), dtype=np.float64)
+        self.knots = np.zeros((0, INTERVALS + 1), dtype=np.float64)
+        self.cumulative = np.zeros(1, dtype=np.float64)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Length of every segment."""
+        return self.knots[:, -1]
+
+    @property
+    def total(self) -> float:
+        return float(self.cumulative[-1])
+
+    def update(self, controls: np.ndarray):
+        """
+        Bring the table up to date with `controls`, the (S, 4, 2) segments of the path.
+        """
+        count = min(len(controls), len(self.controls))
+        changed = np.any(controls[:count] != self.controls[:count], axis=(1, 2))
+        stale = np.concatenate([np.flatnonzero(changed), np.arange(count, len(controls))])
+        if len(stale) == 0 and len(controls) == len(self.controls):
+            return
+
+        knots = np.empty((len(controls), INTERVALS + 1), dtype=np.float64)
+        knots[:count] = self.knots[:count]
+        if len(stale):
+            knots[stale] = knot_lengths(controls[stale])
+
+        self.controls = controls
+        self.knots = knots
+        self.cumulative = np.concatenate([[0.0], np.cumsum(knots[:, -1])])
+
+    def locate(self, distances) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Convert distances along the path to segment indices and local parameters.
+        Distances are clipped to the length of the path.
+
+        Returns:
+            (segments, t) arrays with the shape of the input.
+        """
+        if len(self.knots) == 0:
+            raise ValueError("Cannot evaluate a path with no segments.")
+        distances = np.clip(np.asarray(distances, dtype=np.float64), 0, self.total)
+        flat = distances.reshape(-1)
+        segments = np.clip(np.searchsorted(self.cumulative, flat, side="right") - 1, 0, len(self.knots) - 1)
+        t = parameters_at_lengths(self.controls[segments], self.knots[segments], flat - self.cumulative[segments])
+        return segments.reshape(distances.shape), t.reshape(distances.shape)
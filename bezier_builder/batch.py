@@ -0,0 +1,245 @@
+"""
+Parallel conversion of many SVG files.
+
+Files are parsed, optionally edited and written back out in worker processes.
+Shapes returned to the parent process pickle as packed arrays (see
+BezierShape.to_arrays) so crossing process boundaries stays cheap. A file that
+fails doesn't stop the others, the failures are raised together as a
+BatchError once every file has been tried.
+
+Command line usage:
+    python -m bezier_builder.batch drawings/ -o converted/ --workers 8
+"""
+
+import argparse
+import importlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from bezier_builder.bezier_path import BezierShape
+from bezier_builder.svg_converter import parse_svg_file, save_svg_file
+
+# Function applied to the shapes of each file, must be picklable (defined at module level)
+EditFunction = Callable[[List[BezierShape]], List[BezierShape]]
+
+
+class BatchError(Exception):
+    """
+    Files of a batch that failed, raised after all the others have been yielded.
+
+    Attributes:
+        failures: (file_path, message) of every failed file, with the message
+                  naming the type of the error raised.
+    """
+    def __init__(self, failures: List[tuple[str, str]]):
+        self.failures = failures
+        lines = "".join(f"\n  {file_path}: {message}" for file_path, message in failures)
+        super().__init__(f"{len(failures)} file{'s' if len(failures) != 1 else ''} failed:{lines}")
+
+
+def process_svg_files(
+        file_paths: Iterable[str],
+        edit: Optional[EditFunction] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 1,
+        ordered: bool = True,
+        fast: bool = False
+        ) -> Iterator[tuple[str, List[BezierShape]]]:
+    """
+    Parse SVG files in parallel and yield their shapes.
+
+    Args:
+        file_paths: SVG files to parse.
+        edit: Optional function applied to the shapes of each file in the worker.
+        workers: Number of worker processes, defaults to the number of CPUs. 1 runs in this process.
+        chunk_size: Number of files sent to a worker at a time.
+        ordered: Yield results in the order of `file_paths`, otherwise as they complete.
+        fast: Use the native path data parser.
+
+    Yields:
+        (file_path, shapes) for every file that was parsed.
+
+    Raises:
+        BatchError: After the last file, if any file failed.
+    """
+    yield from _run(_parse_chunk, list(file_paths), (edit, fast), workers, chunk_size, ordered)
+
+
+def convert_svg_files(
+        file_paths: Iterable[str],
+        output_dir: str,
+        edit: Optional[EditFunction] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 1,
+        ordered: bool = True,
+        fast: bool = False,
+        precision: int = 5,
+        relative: bool = False
+        ) -> Iterator[tuple[str, str]]:
+    """
+    Convert SVG files in parallel through parse_svg_file, `edit` and save_svg_file.
+
+    Output files are written by the workers, so no shapes are sent back to this process.
+    They keep the paths of the input files relative to the deepest directory
+    holding them all, so files of the same name in different directories don't
+    overwrite each other. Arguments are the same as process_svg_files, with
+    `precision` and `relative` passed on to the path string writer.
+
+    Yields:
+        (input_path, output_path) for every file that was converted.
+
+    Raises:
+        ValueError: If a file is given twice, before anything is converted.
+        BatchError: After the last file, if any file failed.
+    """
+    file_paths = list(file_paths)
+    pairs = list(zip(file_paths, _output_paths(file_paths, output_dir)))
+    os.makedirs(output_dir, exist_ok=True)
+    options = (edit, fast, precision, relative)
+    yield from _run(_convert_chunk, pairs, options, workers, chunk_size, ordered)
+
+
+def find_svg_files(paths: Iterable[str]) -> List[str]:
+    """
+    Expand directories in `paths` to the SVG files they contain, sorted by name.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(".svg")
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+def _output_paths(file_paths: List[str], output_dir: str) -> List[str]:
+    """
+    Paths in `output_dir` for files, relative to the deepest directory holding them all.
+    """
+    if not file_paths:
+        return []
+    absolute = [os.path.abspath(file_path) for file_path in file_paths]
+    root = os.path.commonpath([os.path.dirname(file_path) for file_path in absolute])
+    output_paths = [os.path.join(output_dir, os.path.relpath(file_path, root)) for file_path in absolute]
+
+    written = {}
+    for file_path, output_path in zip(file_paths, output_paths):
+        key = os.path.normcase(output_path)
+        if key in written:
+            raise ValueError(f"Invalid file paths: {written[key]!r} and {file_path!r}. Both would be written to {output_path!r}.")
+        written[key] = file_path
+    return output_paths
+
+
+def _run(function, items: list, options: tuple, workers: Optional[int], chunk_size: int, ordered: bool):
+    """
+    Apply a chunk function to `items` in worker processes, yielding the results of
+    the files that succeeded and raising the failures at the end, see BatchError.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size}. Must be at least 1.")
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    failures = []
+
+    def finished(results):
+        for file_path, result, failure in results:
+            if failure is None:
+                yield file_path, result
+            else:
+                failures.append((file_path, failure))
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from finished(function(chunk, *options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(function, chunk, *options) for chunk in chunks]
+            for future in (futures if ordered else as_completed(futures)):
+                yield from finished(future.result())
+
+    if failures:
+        raise BatchError(failures)
+
+
+def _attempt(file_path: str, step, *args) -> tuple:
+    """
+    (file_path, result, None) of a step that worked, or (file_path, None, message) of one that raised.
+    """
+    try:
+        return file_path, step(*args), None
+    except Exception as error:
+        return file_path, None, f"{type(error).__name__}: {error}"
+
+
+def _parse_file(file_path: str, edit: Optional[EditFunction], fast: bool) -> List[BezierShape]:
+    shapes = parse_svg_file(file_path, fast=fast)
+    if edit is not None:
+        shapes = edit(shapes)
+    return shapes
+
+
+def _convert_file(file_path: str, output_path: str, edit: Optional[EditFunction], fast: bool, precision: int, relative: bool) -> str:
+    shapes = _parse_file(file_path, edit, fast)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    save_svg_file(output_path, shapes, precision=precision, relative=relative)
+    return output_path
+
+
+def _parse_chunk(file_paths: List[str], edit: Optional[EditFunction], fast: bool) -> list:
+    return [_attempt(file_path, _parse_file, file_path, edit, fast) for file_path in file_paths]
+
+
+def _convert_chunk(pairs: List[tuple[str, str]], edit: Optional[EditFunction], fast: bool, precision: int, relative: bool) -> list:
+    return [
+        _attempt(file_path, _convert_file, file_path, output_path, edit, fast, precision, relative)
+        for file_path, output_path in pairs
+        ]
+
+
+def _load_edit_function(name: str) -> EditFunction:
+    """
+    Import an edit function given as 'module:function'.
+    """
+    module_name, _, function_name = name.partition(":")
+    if not function_name:
+        raise ValueError(f"Invalid edit function: '{name}'. Expected 'module:function'.")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bezier_builder.batch",
+        description="Convert SVG files in parallel through Bezier Builder."
+        )
+    parser.add_argument("inputs", nargs="+", help="SVG files or directories of SVG files")
+    parser.add_argument("-o", "--output-dir", required=True, help="directory for the converted files")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=1, help="files sent to a worker at a time")
+    parser.add_argument("--unordered", action="store_true", help="report files as they complete")
+    parser.add_argument("--edit", help="edit function applied to each file's shapes, as 'module:function'")
+    parser.add_argument("--fast", action="store_true", help="use the native path data parser")
+    parser.add_argument("--precision", type=int, default=5, help="decimal places in the output")
+    parser.add_argument("--relative", action="store_true", help="write relative path commands")
+    args = parser.parse_args(argv)
+
+    edit = _load_edit_function(args.edit) if args.edit else None
+    results = convert_svg_files(
+        find_svg_files(args.inputs), args.output_dir, edit=edit, workers=args.workers,
+        chunk_size=args.chunk_size, ordered=not args.unordered, fast=args.fast,
+        precision=args.precision, relative=args.relative
+        )
+    try:
+        for input_path, output_path in results:
+            print(f"{input_path} -> {output_path}")
+    except BatchError as error:
+        for input_path, message in error.failures:
+            print(f"{input_path}: {message}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,673 @@
 from collections import UserList
-from bezier_builder.anchor_point import AnchorPoint
+import numpy as np
+from bezier_builder.anchor_point import AnchorPoint, _AnchorStore, constrained_handles, detect_handle_types
 from bezier_builder.vector import Vector
+from bezier_builder import boolean, cubic, fitting, intersection, offset, query, subdivision
+from bezier_builder.arc_length import ArcLengthTable
+
+_MIN_CAPACITY = 8
+
+
+class AnchorList(list):
+    """
+    List of AnchorPoint views over the rows of a BezierPath.
+    Mutating the list also updates the path's backing arrays.
+    """
+    def __init__(self, path: 'BezierPath', anchors=()):
+        super().__init__(anchors)
+        self._path = path
+
+    def append(self, anchor: AnchorPoint):
+        self._path.append(anchor)
+
+    def pop(self, index=-1) -> AnchorPoint:
+        return self._path.pop(index)
+
+    def _resyncing(method):
+        """
+        Wrap a list mutator so the path arrays are rebuilt from the new list order.
+        """
+        def mutator(self, *args, **kwargs):
+            previous = list(self)
+            result = getattr(list, method.__name__)(self, *args, **kwargs)
+            self._path._resync(previous)
+            return result
+        mutator.__name__ = method.__name__
+        return mutator
+
+    @_resyncing
+    def insert(self, index, anchor): pass
+
+    @_resyncing
+    def extend(self, anchors): pass
+
+    @_resyncing
+    def remove(self, anchor): pass
+
+    @_resyncing
+    def clear(self): pass
+
+    @_resyncing
+    def reverse(self): pass
+
+    @_resyncing
+    def sort(self, *, key=None, reverse=False): pass
+
+    @_resyncing
+    def __setitem__(self, index, anchor): pass
+
+    @_resyncing
+    def __delitem__(self, index): pass
+
+    @_resyncing
+    def __iadd__(self, anchors): pass
+
+    del _resyncing
+
 
 class BezierPath:
     """
-    Class to define a single cubic bezier path with a list of anchor points 
-    rather than bezier segments
+    Class to define a single cubic bezier path with a list of anchor points
+    rather than bezier segments.
+
+    Anchor data is stored as contiguous (N, 2) float64 arrays of positions,
+    incoming and outgoing handles plus a uint8 array of handle type codes.
+    The AnchorPoint objects in `anchor_points` are views into rows of these arrays
+    and are only created when first requested.
     """
     def __init__(self):
-        self._anchor_points = []
+        self._positions = np.zeros((0, 2), dtype=np.float64)
+        self._handles_in = np.zeros((0, 2), dtype=np.float64)
+        self._handles_out = np.zeros((0, 2), dtype=np.float64)
+        self._handle_types = np.zeros(0, dtype=np.uint8)
+        self._size = 0
+        self._anchors = None
         self._is_closed = False
+        self._arc_lengths = ArcLengthTable()
+
+    @classmethod
+    def from_arrays(cls, positions, handles_in=None, handles_out=None, handle_types=None, is_closed=False, copy=True) -> 'BezierPath':
+        """
+        Create a path from (N, 2) arrays of positions and relative handles.
+
+        Args:
+            positions: (N, 2) array of anchor positions.
+            handles_in: (N, 2) array of incoming handles, defaults to zero.
+            handles_out: (N, 2) array of outgoing handles, defaults to zero.
+            handle_types: Length N array of handle type codes (indexes into HANDLE_TYPES), defaults to corner.
+            is_closed: Whether the path is closed.
+            copy: Copy the arrays. Otherwise float64 and uint8 arrays are used as they are,
+                  e.g. as views of a memory mapped file, until anchors are added.
+        """
+        array = np.array if copy else np.asarray
+        positions = array(positions, dtype=np.float64).reshape(-1, 2)
+        size = len(positions)
+
+        path = cls()
+        path._positions = positions
+        path._handles_in = np.zeros((size, 2)) if handles_in is None else array(handles_in, dtype=np.float64).reshape(size, 2)
+        path._handles_out = np.zeros((size, 2)) if handles_out is None else array(handles_out, dtype=np.float64).reshape(size, 2)
+        path._handle_types = np.zeros(size, dtype=np.uint8) if handle_types is None else array(handle_types, dtype=np.uint8).reshape(size)
+        path._size = size
+        path._is_closed = bool(is_closed)
+        return path
+
+    @classmethod
+    def from_points(cls, points, error: float) -> 'BezierPath':
+        """
+        Fit a smooth open path to an ordered stream of points, such as a pen stroke, see fitting.fit_points.
+        Anchors between segments are aligned or symmetric, use StrokeFitter to fit points as they arrive.
+
+        Args:
+            points: (N, 2) array-like of points.
+            error: Maximum distance between the points and the path.
+        """
+        controls, anchors = fitting.fit_points(points, error)
+        if len(controls) == 0:
+            points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+            return cls.from_arrays(points[anchors])
+        return cls.from_arrays(*fitting.smooth_anchors(controls))
+
+    def __len__(self) -> int:
+        return self._size
 
     def __iter__(self):
-        return iter(self._anchor_points)
+        return iter(self.anchor_points)
 
     @property
-    def anchor_points(self) -> list:
-        return self._anchor_points
-    
+    def positions(self) -> np.ndarray:
+        """(N, 2) view of the anchor positions."""
+        return self._positions[:self._size]
+
+    @property
+    def handles_in(self) -> np.ndarray:
+        """(N, 2) view of the incoming handles, relative to their anchor positions."""
+        return self._handles_in[:self._size]
+
+    @property
+    def handles_out(self) -> np.ndarray:
+        """(N, 2) view of the outgoing handles, relative to their anchor positions."""
+        return self._handles_out[:self._size]
+
+    @property
+    def handle_types(self) -> np.ndarray:
+        """Length N uint8 view of the handle type codes, indexes into HANDLE_TYPES."""
+        return self._handle_types[:self._size]
+
+    @property
+    def anchor_points(self) -> AnchorList:
+        if self._anchors is None:
+            self._anchors = AnchorList(self, [AnchorPoint._view(self, i) for i in range(self._size)])
+        return self._anchors
+
     @anchor_points.setter
     def anchor_points(self, anchors:list[AnchorPoint]):
-        self._anchor_points = anchors
+        previous = list(self._anchors) if self._anchors is not None else []
+        self._anchors = AnchorList(self, anchors)
+        self._resync(previous)
 
     @property
     def is_closed(self) -> bool:
         return self._is_closed
-    
+
     @is_closed.setter
     def is_closed(self, is_closed:bool):
         self._is_closed = is_closed
 
     @property
     def start(self) -> AnchorPoint:
-        if len(self._anchor_points) > 0:
-            return self._anchor_points[0]
+        if self._size > 0:
+            return self.anchor_points[0]
         return None
-        
+
     @property
     def end(self) -> AnchorPoint:
-        if len(self._anchor_points) > 0:
-           return self._anchor_points[-1]
+        if self._size > 0:
+           return self.anchor_points[-1]
         return None
-        
+
     @property
     def previous_point(self) -> AnchorPoint:
-        if len(self._anchor_points) > 1:
-            return self._anchor_points[-2]
+        if self._size > 1:
+            return self.anchor_points[-2]
         return None
-    
+
     def append(self, anchor: AnchorPoint):
         if not isinstance(anchor, AnchorPoint):
             raise TypeError("Anchor must be an instance of AnchorPoint")
-        self._anchor_points.append(anchor)
+        anchors = self.anchor_points
+        index = self._add_row(anchor._pos, anchor._handle_in, anchor._handle_out, anchor._store._handle_types[anchor._index])
+
+        # Standalone anchors become views of their new row, anchors owned by a path are copied
+        if isinstance(anchor._store, _AnchorStore):
+            anchor._bind(self, index)
+        else:
+            anchor = AnchorPoint._view(self, index)
+        list.append(anchors, anchor)
 
     def create(self, pos=Vector(0.0,0.0), handle_in=Vector(0.0,0.0), handle_out=Vector(0.0,0.0), type="corner"):
-        point = AnchorPoint()
-        point.pos = pos
-        point.handle_in = handle_in
-        point.handle_out = handle_out
+        index = self._add_row(pos, handle_in, handle_out, 0)
+        point = AnchorPoint._view(self, index)
         point.handle_type = type
-        self.anchor_points.append(point)
-        pass
+        if self._anchors is not None:
+            list.append(self._anchors, point)
+
+    @property
+    def segment_count(self) -> int:
+        """Number of cubic segments, including the closing segment of closed paths."""
+        return cubic.segment_count(self._size, self._is_closed)
+
+    def segments(self) -> np.ndarray:
+        """
+        Absolute control points of every segment as an (S, 4, 2) array.
+        """
+        return cubic.segment_controls(self.positions, self.handles_in, self.handles_out, self._is_closed)
+
+    def evaluate(self, t) -> np.ndarray:
+        """
+        Evaluate points on the path.
+
+        Args:
+            t: Scalar or array of path parameters from 0 to `segment_count`.
+               The integer part selects the segment and the fractional part the
+               position along it.
+
+        Returns:
+            Array of points with shape `t.shape + (2,)`.
+        """
+        segments, local_t = cubic.locate(t, self.segment_count)
+        return cubic.evaluate(self.segments(), segments, local_t)
+
+    def segment_bounds(self) -> np.ndarray:
+        """
+        Exact bounding boxes of every segment as an (S, 2, 2) array of [min, max] corners.
+        """
+        return cubic.bounds(self.segments())
+
+    def bounds(self) -> np.ndarray:
+        """
+        Exact bounding box of the path as a (2, 2) array of [min, max] corners, or None if it has no anchors.
+        """
+        if self._size == 0:
+            return None
+        positions = self.positions
+        if self.segment_count == 0:
+            return np.stack([positions.min(axis=0), positions.max(axis=0)])
+        segment_bounds = self.segment_bounds()
+        return np.stack([segment_bounds[:, 0].min(axis=0), segment_bounds[:, 1].max(axis=0)])
+
+    def flatten(self, tolerance: float) -> np.ndarray:
+        """
+        Approximate the path with line segments.
+
+        Args:
+            tolerance: Maximum distance between the curves and the lines.
+
+        Returns:
+            (V, 2) array of polyline vertices starting at the first anchor. Closed paths end
+            with the first anchor again.
+        """
+        vertices, _ = _flatten_paths([self], tolerance)
+        return vertices
+
+    def simplify(self, tolerance: float, lines_only: bool = False) -> 'BezierPath':
+        """
+        Create a copy of the path with fewer anchors by merging runs of segments into
+        least squares fitted cubics, see fitting.simplify.
+
+        Args:
+            tolerance: Maximum distance between the new path and the old one.
+            lines_only: Only collapse runs of nearly collinear straight line segments,
+                        which is much faster and leaves curves untouched.
+
+        Returns:
+            A new BezierPath.
+        """
+        arrays = fitting.simplify(
+            self.positions, self.handles_in, self.handles_out, self.handle_types, self._is_closed, tolerance, lines_only
+            )
+        return BezierPath.from_arrays(*arrays, is_closed=self._is_closed)
+
+    def insert_anchor(self, segment: int, t: float) -> int:
+        """
+        Insert an anchor at local parameter `t` of a segment without changing the
+        shape of the path, see subdivision.insert.
+
+        Args:
+            segment: Index of the segment.
+            t: Local parameter in [0, 1], 0 and 1 fall on the existing anchors.
+
+        Returns:
+            Index of the anchor at `t`.
+        """
+        segment = range(self.segment_count)[segment]
+        positions, handles_in, handles_out, handle_types, anchors = subdivision.insert(
+            self.positions, self.handles_in, self.handles_out, self.handle_types, self._is_closed, [segment], t
+            )
+        index = int(anchors[0]) % len(positions)
+        if len(positions) == self._size:
+            return index
+
+        self._positions, self._handles_in, self._handles_out, self._handle_types = positions, handles_in, handles_out, handle_types
+        self._size = len(positions)
+        if self._anchors is not None:
+            for anchor in list.__getitem__(self._anchors, slice(index, None)):
+                anchor._index += 1
+            list.insert(self._anchors, index, AnchorPoint._view(self, index))
+        return index
+
+    def split_at(self, segment: int, t: float) -> tuple['BezierPath', 'BezierPath']:
+        """
+        Split the path in two at local parameter `t` of a segment.
+        Closed paths are opened at their first anchor too, where the second part ends.
+
+        Returns:
+            (before, after) new open paths.
+        """
+        segment = range(self.segment_count)[segment]
+        return self.trim(0, segment + t), self.trim(segment + t, self.segment_count)
+
+    def trim(self, t0: float, t1: float) -> 'BezierPath':
+        """
+        Create the open path between two path parameters, splitting the segments they fall on.
+        Use `parameter_at_distance` to trim between distances along the path.
+
+        Args:
+            t0, t1: Path parameters from 0 to `segment_count`, see `evaluate`. Closed paths
+                    wrap around past their first anchor when `t1` is less than `t0`.
+
+        Returns:
+            A new BezierPath.
+        """
+        count = self.segment_count
+        if count == 0:
+            raise ValueError("Cannot trim a path with no segments.")
+        for value in (t0, t1):
+            if not 0 <= value <= count:
+                raise ValueError(f"Invalid path parameter: {value}. Must be between 0 and {count}.")
+        if t1 < t0 and not self._is_closed:
+            raise ValueError(f"Invalid path parameters: {t0}, {t1}. t0 must not be greater than t1 on an open path.")
+        segments, local_t = cubic.locate([t0, t1], count)
+        *arrays, anchors = subdivision.insert(
+            self.positions, self.handles_in, self.handles_out, self.handle_types, self._is_closed, segments, local_t
+            )
+        return BezierPath.from_arrays(*subdivision.span(*arrays, self._is_closed, *anchors), copy=False)
+
+    def subdivide(self, n: int) -> 'BezierPath':
+        """
+        Create a copy of the path with every segment split into `n` pieces of equal parameter
+        length, all in one batch, see subdivision.subdivide.
+        """
+        arrays = subdivision.subdivide(self.positions, self.handles_in, self.handles_out, self.handle_types, self._is_closed, n)
+        return BezierPath.from_arrays(*arrays, is_closed=self._is_closed, copy=False)
+
+    def _arc_length_table(self) -> ArcLengthTable:
+        """
+        Arc length table of the path, lengths are only recomputed for segments that changed since the last call.
+        """
+        self._arc_lengths.update(self.segments())
+        return self._arc_lengths
+
+    def length(self) -> float:
+        """Total arc length of the path."""
+        return self._arc_length_table().total
+
+    def point_at_distance(self, s) -> np.ndarray:
+        """
+        Points at distances along the path.
+
+        Args:
+            s: Scalar or array of distances from the first anchor, clipped to the length of the path.
+
+        Returns:
+            Array of points with shape `s.shape + (2,)`.
+        """
+        table = self._arc_length_table()
+        segments, local_t = table.locate(s)
+        return cubic.evaluate(table.controls, segments, local_t)
+
+    def parameter_at_distance(self, s) -> np.ndarray:
+        """
+        Path parameters at distances along the path, see `point_at_distance` and `evaluate`.
+        """
+        segments, local_t = self._arc_length_table().locate(s)
+        return segments + local_t
+
+    def resample(self, spacing: float) -> np.ndarray:
+        """
+        Points spaced evenly along the path, starting at the first anchor.
+
+        Open paths include their end point when it falls on a multiple of `spacing`,
+        closed paths stop before returning to the first anchor.
+
+        Args:
+            spacing: Distance between consecutive points.
+
+        Returns:
+            (M, 2) array of points.
+        """
+        if spacing <= 0:
+            raise ValueError(f"Invalid spacing: {spacing}. Must be greater than 0.")
+        if self.segment_count == 0:
+            return self.positions.copy()
+        length = self.length()
+        count = int(np.floor(length / spacing * (1 + 1e-12))) + 1
+        if self._is_closed and (count - 1) * spacing >= length * (1 - 1e-12):
+            count -= 1
+        return self.point_at_distance(np.arange(max(count, 1)) * spacing)
+
+    def self_intersections(self, tolerance: float = 1e-6) -> tuple:
+        """
+        Points where the path crosses or touches itself, including loops within a single segment.
+
+        Neighbouring segments meeting at their shared anchor are not intersections,
+        see intersection.intersections for the rest of the behavior.
+
+        Returns:
+            ((segments_a, t_a), (segments_b, t_b)) arrays with each crossing once, its
+            earlier point along the path first.
+        """
+        return intersection.self_intersections(self, tolerance)
+
+    def nearest(self, points) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Closest points on the path to many points at once, only searching the segments
+        whose bounding boxes are near each point. See query.nearest.
+
+        Args:
+            points: (M, 2) array of points.
+
+        Returns:
+            (segments, t, distances) length M arrays, `segments + t` is the path
+            parameter of the closest point, see `evaluate`.
+        """
+        return query.nearest(self.segments(), points)
+
+    def offset(self, distance: float, join: str = "miter", cap: str = "butt", tolerance: float = None,
+               miter_limit: float = 4.0) -> 'BezierShape':
+        """
+        Outline of the area within `distance` of the path, see the offset module.
+
+        Closed paths grow outwards for positive distances and shrink for negative ones.
+        Open paths are outlined on both sides at the distance, with caps at their ends.
+        Each segment is approximated by a few cubics fitted within `tolerance` of its
+        exact offset, and overlaps are resolved so the outline doesn't cross itself.
+
+        Args:
+            distance: Offset distance.
+            join: "miter", "round" or "bevel" corners on the outer side of turns.
+            cap: "butt", "round" or "square" ends of open paths.
+            tolerance: Largest distance of the outline from the exact offset,
+                       a thousandth of `distance` if None.
+            miter_limit: Longest miter as a multiple of the distance, longer ones are beveled as in SVG.
+
+        Returns:
+            New shape of closed paths with the area on their left.
+        """
+        return BezierShape.from_arrays(*offset.offset_path(self.segments(), self._is_closed, distance, join, cap, tolerance, miter_limit), copy=False)
+
+    def stroke_to_outline(self, width: float, join: str = "miter", cap: str = "butt", tolerance: float = None,
+                          miter_limit: float = 4.0) -> 'BezierShape':
+        """
+        Filled outline of the path stroked with a line of `width`, see `offset`.
+
+        Closed paths give a ring between their offsets on either side.
+        """
+        return BezierShape.from_arrays(*offset.offset_path(self.segments(), self._is_closed, 0.5 * width, join, cap, tolerance, miter_limit, width), copy=False)
+
+    def detect_handle_types(self, tolerance: float = 1e-6, indices=None):
+        """
+        Classify anchors as corner, aligned or symmetric from their handles and realign
+        their outgoing handles to match, in one pass over the handle arrays.
+        See anchor_point.detect_handle_types.
+
+        Args:
+            tolerance: Tolerance of the handle comparisons.
+            indices: Indices or boolean mask of the anchors to classify, defaults to all anchors.
+        """
+        if indices is None:
+            indices = slice(None)
+        else:
+            indices = np.asarray(indices)
+            if indices.dtype != bool:
+                indices = indices.astype(np.intp)
+        handles_in, handles_out = self.handles_in[indices], self.handles_out[indices]
+        handle_types = detect_handle_types(handles_in, handles_out, tolerance)
+        self.handle_types[indices] = handle_types
+        self.handles_out[indices] = constrained_handles(handles_in, handles_out, handle_types)
+
+    def move_anchors(self, indices, delta):
+        """
+        Move anchors in place, their handles are relative so they move along.
+        Only the rows of the given anchors are touched.
+
+        Args:
+            indices: Indices of the anchors, anchors listed more than once move once per listing.
+            delta: (2,) offset for all anchors or (K, 2) offsets, one per index.
+        """
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+        np.add.at(self.positions, indices, np.broadcast_to(np.asarray(delta, dtype=np.float64), (len(indices), 2)))
+
+    def move_handles(self, indices, delta, side: str = "out"):
+        """
+        Move handles of anchors in place and update the opposite handles of aligned
+        and symmetric anchors to match, see anchor_point.constrained_handles.
+
+        Args:
+            indices: Indices of the anchors, anchors listed more than once move once per listing.
+            delta: (2,) offset for all handles or (K, 2) offsets, one per index.
+            side: Which handles to move, "in" or "out".
+        """
+        if side not in ("in", "out"):
+            raise ValueError(f"Invalid handle side: '{side}'. Must be 'in' or 'out'.")
+        handles, opposite = (self.handles_in, self.handles_out) if side == "in" else (self.handles_out, self.handles_in)
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+        if len(indices) == 0:
+            return
+        np.add.at(handles, indices, np.broadcast_to(np.asarray(delta, dtype=np.float64), (len(indices), 2)))
+        changed = np.unique(indices % self._size)
+        opposite[changed] = constrained_handles(handles[changed], opposite[changed], self.handle_types[changed])
+
+    def transform(self, matrix, in_place: bool = False) -> 'BezierPath':
+        """
+        Apply an affine transform to the path. Positions are transformed as points and
+        handles as directions, so handle types are preserved.
+
+        Args:
+            matrix: (2, 3) array-like [[a, c, e], [b, d, f]] mapping (x, y) to (a x + c y + e, b x + d y + f).
+            in_place: Transform this path's arrays rather than a copy.
+
+        Returns:
+            The transformed path, this path if `in_place` is set.
+        """
+        linear, translation = _affine(matrix)
+        if not in_place:
+            return BezierPath.from_arrays(
+                self.positions @ linear.T + translation, self.handles_in @ linear.T, self.handles_out @ linear.T,
+                self.handle_types, self._is_closed
+                )
+        for array in (self.positions, self.handles_in, self.handles_out):
+            np.matmul(array, linear.T, out=array)
+        self.positions[...] += translation
+        return self
+
+    def close(self):
+        """
+        Mark the path as closed. If the last anchor lies exactly on the first one it is
+        merged into it, with the first anchor taking over its incoming handle.
+        """
+        if self._size > 1 and np.array_equal(self._positions[0], self._positions[self._size - 1]):
+            self._handles_in[0] = self._handles_in[self._size - 1]
+            self.pop()
+            self.detect_handle_types(indices=[0])
+        self._is_closed = True
+
+    def _reserve(self, capacity: int):
+        """
+        Grow the backing arrays so they can hold at least `capacity` anchors.
+        Views of the old arrays, such as AnchorPoint.pos, stop tracking the path.
+        """
+        if capacity <= len(self._positions):
+            return
+        capacity = max(capacity, 2 * len(self._positions), _MIN_CAPACITY)
+
+        def grow(array):
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            return grown
+
+        self._positions = grow(self._positions)
+        self._handles_in = grow(self._handles_in)
+        self._handles_out = grow(self._handles_out)
+        self._handle_types = grow(self._handle_types)
+
+    def _add_row(self, pos, handle_in, handle_out, handle_type: int) -> int:
+        index = self._size
+        self._reserve(index + 1)
+        self._positions[index] = pos
+        self._handles_in[index] = handle_in
+        self._handles_out[index] = handle_out
+        self._handle_types[index] = handle_type
+        self._size += 1
+        return index
+
+    def pop(self, index: int = -1) -> AnchorPoint:
+        """
+        Remove the anchor at `index` and return it detached from the path.
+        """
+        index = range(self._size)[index]
+
+        if self._anchors is not None:
+            anchor = list.pop(self._anchors, index)
+            for i in range(index, len(self._anchors)):
+                self._anchors[i]._index = i
+        else:
+            anchor = AnchorPoint._view(self, index)
+        anchor._detach()
+
+        for array in (self._positions, self._handles_in, self._handles_out, self._handle_types):
+            array[index:self._size - 1] = array[index + 1:self._size]
+        self._size -= 1
+        return anchor
+
+    def _resync(self, previous: list):
+        """
+        Rebuild the backing arrays from the current order of `self._anchors`.
+        Anchors in `previous` that are no longer listed are detached.
+        """
+        anchors = list(self._anchors)
+        for anchor in anchors:
+            if not isinstance(anchor, AnchorPoint):
+                raise TypeError("Anchor must be an instance of AnchorPoint")
+
+        size = len(anchors)
+        positions = np.zeros((size, 2))
+        handles_in = np.zeros((size, 2))
+        handles_out = np.zeros((size, 2))
+        handle_types = np.zeros(size, dtype=np.uint8)
+        for i, anchor in enumerate(anchors):
+            positions[i] = anchor._pos
+            handles_in[i] = anchor._handle_in
+            handles_out[i] = anchor._handle_out
+            handle_types[i] = anchor._store._handle_types[anchor._index]
+
+        listed = {id(anchor) for anchor in anchors}
+        for anchor in previous:
+            if id(anchor) not in listed:
+                anchor._detach()
+
+        self._positions, self._handles_in, self._handles_out, self._handle_types = positions, handles_in, handles_out, handle_types
+        self._size = size
+
+        # Anchors listed twice or owned by another path get a new view of their row
+        bound = set()
+        for i, anchor in enumerate(anchors):
+            if id(anchor) in bound or not (anchor._store is self or isinstance(anchor._store, _AnchorStore)):
+                anchors[i] = AnchorPoint._view(self, i)
+            else:
+                anchor._bind(self, i)
+            bound.add(id(anchors[i]))
+        list.__setitem__(self._anchors, slice(None), anchors)
+
+    def __getstate__(self) -> dict:
+        # Only the used rows of the arrays are pickled, anchor views are recreated on demand
+        return {
+            "positions": self.positions, "handles_in": self.handles_in, "handles_out": self.handles_out,
+            "handle_types": self.handle_types, "is_closed": self._is_closed,
+        }
+
+    def __setstate__(self, state: dict):
+        self._positions = state["positions"]
+        self._handles_in = state["handles_in"]
+        self._handles_out = state["handles_out"]
+        self._handle_types = state["handle_types"]
+        self._size = len(self._positions)
+        self._anchors = None
+        self._is_closed = state["is_closed"]
+        self._arc_lengths = ArcLengthTable()
 
     def __repr__(self):
-        return f"BezierPath(points={len(self._anchor_points)}, is_closed={self.is_closed})"
+        return f"BezierPath(points={self._size}, is_closed={self.is_closed})"
 
 
 class BezierShape(UserList):
@@ -74,3 +678,314 @@ class BezierShape(UserList):
 
     def __init__(self, data=None):
         super().__init__(data or [])
+
+    @classmethod
+    def from_arrays(cls, positions, handles_in, handles_out, handle_types, offsets, closed, copy=True) -> 'BezierShape':
+        """
+        Create a shape from the packed arrays returned by `to_arrays`.
+
+        Args:
+            positions: (N, 2) anchor positions of all paths.
+            handles_in: (N, 2) incoming handles.
+            handles_out: (N, 2) outgoing handles.
+            handle_types: Length N handle type codes.
+            offsets: Length P + 1 array, path i uses anchors offsets[i] to offsets[i + 1].
+            closed: Length P array of closed flags.
+            copy: Copy the arrays, otherwise the paths view slices of them, see BezierPath.from_arrays.
+        """
+        return cls([
+            BezierPath.from_arrays(
+                positions[start:end], handles_in[start:end], handles_out[start:end], handle_types[start:end], is_closed, copy
+                )
+            for start, end, is_closed in zip(offsets[:-1].tolist(), offsets[1:].tolist(), np.asarray(closed).tolist())
+        ])
+
+    def to_arrays(self) -> tuple:
+        """
+        Pack the anchors of all paths into single arrays.
+
+        Returns:
+            (positions, handles_in, handles_out, handle_types, offsets, closed), see `from_arrays`.
+        """
+        paths = self.data
+        offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        np.cumsum([len(path) for path in paths], out=offsets[1:])
+
+        def concatenate(arrays, shape, dtype):
+            return np.concatenate(arrays) if arrays else np.empty(shape, dtype=dtype)
+
+        return (
+            concatenate([path.positions for path in paths], (0, 2), np.float64),
+            concatenate([path.handles_in for path in paths], (0, 2), np.float64),
+            concatenate([path.handles_out for path in paths], (0, 2), np.float64),
+            concatenate([path.handle_types for path in paths], (0,), np.uint8),
+            offsets,
+            np.array([path.is_closed for path in paths], dtype=bool),
+        )
+
+    def __reduce__(self):
+        # Pickle as a handful of packed arrays rather than one object per path
+        return (type(self).from_arrays, self.to_arrays())
+
+    @property
+    def segment_count(self) -> int:
+        """Total number of segments across all paths."""
+        return sum(path.segment_count for path in self.data)
+
+    def segments(self) -> np.ndarray:
+        """
+        Control points of the segments of all paths, in path order, as an (S, 4, 2) array.
+        """
+        if not self.data:
+            return np.empty((0, 4, 2), dtype=np.float64)
+        return np.concatenate([path.segments() for path in self.data])
+
+    def evaluate(self, t) -> np.ndarray:
+        """
+        Evaluate points on the shape.
+
+        Args:
+            t: Scalar or array of parameters from 0 to `segment_count`, running over
+               the segments of each path in order.
+
+        Returns:
+            Array of points with shape `t.shape + (2,)`.
+        """
+        segments, local_t = cubic.locate(t, self.segment_count)
+        return cubic.evaluate(self.segments(), segments, local_t)
+
+    def segment_bounds(self) -> np.ndarray:
+        """
+        Exact bounding boxes of the segments of all paths, in path order, as an (S, 2, 2) array.
+        """
+        return cubic.bounds(self.segments())
+
+    def bounds(self) -> np.ndarray:
+        """
+        Exact bounding box of all paths as a (2, 2) array of [min, max] corners, or None if there are no anchors.
+        """
+        path_bounds = [bounds for bounds in (path.bounds() for path in self.data) if bounds is not None]
+        if not path_bounds:
+            return None
+        path_bounds = np.array(path_bounds)
+        return np.stack([path_bounds[:, 0].min(axis=0), path_bounds[:, 1].max(axis=0)])
+
+    def flatten(self, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate all paths with line segments in one pass over their segments.
+
+        Args:
+            tolerance: Maximum distance between the curves and the lines.
+
+        Returns:
+            (vertices, offsets) where vertices is a (V, 2) array of the polylines of all
+            paths and path i uses vertices offsets[i] to offsets[i + 1], see BezierPath.flatten.
+        """
+        return _flatten_paths(self.data, tolerance)
+
+    def length(self) -> float:
+        """Total arc length of all paths."""
+        return sum(path.length() for path in self.data)
+
+    def point_at_distance(self, s) -> np.ndarray:
+        """
+        Points at distances along the shape, running over the paths in order.
+
+        Args:
+            s: Scalar or array of distances, clipped to the length of the shape.
+
+        Returns:
+            Array of points with shape `s.shape + (2,)`.
+        """
+        paths = [path for path in self.data if path.segment_count > 0]
+        if not paths:
+            raise ValueError("Cannot evaluate a path with no segments.")
+        starts = np.cumsum([0.0] + [path.length() for path in paths])
+        s = np.asarray(s, dtype=np.float64)
+        indices = np.clip(np.searchsorted(starts, s, side="right") - 1, 0, len(paths) - 1)
+
+        points = np.empty(s.shape + (2,), dtype=np.float64)
+        for i in np.unique(indices).tolist():
+            mask = indices == i
+            points[mask] = paths[i].point_at_distance(s[mask] - starts[i])
+        return points
+
+    def resample(self, spacing: float) -> list[np.ndarray]:
+        """
+        Resample every path separately, see BezierPath.resample.
+
+        Returns:
+            List with an (M, 2) array of points per path.
+        """
+        return [path.resample(spacing) for path in self.data]
+
+    def winding(self, points) -> np.ndarray:
+        """
+        Winding numbers of the shape around many points at once, with all paths
+        counted together and open paths closed by a straight line as in SVG.
+        See query.winding_numbers.
+
+        Args:
+            points: (M, 2) array of points.
+
+        Returns:
+            Length M integer array, positive where paths run counterclockwise around a point.
+        """
+        contours = [boolean.contour(path.positions, path.handles_in, path.handles_out, path.is_closed) for path in self.data]
+        controls = np.concatenate(contours) if contours else np.empty((0, 4, 2), dtype=np.float64)
+        return query.winding_numbers(controls, points)
+
+    def contains(self, points, fill_rule: str = "nonzero") -> np.ndarray:
+        """
+        Whether the shape fills each of many points.
+
+        Args:
+            points: (M, 2) array of points.
+            fill_rule: "nonzero" or "evenodd", as in SVG, or "positive".
+
+        Returns:
+            Length M boolean array.
+        """
+        if fill_rule not in boolean.FILL_RULES:
+            raise ValueError(f"Invalid fill_rule: {fill_rule!r}. Must be one of {', '.join(boolean.FILL_RULES)}.")
+        return boolean._inside(self.winding(points), fill_rule)
+
+    def union(self, other: 'BezierShape', fill_rule: str = "nonzero", tolerance: float = 1e-6) -> 'BezierShape':
+        """
+        Area filled by either shape, see `combine`.
+        """
+        return self.combine([self, other], "union", fill_rule, tolerance)
+
+    def intersect(self, other: 'BezierShape', fill_rule: str = "nonzero", tolerance: float = 1e-6) -> 'BezierShape':
+        """
+        Area filled by both shapes, see `combine`.
+        """
+        return self.combine([self, other], "intersect", fill_rule, tolerance)
+
+    def difference(self, other: 'BezierShape', fill_rule: str = "nonzero", tolerance: float = 1e-6) -> 'BezierShape':
+        """
+        Area filled by this shape and not by `other`, see `combine`.
+        """
+        return self.combine([self, other], "difference", fill_rule, tolerance)
+
+    def xor(self, other: 'BezierShape', fill_rule: str = "nonzero", tolerance: float = 1e-6) -> 'BezierShape':
+        """
+        Area filled by exactly one of the shapes, see `combine`.
+        """
+        return self.combine([self, other], "xor", fill_rule, tolerance)
+
+    @classmethod
+    def combine(cls, shapes, operation: str = "union", fill_rule: str = "nonzero", tolerance: float = 1e-6) -> 'BezierShape':
+        """
+        Boolean operation on the areas filled by shapes, computed in one pass over all their segments.
+
+        The curves are split where they cross and the result is built from the pieces,
+        so it stays made of cubics. Every shape is filled under `fill_rule` with all its
+        paths together, open paths closed by a straight line as in SVG. Merging many
+        glyph or tile outlines is a single "union" of all of them.
+
+        Args:
+            shapes: Shapes to combine. "union" takes any number, the other operations
+                    apply to the first two.
+            operation: "union", "intersect", "difference" or "xor".
+            fill_rule: "nonzero" or "evenodd", or "positive" for only the area paths
+                       wind around counterclockwise.
+            tolerance: Distance within which curves touch and points are merged.
+
+        Returns:
+            New shape of closed paths, each with the filled area on its left.
+        """
+        contours, operands = [], []
+        for index, shape in enumerate(shapes):
+            for path in shape:
+                contours.append(boolean.contour(path.positions, path.handles_in, path.handles_out, path.is_closed))
+                operands.append(index)
+        return cls.from_arrays(*boolean.combine(contours, operands, operation, fill_rule, tolerance), copy=False)
+
+    def transform(self, matrix, in_place: bool = False) -> 'BezierShape':
+        """
+        Apply an affine transform to all paths, see BezierPath.transform.
+
+        Returns:
+            The transformed shape, this shape if `in_place` is set.
+        """
+        if in_place:
+            for path in self.data:
+                path.transform(matrix, in_place=True)
+            return self
+        return self.transform_many(np.asarray(matrix)[np.newaxis])[0]
+
+    def transform_many(self, matrices) -> list['BezierShape']:
+        """
+        Instance the shape under many affine transforms, with all anchors of all
+        instances transformed together.
+
+        Args:
+            matrices: (K, 2, 3) array-like of affine matrices, see BezierPath.transform.
+
+        Returns:
+            List of K new shapes.
+        """
+        linear, translation = _affine(matrices)
+        linear = linear.reshape(-1, 2, 2)
+        translation = translation.reshape(-1, 1, 2)
+        positions, handles_in, handles_out, handle_types, offsets, closed = self.to_arrays()
+        transposed = linear.transpose(0, 2, 1)
+        positions = positions @ transposed + translation
+        handles_in = handles_in @ transposed
+        handles_out = handles_out @ transposed
+        return [
+            BezierShape.from_arrays(positions[i], handles_in[i], handles_out[i], handle_types, offsets, closed)
+            for i in range(len(linear))
+        ]
+
+
+def _affine(matrix) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split (..., 2, 3) affine matrices into their (..., 2, 2) linear parts and (..., 2) translations.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.shape[-2:] != (2, 3):
+        raise ValueError(f"Invalid affine matrix shape: {matrix.shape}. Must end in (2, 3).")
+    return matrix[..., :2], matrix[..., 2]
+
+
+def _flatten_paths(paths: list, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Flatten the segments of many paths together.
+
+    Every segment is evaluated at the ends of its equal parameter steps (see
+    cubic.subdivisions), and the first segment of each path at its start too,
+    so the vertices come out of a single evaluation already in order. Paths
+    with one anchor get a point segment with no steps that only yields its start.
+    """
+    controls = [
+        path.segments() if path.segment_count else np.repeat(path.positions[:, np.newaxis], 4, axis=1)
+        for path in paths
+    ]
+    rows = np.array([len(path_controls) for path_controls in controls], dtype=np.intp)
+    controls = np.concatenate(controls) if paths else np.empty((0, 4, 2))
+    steps = cubic.subdivisions(controls, tolerance)
+    has_segments = np.repeat([path.segment_count > 0 for path in paths], rows).astype(bool)
+    steps[~has_segments] = 0
+
+    row_offsets = np.zeros(len(paths) + 1, dtype=np.intp)
+    np.cumsum(rows, out=row_offsets[1:])
+    is_first = np.zeros(len(controls), dtype=np.intp)
+    is_first[row_offsets[:-1][rows > 0]] = 1
+    counts = steps + is_first
+
+    # Vertex j of a segment is at step k = j, or j + 1 when the segment doesn't start a path
+    segments = np.repeat(np.arange(len(controls)), counts)
+    k = np.arange(len(segments)) - np.repeat(np.cumsum(counts) - counts + is_first - 1, counts)
+    vertices = cubic.evaluate(controls, segments, k / np.repeat(np.maximum(steps, 1), counts))
+
+    # The last step of every segment lands exactly on its end point
+    vertices[(np.cumsum(counts) - 1)[has_segments]] = controls[has_segments, 3]
+
+    vertex_counts = np.zeros(len(paths), dtype=np.int64)
+    if len(counts):
+        vertex_counts = np.where(rows > 0, np.add.reduceat(counts, np.minimum(row_offsets[:-1], len(counts) - 1)), 0)
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum(vertex_counts, out=offsets[1:])
+    return vertices, offsets
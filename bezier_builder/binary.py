@@ -0,0 +1,158 @@
+"""
+Versioned binary format for BezierShapes.
+
+A shape is stored as a fixed header followed by the packed arrays of
+BezierShape.to_arrays, all little-endian and each starting on an 8 byte boundary:
+
+    header          magic b"BZSH", version (uint16), flags (uint16),
+                    anchor count N (uint64), path count P (uint64)
+    positions       (N, 2) float64, or float32 with FLOAT32
+    handles_in      (N, 2) float64, or float32 with FLOAT32
+    handles_out     (N, 2) float64, or float32 with FLOAT32
+    handle_types    (N,) uint8
+    offsets         (P + 1,) int64
+    closed          (P,) uint8
+
+Shapes stored as float64 load without copying, their paths view the buffer or
+memory mapped file directly. Float32 files are half the size but are converted
+back to float64 when loaded.
+"""
+
+import math
+import struct
+from typing import Optional
+
+import numpy as np
+
+from bezier_builder.bezier_path import BezierShape
+
+MAGIC = b"BZSH"
+VERSION = 1
+
+# Header flags
+FLOAT32 = 1
+
+_HEADER = struct.Struct("<4sHHQQ")
+_ALIGNMENT = 8
+
+
+def _aligned(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def _layout(anchors: int, paths: int, float_type: np.dtype) -> list[tuple[int, np.dtype, tuple]]:
+    """
+    Offset from the start of the shape, dtype and shape of each stored array, in order.
+    """
+    arrays = [
+        (float_type, (anchors, 2)),
+        (float_type, (anchors, 2)),
+        (float_type, (anchors, 2)),
+        (np.dtype("<u1"), (anchors,)),
+        (np.dtype("<i8"), (paths + 1,)),
+        (np.dtype("<u1"), (paths,)),
+    ]
+    layout = []
+    offset = _HEADER.size
+    for dtype, shape in arrays:
+        layout.append((offset, dtype, shape))
+        offset = _aligned(offset + dtype.itemsize * math.prod(shape))
+    return layout
+
+
+def _float_type(flags: int) -> np.dtype:
+    return np.dtype("<f4") if flags & FLOAT32 else np.dtype("<f8")
+
+
+def encoded_size(shape: BezierShape, float32: bool = False) -> int:
+    """
+    Number of bytes `to_bytes` writes for a shape.
+    """
+    anchors = sum(len(path) for path in shape)
+    offset, dtype, array_shape = _layout(anchors, len(shape), _float_type(FLOAT32 if float32 else 0))[-1]
+    return _aligned(offset + dtype.itemsize * math.prod(array_shape))
+
+
+def to_bytes(shape: BezierShape, float32: bool = False) -> bytes:
+    """
+    Encode a shape in the binary format.
+
+    Args:
+        shape: Shape to encode.
+        float32: Store positions and handles as float32, halving their size at the cost of precision.
+    """
+    arrays = shape.to_arrays()
+    flags = FLOAT32 if float32 else 0
+    layout = _layout(len(arrays[0]), len(arrays[4]) - 1, _float_type(flags))
+
+    buffer = bytearray(encoded_size(shape, float32))
+    _HEADER.pack_into(buffer, 0, MAGIC, VERSION, flags, len(arrays[0]), len(arrays[4]) - 1)
+    for array, (offset, dtype, array_shape) in zip(arrays, layout):
+        np.frombuffer(buffer, dtype=dtype, count=math.prod(array_shape), offset=offset)[:] = array.reshape(-1)
+    return bytes(buffer)
+
+
+def from_buffer(buffer, offset: int = 0) -> tuple[BezierShape, int]:
+    """
+    Decode a shape from a buffer without copying its float64 arrays.
+
+    The paths of the shape view `buffer`, so they are read-only for immutable buffers
+    such as bytes and write through to mutable ones, e.g. a memmap opened with mode "r+".
+
+    Args:
+        buffer: Object supporting the buffer protocol.
+        offset: Byte offset of the shape in `buffer`.
+
+    Returns:
+        (shape, end) with the byte offset just past the shape.
+    """
+    magic, version, flags, anchors, paths = _HEADER.unpack_from(buffer, offset)
+    if magic != MAGIC:
+        raise ValueError("Not a BezierShape binary file.")
+    if version > VERSION:
+        raise ValueError(f"Unsupported format version {version}, this version reads up to {VERSION}.")
+
+    layout = _layout(anchors, paths, _float_type(flags))
+    positions, handles_in, handles_out, handle_types, offsets, closed = (
+        np.frombuffer(buffer, dtype=dtype, count=math.prod(shape), offset=offset + start).reshape(shape)
+        for start, dtype, shape in layout
+        )
+    start, dtype, shape = layout[-1]
+    end = offset + _aligned(start + dtype.itemsize * math.prod(shape))
+
+    shape = BezierShape.from_arrays(
+        positions, handles_in, handles_out, handle_types, offsets, closed.astype(bool), copy=False
+        )
+    return shape, end
+
+
+def from_bytes(data) -> BezierShape:
+    """
+    Decode a shape encoded by `to_bytes`, see from_buffer.
+    """
+    return from_buffer(data)[0]
+
+
+def save_shape(file_path: str, shape: BezierShape, float32: bool = False):
+    """
+    Write a shape to a binary file, see to_bytes.
+    """
+    with open(file_path, "wb") as f:
+        f.write(to_bytes(shape, float32))
+
+
+def load_shape(file_path: str, mmap_mode: Optional[str] = "c") -> BezierShape:
+    """
+    Load a shape from a binary file.
+
+    Args:
+        file_path: Path of the file.
+        mmap_mode: Memory map the file with this numpy.memmap mode so the arrays are
+                   paged in on demand without copying. The default "c" is copy-on-write:
+                   edits stay in memory and never reach the file, "r" makes the shape
+                   read-only and "r+" writes edits back to the file. None reads the whole file.
+    """
+    if mmap_mode is None:
+        with open(file_path, "rb") as f:
+            return from_bytes(bytearray(f.read()))
+    return from_bytes(np.memmap(file_path, dtype=np.uint8, mode=mmap_mode))
@@ -0,0 +1,556 @@
+"""
+Boolean operations on the filled areas of cubic bezier contours.
+
+The contours of all operands are combined into one arrangement: every segment is
+split where it crosses or touches another curve, so the pieces left only meet at
+their ends. Each piece is then classified by casting rays from points just to its
+left and right, which gives the winding number of every operand on either side.
+Pieces with the inside of the result on one side and the outside on the other
+form its boundary, and are linked back into closed contours with the inside on
+their left.
+
+Pieces are exact sub-curves of the original segments found with de Casteljau's
+algorithm, so curves are never flattened. Neighbouring pieces of the same segment
+that both end up on the boundary are merged back into one cubic.
+
+Results are returned as the packed arrays of BezierShape.to_arrays.
+"""
+
+import numpy as np
+
+from bezier_builder import cubic, query
+from bezier_builder.anchor_point import detect_handle_types
+from bezier_builder.intersection import _cross, _deviation, _onward, _resolve, monotone_pieces, overlapping_pairs
+
+OPERATIONS = ("union", "intersect", "difference", "xor")
+FILL_RULES = ("nonzero", "evenodd", "positive")
+# Longest straight line, in tolerances, that may close a broken boundary chain
+_BRIDGE = 16
+
+
+def contour(positions: np.ndarray, handles_in: np.ndarray, handles_out: np.ndarray, is_closed: bool) -> np.ndarray:
+    """
+    Segments bounding the filled area of a path. Open paths are closed with a
+    straight line back to their first anchor, the way SVG fills them.
+
+    Returns:
+        (S, 4, 2) control points.
+    """
+    controls = cubic.segment_controls(positions, handles_in, handles_out, is_closed)
+    if not is_closed and len(positions) > 1 and np.any(positions[-1] != positions[0]):
+        closing = np.array([[positions[-1], positions[-1], positions[0], positions[0]]], dtype=np.float64)
+        controls = np.concatenate([controls, closing])
+    return controls
+
+
+def combine(contours: list, operands, operation: str = "union", fill_rule: str = "nonzero", tolerance: float = 1e-6) -> tuple:
+    """
+    Combine the areas filled by groups of contours.
+
+    "union" keeps the area filled by any operand, "intersect" the area filled by
+    both operands 0 and 1, "difference" the area of operand 0 outside operand 1
+    and "xor" the area filled by exactly one of them.
+
+    Args:
+        contours: List of (S, 4, 2) control points of closed contours, see `contour`.
+        operands: Operand index of each contour. Contours of one operand are filled
+                  together under `fill_rule`, so holes and overlapping subpaths
+                  within an operand count the way they are drawn.
+        operation: One of OPERATIONS.
+        fill_rule: "nonzero" or "evenodd", as in SVG, or "positive" to fill only
+                   where contours wind counterclockwise.
+        tolerance: Distance within which curves touch and points are merged.
+
+    Returns:
+        (positions, handles_in, handles_out, handle_types, offsets, closed) of the
+        closed result contours, see BezierShape.from_arrays.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Invalid operation: {operation!r}. Must be one of {', '.join(OPERATIONS)}.")
+    if fill_rule not in FILL_RULES:
+        raise ValueError(f"Invalid fill_rule: {fill_rule!r}. Must be one of {', '.join(FILL_RULES)}.")
+    if tolerance <= 0:
+        raise ValueError(f"Invalid tolerance: {tolerance}. Must be greater than 0.")
+    radius = 4 * tolerance
+
+    lengths = np.array([len(controls) for controls in contours], dtype=np.intp)
+    if lengths.sum() == 0:
+        return _empty()
+    controls = np.concatenate([np.asarray(controls, dtype=np.float64).reshape(-1, 4, 2) for controls in contours])
+    segment_contours = np.repeat(np.arange(len(contours)), lengths)
+    segment_operands = np.repeat(np.asarray(operands, dtype=np.intp), lengths)
+
+    pieces, piece_segments, starts, stops = monotone_pieces(controls)
+    if len(pieces) == 0:
+        return _empty()
+    following = _following(segment_contours[piece_segments])
+    piece_bounds = np.stack([pieces.min(axis=1), pieces.max(axis=1)], axis=1)
+
+    # Crossings between pieces, neighbours that only meet at their shared end are skipped
+    i, j = overlapping_pairs(piece_bounds, None, tolerance)
+    before, after = following[i] == j, following[j] == i
+    skip = (before & ~after & _onward(pieces, i, j)) | (after & ~before & _onward(pieces, j, i))
+    # Lines running along each other, such as the shared edges of tiles, overlap rather than
+    # cross. The ends of the overlap split them below, so they are spared the subdivision
+    chords = pieces[:, 3] - pieces[:, 0]
+    chord_lengths = np.hypot(chords[:, 0], chords[:, 1])
+    straight = _deviation(pieces, chords, chord_lengths) <= tolerance
+    parallel = np.abs(_cross(chords[i], chords[j])) <= tolerance * (chord_lengths[i] + chord_lengths[j])
+    skip |= straight[i] & straight[j] & parallel
+    i, j = i[~skip], j[~skip]
+    pairs, u, _ = _resolve(pieces, pieces, i, j, tolerance)
+
+    # Crossings at the ends of pieces add nothing to the piece ends already there
+    crossings = cubic.evaluate(pieces, i[pairs], u)
+    ends = np.concatenate([pieces[i[pairs]][:, [0, 3]], pieces[j[pairs]][:, [0, 3]]], axis=1)
+    gaps = np.hypot(*(ends - crossings[:, np.newaxis]).transpose(2, 0, 1))
+    crossings = crossings[np.all(gaps > radius, axis=1)]
+
+    # Vertices of the arrangement are the piece ends and the crossings, merged when they
+    # are closer than the radius. Every vertex lying on a piece splits it, which also
+    # splits curves that overlap along a stretch at the ends of the stretch
+    vertices = np.concatenate([pieces[:, 0], crossings])
+    vertex_bounds = np.stack([vertices, vertices], axis=1)
+    labels = _clusters(vertex_bounds, radius)
+    vertex_index, piece_index = overlapping_pairs(vertex_bounds, piece_bounds, radius)
+    t, distances = cubic.closest(pieces, piece_index, vertices[vertex_index])
+    points = vertices[vertex_index]
+    lies = (
+        (distances <= radius)
+        & (np.hypot(*(points - pieces[piece_index, 0]).T) > radius)
+        & (np.hypot(*(points - pieces[piece_index, 3]).T) > radius)
+        )
+    edges, edge_pieces, edge_t, edge_vertices = _split(
+        pieces, following, piece_index[lies], t[lies], vertex_index[lies], labels, vertices
+        )
+    duplicate = _duplicates(edges, edge_vertices, radius)
+
+    # Which sides of each edge the result fills
+    count = len(edges)
+    middles = cubic.evaluate(edges, np.arange(count), np.full(count, 0.5))
+    tangents = cubic.derivative(edges, np.arange(count), np.full(count, 0.5))
+    chords = edges[:, 3] - edges[:, 0]
+    flat = np.all(tangents == 0, axis=1)
+    tangents[flat] = chords[flat]
+    normals = np.column_stack([-tangents[:, 1], tangents[:, 0]]) / np.hypot(*tangents.T)[:, np.newaxis]
+    offsets = np.minimum(2 * radius, 0.25 * np.hypot(*chords.T))
+    offsets = _clearances(edges, edge_vertices, middles, offsets, tolerance)[:, np.newaxis]
+    samples = np.concatenate([middles + offsets * normals, middles - offsets * normals])
+    sample_index, sample_operands = _filled(
+        samples, pieces, segment_operands[piece_segments], piece_bounds, fill_rule
+        )
+    filled = _apply(operation, sample_index, sample_operands, len(samples))
+    left, right = filled[:count], filled[count:]
+
+    # Orient the boundary with the result on its left
+    kept = np.flatnonzero((left != right) & ~duplicate)
+    reverse = right[kept]
+    edges = edges[kept]
+    edges[reverse] = edges[reverse, ::-1]
+    edge_vertices = edge_vertices[kept]
+    edge_vertices[reverse] = edge_vertices[reverse, ::-1]
+    edge_pieces, edge_t = edge_pieces[kept], edge_t[kept]
+
+    # Parameters along the original segments, to merge pieces of one segment back together
+    edge_segments = piece_segments[edge_pieces]
+    span = (stops - starts)[edge_pieces, np.newaxis]
+    edge_s = starts[edge_pieces, np.newaxis] + edge_t * span
+    return _contours(controls, edges, edge_vertices, edge_segments, edge_s, reverse, vertices, tolerance)
+
+
+def _empty() -> tuple:
+    return (
+        np.empty((0, 2), dtype=np.float64),
+        np.empty((0, 2), dtype=np.float64),
+        np.empty((0, 2), dtype=np.float64),
+        np.empty(0, dtype=np.uint8),
+        np.zeros(1, dtype=np.int64),
+        np.empty(0, dtype=bool),
+    )
+
+
+def _following(contours: np.ndarray) -> np.ndarray:
+    """
+    Index of the piece after each piece around its closed contour, given the
+    contour index of pieces stored in order.
+    """
+    index = np.arange(len(contours))
+    first = np.ones(len(contours), dtype=bool)
+    first[1:] = contours[1:] != contours[:-1]
+    last = np.roll(first, -1)
+    following = index + 1
+    following[last] = np.maximum.accumulate(np.where(first, index, 0))[last]
+    return following
+
+
+def _clusters(bounds: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Label points by groups closer than `radius` to each other, chains included.
+
+    Args:
+        bounds: (N, 2, 2) boxes of the points, see overlapping_pairs.
+
+    Returns:
+        Length N array with the lowest index of the group of each point.
+    """
+    i, j = overlapping_pairs(bounds, None, radius)
+    labels = np.arange(len(bounds))
+    while True:
+        # Spread the lowest label over the pairs, then jump to the label's own label
+        lowest = np.minimum(labels[i], labels[j])
+        updated = labels.copy()
+        np.minimum.at(updated, i, lowest)
+        np.minimum.at(updated, j, lowest)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _split(pieces, following, split_pieces, split_t, split_vertices, labels, vertices) -> tuple:
+    """
+    Split pieces at the vertices lying on them.
+
+    Returns:
+        (edges, edge_pieces, edge_t, edge_vertices) with the (E, 4, 2) control points of
+        the edges, the piece each came from, its (E, 2) start and stop parameters along
+        the piece and the (E, 2) labels of the vertices it runs between. Edge ends are
+        moved onto their vertices so edges meeting at a vertex share the end point exactly.
+    """
+    count = len(pieces)
+    rows = np.concatenate([np.arange(count), np.arange(count), split_pieces])
+    t = np.concatenate([np.zeros(count), np.ones(count), split_t])
+    row_labels = labels[np.concatenate([np.arange(count), following, split_vertices])]
+    order = np.lexsort((t, rows))
+    rows, t, row_labels = rows[order], t[order], row_labels[order]
+
+    # Several vertices of one group on a piece split it once, at the piece's ends if they are there
+    same = (rows[1:] == rows[:-1]) & (row_labels[1:] == row_labels[:-1])
+    at_end, at_start = t[1:] == 1, t[:-1] == 0
+    drop = np.zeros(len(rows), dtype=bool)
+    drop[1:] |= same & ~at_end
+    drop[:-1] |= same & at_end & ~at_start
+    rows, t, row_labels = rows[~drop], t[~drop], row_labels[~drop]
+
+    # Pieces whose ends fall into one group are shorter than the radius and left out
+    link = np.flatnonzero((rows[1:] == rows[:-1]) & (row_labels[1:] != row_labels[:-1]))
+    edge_pieces = rows[link]
+    edge_t = np.stack([t[link], t[link + 1]], axis=1)
+    edge_vertices = np.stack([row_labels[link], row_labels[link + 1]], axis=1)
+
+    edges = cubic.trim(pieces[edge_pieces], edge_t[:, 0], edge_t[:, 1])
+    start, end = vertices[edge_vertices[:, 0]], vertices[edge_vertices[:, 1]]
+    edges[:, 1] += start - edges[:, 0]
+    edges[:, 2] += end - edges[:, 3]
+    edges[:, 0], edges[:, 3] = start, end
+    return edges, edge_pieces, edge_t, edge_vertices
+
+
+def _duplicates(edges: np.ndarray, edge_vertices: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Mark edges that run along an earlier edge between the same vertices, where
+    curves of different contours overlap.
+    """
+    low, high = edge_vertices.min(axis=1), edge_vertices.max(axis=1)
+    order = np.lexsort((high, low))
+    same = (low[order[1:]] == low[order[:-1]]) & (high[order[1:]] == high[order[:-1]])
+    first, second = order[:-1][same], order[1:][same]
+    _, gaps = cubic.closest(edges, first, cubic.evaluate(edges, second, np.full(len(second), 0.5)))
+    duplicate = np.zeros(len(edges), dtype=bool)
+    duplicate[second[gaps <= radius]] = True
+    return duplicate
+
+
+def _clearances(edges: np.ndarray, edge_vertices: np.ndarray, middles: np.ndarray, offsets: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Shrink sampling offsets to half the distance from each edge middle to the nearest
+    other edge, so samples in slivers thinner than the offset stay inside them.
+
+    Edges between the same vertices are duplicates and don't count, and offsets
+    don't shrink below half the tolerance.
+    """
+    middle_bounds = np.stack([middles, middles], axis=1)
+    edge_bounds = np.stack([edges.min(axis=1), edges.max(axis=1)], axis=1)
+    middle_index, edge_index = overlapping_pairs(middle_bounds, edge_bounds, offsets.max(initial=0))
+    other = (
+        (edge_vertices[middle_index].min(axis=1) != edge_vertices[edge_index].min(axis=1))
+        | (edge_vertices[middle_index].max(axis=1) != edge_vertices[edge_index].max(axis=1))
+        )
+    middle_index, edge_index = middle_index[other], edge_index[other]
+    _, distances = cubic.closest(edges, edge_index, middles[middle_index])
+    clearances = offsets.copy()
+    np.minimum.at(clearances, middle_index, np.maximum(0.5 * distances, 0.5 * tolerance))
+    return np.minimum(offsets, clearances)
+
+
+def _filled(points: np.ndarray, pieces: np.ndarray, piece_operands: np.ndarray, piece_bounds: np.ndarray, fill_rule: str) -> tuple:
+    """
+    Operands that fill points, found by casting a ray from each point and summing
+    the directions of the pieces it crosses.
+
+    Rays head for the nearest edge of the box around all pieces, see
+    query.quarter_turns. An operand only winds around points inside its bounding
+    box, so rays stop at the far edge of the furthest box holding their point and
+    only count the operands whose box holds it, see query.ray_candidates.
+
+    Returns:
+        (point_index, operands) of the pairs where the operand fills the point.
+    """
+    point_index, operands = [], []
+    for group, turned_points, turned, turned_bounds in query.quarter_turns(points, pieces, piece_bounds):
+        index, filling = _filled_rightwards(turned_points, turned, piece_operands, turned_bounds, fill_rule)
+        point_index.append(group[index])
+        operands.append(filling)
+    if not point_index:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    return np.concatenate(point_index), np.concatenate(operands)
+
+
+def _filled_rightwards(points: np.ndarray, pieces: np.ndarray, piece_operands: np.ndarray, piece_bounds: np.ndarray, fill_rule: str) -> tuple:
+    """
+    Operands that fill points, with rays cast in +x, see `_filled`.
+    """
+    operand_count = int(piece_operands.max()) + 1
+    operand_bounds = np.empty((operand_count, 2, 2))
+    operand_bounds[:, 0], operand_bounds[:, 1] = np.inf, -np.inf
+    np.minimum.at(operand_bounds[:, 0], piece_operands, piece_bounds[:, 0])
+    np.maximum.at(operand_bounds[:, 1], piece_operands, piece_bounds[:, 1])
+    present = np.flatnonzero(np.isfinite(operand_bounds[:, 0, 0]))
+    operand_bounds = operand_bounds[present]
+
+    point_bounds = np.stack([points, points], axis=1)
+    point_index, box_index = overlapping_pairs(point_bounds, operand_bounds)
+    held = np.unique(point_index * operand_count + present[box_index])
+    reach = np.full(len(points), -np.inf)
+    np.maximum.at(reach, point_index, operand_bounds[box_index, 1, 0])
+
+    ray_index, piece_index, rising = query.ray_candidates(points, reach, pieces, piece_bounds)
+    keys = ray_index * operand_count + piece_operands[piece_index]
+    candidates = np.isin(keys, held)
+    keys, ray_index, piece_index, rising = keys[candidates], ray_index[candidates], piece_index[candidates], rising[candidates]
+    crossed = query.ray_crossings(points, pieces, piece_bounds, ray_index, piece_index, rising)
+
+    keys, inverse = np.unique(keys[crossed], return_inverse=True)
+    windings = np.bincount(inverse, np.where(rising[crossed], 1.0, -1.0), minlength=len(keys))
+    inside = _inside(windings, fill_rule)
+    keys = keys[inside]
+    return keys // operand_count, keys % operand_count
+
+
+def _inside(windings: np.ndarray, fill_rule: str) -> np.ndarray:
+    """
+    Whether winding numbers are filled under a fill rule.
+    """
+    if fill_rule == "nonzero":
+        return windings != 0
+    if fill_rule == "evenodd":
+        return np.abs(windings) % 2 == 1
+    return windings > 0
+
+
+def _apply(operation: str, point_index: np.ndarray, operands: np.ndarray, count: int) -> np.ndarray:
+    """
+    Whether the result of an operation fills each of `count` points, given the operands filling them.
+    """
+    if operation == "union":
+        filled = np.zeros(count, dtype=bool)
+        filled[point_index] = True
+        return filled
+    binary = operands < 2
+    filled = np.zeros((count, 2), dtype=bool)
+    filled[point_index[binary], operands[binary]] = True
+    a, b = filled[:, 0], filled[:, 1]
+    if operation == "intersect":
+        return a & b
+    if operation == "difference":
+        return a & ~b
+    return a ^ b
+
+
+def _directions(edges: np.ndarray) -> np.ndarray:
+    """
+    Direction each edge leaves its first control point in, from its first non-zero handle or its chord.
+    """
+    directions = edges[:, 1] - edges[:, 0]
+    for k in (2, 3):
+        zero = np.all(directions == 0, axis=1)
+        directions[zero] = edges[zero, k] - edges[zero, 0]
+    return np.arctan2(directions[:, 1], directions[:, 0])
+
+
+def _link(edges: np.ndarray, edge_vertices: np.ndarray) -> np.ndarray:
+    """
+    Index of the edge following each edge around the boundary, -1 where none leaves its end.
+
+    Where several edges leave a vertex, which happens where parts of the result
+    touch at a point, each edge arriving there turns to the first edge leaving it
+    clockwise from its own direction back, which keeps the parts separate contours.
+    """
+    order = np.argsort(edge_vertices[:, 0], kind="stable")
+    leaving = edge_vertices[order, 0]
+    first = np.searchsorted(leaving, edge_vertices[:, 1], side="left")
+    last = np.searchsorted(leaving, edge_vertices[:, 1], side="right")
+    following = np.where(last > first, order[np.minimum(first, len(order) - 1)], -1)
+
+    crowded = np.flatnonzero(last - first > 1)
+    if len(crowded):
+        outgoing, back = _directions(edges), _directions(edges[:, ::-1])
+        for edge in crowded.tolist():
+            candidates = order[first[edge]:last[edge]]
+            turns = np.mod(back[edge] - outgoing[candidates], 2 * np.pi)
+            turns[turns == 0] = 2 * np.pi
+            following[edge] = candidates[np.argmin(turns)]
+    return following
+
+
+def _bridge(edges, edge_vertices, edge_segments, edge_s, reverse, following, vertices, tolerance) -> tuple:
+    """
+    Close chains broken where an edge was misclassified, which leaves a vertex with
+    more edges arriving than leaving and another with more leaving than arriving.
+
+    Edges left without a following edge, or sharing theirs with an earlier edge, are
+    linked to the nearest edge no other edge leads to, through a straight line edge
+    when the two don't meet at a vertex. Afterwards every edge lies on a cycle.
+    Lines are at most _BRIDGE tolerances long, a wider gap means the boundary is
+    broken beyond repair and raises a ValueError.
+
+    Returns:
+        (edges, edge_vertices, edge_segments, edge_s, reverse, following) with the
+        line edges appended.
+    """
+    count = len(edges)
+    linked = np.flatnonzero(following >= 0)
+    _, first = np.unique(following[linked], return_index=True)
+    claims = linked[first]
+    claimed = np.zeros(count, dtype=bool)
+    claimed[following[claims]] = True
+    dead = np.ones(count, dtype=bool)
+    dead[claims] = False
+    dead = np.flatnonzero(dead).tolist()
+    if not dead:
+        return edges, edge_vertices, edge_segments, edge_s, reverse, following
+
+    spare = np.flatnonzero(~claimed)
+    spare_points = vertices[edge_vertices[spare, 0]]
+    available = np.ones(len(spare), dtype=bool)
+    following = following.copy()
+    lines = []
+    for edge in dead:
+        end = edge_vertices[edge, 1]
+        gaps = np.hypot(*(spare_points - vertices[end]).T)
+        gaps[~available] = np.inf
+        choice = int(np.argmin(gaps))
+        if gaps[choice] > _BRIDGE * tolerance:
+            raise ValueError(
+                f"Invalid boundary: gap of {gaps[choice]:.3g} at {vertices[end].tolist()}. "
+                f"Must be at most {_BRIDGE * tolerance:.3g}, try a larger tolerance."
+                )
+        available[choice] = False
+        target = spare[choice]
+        if edge_vertices[target, 0] == end:
+            following[edge] = target
+        else:
+            following[edge] = count + len(lines)
+            lines.append((end, edge_vertices[target, 0], target))
+    if not lines:
+        return edges, edge_vertices, edge_segments, edge_s, reverse, following
+
+    starts, stops, targets = (np.array(column, dtype=np.intp) for column in zip(*lines))
+    a, b = vertices[starts], vertices[stops]
+    return (
+        np.concatenate([edges, np.stack([a, a, b, b], axis=1)]),
+        np.concatenate([edge_vertices, np.column_stack([starts, stops])]),
+        np.concatenate([edge_segments, np.full(len(lines), -1, dtype=edge_segments.dtype)]),
+        np.concatenate([edge_s, np.zeros((len(lines), 2))]),
+        np.concatenate([reverse, np.zeros(len(lines), dtype=bool)]),
+        np.concatenate([following, targets]),
+    )
+
+
+def _contours(controls, edges, edge_vertices, edge_segments, edge_s, reverse, vertices, tolerance) -> tuple:
+    """
+    Link boundary edges into closed contours and pack them as shape arrays, merging
+    runs of edges that continue along one original segment back into single cubics.
+    """
+    if len(edges) == 0:
+        return _empty()
+    following = _link(edges, edge_vertices)
+    edges, edge_vertices, edge_segments, edge_s, reverse, following = _bridge(
+        edges, edge_vertices, edge_segments, edge_s, reverse, following, vertices, tolerance
+        )
+
+    # An edge continues its predecessor when both are neighbouring stretches of one segment
+    linked = following >= 0
+    continues = np.zeros(len(edges), dtype=bool)
+    previous, current = np.flatnonzero(linked), following[linked]
+    continues[current] = (
+        (edge_segments[previous] == edge_segments[current])
+        & (edge_segments[current] >= 0)
+        & (reverse[previous] == reverse[current])
+        & np.isclose(
+            np.where(reverse[previous], edge_s[previous, 0], edge_s[previous, 1]),
+            np.where(reverse[current], edge_s[current, 1], edge_s[current, 0]),
+            rtol=0, atol=1e-12,
+            )
+        )
+
+    # Walk the cycles, starting each at an edge that doesn't continue its predecessor where there is one
+    next_edge = following.tolist()
+    visited = np.zeros(len(edges), dtype=bool)
+    cycle_edges, cycle_lengths = [], []
+    for start in np.concatenate([np.flatnonzero(~continues), np.flatnonzero(continues)]).tolist():
+        if visited[start]:
+            continue
+        cycle = []
+        edge = start
+        while edge >= 0 and not visited[edge]:
+            visited[edge] = True
+            cycle.append(edge)
+            edge = next_edge[edge]
+        cycle_edges.extend(cycle)
+        cycle_lengths.append(len(cycle))
+    if not cycle_edges:
+        return _empty()
+    cycle_edges = np.array(cycle_edges, dtype=np.intp)
+    cycle_starts = np.zeros(len(cycle_edges), dtype=bool)
+    cycle_starts[np.cumsum([0] + cycle_lengths[:-1])] = True
+
+    # Runs of continuing edges become one cubic trimmed from the original segment
+    run_starts = np.flatnonzero(cycle_starts | ~continues[cycle_edges])
+    run_ends = np.append(run_starts[1:], len(cycle_edges)) - 1
+    first, last = cycle_edges[run_starts], cycle_edges[run_ends]
+    runs = edges[first].copy()
+    merged = np.flatnonzero(run_ends > run_starts)
+    if len(merged):
+        head, tail, flipped = first[merged], last[merged], reverse[first[merged]]
+        pieces = cubic.trim(
+            controls[edge_segments[head]],
+            np.where(flipped, edge_s[tail, 0], edge_s[head, 0]),
+            np.where(flipped, edge_s[head, 1], edge_s[tail, 1]),
+            )
+        pieces[flipped] = pieces[flipped, ::-1]
+        start, end = vertices[edge_vertices[head, 0]], vertices[edge_vertices[tail, 1]]
+        pieces[:, 1] += start - pieces[:, 0]
+        pieces[:, 2] += end - pieces[:, 3]
+        pieces[:, 0], pieces[:, 3] = start, end
+        runs[merged] = pieces
+
+    # Anchors sit at the start of each run, the incoming handle comes from the run before
+    run_cycles = np.cumsum(cycle_starts)[run_starts] - 1
+    run_counts = np.bincount(run_cycles, minlength=len(cycle_lengths))
+    offsets = np.zeros(len(run_counts) + 1, dtype=np.int64)
+    np.cumsum(run_counts, out=offsets[1:])
+    previous = np.arange(len(runs)) - 1
+    previous[offsets[:-1]] = offsets[1:] - 1
+
+    positions = runs[:, 0].copy()
+    handles_out = runs[:, 1] - runs[:, 0]
+    handles_in = runs[previous, 2] - runs[previous, 3]
+    return (
+        positions,
+        handles_in,
+        handles_out,
+        detect_handle_types(handles_in, handles_out),
+        offsets,
+        np.ones(len(run_counts), dtype=bool),
+    )
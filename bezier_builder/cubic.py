@@ -0,0 +1,393 @@
+"""
+Vectorized kernels for arrays of cubic bezier segments.
+
+Segments are stored as (S, 4, 2) arrays of absolute control points
+[start, start + handle_out, end + handle_in, end] so whole paths and shapes
+can be processed in single NumPy passes.
+"""
+
+from math import comb
+
+import numpy as np
+
+# Times closest splits the intervals the slope of the squared distance may turn more than once in
+_CLOSEST_LEVELS = 7
+
+
+def segment_count(anchor_count: int, is_closed: bool) -> int:
+    """
+    Number of cubic segments in a path with `anchor_count` anchors, including
+    the closing segment back to the first anchor for closed paths.
+    """
+    if anchor_count == 0:
+        return 0
+    return anchor_count if is_closed else anchor_count - 1
+
+
+def segment_controls(positions: np.ndarray, handles_in: np.ndarray, handles_out: np.ndarray, is_closed: bool) -> np.ndarray:
+    """
+    Build the (S, 4, 2) absolute control points of every segment in a path.
+
+    Args:
+        positions: (N, 2) anchor positions.
+        handles_in: (N, 2) incoming handles relative to their anchors.
+        handles_out: (N, 2) outgoing handles relative to their anchors.
+        is_closed: Include the closing segment from the last anchor to the first.
+    """
+    count = segment_count(len(positions), is_closed)
+    controls = np.empty((count, 4, 2), dtype=np.float64)
+    if count == 0:
+        return controls
+
+    # Segment i runs from anchor i to anchor i + 1, the closing segment wraps around to anchor 0
+    open_count = len(positions) - 1
+    controls[:, 0] = positions[:count]
+    np.add(positions[:count], handles_out[:count], out=controls[:, 1])
+    np.add(positions[1:], handles_in[1:], out=controls[:open_count, 2])
+    controls[:open_count, 3] = positions[1:]
+    if is_closed:
+        controls[-1, 2] = positions[0] + handles_in[0]
+        controls[-1, 3] = positions[0]
+    return controls
+
+
+def power_coefficients(controls: np.ndarray) -> np.ndarray:
+    """
+    Convert (S, 4, 2) control points to power basis coefficients [a, b, c, d]
+    so that B(t) = ((a * t + b) * t + c) * t + d.
+    """
+    p0, p1, p2, p3 = controls[:, 0], controls[:, 1], controls[:, 2], controls[:, 3]
+    coefficients = np.empty_like(controls)
+    coefficients[:, 0] = p3 - p0 + 3 * (p1 - p2)
+    coefficients[:, 1] = 3 * (p0 - 2 * p1 + p2)
+    coefficients[:, 2] = 3 * (p1 - p0)
+    coefficients[:, 3] = p0
+    return coefficients
+
+
+def locate(t, count: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split path parameters into segment indices and local segment parameters.
+
+    Path parameters run from 0 to `count`, the integer part selects the segment
+    and the fractional part is the position along it. The final value `count`
+    maps to the end of the last segment.
+
+    Returns:
+        (segments, t) arrays with the shape of the input.
+    """
+    if count == 0:
+        raise ValueError("Cannot evaluate a path with no segments.")
+    t = np.asarray(t, dtype=np.float64)
+    segments = np.clip(np.floor(t), 0, count - 1).astype(np.intp)
+    return segments, t - segments
+
+
+def evaluate(controls: np.ndarray, segments: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Evaluate cubic segments at local parameters.
+
+    Args:
+        controls: (S, 4, 2) control points.
+        segments: Array of segment indices.
+        t: Array of local parameters in [0, 1], same shape as `segments`.
+
+    Returns:
+        Array of points with shape `segments.shape + (2,)`.
+    """
+    coefficients = power_coefficients(controls)
+    t = np.asarray(t, dtype=np.float64)[..., np.newaxis]
+
+    # Horner's scheme with in place updates to avoid temporaries on large inputs,
+    # np.take on each coefficient gathers faster than fancy indexing the (S, 4, 2) array
+    points = np.take(coefficients[:, 0], segments, axis=0)
+    for i in range(1, 4):
+        points *= t
+        points += np.take(coefficients[:, i], segments, axis=0)
+    return points
+
+
+def derivative(controls: np.ndarray, segments: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the first derivative of cubic segments at local parameters.
+
+    Args:
+        controls: (S, 4, 2) control points.
+        segments: Array of segment indices.
+        t: Array of local parameters in [0, 1], same shape as `segments`.
+
+    Returns:
+        Array of tangent vectors with shape `segments.shape + (2,)`.
+    """
+    coefficients = power_coefficients(controls)
+    t = np.asarray(t, dtype=np.float64)[..., np.newaxis]
+    tangents = 3 * np.take(coefficients[:, 0], segments, axis=0)
+    tangents *= t
+    tangents += 2 * np.take(coefficients[:, 1], segments, axis=0)
+    tangents *= t
+    tangents += np.take(coefficients[:, 2], segments, axis=0)
+    return tangents
+
+
+def bounds(controls: np.ndarray) -> np.ndarray:
+    """
+    Exact axis aligned bounding boxes of cubic segments.
+
+    Each coordinate is bounded by the segment end points and its values at the
+    roots of the derivative that fall inside the segment.
+
+    Args:
+        controls: (S, 4, 2) control points.
+
+    Returns:
+        (S, 2, 2) array of [min, max] corners.
+    """
+    coefficients = power_coefficients(controls)
+    a, b, c = coefficients[:, 0], coefficients[:, 1], coefficients[:, 2]
+    roots, valid = _derivative_roots(coefficients)
+    roots = np.where(valid, roots, 0.0)
+
+    # Axis values at the roots, invalid roots fall back to the start point
+    values = ((a[:, np.newaxis] * roots + b[:, np.newaxis]) * roots + c[:, np.newaxis]) * roots + coefficients[:, np.newaxis, 3]
+
+    result = np.empty((len(controls), 2, 2), dtype=np.float64)
+    ends = controls[:, [0, 3]]
+    result[:, 0] = np.minimum(ends.min(axis=1), values.min(axis=1))
+    result[:, 1] = np.maximum(ends.max(axis=1), values.max(axis=1))
+    return result
+
+
+def _derivative_roots(coefficients: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Roots of the derivative 3a t^2 + 2b t + c of each axis of segments.
+
+    Uses the numerically stable form of the quadratic formula, which also yields the
+    root of the linear case when a is zero.
+
+    Returns:
+        (roots, valid) as (S, 2, 2) arrays indexed by [segment, root, axis], valid
+        marks the real roots strictly inside (0, 1).
+    """
+    qa, qb, qc = 3 * coefficients[:, 0], 2 * coefficients[:, 1], coefficients[:, 2]
+    discriminant = qb * qb - 4 * qa * qc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = -0.5 * (qb + np.copysign(np.sqrt(np.maximum(discriminant, 0)), qb))
+        roots = np.stack([q / qa, qc / q], axis=1)
+    valid = (discriminant >= 0)[:, np.newaxis] & np.isfinite(roots) & (roots > 0) & (roots < 1)
+    return roots, valid
+
+
+def extrema(controls: np.ndarray) -> np.ndarray:
+    """
+    Parameters where segments turn around in x or y, splitting them there leaves pieces
+    that are monotonic in both coordinates.
+
+    Returns:
+        (S, 4) array of sorted parameters strictly inside (0, 1), padded with NaN.
+    """
+    roots, valid = _derivative_roots(power_coefficients(controls))
+    return np.sort(np.where(valid, roots, np.nan).reshape(len(controls), 4), axis=1)
+
+
+def split(controls: np.ndarray, t) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split segments in two at local parameters with de Casteljau's algorithm.
+
+    Args:
+        controls: (S, 4, 2) control points.
+        t: Scalar or length S array of parameters.
+
+    Returns:
+        (left, right) (S, 4, 2) control points of the parts before and after `t`.
+    """
+    t = np.broadcast_to(np.asarray(t, dtype=np.float64), (len(controls),))[:, np.newaxis]
+    p0, p1, p2, p3 = controls[:, 0], controls[:, 1], controls[:, 2], controls[:, 3]
+    p01 = p0 + (p1 - p0) * t
+    p12 = p1 + (p2 - p1) * t
+    p23 = p2 + (p3 - p2) * t
+    p012 = p01 + (p12 - p01) * t
+    p123 = p12 + (p23 - p12) * t
+    middle = p012 + (p123 - p012) * t
+    return np.stack([p0, p01, p012, middle], axis=1), np.stack([middle, p123, p23, p3], axis=1)
+
+
+def trim(controls: np.ndarray, t0, t1) -> np.ndarray:
+    """
+    Control points of the parts of segments between local parameters `t0` and `t1`.
+
+    Args:
+        controls: (S, 4, 2) control points.
+        t0, t1: Scalars or length S arrays of parameters with t0 <= t1.
+
+    Returns:
+        (S, 4, 2) control points, reparameterized to run from 0 to 1.
+    """
+    t0 = np.broadcast_to(np.asarray(t0, dtype=np.float64), (len(controls),))
+    t1 = np.broadcast_to(np.asarray(t1, dtype=np.float64), (len(controls),))
+    before, _ = split(controls, t1)
+    # Where t1 is 0 the part is the start point, which any parameter of `before` gives
+    relative = np.divide(t0, t1, out=np.zeros(len(controls)), where=t1 > 0)
+    return split(before, relative)[1]
+
+
+def closest(controls: np.ndarray, segments: np.ndarray, points: np.ndarray, samples: int = 4, iterations: int = 12) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parameters of the points on segments closest to given points.
+
+    The slope of the squared distance is a quintic in the parameter. Its roots are
+    isolated by the signs of its Bernstein coefficients over an interval, which
+    change at least as often as it has roots there and by an even number more:
+    intervals without changes are dropped, and those with more than one are split
+    into `samples` even parts and looked at again. Every interval left where the
+    slope turns from falling to rising holds one local minimum, which is narrowed
+    by bisection and finished with Newton's method, keeping only Newton steps that
+    get closer. The nearest of those minima and the segment ends is kept. The
+    bisection handles ends where the tangent vanishes, such as segments without
+    handles.
+
+    Args:
+        controls: (S, 4, 2) control points.
+        segments: Length M array of segment indices.
+        points: (M, 2) points, one per segment index.
+        samples: Number of even parts intervals are split into.
+        iterations: Number of bisection steps.
+
+    Returns:
+        (t, distances) length M arrays.
+    """
+    coefficients = power_coefficients(controls)
+    a, b, c, d = (np.take(coefficients[:, i], segments, axis=0) for i in range(4))
+    d = d - np.asarray(points, dtype=np.float64)
+    count = len(d)
+
+    def dot(u, v):
+        return np.einsum("ij,ij->i", u, v)
+
+    # Half the slope of the squared distance, highest power first
+    quintic = np.column_stack([
+        3 * dot(a, a), 5 * dot(a, b), 4 * dot(a, c) + 2 * dot(b, b), 3 * (dot(a, d) + dot(b, c)), dot(c, c) + 2 * dot(b, d), dot(c, d)
+        ])
+
+    # The nearer segment end is the answer unless a local minimum inside is nearer
+    start, end = dot(d, d), dot(a + b + c + d, a + b + c + d)
+    t = (end < start).astype(np.float64)
+    squared = np.minimum(start, end)
+
+    rows, lower, width = np.arange(count), np.zeros(count), 1.0
+    found_rows, found_lower, found_width = [], [], []
+    for level in range(_CLOSEST_LEVELS):
+        bernstein = _bernstein(quintic[rows], lower, width)
+        changes = np.count_nonzero((bernstein[:, 1:] < 0) != (bernstein[:, :-1] < 0), axis=1)
+        if level == _CLOSEST_LEVELS - 1:
+            # Turns closer together than the finest parts are taken where the ends show one
+            changes = np.where(changes > 1, (bernstein[:, 0] < 0) != (bernstein[:, -1] < 0), changes)
+        turning = (changes == 1) & (bernstein[:, 0] < 0)
+        found_rows.append(rows[turning])
+        found_lower.append(lower[turning])
+        found_width.append(np.full(np.count_nonzero(turning), width))
+        split = changes > 1
+        rows = np.repeat(rows[split], samples)
+        lower = (lower[split][:, np.newaxis] + np.arange(samples) * (width / samples)).reshape(-1)
+        width /= samples
+    rows, lower = np.concatenate(found_rows), np.concatenate(found_lower)
+    upper = lower + np.concatenate(found_width)
+    quintic, a, b, c, d = quintic[rows], a[rows], b[rows], c[rows], d[rows]
+
+    def slope(t):
+        value = quintic[:, 0]
+        for k in range(1, 6):
+            value = value * t + quintic[:, k]
+        return value
+
+    def offset(t):
+        column = t[:, np.newaxis]
+        return ((a * column + b) * column + c) * column + d
+
+    for _ in range(iterations):
+        middle = 0.5 * (lower + upper)
+        rising = slope(middle) > 0
+        lower, upper = np.where(rising, lower, middle), np.where(rising, middle, upper)
+    local = 0.5 * (lower + upper)
+    local_squared = dot(offset(local), offset(local))
+
+    for _ in range(4):
+        column = local[:, np.newaxis]
+        tangent = (3 * a * column + 2 * b) * column + c
+        change = dot(tangent, tangent) + dot(offset(local), 6 * a * column + 2 * b)
+        step = np.divide(slope(local), change, out=np.zeros(len(local)), where=change > 0)
+        trial = np.clip(local - step, 0, 1)
+        trial_squared = dot(offset(trial), offset(trial))
+        better = trial_squared < local_squared
+        if not better.any():
+            break
+        local = np.where(better, trial, local)
+        local_squared = np.where(better, trial_squared, local_squared)
+
+    # Sorted by point and then furthest first, the last minimum of each point is its nearest
+    order = np.lexsort((-local_squared, rows))
+    rows, local, local_squared = rows[order], local[order], local_squared[order]
+    last = np.r_[rows[1:] != rows[:-1], True] if len(rows) else np.zeros(0, dtype=bool)
+    rows, local, local_squared = rows[last], local[last], local_squared[last]
+    nearer = local_squared < squared[rows]
+    t[rows[nearer]], squared[rows[nearer]] = local[nearer], local_squared[nearer]
+    return t, np.sqrt(squared)
+
+
+def _bernstein(polynomials: np.ndarray, lower: np.ndarray, width: float) -> np.ndarray:
+    """
+    Bernstein coefficients of polynomials over intervals.
+
+    Args:
+        polynomials: (K, N + 1) power coefficients, highest power first.
+        lower: Length K array of the starts of the intervals.
+        width: Width of the intervals.
+
+    Returns:
+        (K, N + 1) coefficients, the first and last being the values at the ends.
+    """
+    degree = polynomials.shape[1] - 1
+    # Taylor coefficients at the start of the interval by repeated synthetic division, scaled to its width
+    shifted = polynomials.T.copy()
+    if np.any(lower):
+        for k in range(degree):
+            for j in range(1, degree + 1 - k):
+                shifted[j] += shifted[j - 1] * lower
+    shifted *= (width ** np.arange(degree, -1, -1))[:, np.newaxis]
+    change = np.array([[comb(i, k) / comb(degree, k) if k <= i else 0.0 for k in range(degree, -1, -1)] for i in range(degree + 1)])
+    return (change @ shifted).T
+
+
+def subdivisions(controls: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Number of equal parameter steps that keep each segment's polyline within `tolerance` of the curve.
+
+    Uses Wang's formula, which bounds the distance between a cubic and its uniformly
+    sampled polyline by its largest second difference of control points, so flat
+    segments get a single line and tight curves many.
+
+    Args:
+        controls: (S, 4, 2) control points.
+        tolerance: Maximum distance between the curve and the polyline.
+
+    Returns:
+        Length S integer array of step counts, at least 1.
+    """
+    if tolerance <= 0:
+        raise ValueError(f"Invalid tolerance: {tolerance}. Must be greater than 0.")
+    second_differences = controls[:, :2] - 2 * controls[:, 1:3] + controls[:, 2:]
+    largest = np.sqrt(np.max(np.sum(second_differences ** 2, axis=2), axis=1))
+    steps = np.maximum(np.ceil(np.sqrt(0.75 * largest / tolerance)), 1).astype(np.intp)
+
+    # Uneven handle lengths raise the second differences of straight segments, so segments
+    # whose handles lie within tolerance of their chord (and don't reach further past its ends) take one step
+    chord = controls[:, 3] - controls[:, 0]
+    chord_length = np.hypot(chord[:, 0], chord[:, 1])
+    handles = controls[:, 1:3] - controls[:, np.newaxis, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        along = (handles[..., 0] * chord[:, np.newaxis, 0] + handles[..., 1] * chord[:, np.newaxis, 1]) / chord_length[:, np.newaxis]
+        across = np.abs(handles[..., 0] * chord[:, np.newaxis, 1] - handles[..., 1] * chord[:, np.newaxis, 0]) / chord_length[:, np.newaxis]
+    flat = (chord_length > 0) & np.all(
+        (across <= tolerance) & (along >= -tolerance) & (along <= chord_length[:, np.newaxis] + tolerance), axis=1
+        )
+    steps[flat] = 1
+    return steps
@@ -0,0 +1,434 @@
+"""
+Least squares fitting of cubic segments to points.
+
+Follows Schneider's algorithm ("An Algorithm for Automatically Fitting
+Digitized Curves", Graphics Gems, 1990): with the end points and the directions
+of the end tangents fixed, the two handle lengths are solved by least squares
+over the points at chord length parameters, which are then refined with
+Newton steps towards the nearest points on the fitted curve.
+
+Fits are batched: many runs of points are solved together, each run being a
+contiguous slice of one points array, so whole paths are fitted in a few
+NumPy passes rather than one small fit at a time.
+"""
+
+import numpy as np
+
+from bezier_builder import cubic
+from bezier_builder.anchor_point import CORNER, ALIGNED, SYMMETRIC
+
+# Points sampled from each segment when refitting paths, at t = 0, 1/4, 1/2 and 3/4
+SAMPLES_PER_SEGMENT = 4
+
+# Newton reparameterization rounds before a fit is rejected
+_ITERATIONS = 4
+
+
+class Runs:
+    """
+    Runs of points given as inclusive index ranges into a shared (M, 2) points array.
+    Precomputes the flattened indices and run numbers used by the batched kernels.
+    """
+    def __init__(self, points: np.ndarray, starts, stops):
+        self.starts = np.asarray(starts, dtype=np.intp)
+        self.stops = np.asarray(stops, dtype=np.intp)
+        self.lengths = self.stops - self.starts + 1
+        self.count = len(self.lengths)
+        self.offsets = np.cumsum(self.lengths) - self.lengths
+        self.run = np.repeat(np.arange(self.count), self.lengths)
+        self.local = np.arange(len(self.run)) - self.offsets[self.run]
+        self.index = self.starts[self.run] + self.local
+        self.points = points[self.index]
+
+    def sum(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.run, weights=values, minlength=self.count)
+
+    def max(self, values: np.ndarray) -> np.ndarray:
+        return np.maximum.reduceat(values, self.offsets) if self.count else np.zeros(0)
+
+    def chord_parameters(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Parameters in [0, 1] proportional to the distance along each run.
+
+        Args:
+            distances: Cumulative distances along the shared points array, see cumulative_distances.
+        """
+        start, stop = distances[self.starts], distances[self.stops]
+        total = (stop - start)[self.run]
+        even = self.local / np.maximum(self.lengths - 1, 1)[self.run]
+        return np.divide(distances[self.index] - start[self.run], total, out=even, where=total > 0)
+
+
+def cumulative_distances(points: np.ndarray) -> np.ndarray:
+    """
+    Distance from the first of (M, 2) points to each point along the polyline through them.
+    """
+    distances = np.zeros(len(points))
+    np.cumsum(np.hypot(*np.diff(points, axis=0).T), out=distances[1:])
+    return distances
+
+
+def fit_cubics(runs: Runs, u: np.ndarray, tangents_start: np.ndarray, tangents_end: np.ndarray) -> np.ndarray:
+    """
+    Least squares cubic through the first and last point of each run with fixed tangent directions.
+
+    Args:
+        runs: Runs of points to fit.
+        u: Parameters of the points of all runs.
+        tangents_start: (R, 2) unit directions of the outgoing handles at the run starts.
+        tangents_end: (R, 2) unit directions of the incoming handles at the run ends,
+                      pointing back along the curves.
+
+    Returns:
+        (R, 4, 2) control points.
+    """
+    points, run = runs.points, runs.run
+    start, end = points[runs.offsets], points[runs.offsets + runs.lengths - 1]
+    v = 1 - u
+    b1, b2 = 3 * u * v * v, 3 * u * u * v
+    b01, b23 = v * v * (v + 3 * u), u * u * (u + 3 * v)
+
+    def dot(vectors, tangents):
+        return np.einsum("ij,ij->i", vectors, tangents)
+
+    # With unit tangents the normal equations reduce to sums over the Bernstein weights
+    # of the points projected onto each tangent
+    rest_start = dot(points, tangents_start[run]) - b01 * dot(start, tangents_start)[run] - b23 * dot(end, tangents_start)[run]
+    rest_end = dot(points, tangents_end[run]) - b01 * dot(start, tangents_end)[run] - b23 * dot(end, tangents_end)[run]
+    c11, c22 = runs.sum(b1 * b1), runs.sum(b2 * b2)
+    c12 = runs.sum(b1 * b2) * dot(tangents_start, tangents_end)
+    x1, x2 = runs.sum(b1 * rest_start), runs.sum(b2 * rest_end)
+    determinant = c11 * c22 - c12 * c12
+
+    chord = np.hypot(*(end - start).T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha_start = (x1 * c22 - x2 * c12) / determinant
+        alpha_end = (c11 * x2 - c12 * x1) / determinant
+    # Singular systems and short or backwards handles fall back to a third of the chord (Wu-Barsky heuristic)
+    solved = (np.abs(determinant) > 1e-12 * c11 * c22) & (alpha_start > 1e-6 * chord) & (alpha_end > 1e-6 * chord)
+    alpha_start = np.where(solved, alpha_start, chord / 3)
+    alpha_end = np.where(solved, alpha_end, chord / 3)
+
+    controls = np.empty((runs.count, 4, 2))
+    controls[:, 0] = start
+    controls[:, 1] = start + alpha_start[:, np.newaxis] * tangents_start
+    controls[:, 2] = end + alpha_end[:, np.newaxis] * tangents_end
+    controls[:, 3] = end
+    return controls
+
+
+def reparameterize(controls: np.ndarray, runs: Runs, u: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    One Newton step moving each parameter towards the point on its run's curve nearest its point.
+
+    Returns:
+        (u, distances) with the new parameters and the distance between each point
+        and the curve at its new parameter.
+    """
+    # Coordinates are handled separately as flat arrays, which avoids (M, 4, 2) temporaries
+    coefficients = cubic.power_coefficients(controls)
+    (ax, ay), (bx, by), (cx, cy), (dx, dy) = (
+        (coefficients[:, i, 0][runs.run], coefficients[:, i, 1][runs.run]) for i in range(4)
+        )
+    x, y = runs.points[:, 0], runs.points[:, 1]
+
+    offset_x = ((ax * u + bx) * u + cx) * u + dx - x
+    offset_y = ((ay * u + by) * u + cy) * u + dy - y
+    first_x = (3 * ax * u + 2 * bx) * u + cx
+    first_y = (3 * ay * u + 2 * by) * u + cy
+    numerator = offset_x * first_x + offset_y * first_y
+    denominator = first_x * first_x + first_y * first_y + offset_x * (6 * ax * u + 2 * bx) + offset_y * (6 * ay * u + 2 * by)
+    step = np.divide(numerator, denominator, out=np.zeros(len(u)), where=denominator != 0)
+    u = np.clip(u - step, 0, 1)
+
+    offset_x = ((ax * u + bx) * u + cx) * u + dx - x
+    offset_y = ((ay * u + by) * u + cy) * u + dy - y
+    return u, np.hypot(offset_x, offset_y)
+
+
+def fit_runs(runs: Runs, u: np.ndarray, tangents_start: np.ndarray, tangents_end: np.ndarray,
+             tolerance: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit a cubic to every run, refining the parameters until its points are within `tolerance`.
+
+    Returns:
+        (controls, fitted, farthest): (R, 4, 2) control points of the best fit of each run,
+        a length R mask of the runs fitted within tolerance and the index into the shared
+        points array of the point farthest from each run's curve.
+    """
+    controls = np.empty((runs.count, 4, 2))
+    errors = np.full(runs.count, np.inf)
+    farthest = runs.starts.copy()
+    for _ in range(_ITERATIONS):
+        attempt = fit_cubics(runs, u, tangents_start, tangents_end)
+        # Measuring after the Newton step gets closer to the true distance from each point to the curve
+        u, distances = reparameterize(attempt, runs, u)
+        attempt_errors = runs.max(distances)
+        better = attempt_errors < errors
+        controls[better] = attempt[better]
+        errors[better] = attempt_errors[better]
+
+        # First point of each improved run at its largest distance
+        at_max = np.flatnonzero((distances == attempt_errors[runs.run]) & better[runs.run])
+        improved, first = np.unique(runs.run[at_max], return_index=True)
+        farthest[improved] = runs.index[at_max[first]]
+        if np.all(errors <= tolerance):
+            break
+    return controls, errors <= tolerance, farthest
+
+
+def fit_points(points: np.ndarray, tolerance: float, tangent_start=None, tangent_end=None) -> tuple:
+    """
+    Fit a chain of smooth cubic segments to an ordered stream of points.
+
+    Every run of points that can't be fitted within tolerance is split at its
+    farthest point, with the tangent there estimated from its neighbours so the
+    two halves join smoothly. All runs of one level of splitting are fitted together.
+
+    Args:
+        points: (N, 2) points, consecutive duplicates are ignored.
+        tolerance: Maximum distance between the points and the curve.
+        tangent_start: Unit direction of the first handle, estimated from the points if None.
+        tangent_end: Unit direction of the last handle pointing back along the curve,
+                     estimated from the points if None.
+
+    Returns:
+        (controls, anchors): (S, 4, 2) control points of the segments and the length S + 1
+        indices of the points the anchors were placed on.
+    """
+    if tolerance <= 0:
+        raise ValueError(f"Invalid tolerance: {tolerance}. Must be greater than 0.")
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+    original = np.flatnonzero(keep)
+    points = points[keep]
+    if len(points) < 2:
+        return np.empty((0, 4, 2)), original
+    distances = cumulative_distances(points)
+    last = len(points) - 1
+
+    tangent_start = _direction(points[1] - points[0]) if tangent_start is None else np.asarray(tangent_start, dtype=np.float64)
+    tangent_end = _direction(points[-2] - points[-1]) if tangent_end is None else np.asarray(tangent_end, dtype=np.float64)
+
+    # Runs still to fit as (start, stop, tangent at start, tangent at stop) and fitted segments by start index
+    pending = [(0, last, tangent_start, tangent_end)]
+    finished = {}
+    while pending:
+        starts, stops, tangents_start, tangents_end = (np.array(values) for values in zip(*pending))
+        runs = Runs(points, starts, stops)
+        controls, fitted, farthest = fit_runs(runs, runs.chord_parameters(distances), tangents_start, tangents_end, tolerance)
+
+        pending = []
+        for i in range(runs.count):
+            start, stop = int(starts[i]), int(stops[i])
+            if fitted[i] or stop - start < 2:
+                finished[start] = controls[i]
+                continue
+            split = min(max(int(farthest[i]), start + 1), stop - 1)
+            center = _direction(points[split - 1] - points[split + 1])
+            if not center.any():
+                center = _direction(points[split - 1] - points[split])
+            pending.append((start, split, tangents_start[i], center))
+            pending.append((split, stop, -center, tangents_end[i]))
+
+    starts = sorted(finished)
+    return np.array([finished[start] for start in starts]), original[starts + [last]]
+
+
+def smooth_anchors(controls: np.ndarray) -> tuple:
+    """
+    Anchor arrays of an open path through a chain of (S, 4, 2) segments.
+
+    Anchors between segments are symmetric if their handles have the same length
+    and aligned otherwise, the two end anchors are corners.
+
+    Returns:
+        (positions, handles_in, handles_out, handle_types) of the S + 1 anchors.
+    """
+    count = len(controls) + 1
+    positions = np.concatenate([controls[:, 0], controls[-1:, 3]])
+    handles_in = np.zeros((count, 2))
+    handles_out = np.zeros((count, 2))
+    handles_out[:-1] = controls[:, 1] - controls[:, 0]
+    handles_in[1:] = controls[:, 2] - controls[:, 3]
+
+    handle_types = np.full(count, ALIGNED, dtype=np.uint8)
+    handle_types[np.isclose(np.hypot(*handles_in.T), np.hypot(*handles_out.T))] = SYMMETRIC
+    handle_types[[0, -1]] = CORNER
+    return positions, handles_in, handles_out, handle_types
+
+
+def _direction(vector: np.ndarray) -> np.ndarray:
+    """Unit vector in the direction of `vector`, or zero for a zero vector."""
+    length = np.hypot(*vector)
+    return vector / length if length > 0 else np.zeros(2)
+
+
+def segment_tangents(controls: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Unit tangent directions at both ends of (S, 4, 2) segments.
+
+    A zero handle doesn't give a direction, so the next control point that differs
+    from the end point is used instead, matching the curve's actual tangent.
+
+    Returns:
+        (start, end) arrays of shape (S, 2). End tangents point back along the segment.
+    """
+    def first_direction(differences):
+        lengths = np.hypot(differences[..., 0], differences[..., 1])
+        choice = np.argmax(lengths > 0, axis=1)
+        rows = np.arange(len(differences))
+        chosen, length = differences[rows, choice], lengths[rows, choice]
+        return np.divide(chosen, length[:, np.newaxis], out=np.zeros_like(chosen), where=length[:, np.newaxis] > 0)
+
+    start = first_direction(controls[:, 1:] - controls[:, :1])
+    end = first_direction(controls[:, 2::-1] - controls[:, 3:])
+    return start, end
+
+
+def sample_segments(controls: np.ndarray) -> np.ndarray:
+    """
+    Points at t = k / SAMPLES_PER_SEGMENT along every segment plus the final end point.
+
+    Segment i's samples are rows i * SAMPLES_PER_SEGMENT to (i + 1) * SAMPLES_PER_SEGMENT inclusive.
+    """
+    count = len(controls)
+    t = np.tile(np.arange(SAMPLES_PER_SEGMENT) / SAMPLES_PER_SEGMENT, count)
+    segments = np.repeat(np.arange(count), SAMPLES_PER_SEGMENT)
+    samples = np.empty((count * SAMPLES_PER_SEGMENT + 1, 2))
+    samples[:-1] = cubic.evaluate(controls, segments, t)
+    samples[-1] = controls[-1, 3]
+    return samples
+
+
+def simplify(positions: np.ndarray, handles_in: np.ndarray, handles_out: np.ndarray, handle_types: np.ndarray,
+             is_closed: bool, tolerance: float, lines_only: bool = False) -> tuple:
+    """
+    Remove anchors from a path while keeping it within `tolerance` of the original.
+
+    Works bottom up: every segment starts as its own run, then each round tries
+    to merge non-overlapping pairs of neighbouring runs into single segments,
+    fitting all pairs in one batch. Pairs that fail aren't tried again until one
+    of their runs grows, and merging stops once no pair can be merged.
+
+    Merged segments keep the tangent directions of the anchors at both ends of
+    their run, so only handle lengths change and aligned anchors stay aligned.
+    Symmetric anchors whose refitted handles differ in length become aligned.
+
+    Args:
+        positions, handles_in, handles_out, handle_types: Anchor arrays of the path, see BezierPath.from_arrays.
+        is_closed: Whether the path is closed.
+        tolerance: Maximum distance between the new segments and points sampled from the old ones.
+        lines_only: Only merge runs of straight line segments (both handles zero) whose
+                    anchors lie within `tolerance` of the line replacing them.
+
+    Returns:
+        (positions, handles_in, handles_out, handle_types) of the kept anchors.
+    """
+    if tolerance < 0:
+        raise ValueError(f"Invalid tolerance: {tolerance}. Must be at least 0.")
+    controls = cubic.segment_controls(positions, handles_in, handles_out, is_closed)
+    count = len(controls)
+    if count < 2:
+        return positions.copy(), handles_in.copy(), handles_out.copy(), handle_types.copy()
+
+    if lines_only:
+        merge = _line_merger(controls, handles_in, handles_out, tolerance)
+    else:
+        merge = _curve_merger(controls, tolerance)
+
+    # Boundaries between runs are the kept anchors, runs[i] is the segment from boundary i to i + 1
+    boundaries = np.arange(count + 1)
+    runs = controls.copy()
+    # Pair i joins runs i and i + 1, blocked when it failed and neither run changed since
+    blocked = np.zeros(count - 1, dtype=bool)
+    parity = 0
+
+    while not np.all(blocked):
+        # Every other open pair, so no run takes part in two merges
+        candidates = np.flatnonzero(~blocked)
+        if len(candidates) > 1:
+            candidates = candidates[(candidates % 2) == parity]
+        parity ^= 1
+        if len(candidates) == 0:
+            continue
+
+        merged, fitted = merge(boundaries[candidates], boundaries[candidates + 2])
+        blocked[candidates[~fitted]] = True
+        if not np.any(fitted):
+            continue
+
+        # Replace each merged pair of runs by its fitted segment and drop the boundary between them
+        joined = candidates[fitted]
+        runs[joined] = merged[fitted]
+        keep = np.ones(len(boundaries), dtype=bool)
+        keep[joined + 1] = False
+        changed = np.zeros(len(blocked), dtype=bool)
+        changed[joined[joined > 0] - 1] = True
+        changed[joined[joined < len(blocked) - 1] + 1] = True
+        boundaries = boundaries[keep]
+        runs = runs[keep[:-1]]
+        blocked = (blocked & ~changed)[keep[1:-1]]
+
+    return _kept_anchors(positions, handles_in, handles_out, handle_types, is_closed, boundaries, runs)
+
+
+def _curve_merger(controls: np.ndarray, tolerance: float):
+    """
+    Merge function fitting cubics to points sampled from the segments between pairs of anchors.
+    """
+    samples = sample_segments(controls)
+    distances = cumulative_distances(samples)
+    tangents_start, tangents_end = segment_tangents(controls)
+
+    def merge(starts: np.ndarray, stops: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        runs = Runs(samples, starts * SAMPLES_PER_SEGMENT, stops * SAMPLES_PER_SEGMENT)
+        u = runs.chord_parameters(distances)
+        merged, fitted, _ = fit_runs(runs, u, tangents_start[starts], tangents_end[stops - 1], tolerance)
+        return merged, fitted
+    return merge
+
+
+def _line_merger(controls: np.ndarray, handles_in: np.ndarray, handles_out: np.ndarray, tolerance: float):
+    """
+    Merge function joining runs of straight lines whose anchors lie within tolerance of one line.
+    """
+    count = len(controls)
+    ends = np.arange(1, count + 1) % len(handles_in)
+    is_line = np.all(handles_out[:count] == 0, axis=1) & np.all(handles_in[ends] == 0, axis=1)
+    curves_before = np.concatenate([[0], np.cumsum(~is_line)])
+    anchors = np.concatenate([controls[:, 0], controls[-1:, 3]])
+
+    def merge(starts: np.ndarray, stops: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        a, b = anchors[starts], anchors[stops]
+        runs = Runs(anchors, starts + 1, stops - 1)
+        direction = (b - a)[runs.run]
+        offset = runs.points - a[runs.run]
+        squared = np.einsum("ij,ij->i", direction, direction)
+        along = np.divide(np.einsum("ij,ij->i", offset, direction), squared, out=np.zeros(len(squared)), where=squared > 0)
+        distances = np.hypot(*(offset - np.clip(along, 0, 1)[:, np.newaxis] * direction).T)
+        fitted = (runs.max(distances) <= tolerance) & (curves_before[stops] == curves_before[starts])
+        return np.stack([a, a, b, b], axis=1), fitted
+    return merge
+
+
+def _kept_anchors(positions, handles_in, handles_out, handle_types, is_closed: bool, boundaries: np.ndarray, runs: np.ndarray) -> tuple:
+    """
+    Anchor arrays of the simplified path from the indices of the kept anchors and the segments between them.
+    """
+    indices = boundaries % len(positions)
+    if is_closed:
+        indices = indices[:-1]
+
+    positions = positions[indices]
+    handle_types = handle_types[indices]
+    handles_out = handles_out[indices]
+    handles_in = handles_in[indices]
+    handles_out[:len(runs)] = runs[:, 1] - runs[:, 0]
+    handles_in[np.arange(1, len(runs) + 1) % len(indices)] = runs[:, 2] - runs[:, 3]
+
+    symmetric = handle_types == SYMMETRIC
+    unequal = ~np.isclose(np.hypot(*handles_in.T), np.hypot(*handles_out.T))
+    handle_types[symmetric & unequal] = ALIGNED
+    return positions, handles_in, handles_out, handle_types
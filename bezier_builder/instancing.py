@@ -0,0 +1,68 @@
+"""
+Shapes reused through <use> elements, kept once per definition.
+
+An InstancedShapes holds the shapes drawn directly in a document, one shared
+BezierShape per referenced definition and a compact (K, 2, 3) array of the
+affine transforms placing each of the K instances, see BezierPath.transform.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from bezier_builder.bezier_path import BezierShape
+
+
+class InstancedShapes:
+    """
+    Shapes of a document with every <use> instance stored as a definition index and a transform.
+    """
+    def __init__(
+            self,
+            shapes: Optional[list[BezierShape]] = None,
+            definitions: Optional[list[BezierShape]] = None,
+            definition_ids: Optional[list[str]] = None,
+            indices=None,
+            transforms=None,
+            ):
+        """
+        Args:
+            shapes: Shapes drawn directly, with their transforms applied.
+            definitions: Shapes of the referenced definitions in their own coordinates.
+            definition_ids: Id of each definition.
+            indices: Length K array, the definition drawn by each instance.
+            transforms: (K, 2, 3) affine matrices placing each instance.
+        """
+        self.shapes = shapes if shapes is not None else []
+        self.definitions = definitions if definitions is not None else []
+        self.definition_ids = definition_ids if definition_ids is not None else [f"shape{i}" for i in range(len(self.definitions))]
+        self.indices = np.zeros(0, dtype=np.intp) if indices is None else np.asarray(indices, dtype=np.intp).reshape(-1)
+        self.transforms = np.zeros((0, 2, 3)) if transforms is None else np.asarray(transforms, dtype=np.float64).reshape(-1, 2, 3)
+        if len(self.definition_ids) != len(self.definitions):
+            raise ValueError("Every definition needs an id.")
+        if len(self.indices) != len(self.transforms):
+            raise ValueError("Every instance needs a definition index and a transform.")
+
+    @property
+    def instance_count(self) -> int:
+        return len(self.indices)
+
+    def instances(self, definition: int) -> np.ndarray:
+        """
+        (M, 2, 3) transforms of the instances of one definition.
+        """
+        return self.transforms[self.indices == definition]
+
+    def expand(self) -> list[BezierShape]:
+        """
+        Copy every instance into its own transformed shape, as iter_svg_file would return them.
+
+        Returns:
+            The directly drawn shapes followed by one shape per instance, in instance order.
+        """
+        expanded = [None] * self.instance_count
+        for definition, shape in enumerate(self.definitions):
+            positions = np.flatnonzero(self.indices == definition)
+            for position, instance in zip(positions.tolist(), shape.transform_many(self.transforms[positions])):
+                expanded[position] = instance
+        return list(self.shapes) + expanded
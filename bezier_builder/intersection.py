@@ -0,0 +1,517 @@
+"""
+Intersections between cubic bezier paths.
+
+Candidate segment pairs are culled with a sweep line over their bounding boxes,
+so only pairs whose boxes overlap are ever formed. The surviving pairs are
+resolved together by repeatedly halving the larger curve of every pair and
+discarding halves that separate, either by their control point boxes or by the
+fat line test of Bezier clipping, until both curves of a pair are straight
+enough to intersect as lines. The parameters found are polished with Newton's
+method on the original segments.
+
+Results are returned as (segments, t) arrays of segment indices and local
+segment parameters, see BezierPath.evaluate.
+"""
+
+import numpy as np
+
+from bezier_builder import cubic
+
+# Stop subdividing a pair after this many halvings
+_MAX_DEPTH = 64
+# More live pairs than this descending from one candidate pair means its curves overlap
+# along a stretch rather than cross, they are dropped
+_MAX_PAIRS = 64
+# Number of x overlapping pairs the sweep line expands at once, bounding its memory
+_CHUNK = 1 << 20
+# Number of candidate pairs subdivided together
+_BATCH = 1 << 14
+# Curves whose handles stray from their chords by less than this fraction of its length,
+# with chords crossing at an angle whose sine is above _ANGLE, are polished with Newton's method
+_STRAIGHT = 0.02
+_ANGLE = 0.25
+# Times a Newton step that overshoots is halved before giving up on it
+_BACKTRACK = 4
+# Extrema closer than this to each other or to the ends of a segment are not split at,
+# and the parameter slack allowed when checking a root falls inside a piece
+_EDGE = 1e-9
+
+
+def overlapping_pairs(bounds_a: np.ndarray, bounds_b: np.ndarray = None, tolerance: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Index pairs of overlapping bounding boxes, found with a sweep line.
+
+    Boxes are sorted by their leading edges along the axis they are narrowest on
+    relative to the spread of all boxes, and each box is only paired with the boxes
+    whose leading edge falls within its own span, so the cost grows with the number
+    of boxes and overlaps rather than with the number of all pairs.
+
+    Args:
+        bounds_a: (N, 2, 2) array of [min, max] corners.
+        bounds_b: (M, 2, 2) array of [min, max] corners, None pairs the boxes of `bounds_a` with each other.
+        tolerance: Grow the boxes by this much so boxes closer than it overlap.
+
+    Returns:
+        (i, j) index arrays into bounds_a and bounds_b. Pairs within `bounds_a` have i < j.
+    """
+    both = bounds_a if bounds_b is None else np.concatenate([bounds_a, bounds_b])
+    if len(both) == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    spread = both[:, 1].max(axis=0) - both[:, 0].min(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sweep = int(np.argmin(np.nan_to_num((both[:, 1] - both[:, 0]).mean(axis=0) / spread, nan=np.inf)))
+    other = 1 - sweep
+
+    # Contiguous copies of each coordinate gather much faster than columns of the bounds
+    start_a, stop_a = bounds_a[:, 0, sweep] - tolerance, bounds_a[:, 1, sweep] + tolerance
+    low_a, high_a = bounds_a[:, 0, other] - tolerance, bounds_a[:, 1, other] + tolerance
+    order_a = np.argsort(start_a, kind="stable")
+    sorted_a = start_a[order_a]
+
+    if bounds_b is None:
+        def overlap(i, j):
+            return (low_a[i] <= high_a[j]) & (low_a[j] <= high_a[i])
+
+        # Ties in the leading edges are broken by sort position, so each pair is formed once
+        starts = np.arange(1, len(order_a) + 1)
+        stops = np.searchsorted(sorted_a, stop_a[order_a], side="right")
+        i, j = _sweep(order_a, starts, stops, order_a, overlap)
+        return np.minimum(i, j), np.maximum(i, j)
+
+    start_b, stop_b = bounds_b[:, 0, sweep] - tolerance, bounds_b[:, 1, sweep] + tolerance
+    low_b, high_b = bounds_b[:, 0, other] - tolerance, bounds_b[:, 1, other] + tolerance
+    order_b = np.argsort(start_b, kind="stable")
+    sorted_b = start_b[order_b]
+
+    def overlap(i, j):
+        return (low_a[i] <= high_b[j]) & (low_b[j] <= high_a[i])
+
+    # Spans overlap when the leading edge of one falls inside the other, pair every box
+    # of a with the boxes of b starting inside it and every box of b with the boxes of a
+    # starting strictly inside it, so pairs with equal leading edges are only formed once
+    i1, j1 = _sweep(
+        order_a,
+        np.searchsorted(sorted_b, start_a[order_a], side="left"),
+        np.searchsorted(sorted_b, stop_a[order_a], side="right"),
+        order_b,
+        overlap,
+        )
+    j2, i2 = _sweep(
+        order_b,
+        np.searchsorted(sorted_a, start_b[order_b], side="right"),
+        np.searchsorted(sorted_a, stop_b[order_b], side="right"),
+        order_a,
+        lambda j, i: overlap(i, j),
+        )
+    return np.concatenate([i1, i2]), np.concatenate([j1, j2])
+
+
+def _sweep(rows, starts, stops, columns, overlap) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pair rows[k] with columns[starts[k]:stops[k]] and keep the pairs where `overlap` holds,
+    in chunks of at most about _CHUNK pairs.
+    """
+    counts = np.maximum(stops - starts, 0)
+    ends = np.cumsum(counts)
+    found_i, found_j = [np.zeros(0, dtype=np.intp)], [np.zeros(0, dtype=np.intp)]
+    first = 0
+    while first < len(rows):
+        last = max(int(np.searchsorted(ends, ends[first] - counts[first] + _CHUNK, side="right")), first + 1)
+        chunk = counts[first:last]
+        owners = np.repeat(np.arange(first, last), chunk)
+        offsets = np.arange(len(owners)) - np.repeat(np.cumsum(chunk) - chunk, chunk)
+        i = rows[owners]
+        j = columns[starts[owners] + offsets]
+        keep = overlap(i, j)
+        found_i.append(i[keep])
+        found_j.append(j[keep])
+        first = last
+    return np.concatenate(found_i), np.concatenate(found_j)
+
+
+def _deviation(controls: np.ndarray, chords: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    How far the handles of segments stray from their chords, to either side or past the ends.
+
+    Args:
+        controls: (..., 4, 2) control points.
+        chords: (..., 2) vectors from the start to the end of each segment.
+        lengths: Lengths of the chords.
+
+    Returns:
+        Array of distances, infinite for segments whose ends coincide.
+    """
+    handles = controls[..., 1:3, :] - controls[..., :1, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        along = (handles[..., 0] * chords[..., np.newaxis, 0] + handles[..., 1] * chords[..., np.newaxis, 1]) / lengths[..., np.newaxis]
+        across = np.abs(handles[..., 0] * chords[..., np.newaxis, 1] - handles[..., 1] * chords[..., np.newaxis, 0]) / lengths[..., np.newaxis]
+    stray = np.maximum(across, np.maximum(-along, along - lengths[..., np.newaxis]))
+    return np.where(lengths > 0, np.maximum(stray[..., 0], stray[..., 1]), np.inf)
+
+
+def _cross(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def _separated(curves: np.ndarray, chords: np.ndarray, lengths: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Mask of pairs where one curve lies clear of the fat line of the other, the band along
+    its chord holding all its control points, as in Bezier clipping.
+
+    Args:
+        curves: (K, 2, 4, 2) control points of both curves of each pair.
+        chords: (K, 2, 2) chords of the curves.
+        lengths: (K, 2) lengths of the chords.
+    """
+    separated = np.zeros(len(curves), dtype=bool)
+    for this, other in ((0, 1), (1, 0)):
+        chord, origin = chords[:, np.newaxis, this], curves[:, this, :1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            band = _cross(chord, curves[:, this, 1:3] - origin) / lengths[:, this, np.newaxis]
+            distances = _cross(chord, curves[:, other] - origin) / lengths[:, this, np.newaxis]
+        # The chord ends are on the line, so only the handles widen the band
+        band_low = np.minimum(np.minimum(band[:, 0], band[:, 1]), 0)
+        band_high = np.maximum(np.maximum(band[:, 0], band[:, 1]), 0)
+        lowest = np.minimum(np.minimum(distances[:, 0], distances[:, 1]), np.minimum(distances[:, 2], distances[:, 3]))
+        highest = np.maximum(np.maximum(distances[:, 0], distances[:, 1]), np.maximum(distances[:, 2], distances[:, 3]))
+        separated |= (lowest > band_high + tolerance) | (highest < band_low - tolerance)
+    return separated
+
+
+def _chord_parameters(controls: np.ndarray, fractions: np.ndarray, iterations: int = 24) -> np.ndarray:
+    """
+    Parameters where flat segments get `fractions` of the way along their chords, found by bisection.
+
+    Parameters don't advance evenly along segments whose handles differ in length,
+    so crossings of their chords have to be mapped back onto the curves.
+    """
+    chords = controls[:, 3] - controls[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Bernstein coefficients of the projection onto the chord, running from 0 to 1
+        along = np.sum((controls - controls[:, :1]) * chords[:, np.newaxis], axis=2) / np.sum(chords * chords, axis=1)[:, np.newaxis]
+    low, high = np.zeros(len(controls)), np.ones(len(controls))
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        rest = 1 - middle
+        value = rest * rest * 3 * middle * along[:, 1] + rest * 3 * middle * middle * along[:, 2] + middle ** 3 * along[:, 3]
+        below = value < fractions
+        low, high = np.where(below, middle, low), np.where(below, high, middle)
+    return (low + high) / 2
+
+
+def _resolve(controls_a: np.ndarray, controls_b: np.ndarray, i: np.ndarray, j: np.ndarray, tolerance: float) -> tuple:
+    """
+    Intersect the segment pairs (controls_a[i], controls_b[j]) by subdivision, in batches
+    of _BATCH pairs so the working arrays stay small.
+
+    Returns:
+        (pairs, s, t) with the candidate pair of every intersection found and its local
+        parameters on each segment. One crossing may be found more than once.
+    """
+    found = [(np.zeros(0, dtype=np.intp), np.zeros(0), np.zeros(0))]
+    for first in range(0, len(i), _BATCH):
+        pairs, s, t = _resolve_batch(controls_a, controls_b, i[first:first + _BATCH], j[first:first + _BATCH], tolerance)
+        found.append((pairs + first, s, t))
+    pairs, s, t = (np.concatenate(arrays) for arrays in zip(*found))
+    return pairs, s, t
+
+
+def _resolve_batch(controls_a: np.ndarray, controls_b: np.ndarray, i: np.ndarray, j: np.ndarray, tolerance: float) -> tuple:
+    """
+    Intersect the segment pairs (controls_a[i], controls_b[j]) by subdivision, all pairs at once, see _resolve.
+    """
+    found = [(np.zeros(0, dtype=np.intp), np.zeros(0), np.zeros(0))]
+    pairs = np.arange(len(i))
+    # Both curves of every pair as a (K, 2, 4, 2) array, with the [start, stop]
+    # parameters each one covers on its original segment
+    curves = np.stack([controls_a[i], controls_b[j]], axis=1)
+    ranges = np.zeros((len(i), 2, 2))
+    ranges[..., 1] = 1
+
+    for _ in range(_MAX_DEPTH):
+        if len(pairs) == 0:
+            break
+        # Curves lie inside the boxes of their control points, pairs whose boxes separate can't meet
+        lower = np.minimum(np.minimum(curves[:, :, 0], curves[:, :, 1]), np.minimum(curves[:, :, 2], curves[:, :, 3]))
+        upper = np.maximum(np.maximum(curves[:, :, 0], curves[:, :, 1]), np.maximum(curves[:, :, 2], curves[:, :, 3]))
+        keep = np.all((lower[:, 0] <= upper[:, 1] + tolerance) & (lower[:, 1] <= upper[:, 0] + tolerance), axis=1)
+        pairs, curves, ranges, lower, upper = (array[keep] for array in (pairs, curves, ranges, lower, upper))
+        chords = curves[:, :, 3] - curves[:, :, 0]
+        lengths = np.hypot(chords[..., 0], chords[..., 1])
+        keep = ~_separated(curves, chords, lengths, tolerance)
+        pairs, curves, ranges, lower, upper, chords, lengths = (
+            array[keep] for array in (pairs, curves, ranges, lower, upper, chords, lengths)
+            )
+        size = np.maximum(upper[..., 0] - lower[..., 0], upper[..., 1] - lower[..., 1])
+
+        deviation = _deviation(curves, chords, lengths)
+        determinant = _cross(chords[:, 0], chords[:, 1])
+        offset = curves[:, 1, 0] - curves[:, 0, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            local = np.stack([_cross(offset, chords[:, 1]), _cross(offset, chords[:, 0])], axis=1) / determinant[:, np.newaxis]
+            slack = tolerance / lengths
+        start, stop = ranges[..., 0], ranges[..., 1]
+
+        def guess(rows):
+            # Parameters on the original segments where the chords cross
+            fractions = _chord_parameters(curves[rows].reshape(-1, 4, 2), np.clip(local[rows], 0, 1).reshape(-1))
+            return start[rows] + fractions.reshape(-1, 2) * (stop[rows] - start[rows])
+
+        # Nearly straight curves crossing at a clear angle meet at most once. Polish the crossing
+        # of their chords with Newton's method on the original segments and settle the pairs it
+        # converges for, sparing them the many halvings it takes to get flat to within tolerance
+        straight = np.all(deviation <= _STRAIGHT * lengths, axis=1) & (np.abs(determinant) > _ANGLE * lengths[:, 0] * lengths[:, 1])
+        rows = np.flatnonzero(straight)
+        segments = np.arange(len(rows))
+        parameters = guess(rows)
+        s, t, distance = _polish(
+            controls_a[i[pairs[rows]]], segments, parameters[:, 0], controls_b[j[pairs[rows]]], segments, parameters[:, 1]
+            )
+        converged = (
+            (distance <= tolerance)
+            & (s >= start[rows, 0] - _EDGE) & (s <= stop[rows, 0] + _EDGE)
+            & (t >= start[rows, 1] - _EDGE) & (t <= stop[rows, 1] + _EDGE)
+            )
+        found.append((pairs[rows[converged]], s[converged], t[converged]))
+        settled = np.zeros(len(pairs), dtype=bool)
+        settled[rows[converged]] = True
+
+        # Pairs of curves flat to within tolerance intersect where their chords do, unless the chords are parallel
+        lines = ~settled & np.all(deviation <= tolerance, axis=1) & (np.abs(determinant) > 1e-9 * lengths[:, 0] * lengths[:, 1])
+        hits = lines & np.all((local >= -slack) & (local <= 1 + slack), axis=1)
+        parameters = guess(hits)
+        found.append((pairs[hits], parameters[:, 0], parameters[:, 1]))
+        lines |= settled
+
+        # Pieces too small to split further meet at their centers
+        small = ~lines & np.all(size <= tolerance, axis=1)
+        parameters = ranges[small].mean(axis=2)
+        found.append((pairs[small], parameters[:, 0], parameters[:, 1]))
+
+        keep = ~lines & ~small
+        keep &= np.bincount(pairs[keep], minlength=len(i))[pairs] <= _MAX_PAIRS
+        pairs, curves, ranges, size = (array[keep] for array in (pairs, curves, ranges, size))
+
+        # Halve the larger curve of every pair, the first half goes in the first copy of the pair
+        count = len(pairs)
+        rows = np.arange(count)
+        larger = (size[:, 1] > size[:, 0]).astype(np.intp)
+        first, second = cubic.split(curves[rows, larger], 0.5)
+        middle = ranges[rows, larger].mean(axis=1)
+        pairs, curves, ranges = (np.concatenate([array, array]) for array in (pairs, curves, ranges))
+        curves[rows, larger], curves[rows + count, larger] = first, second
+        ranges[rows, larger, 1] = middle
+        ranges[rows + count, larger, 0] = middle
+
+    pairs, s, t = (np.concatenate(arrays) for arrays in zip(*found))
+    return pairs, s, t
+
+
+def _polish(controls_a: np.ndarray, segments_a: np.ndarray, s: np.ndarray,
+            controls_b: np.ndarray, segments_b: np.ndarray, t: np.ndarray, iterations: int = 6) -> tuple:
+    """
+    Refine intersection parameters with Newton's method on A(s) - B(t), halving steps
+    that overshoot so the points only ever get closer.
+
+    Returns:
+        (s, t, distance) with the distance left between the points.
+    """
+    # Convert the segments once rather than on every evaluation
+    a, b = cubic.power_coefficients(controls_a[segments_a]), cubic.power_coefficients(controls_b[segments_b])
+
+    def point(coefficients, u):
+        u = u[:, np.newaxis]
+        return ((coefficients[:, 0] * u + coefficients[:, 1]) * u + coefficients[:, 2]) * u + coefficients[:, 3]
+
+    def tangent(coefficients, u):
+        u = u[:, np.newaxis]
+        return (3 * coefficients[:, 0] * u + 2 * coefficients[:, 1]) * u + coefficients[:, 2]
+
+    def offset(s, t):
+        error = point(a, s) - point(b, t)
+        return error, np.hypot(error[:, 0], error[:, 1])
+
+    error, distance = offset(s, t)
+    for _ in range(iterations):
+        tangent_a, tangent_b = tangent(a, s), tangent(b, t)
+        determinant = _cross(tangent_a, tangent_b)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step_s = _cross(-error, tangent_b) / determinant
+            step_t = _cross(-error, tangent_a) / determinant
+        valid = np.isfinite(step_s) & np.isfinite(step_t)
+        step_s, step_t = np.where(valid, step_s, 0), np.where(valid, step_t, 0)
+
+        pending = valid & (distance > 0)
+        for _ in range(_BACKTRACK):
+            if not pending.any():
+                break
+            new_s, new_t = np.clip(s + step_s, 0, 1), np.clip(t + step_t, 0, 1)
+            new_error, new_distance = offset(new_s, new_t)
+            better = pending & (new_distance < distance)
+            s, t, distance = np.where(better, new_s, s), np.where(better, new_t, t), np.where(better, new_distance, distance)
+            error = np.where(better[:, np.newaxis], new_error, error)
+            pending &= ~better
+            step_s, step_t = step_s / 2, step_t / 2
+    return s, t, distance
+
+
+def _following(count: int, is_closed: bool) -> np.ndarray:
+    """
+    Index of the segment after each segment of a path, -1 at the end of an open path.
+    """
+    following = np.arange(1, count + 1)
+    if count:
+        following[-1] = 0 if is_closed else -1
+    return following
+
+
+def _snap(controls: np.ndarray, following: np.ndarray, segments: np.ndarray, t: np.ndarray, tolerance: float) -> tuple:
+    """
+    Move parameters within a few tolerances of a segment's ends onto its anchors, writing
+    the end of a segment as the start of the following one so crossings at anchors compare equal.
+    """
+    points = cubic.evaluate(controls, segments, t)
+    radius = 4 * tolerance
+    at_start = np.hypot(*(points - controls[segments, 0]).T) <= radius
+    at_end = np.hypot(*(points - controls[segments, 3]).T) <= radius
+    t = np.where(at_end, 1.0, np.where(at_start, 0.0, t))
+    move = at_end & (following[segments] >= 0)
+    return np.where(move, following[segments], segments), np.where(move, 0.0, t)
+
+
+def _unique(segments_a, t_a, segments_b, t_b, points: np.ndarray, tolerance: float) -> tuple:
+    """
+    Sort intersections along the first path and merge repeats of the same crossing between the same segments.
+    """
+    order = np.lexsort((t_a, segments_b, segments_a))
+    segments_a, t_a, segments_b, t_b, points = (array[order] for array in (segments_a, t_a, segments_b, t_b, points))
+    repeat = (
+        (segments_a[1:] == segments_a[:-1])
+        & (segments_b[1:] == segments_b[:-1])
+        & (np.hypot(*(points[1:] - points[:-1]).T) <= 4 * tolerance)
+        )
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = ~repeat
+    segments_a, t_a, segments_b, t_b = (array[keep] for array in (segments_a, t_a, segments_b, t_b))
+    order = np.lexsort((t_b, segments_b, t_a, segments_a))
+    return (segments_a[order], t_a[order]), (segments_b[order], t_b[order])
+
+
+def intersections(path_a, path_b, tolerance: float = 1e-6) -> tuple:
+    """
+    Points where two paths cross or touch.
+
+    Stretches where the paths overlap each other are not reported.
+
+    Args:
+        path_a, path_b: BezierPaths to intersect.
+        tolerance: Distance within which curves count as meeting, and the accuracy of the results.
+
+    Returns:
+        ((segments_a, t_a), (segments_b, t_b)) arrays of the segment indices and local parameters
+        of each intersection on both paths, sorted along path_a. Intersections at anchors are
+        given as the start of the following segment.
+    """
+    if tolerance <= 0:
+        raise ValueError(f"Invalid tolerance: {tolerance}. Must be greater than 0.")
+    controls_a, controls_b = path_a.segments(), path_b.segments()
+    i, j = overlapping_pairs(cubic.bounds(controls_a), cubic.bounds(controls_b), tolerance)
+    pairs, s, t = _resolve(controls_a, controls_b, i, j, tolerance)
+    segments_a, segments_b = i[pairs], j[pairs]
+
+    s, t, _ = _polish(controls_a, segments_a, s, controls_b, segments_b, t)
+    segments_a, s = _snap(controls_a, _following(len(controls_a), path_a.is_closed), segments_a, s, tolerance)
+    segments_b, t = _snap(controls_b, _following(len(controls_b), path_b.is_closed), segments_b, t, tolerance)
+    return _unique(segments_a, s, segments_b, t, cubic.evaluate(controls_a, segments_a, s), tolerance)
+
+
+def monotone_pieces(controls: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split segments where they turn around in x or y.
+
+    Monotonic pieces can't cross themselves, so loops within a segment become crossings
+    between its pieces, and a horizontal line crosses each piece at most once. Pieces
+    without extent are dropped, which keeps the pieces on either side of them adjacent.
+    Pieces that meet share their end points exactly.
+
+    Args:
+        controls: (S, 4, 2) control points.
+
+    Returns:
+        (pieces, segments, starts, stops) with the (P, 4, 2) control points of the pieces
+        in order along the segments, the segment each piece belongs to and the local
+        parameters of the segment where it starts and stops.
+    """
+    count = len(controls)
+    roots = cubic.extrema(controls)
+    roots[(roots < _EDGE) | (roots > 1 - _EDGE)] = np.nan
+    roots[:, 1:][np.diff(roots, axis=1) <= _EDGE] = np.nan
+    breaks = np.sort(np.concatenate([np.zeros((count, 1)), roots, np.ones((count, 1))], axis=1), axis=1)
+    valid = np.isfinite(breaks[:, 1:])
+    segments = np.broadcast_to(np.arange(count)[:, np.newaxis], valid.shape)[valid]
+    starts, stops = breaks[:, :-1][valid], breaks[:, 1:][valid]
+    pieces = cubic.trim(controls[segments], starts, stops)
+
+    # Rounding in the splits moves the shared end points apart by a few ulps
+    pieces[:, 0] = np.where((starts == 0)[:, np.newaxis], controls[segments, 0], pieces[:, 0])
+    pieces[:, 3] = np.where((stops == 1)[:, np.newaxis], controls[segments, 3], pieces[:, 3])
+    pieces[:-1, 3] = np.where((stops[:-1] != 1)[:, np.newaxis], pieces[1:, 0], pieces[:-1, 3])
+
+    extent = np.any(pieces.max(axis=1) > pieces.min(axis=1), axis=1)
+    return pieces[extent], segments[extent], starts[extent], stops[extent]
+
+
+def _onward(pieces: np.ndarray, before: np.ndarray, after: np.ndarray) -> np.ndarray:
+    """
+    Whether a path keeps heading the same way along either axis from the end of each
+    piece in `before` into the piece `after` it, in which case they meet nowhere else.
+    """
+    shared = pieces[before, 3]
+    return np.any((pieces[before, 0] - shared) * (pieces[after, 3] - shared) < 0, axis=1)
+
+
+def self_intersections(path, tolerance: float = 1e-6) -> tuple:
+    """
+    Points where a path crosses or touches itself, see BezierPath.self_intersections.
+    """
+    if tolerance <= 0:
+        raise ValueError(f"Invalid tolerance: {tolerance}. Must be greater than 0.")
+    controls = path.segments()
+    count = len(controls)
+    pieces, piece_segments, starts, stops = monotone_pieces(controls)
+    lower, upper = pieces.min(axis=1), pieces.max(axis=1)
+    last = len(pieces) - 1
+
+    i, j = overlapping_pairs(np.stack([lower, upper], axis=1), None, tolerance)
+
+    # Adjacent pieces meet where one ends and the next starts, the one before also ends
+    # there when the path is closed. They meet nowhere else when the path keeps heading
+    # the same way along either axis through that point
+    wrap = path.is_closed & (i == 0) & (j == last) & (last > 0)
+    adjacent = (j == i + 1) | wrap
+    before, after = np.where(wrap, j, i), np.where(wrap, i, j)
+    shared = pieces[before, 3]
+    keep = ~(adjacent & _onward(pieces, before, after))
+    i, j, adjacent, shared = i[keep], j[keep], adjacent[keep], shared[keep]
+
+    pairs, u, v = _resolve(pieces, pieces, i, j, tolerance)
+    meeting = np.hypot(*(cubic.evaluate(pieces, i[pairs], u) - shared[pairs]).T) <= 4 * tolerance
+    keep = ~(adjacent[pairs] & meeting)
+    pairs, u, v = pairs[keep], u[keep], v[keep]
+    piece_a, piece_b = i[pairs], j[pairs]
+
+    segments_a, segments_b = piece_segments[piece_a], piece_segments[piece_b]
+    s = starts[piece_a] + u * (stops[piece_a] - starts[piece_a])
+    t = starts[piece_b] + v * (stops[piece_b] - starts[piece_b])
+    s, t, _ = _polish(controls, segments_a, s, controls, segments_b, t)
+    following = _following(count, path.is_closed)
+    segments_a, s = _snap(controls, following, segments_a, s, tolerance)
+    segments_b, t = _snap(controls, following, segments_b, t, tolerance)
+
+    # Put the earlier point along the path first and drop pieces meeting at shared anchors
+    swap = (segments_b < segments_a) | ((segments_b == segments_a) & (t < s))
+    segments_a, segments_b = np.where(swap, segments_b, segments_a), np.where(swap, segments_a, segments_b)
+    s, t = np.where(swap, t, s), np.where(swap, s, t)
+    distinct = (segments_a != segments_b) | (np.abs(s - t) > _EDGE)
+    segments_a, s, segments_b, t = segments_a[distinct], s[distinct], segments_b[distinct], t[distinct]
+    return _unique(segments_a, s, segments_b, t, cubic.evaluate(controls, segments_a, s), tolerance)
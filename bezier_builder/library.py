@@ -0,0 +1,114 @@
+"""
+Read-only on-disk library of BezierShapes with random access.
+
+A library file is a header, the shapes encoded one after another in the binary
+format of bezier_builder.binary, and an index of their byte offsets:
+
+    header          magic b"BZLB", version (uint16), flags (uint16),
+                    shape count S (uint64), index offset (uint64)
+    shapes          S shapes, see bezier_builder.binary
+    index           (S + 1,) uint64 byte offsets of the shapes and the index
+
+Opening a library only maps the file into memory, so it takes the same time
+whatever its size. Shapes are decoded when indexed and their anchor arrays view
+the mapped file, so only the pages of shapes that are used are ever read, and
+processes opening the same file share one copy in the page cache.
+"""
+
+import struct
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from bezier_builder import binary
+from bezier_builder.bezier_path import BezierShape
+
+MAGIC = b"BZLB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQQ")
+
+
+def write_library(file_path: str, shapes: Iterable[BezierShape], float32: bool = False) -> int:
+    """
+    Write shapes to a library file, streaming them so they don't need to be in memory together.
+
+    Args:
+        file_path: Path of the file.
+        shapes: Shapes to store, in index order.
+        float32: Store positions and handles as float32, see binary.to_bytes.
+
+    Returns:
+        Number of shapes written.
+    """
+    offsets = []
+    with open(file_path, "wb") as f:
+        f.write(bytes(_HEADER.size))
+        position = _HEADER.size
+        for shape in shapes:
+            data = binary.to_bytes(shape, float32)
+            offsets.append(position)
+            f.write(data)
+            position += len(data)
+        offsets.append(position)
+        f.write(np.array(offsets, dtype="<u8").tobytes())
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, binary.FLOAT32 if float32 else 0, len(offsets) - 1, position))
+    return len(offsets) - 1
+
+
+class ShapeLibrary:
+    """
+    Memory mapped library file, `library[i]` decodes shape i as views into the file.
+
+    Shapes are read-only unless the library is opened with mmap_mode "c", which
+    keeps edits in memory. Copy a shape with BezierShape.from_arrays(*shape.to_arrays())
+    to edit it freely. Libraries pickle as their file path, so they can be sent to
+    worker processes cheaply.
+    """
+    def __init__(self, file_path: str, mmap_mode: str = "r"):
+        """
+        Args:
+            file_path: Path of a file written by write_library.
+            mmap_mode: numpy.memmap mode, "r" for read-only or "c" for copy-on-write shapes.
+        """
+        if mmap_mode not in ("r", "c"):
+            raise ValueError(f"Invalid mmap_mode: '{mmap_mode}'. Must be 'r' or 'c'.")
+        self.file_path = file_path
+        self.mmap_mode = mmap_mode
+        self._map = np.memmap(file_path, dtype=np.uint8, mode=mmap_mode)
+
+        magic, version, _, count, index_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{file_path} is not a shape library.")
+        if version > VERSION:
+            raise ValueError(f"Unsupported library version {version}, this version reads up to {VERSION}.")
+        self._offsets = np.frombuffer(self._map, dtype="<u8", count=count + 1, offset=index_offset)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _index(self, index: int) -> int:
+        """Shape `index` wrapped into range like a list index."""
+        count = len(self)
+        if not -count <= index < count:
+            raise IndexError(f"Shape index {index} out of range for a library of {count} shapes.")
+        return index % count
+
+    def __getitem__(self, index: int) -> BezierShape:
+        return binary.from_buffer(self._map, int(self._offsets[self._index(index)]))[0]
+
+    def __iter__(self) -> Iterator[BezierShape]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def nbytes(self, index: int) -> int:
+        """Size of shape `index` in the file."""
+        index = self._index(index)
+        return int(self._offsets[index + 1] - self._offsets[index])
+
+    def __reduce__(self):
+        return (type(self), (self.file_path, self.mmap_mode))
+
+    def __repr__(self):
+        return f"ShapeLibrary(file_path={self.file_path!r}, shapes={len(self)})"
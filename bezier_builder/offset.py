@@ -0,0 +1,485 @@
+"""
+Offset curves and stroke outlines of cubic bezier paths.
+
+The offset of a cubic is not a cubic, so every segment is approximated by cubics
+fitted to points sampled from its exact offset: the ends are kept exact and the
+handles keep the directions of the segment's tangents, with their lengths solved
+by the least squares fit of the fitting module. Pieces that miss the tolerance
+are halved and fitted again, all pieces of one level in a single batch.
+
+Corners between segments get miter, round or bevel joins on their outer side.
+On the inner side the offsets are trimmed back to where they cross, or joined by
+straight lines through the anchor where they don't, which leaves loops winding
+the other way. A union under the "positive" fill rule then keeps only the area
+the outline winds around counterclockwise, which removes the loops and any other
+overlaps. Paths shrunk
+by more than their thickness turn inside out and wind counterclockwise again,
+the outlines they leave lie closer to the path than the distance and are dropped.
+"""
+
+import numpy as np
+
+from bezier_builder import boolean, cubic, fitting, query
+from bezier_builder.intersection import _deviation, _resolve
+
+JOINS = ("miter", "round", "bevel")
+CAPS = ("butt", "round", "square")
+
+# Points sampled along the exact offset of every piece, ends included
+_SAMPLES = 9
+# Times a piece is halved before it is offset by an arc whatever its error
+_MAX_DEPTH = 12
+# Largest turn in radians between neighbouring samples of a piece whose fit is accepted
+_STEP = 0.125 * np.pi
+# Turn in radians beyond which a piece smaller than the tolerance is offset by an arc
+_CUSP = 0.5 * np.pi
+# Offset ends closer than this fraction of the tolerance are joined without a join
+_GAP = 1e-3
+# Gauss-Legendre nodes and weights on [0, 1], exact for the quintic area integrand
+_NODES = 0.5 + 0.5 * np.array([-np.sqrt(0.6), 0.0, np.sqrt(0.6)])
+_WEIGHTS = np.array([5.0, 8.0, 5.0]) / 18
+
+
+def signed_area(controls: np.ndarray) -> float:
+    """
+    Area enclosed by a closed chain of (S, 4, 2) segments, positive when it runs counterclockwise.
+    """
+    count = len(controls)
+    segments = np.repeat(np.arange(count), len(_NODES))
+    t = np.tile(_NODES, count)
+    points = cubic.evaluate(controls, segments, t)
+    tangents = cubic.derivative(controls, segments, t)
+    integrand = points[:, 0] * tangents[:, 1] - points[:, 1] * tangents[:, 0]
+    return 0.5 * float(np.sum(integrand * np.tile(_WEIGHTS, count)))
+
+
+def _left(directions: np.ndarray) -> np.ndarray:
+    """Directions turned a quarter counterclockwise."""
+    return np.column_stack([-directions[:, 1], directions[:, 0]])
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    lengths = np.hypot(vectors[:, 0], vectors[:, 1])[:, np.newaxis]
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
+
+
+def _lines(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Straight segments without handles, the way lines are stored in paths."""
+    return np.stack([starts, starts, ends, ends], axis=1)
+
+
+def _arcs(centers: np.ndarray, radii: np.ndarray, angles: np.ndarray, sweeps: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Circular arcs approximated by cubics of at most a quarter turn each.
+
+    Returns:
+        (controls, arcs) with the control points of the cubics, in order along each
+        arc, and the index of the arc each belongs to.
+    """
+    counts = np.maximum(np.ceil(np.abs(sweeps) / (0.5 * np.pi) - 1e-9), 1).astype(np.intp)
+    arcs = np.repeat(np.arange(len(sweeps)), counts)
+    steps = (sweeps / counts)[arcs]
+    starts = angles[arcs] + steps * (np.arange(len(arcs)) - np.repeat(np.cumsum(counts) - counts, counts))
+    ends = starts + steps
+    radii = radii[arcs][:, np.newaxis]
+    handles = 4 / 3 * np.tan(steps / 4)[:, np.newaxis] * radii
+
+    first = np.column_stack([np.cos(starts), np.sin(starts)])
+    last = np.column_stack([np.cos(ends), np.sin(ends)])
+    controls = np.empty((len(arcs), 4, 2))
+    controls[:, 0] = centers[arcs] + radii * first
+    controls[:, 3] = centers[arcs] + radii * last
+    controls[:, 1] = controls[:, 0] + handles * _left(first)
+    controls[:, 2] = controls[:, 3] - handles * _left(last)
+    return controls, arcs
+
+
+def offset_segments(controls: np.ndarray, distance: float, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Approximate the offsets of segments to their left by cubics.
+
+    Args:
+        controls: (S, 4, 2) control points of segments with extent.
+        distance: Offset to the left of the direction of travel, negative offsets to the right.
+        tolerance: Largest distance between the sampled offset points and their fitted cubics.
+
+    Returns:
+        (curves, segments) with the (C, 4, 2) control points of the offset cubics in
+        order along the segments and the segment each belongs to.
+    """
+    # Straight segments offset exactly by moving their control points
+    chords = controls[:, 3] - controls[:, 0]
+    lengths = np.hypot(chords[:, 0], chords[:, 1])
+    straight = _deviation(controls, chords, lengths) <= 1e-12 * lengths
+    lines = np.flatnonzero(straight)
+    moved = controls[lines] + distance * _left(chords[lines] / lengths[lines, np.newaxis])[:, np.newaxis]
+
+    curved = np.flatnonzero(~straight)
+    pieces = controls[curved]
+    piece_segments = curved
+    piece_starts = np.zeros(len(curved))
+    spans = np.ones(len(curved))
+    u = np.linspace(0, 1, _SAMPLES)
+    done_curves, done_segments, done_starts = [moved], [lines], [np.zeros(len(lines))]
+    for depth in range(_MAX_DEPTH + 1):
+        count = len(pieces)
+        if count == 0:
+            break
+        rows = np.repeat(np.arange(count), _SAMPLES)
+        t = np.tile(u, count)
+        curve_points = cubic.evaluate(pieces, rows, t)
+
+        # The derivative vanishes at the ends of pieces without handles, which take
+        # their tangents from the next control point instead
+        tangents_start, tangents_end = fitting.segment_tangents(pieces)
+        tangents = cubic.derivative(pieces, rows, t).reshape(count, _SAMPLES, 2)
+        tangents[:, 0], tangents[:, -1] = tangents_start, -tangents_end
+        tangents = _unit(tangents.reshape(-1, 2))
+        points = curve_points + distance * _left(tangents)
+
+        # Pieces smaller than the tolerance that still turn sharply hold a cusp, around which
+        # the offset is an arc. Turning back on itself goes around the front, as at reversals
+        tangents = tangents.reshape(count, _SAMPLES, 2)
+        steps = np.arctan2(
+            tangents[:, :-1, 0] * tangents[:, 1:, 1] - tangents[:, :-1, 1] * tangents[:, 1:, 0],
+            np.einsum("ijk,ijk->ij", tangents[:, :-1], tangents[:, 1:]),
+            )
+        steps[np.abs(steps) > np.pi - 1e-6] = -np.pi * np.sign(distance)
+        turns = steps.sum(axis=1)
+        extent = np.max(np.hypot(*(pieces - pieces[:, :1]).transpose(2, 0, 1)), axis=1)
+        cusp = (extent <= tolerance) & (np.abs(turns) > _CUSP)
+
+        # Where the curvature radius on the offset side is below the distance the offset
+        # runs backwards, and its handles point the other way
+        coefficients = cubic.power_coefficients(pieces)
+        flips = []
+        for t_end, tangent in ((0.0, tangents_start), (1.0, -tangents_end)):
+            second = 6 * coefficients[:, 0] * t_end + 2 * coefficients[:, 1]
+            speed = np.hypot(*cubic.derivative(pieces, np.arange(count), np.full(count, t_end)).T)
+            curvature = np.divide(tangent[:, 0] * second[:, 1] - tangent[:, 1] * second[:, 0], speed * speed, out=np.zeros(count), where=speed > 0)
+            flips.append(np.where(1 - distance * curvature < 0, -1.0, 1.0)[:, np.newaxis])
+
+        runs = fitting.Runs(points, np.arange(count) * _SAMPLES, np.arange(count) * _SAMPLES + _SAMPLES - 1)
+        u_fit = runs.chord_parameters(fitting.cumulative_distances(points))
+        curves, fitted, _ = fitting.fit_runs(runs, u_fit, flips[0] * tangents_start, flips[1] * tangents_end, tolerance)
+        # Samples turning too far apart may miss where the offset swings around between them
+        fitted &= ~cusp & (np.abs(steps).max(axis=1) <= _STEP)
+        done_curves.append(curves[fitted])
+        done_segments.append(piece_segments[fitted])
+        done_starts.append(piece_starts[fitted])
+
+        # Pieces that still miss at the last level are no larger than the arcs' error either
+        arc = np.flatnonzero(cusp | (~fitted & (depth == _MAX_DEPTH)))
+        if len(arc):
+            first, last = points[arc * _SAMPLES], points[arc * _SAMPLES + _SAMPLES - 1]
+            centers = curve_points[arc * _SAMPLES + _SAMPLES // 2]
+            offsets = first - centers
+            arcs, arc_index = _arcs(centers, np.full(len(arc), abs(distance)), np.arctan2(offsets[:, 1], offsets[:, 0]), turns[arc])
+            numbers = np.arange(len(arc))
+            heads = np.searchsorted(arc_index, numbers)
+            arcs[heads, 0] = first
+            arcs[np.searchsorted(arc_index, numbers, side="right") - 1, 3] = last
+            local = np.arange(len(arc_index)) - heads[arc_index]
+            done_curves.append(arcs)
+            done_segments.append(piece_segments[arc][arc_index])
+            done_starts.append(piece_starts[arc][arc_index] + spans[arc][arc_index] * local / np.bincount(arc_index)[arc_index])
+
+        accept = fitted | (depth == _MAX_DEPTH)
+        accept[arc] = True
+        rest = np.flatnonzero(~accept)
+        if len(rest) == 0:
+            break
+        left, right = cubic.split(pieces[rest], 0.5)
+        pieces = np.concatenate([left, right])
+        piece_segments = np.tile(piece_segments[rest], 2)
+        half = 0.5 * spans[rest]
+        piece_starts = np.concatenate([piece_starts[rest], piece_starts[rest] + half])
+        spans = np.tile(half, 2)
+
+    curves, segments, starts = (np.concatenate(parts) for parts in (done_curves, done_segments, done_starts))
+    order = np.lexsort((starts, segments))
+    curves, segments = curves[order], segments[order]
+
+    # Pieces of one segment meet where they were split, rounding moves their ends apart by a few ulps
+    same = segments[1:] == segments[:-1]
+    curves[1:, 0] = np.where(same[:, np.newaxis], curves[:-1, 3], curves[1:, 0])
+    return curves, segments
+
+
+def _joins(controls: np.ndarray, curves: np.ndarray, curve_segments: np.ndarray, before: np.ndarray,
+           distance: float, join: str, miter_limit: float, tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Joins from the offset of each segment in `before` to the offset of the segment after it.
+
+    Returns:
+        (joins, slots) with the control points of the join cubics, in order, and the
+        index of the segment in `before` each join follows.
+    """
+    after = (before + 1) % len(controls)
+    last = np.searchsorted(curve_segments, before, side="right") - 1
+    first = np.searchsorted(curve_segments, after, side="left")
+    starts, ends = curves[last, 3], curves[first, 0]
+    pivots = controls[before, 3]
+    outgoing = -fitting.segment_tangents(controls[before])[1]
+    incoming = fitting.segment_tangents(controls[after])[0]
+
+    gaps = np.hypot(*(ends - starts).T)
+    turns = np.arctan2(
+        outgoing[:, 0] * incoming[:, 1] - outgoing[:, 1] * incoming[:, 0],
+        np.einsum("ij,ij->i", outgoing, incoming),
+        )
+    # Turning back on itself has an outer side either way, it is taken around the front
+    reversal = np.abs(np.abs(turns) - np.pi) < 1e-12
+    turns[reversal] = -np.pi * np.sign(distance)
+    needed = gaps > _GAP * tolerance
+    outer = needed & (turns * distance < 0)
+    inner = needed & ~outer
+
+    # Inner offsets are trimmed where they cross, or joined through the pivot where they don't
+    crossed = _trim_crossings(curves, last, first, np.flatnonzero(inner), tolerance)
+    starts, ends = curves[last, 3], curves[first, 0]
+    parts, slots = [], []
+    index = np.flatnonzero(inner & ~crossed)
+    parts += [_lines(starts[index], pivots[index]), _lines(pivots[index], ends[index])]
+    slots += [index, index]
+
+    if join == "miter":
+        ratios = 1 / np.maximum(np.cos(0.5 * turns), 1e-12)
+        miter = outer & (ratios <= miter_limit)
+        index = np.flatnonzero(miter)
+        normals = _left(outgoing[index]) + _left(incoming[index])
+        corners = pivots[index] + distance * normals / (1 + np.cos(turns[index]))[:, np.newaxis]
+        parts += [_lines(starts[index], corners), _lines(corners, ends[index])]
+        slots += [index, index]
+        bevel = outer & ~miter
+    elif join == "round":
+        index = np.flatnonzero(outer)
+        offsets = starts[index] - pivots[index]
+        arcs, arc_index = _arcs(pivots[index], np.full(len(index), abs(distance)), np.arctan2(offsets[:, 1], offsets[:, 0]), turns[index])
+        # Arcs end exactly on the offsets they join
+        numbers = np.arange(len(index))
+        arcs[np.searchsorted(arc_index, numbers), 0] = starts[index]
+        arcs[np.searchsorted(arc_index, numbers, side="right") - 1, 3] = ends[index]
+        parts.append(arcs)
+        slots.append(index[arc_index])
+        bevel = np.zeros(len(before), dtype=bool)
+    else:
+        bevel = outer
+    index = np.flatnonzero(bevel)
+    parts.append(_lines(starts[index], ends[index]))
+    slots.append(index)
+
+    # Offsets meeting within the gap share their end point
+    index = np.flatnonzero(~needed)
+    curves[first[index], 1] += starts[index] - curves[first[index], 0]
+    curves[first[index], 0] = starts[index]
+
+    joins, slots = np.concatenate(parts), np.concatenate(slots)
+    order = np.argsort(slots, kind="stable")
+    return joins[order], slots[order]
+
+
+def _trim_crossings(curves: np.ndarray, last: np.ndarray, first: np.ndarray, corners: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Trim the offsets either side of inner corners back to where they cross, in place.
+
+    The crossing nearest the corner is taken. Corners whose offsets don't cross, or
+    whose trims would leave nothing of a curve trimmed at both ends, are left alone.
+
+    Returns:
+        Boolean mask over the corner arrays of the corners that were trimmed.
+    """
+    crossed = np.zeros(len(last), dtype=bool)
+    pairs, s, t = _resolve(curves, curves, last[corners], first[corners], _GAP * tolerance)
+    if len(pairs) == 0:
+        return crossed
+    # Latest crossing along the curve before each corner
+    order = np.lexsort((s, pairs))
+    final = order[np.r_[pairs[order[1:]] != pairs[order[:-1]], True]]
+    trimmed, s, t = corners[pairs[final]], s[final], t[final]
+
+    lower, upper = np.zeros(len(curves)), np.ones(len(curves))
+    upper[last[trimmed]], lower[first[trimmed]] = s, t
+    swallowed = lower >= upper
+    keep = ~swallowed[last[trimmed]] & ~swallowed[first[trimmed]]
+    trimmed, s, t = trimmed[keep], s[keep], t[keep]
+    lower[:], upper[:] = 0, 1
+    upper[last[trimmed]], lower[first[trimmed]] = s, t
+
+    changed = np.flatnonzero((lower > 0) | (upper < 1))
+    points = cubic.evaluate(curves, last[trimmed], s)
+    curves[changed] = cubic.trim(curves[changed], lower[changed], upper[changed])
+    curves[last[trimmed], 3] = curves[first[trimmed], 0] = points
+    crossed[trimmed] = True
+    return crossed
+
+
+def _side(controls: np.ndarray, distance: float, join: str, miter_limit: float, tolerance: float, is_closed: bool) -> np.ndarray:
+    """
+    Chain of cubics offsetting a chain of segments with extent, with joins between
+    its segments and from the last back to the first if it is closed.
+    """
+    if distance == 0:
+        return controls
+    curves, curve_segments = offset_segments(controls, distance, tolerance)
+    before = np.arange(len(controls) if is_closed else len(controls) - 1)
+    joins, join_slots = _joins(controls, curves, curve_segments, before, distance, join, miter_limit, tolerance)
+    # Joins go after the last curve of the segment they follow
+    keys = np.concatenate([2 * curve_segments, 2 * before[join_slots] + 1])
+    order = np.argsort(keys, kind="stable")
+    return np.concatenate([curves, joins])[order]
+
+
+def _cap(pivot: np.ndarray, travel: np.ndarray, start: np.ndarray, end: np.ndarray, distance: float, cap: str) -> np.ndarray:
+    """
+    Cap turning from one side of an open path to the other around its end at `pivot`.
+    """
+    if cap == "butt":
+        return _lines(start[np.newaxis], end[np.newaxis])
+    if cap == "square":
+        ahead = abs(distance) * travel
+        corners = np.array([start, start + ahead, end + ahead, end])
+        return _lines(corners[:-1], corners[1:])
+    offset = start - pivot
+    arcs, _ = _arcs(pivot[np.newaxis], np.array([abs(distance)]), np.array([np.arctan2(offset[1], offset[0])]), np.array([-np.pi * np.sign(distance)]))
+    arcs[0, 0], arcs[-1, 3] = start, end
+    return arcs
+
+
+def _validate(join: str, cap: str, miter_limit: float, tolerance: float):
+    if join not in JOINS:
+        raise ValueError(f"Invalid join: {join!r}. Must be one of {', '.join(JOINS)}.")
+    if cap not in CAPS:
+        raise ValueError(f"Invalid cap: {cap!r}. Must be one of {', '.join(CAPS)}.")
+    if miter_limit < 1:
+        raise ValueError(f"Invalid miter_limit: {miter_limit}. Must be at least 1.")
+    if tolerance <= 0:
+        raise ValueError(f"Invalid tolerance: {tolerance}. Must be greater than 0.")
+
+
+def _extent(controls: np.ndarray) -> np.ndarray:
+    """Segments whose control points aren't all the same point."""
+    return controls[np.any(controls != controls[:, :1], axis=(1, 2))]
+
+
+def _tolerance(size: float, tolerance: float) -> float:
+    """Default tolerance of a thousandth of the offset distance."""
+    if tolerance is None:
+        return 1e-3 * size if size > 0 else 1e-3
+    return tolerance
+
+
+def offset_path(controls: np.ndarray, is_closed: bool, distance: float, join: str = "miter", cap: str = "butt",
+                tolerance: float = None, miter_limit: float = 4.0, width: float = None) -> tuple:
+    """
+    Outline of the area around a path, see BezierPath.offset and BezierPath.stroke_to_outline.
+
+    Raw outlines from `offset_contours` are resolved by `outline`, then paths whose
+    segment midpoints all lie closer to the path than the distance are dropped.
+
+    Returns:
+        (positions, handles_in, handles_out, handle_types, offsets, closed), see BezierShape.from_arrays.
+    """
+    size = abs(distance if width is None else 0.5 * width)
+    tolerance = _tolerance(size, tolerance)
+    contours = offset_contours(controls, is_closed, distance, join, cap, tolerance, miter_limit, width)
+    positions, handles_in, handles_out, handle_types, offsets, closed = outline(contours)
+    if len(closed) == 0:
+        return positions, handles_in, handles_out, handle_types, offsets, closed
+
+    paths = np.repeat(np.arange(len(closed)), np.diff(offsets))
+    index = np.arange(len(positions))
+    following = np.where(index == offsets[paths + 1] - 1, offsets[paths], index + 1)
+    middles = (4 * positions + 3 * handles_out + 3 * handles_in[following] + 4 * positions[following]) / 8
+    _, _, distances = query.nearest(controls, middles)
+    farthest = np.full(len(closed), -np.inf)
+    np.maximum.at(farthest, paths, distances)
+    kept = farthest >= size - 2 * tolerance
+    anchors = kept[paths]
+    offsets = np.concatenate([[0], np.cumsum(np.diff(offsets)[kept])]).astype(np.int64)
+    return positions[anchors], handles_in[anchors], handles_out[anchors], handle_types[anchors], offsets, closed[kept]
+
+
+def offset_contours(controls: np.ndarray, is_closed: bool, distance: float, join: str = "miter", cap: str = "butt",
+                    tolerance: float = None, miter_limit: float = 4.0, width: float = None) -> list:
+    """
+    Raw outlines of the area around a path, see BezierPath.offset and BezierPath.stroke_to_outline.
+
+    Outlines wind counterclockwise around the area and clockwise around holes, but
+    may cross themselves.
+
+    Args:
+        controls: (S, 4, 2) control points of the path's segments.
+        is_closed: Whether the path is closed.
+        distance: Offset of closed paths, positive outwards, and half the width of
+                  the area around open paths.
+        width: Outline a stroke of this width instead of offsetting, around both
+               sides of closed paths.
+
+    Returns:
+        List of (C, 4, 2) control points of closed contours.
+    """
+    half = None if width is None else 0.5 * width
+    size = abs(distance if half is None else half)
+    tolerance = _tolerance(size, tolerance)
+    _validate(join, cap, miter_limit, tolerance)
+    controls = _extent(np.asarray(controls, dtype=np.float64).reshape(-1, 4, 2))
+    if len(controls) == 0:
+        return []
+
+    if is_closed:
+        # Orient counterclockwise, so the outside is on the right
+        if signed_area(controls) < 0:
+            controls = controls[::-1, ::-1]
+        if half is None:
+            return [_side(controls, -distance, join, miter_limit, tolerance, True)]
+        outer = _side(controls, -half, join, miter_limit, tolerance, True)
+        inner = _side(controls, half, join, miter_limit, tolerance, True)
+        return [outer, inner[::-1, ::-1]]
+
+    if size == 0:
+        return []
+    # Down the right side, around the end, back up the other side and around the start
+    reverse = controls[::-1, ::-1]
+    right = _side(controls, -size, join, miter_limit, tolerance, False)
+    back = _side(reverse, -size, join, miter_limit, tolerance, False)
+    travel_end = -fitting.segment_tangents(controls[-1:])[1][0]
+    travel_start = -fitting.segment_tangents(reverse[-1:])[1][0]
+    return [np.concatenate([
+        right,
+        _cap(controls[-1, 3], travel_end, right[-1, 3], back[0, 0], -size, cap),
+        back,
+        _cap(controls[0, 0], travel_start, back[-1, 3], right[0, 0], -size, cap),
+        ])]
+
+
+def outline(contours: list, tolerance: float = 1e-6) -> tuple:
+    """
+    Resolve raw outlines into the area they wind counterclockwise around.
+
+    Miters and square caps continue the straight offsets beside them, the anchors
+    left between such lines are dropped.
+
+    Returns:
+        (positions, handles_in, handles_out, handle_types, offsets, closed), see BezierShape.from_arrays.
+    """
+    positions, handles_in, handles_out, handle_types, offsets, closed = boolean.combine(
+        contours, np.zeros(len(contours), dtype=np.intp), "union", "positive", tolerance
+        )
+    count = len(positions)
+    index = np.arange(count)
+    paths = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    previous = np.where(index == offsets[paths], offsets[paths + 1] - 1, index - 1)
+    following = np.where(index == offsets[paths + 1] - 1, offsets[paths], index + 1)
+
+    lines = ~np.any(handles_in, axis=1) & ~np.any(handles_out, axis=1)
+    lines &= ~np.any(handles_out[previous], axis=1) & ~np.any(handles_in[following], axis=1)
+    incoming, outgoing = positions - positions[previous], positions[following] - positions
+    cross = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0]
+    straight = (np.abs(cross) <= tolerance * np.hypot(*(positions[following] - positions[previous]).T)) & (np.einsum("ij,ij->i", incoming, outgoing) > 0)
+    # A path of nothing but straight anchors still keeps its first
+    keep = ~(lines & straight)
+    emptied = np.bincount(paths[keep], minlength=len(offsets) - 1) == 0
+    keep |= (index == offsets[paths]) & emptied[paths]
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(paths[keep], minlength=len(offsets) - 1))]).astype(np.int64)
+    return positions[keep], handles_in[keep], handles_out[keep], handle_types[keep], offsets, closed
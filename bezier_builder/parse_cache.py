@@ -0,0 +1,162 @@
+"""
+Bounded LRU cache of parsed path data.
+
+Documents often repeat the same geometry (icons, symbols, glyph outlines), so
+parsed shapes are kept as packed, read-only anchor arrays keyed by a hash of
+their 'd' string. Every lookup builds a new BezierShape from the cached arrays,
+so callers are free to edit what they get back without touching the cache.
+
+The cache is opt-in: pass one to parse_path_string or enable a process-wide
+cache with enable_parse_cache.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+from bezier_builder.bezier_path import BezierShape
+
+# Rough per-entry cost of the key, dictionary slot and array headers, in bytes
+_ENTRY_OVERHEAD = 512
+
+_default_cache = None
+
+
+class ParseCache:
+    """
+    LRU cache of parsed BezierShapes with a memory budget.
+
+    Entries are evicted least recently used first once the arrays they hold
+    exceed `max_bytes`. Safe to share between threads.
+    """
+    def __init__(self, max_bytes: int = 64 * 2 ** 20):
+        """
+        Args:
+            max_bytes: Memory budget for the cached anchor arrays.
+        """
+        if max_bytes < 0:
+            raise ValueError(f"Invalid max_bytes: {max_bytes}. Must be at least 0.")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory held by the cached entries."""
+        return self._nbytes
+
+    @staticmethod
+    def key(d_string: str, fast: bool) -> bytes:
+        """
+        Cache key of a 'd' string, a 128 bit hash so long strings aren't kept alive by the cache.
+        """
+        digest = hashlib.blake2b(d_string.encode(), digest_size=16)
+        digest.update(b"fast" if fast else b"svgelements")
+        return digest.digest()
+
+    def get(self, d_string: str, fast: bool, parse: Callable[[str], BezierShape]) -> BezierShape:
+        """
+        Shape parsed from `d_string`, calling `parse` on a miss.
+
+        Returns:
+            A new BezierShape owning its arrays.
+        """
+        key = self.key(d_string, fast)
+        with self._lock:
+            arrays = self._entries.get(key)
+            if arrays is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if arrays is not None:
+            return BezierShape.from_arrays(*arrays)
+
+        shape = parse(d_string)
+        self._store(key, shape.to_arrays())
+        return shape
+
+    def clear(self):
+        """
+        Remove all entries, statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self) -> dict:
+        """
+        Hit and miss counts with the current size of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "nbytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _store(self, key: bytes, arrays: tuple):
+        # Cached arrays are read-only copies, shapes handed out get copies of them from from_arrays
+        arrays = tuple(np.array(array) for array in arrays)
+        for array in arrays:
+            array.setflags(write=False)
+        size = _entry_size(arrays)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= _entry_size(previous)
+            self._entries[key] = arrays
+            self._nbytes += size
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= _entry_size(evicted)
+                self.evictions += 1
+
+
+def _entry_size(arrays: tuple) -> int:
+    return _ENTRY_OVERHEAD + sum(array.nbytes for array in arrays)
+
+
+def enable_parse_cache(max_bytes: int = 64 * 2 ** 20) -> ParseCache:
+    """
+    Use a new process-wide cache for every parse_path_string call without an explicit cache.
+
+    Returns:
+        The new cache, for reading its statistics.
+    """
+    global _default_cache
+    _default_cache = ParseCache(max_bytes)
+    return _default_cache
+
+
+def disable_parse_cache():
+    """
+    Stop using the process-wide cache and release its entries.
+    """
+    global _default_cache
+    _default_cache = None
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """
+    The process-wide cache, None unless enable_parse_cache was called.
+    """
+    return _default_cache
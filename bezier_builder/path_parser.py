@@ -0,0 +1,301 @@
+"""
+Native parser for SVG path data.
+
+Tokenizes 'd' attribute strings straight into anchor arrays without building
+intermediate svgelements segment objects. Produces the same BezierShape as the
+svgelements based parse_path_string.
+"""
+
+import math
+import re
+import numpy as np
+
+from bezier_builder.bezier_path import BezierPath, BezierShape
+
+_COMMAND = re.compile(r"([MmZzLlHhVvCcSsQqTtAa])([^MmZzLlHhVvCcSsQqTtAa]*)")
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+# Number of parameters taken by each command
+_PARAMETER_COUNTS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+
+
+def parse_path_data(d_string: str) -> BezierShape:
+    """
+    Parses an SVG path 'd' attribute string into a BezierShape without svgelements.
+
+    Handles M, L, H, V, C, S, Q, T, A and Z commands in absolute and relative form.
+    Quadratic segments are raised to cubics and arcs are approximated with cubics,
+    roughly one per 90 degrees of sweep.
+
+    Args:
+        d_string: The string from the 'd' attribute of an SVG <path> element.
+
+    Returns:
+        A BezierShape with one BezierPath per subpath.
+    """
+    # Finished subpaths as (builder, ended with 'Z')
+    subpaths = []
+    subpath = None
+    x = y = 0.0
+    start_x = start_y = 0.0
+
+    # Last control point of the previous cubic or quadratic segment, for S and T reflections
+    cubic_control = None
+    quadratic_control = None
+
+    for command, arguments in _COMMAND.findall(d_string):
+        upper = command.upper()
+        relative = command != upper
+
+        if upper == "Z":
+            if subpath is not None:
+                subpaths.append((subpath, True))
+                subpath = None
+            x, y = start_x, start_y
+            cubic_control = quadratic_control = None
+            continue
+
+        values = _arc_values(arguments) if upper == "A" else [float(value) for value in _NUMBER.findall(arguments)]
+        count = _PARAMETER_COUNTS[upper]
+
+        for i in range(0, len(values) - count + 1, count):
+            v = values[i:i + count]
+            next_cubic_control = next_quadratic_control = None
+
+            if upper == "M" and i == 0:
+                if subpath is not None:
+                    subpaths.append((subpath, False))
+                x, y = (x + v[0], y + v[1]) if relative else (v[0], v[1])
+                start_x, start_y = x, y
+                subpath = _SubpathBuilder(x, y)
+                cubic_control = quadratic_control = None
+                continue
+
+            # Drawing after a 'Z' starts a new subpath at the closed subpath's start
+            if subpath is None:
+                subpath = _SubpathBuilder(x, y)
+
+            if upper in ("M", "L"):
+                x, y = (x + v[0], y + v[1]) if relative else (v[0], v[1])
+                subpath.line_to(x, y)
+            elif upper == "H":
+                x = x + v[0] if relative else v[0]
+                subpath.line_to(x, y)
+            elif upper == "V":
+                y = y + v[0] if relative else v[0]
+                subpath.line_to(x, y)
+            elif upper in ("C", "S"):
+                if upper == "C":
+                    c1x, c1y = (x + v[0], y + v[1]) if relative else (v[0], v[1])
+                    v = v[2:]
+                elif cubic_control is not None:
+                    c1x, c1y = 2 * x - cubic_control[0], 2 * y - cubic_control[1]
+                else:
+                    c1x, c1y = x, y
+                c2x, c2y = (x + v[0], y + v[1]) if relative else (v[0], v[1])
+                end_x, end_y = (x + v[2], y + v[3]) if relative else (v[2], v[3])
+                subpath.curve_to(c1x, c1y, c2x, c2y, end_x, end_y)
+                next_cubic_control = (c2x, c2y)
+                x, y = end_x, end_y
+            elif upper in ("Q", "T"):
+                if upper == "Q":
+                    qx, qy = (x + v[0], y + v[1]) if relative else (v[0], v[1])
+                    v = v[2:]
+                elif quadratic_control is not None:
+                    qx, qy = 2 * x - quadratic_control[0], 2 * y - quadratic_control[1]
+                else:
+                    qx, qy = x, y
+                end_x, end_y = (x + v[0], y + v[1]) if relative else (v[0], v[1])
+                subpath.curve_to(
+                    x + (2 / 3) * (qx - x), y + (2 / 3) * (qy - y),
+                    end_x + (2 / 3) * (qx - end_x), end_y + (2 / 3) * (qy - end_y),
+                    end_x, end_y
+                    )
+                next_quadratic_control = (qx, qy)
+                x, y = end_x, end_y
+            elif upper == "A":
+                end_x, end_y = (x + v[5], y + v[6]) if relative else (v[5], v[6])
+                if end_x == x and end_y == y:
+                    # Arcs ending at their start point are omitted
+                    pass
+                elif v[0] == 0 or v[1] == 0:
+                    # Arcs without a radius are straight lines
+                    subpath.line_to(end_x, end_y)
+                else:
+                    for c1x, c1y, c2x, c2y, px, py in _arc_to_cubics(x, y, v[0], v[1], v[2], v[3], v[4], end_x, end_y):
+                        subpath.curve_to(c1x, c1y, c2x, c2y, px, py)
+                x, y = end_x, end_y
+
+            cubic_control = next_cubic_control
+            quadratic_control = next_quadratic_control
+
+    if subpath is not None:
+        subpaths.append((subpath, False))
+    return _build_shape(subpaths)
+
+
+def close_subpath(path: BezierPath, is_closed: bool):
+    """
+    Close a parsed subpath when it ended with 'Z' or its last anchor returns to its start point.
+    """
+    if is_closed or (len(path) > 1 and np.array_equal(path.positions[0], path.positions[-1])):
+        path.close()
+
+
+class _SubpathBuilder:
+    """
+    Collects the anchors of one subpath in lists before building its arrays.
+    """
+    def __init__(self, x: float, y: float):
+        self.positions = [(x, y)]
+        self.handles_in = [(0.0, 0.0)]
+        self.handles_out = [(0.0, 0.0)]
+        # Anchors followed by a curve, their handle types are detected when the shape is built
+        self.curve_starts = []
+
+    def line_to(self, x: float, y: float):
+        self.positions.append((x, y))
+        self.handles_in.append((0.0, 0.0))
+        self.handles_out.append((0.0, 0.0))
+
+    def curve_to(self, c1x: float, c1y: float, c2x: float, c2y: float, x: float, y: float):
+        previous_x, previous_y = self.positions[-1]
+        self.handles_out[-1] = (c1x - previous_x, c1y - previous_y)
+        self.curve_starts.append(len(self.positions) - 1)
+
+        self.positions.append((x, y))
+        self.handles_in.append((c2x - x, c2y - y))
+        self.handles_out.append((0.0, 0.0))
+
+
+def _build_shape(subpaths: list) -> BezierShape:
+    """
+    Build the paths of a shape from its subpaths with one handle type detection pass
+    over the anchors of all of them.
+
+    Subpaths are closed as close_subpath would, merging a last anchor that returns
+    exactly to the start into the first anchor, whose handle type is then detected
+    along with the anchors followed by curves.
+    """
+    positions, handles_in, handles_out = [], [], []
+    detect, sizes, closed = [], [], []
+    for subpath, is_closed in subpaths:
+        offset = len(positions)
+        size = len(subpath.positions)
+        positions += subpath.positions
+        handles_in += subpath.handles_in
+        handles_out += subpath.handles_out
+        detect += [offset + index for index in subpath.curve_starts]
+        if size > 1 and subpath.positions[0] == subpath.positions[-1]:
+            handles_in[offset] = handles_in.pop()
+            positions.pop()
+            handles_out.pop()
+            detect.append(offset)
+            size -= 1
+            is_closed = True
+        sizes.append(size)
+        closed.append(is_closed)
+
+    if not positions:
+        return BezierShape()
+    anchors = BezierPath.from_arrays(positions, handles_in, handles_out)
+    anchors.detect_handle_types(indices=detect)
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    return BezierShape.from_arrays(
+        anchors.positions, anchors.handles_in, anchors.handles_out, anchors.handle_types, offsets, closed
+        )
+
+
+def _arc_values(arguments: str) -> list[float]:
+    """
+    Read arc parameters, where the two flags may be written without separators (e.g. 'a5 5 0 0110 10').
+    """
+    tokens = _NUMBER.findall(arguments)
+    values = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if len(values) % 7 in (3, 4) and len(token) > 1 and token[0] in "01":
+            values.append(float(token[0]))
+            tokens[i] = token[1:]
+            continue
+        values.append(float(token))
+        i += 1
+    return values
+
+
+def _arc_to_cubics(x1, y1, rx, ry, rotation, large_arc, sweep, x2, y2):
+    """
+    Approximate an SVG endpoint parameterized arc with cubic segments.
+
+    Follows the endpoint to center conversion of the SVG implementation notes and
+    uses one cubic per full 90 degrees of sweep.
+
+    Returns:
+        List of (c1x, c1y, c2x, c2y, x, y) tuples.
+    """
+    rx, ry = abs(rx), abs(ry)
+    phi = math.radians(rotation)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1_prime = cos_phi * dx + sin_phi * dy
+    y1_prime = -sin_phi * dx + cos_phi * dy
+
+    # Scale up radii that are too small to reach the end point
+    radius_check = (x1_prime ** 2) / (rx ** 2) + (y1_prime ** 2) / (ry ** 2)
+    if radius_check > 1:
+        rx *= math.sqrt(radius_check)
+        ry *= math.sqrt(radius_check)
+
+    t1 = rx ** 2 * y1_prime ** 2
+    t2 = ry ** 2 * x1_prime ** 2
+    c = math.sqrt(abs((rx ** 2 * ry ** 2 - t1 - t2) / (t1 + t2)))
+    if bool(large_arc) == bool(sweep):
+        c = -c
+    cx_prime = c * rx * y1_prime / ry
+    cy_prime = -c * ry * x1_prime / rx
+    cx = cos_phi * cx_prime - sin_phi * cy_prime + (x1 + x2) / 2
+    cy = sin_phi * cx_prime + cos_phi * cy_prime + (y1 + y2) / 2
+
+    ux, uy = (x1_prime - cx_prime) / rx, (y1_prime - cy_prime) / ry
+    vx, vy = (-x1_prime - cx_prime) / rx, (-y1_prime - cy_prime) / ry
+    start_angle = math.atan2(uy, ux)
+    cosine = (ux * vx + uy * vy) / math.sqrt((ux * ux + uy * uy) * (vx * vx + vy * vy))
+    delta = math.acos(max(-1.0, min(1.0, cosine)))
+    if ux * vy - uy * vx < 0:
+        delta = -delta
+    if sweep and delta < 0:
+        delta += math.tau
+    elif not sweep and delta > 0:
+        delta -= math.tau
+
+    count = 1
+    if abs(delta) > math.tau / 4:
+        count = int(math.floor(abs(delta) / (math.tau / 4)))
+    step = delta / count
+    alpha = math.sin(step) * (math.sqrt(4 + 3 * math.tan(step / 2) ** 2) - 1) / 3
+
+    def point(angle):
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        return (cx + rx * cos_a * cos_phi - ry * sin_a * sin_phi,
+                cy + rx * cos_a * sin_phi + ry * sin_a * cos_phi)
+
+    def derivative(angle):
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        return (-rx * cos_phi * sin_a - ry * sin_phi * cos_a,
+                -rx * sin_phi * sin_a + ry * cos_phi * cos_a)
+
+    cubics = []
+    px, py = x1, y1
+    angle = start_angle
+    for i in range(count):
+        next_angle = angle + step
+        ex, ey = (x2, y2) if i == count - 1 else point(next_angle)
+        d1x, d1y = derivative(angle)
+        d2x, d2y = derivative(next_angle)
+        cubics.append((px + alpha * d1x, py + alpha * d1y, ex - alpha * d2x, ey - alpha * d2y, ex, ey))
+        px, py = ex, ey
+        angle = next_angle
+    return cubics
@@ -0,0 +1,242 @@
+"""
+Point queries against cubic bezier contours and paths.
+
+Winding numbers are found by casting a ray in +x from every point and summing
+the directions of the curves it crosses. Curves are split into pieces monotonic
+in x and y first, so a ray crosses each piece at most once and deciding whether
+it does only takes a bisection. Rays are paired with segments by the sweep line
+of intersection.overlapping_pairs, so each point only meets the curves near it.
+Points and curves are given quarter turns first so that each ray heads for the
+edge of the bounding box nearest its point, crossing the curves the short way.
+
+Nearest points are searched down a hierarchy of boxes around runs of segments,
+see `nearest`.
+"""
+
+import numpy as np
+
+from bezier_builder import cubic
+from bezier_builder.intersection import monotone_pieces, overlapping_pairs
+
+# Bisection steps used to find where a ray crosses a piece
+_LEVEL_STEPS = 48
+# Points searched for their nearest points at once
+_CHUNK = 4096
+
+
+def quarter_turns(points: np.ndarray, pieces: np.ndarray, piece_bounds: np.ndarray):
+    """
+    Group points by the edge of the box around all pieces they are nearest, and
+    turn each group with the pieces a quarter at a time counterclockwise until that
+    edge is on the right, so rays cast in +x leave the box the short way.
+
+    Rotations keep winding numbers and keep pieces monotonic in x and y.
+
+    Yields:
+        (group, points, pieces, piece_bounds) for every group of points, with the
+        indices of the group and the turned points, pieces and boxes.
+    """
+    if len(piece_bounds) == 0:
+        return
+    lower, upper = piece_bounds[:, 0].min(axis=0), piece_bounds[:, 1].max(axis=0)
+    # Gaps to the right, bottom, left and top edges, the edges that one to three turns bring to the right
+    gaps = np.column_stack([upper[0] - points[:, 0], points[:, 1] - lower[1], points[:, 0] - lower[0], upper[1] - points[:, 1]])
+    edges = np.argmin(gaps, axis=1)
+    turn = np.eye(2)
+    for edge in range(4):
+        group = np.flatnonzero(edges == edge)
+        if len(group):
+            corners = piece_bounds @ turn
+            yield group, points[group] @ turn, pieces @ turn, np.stack([corners.min(axis=1), corners.max(axis=1)], axis=1)
+        turn = turn @ np.array([[0.0, 1.0], [-1.0, 0.0]])
+
+
+def ray_candidates(points: np.ndarray, reach: np.ndarray, pieces: np.ndarray, piece_bounds: np.ndarray) -> tuple:
+    """
+    Pieces that a ray cast in +x from each point may cross.
+
+    A piece is a candidate when its box overlaps the ray and its y range holds the
+    ray half-open, so pieces meeting at an end on the ray count once between them.
+
+    Args:
+        points: (M, 2) ray origins.
+        reach: Length M array of the x coordinates the rays stop at. Rays with a
+               reach left of their origin, such as -inf, are not cast.
+        pieces: (P, 4, 2) control points of pieces monotonic in x and y, see
+                intersection.monotone_pieces.
+        piece_bounds: (P, 2, 2) boxes of the pieces.
+
+    Returns:
+        (point_index, piece_index, rising) arrays of the candidate pairs, with
+        whether the piece runs up through the ray.
+    """
+    cast = np.flatnonzero(reach >= points[:, 0])
+    rays = np.stack([points[cast], points[cast]], axis=1)
+    rays[:, 1, 0] = reach[cast]
+    ray_index, piece_index = overlapping_pairs(rays, piece_bounds)
+    point_index = cast[ray_index]
+
+    y = points[point_index, 1]
+    start, end = pieces[piece_index, 0, 1], pieces[piece_index, 3, 1]
+    rising = (start <= y) & (y < end)
+    falling = (end <= y) & (y < start)
+    candidates = rising | falling
+    return point_index[candidates], piece_index[candidates], rising[candidates]
+
+
+def ray_crossings(points: np.ndarray, pieces: np.ndarray, piece_bounds: np.ndarray, point_index: np.ndarray, piece_index: np.ndarray, rising: np.ndarray) -> np.ndarray:
+    """
+    Whether the ray from each point crosses each candidate piece, see `ray_candidates`.
+
+    Pieces wholly right of the point cross its ray. For the rest the monotonic y
+    coordinate is bisected for the crossing until x, which is monotonic too, falls
+    on one side of the point across the whole bracket.
+
+    Returns:
+        Boolean array with an entry per candidate pair.
+    """
+    crossed = piece_bounds[piece_index, 0, 0] > points[point_index, 0]
+    unsure = np.flatnonzero(~crossed)
+    coefficients = cubic.power_coefficients(pieces)[piece_index[unsure]]
+    level, upward, x = points[point_index[unsure], 1], rising[unsure], points[point_index[unsure], 0]
+    rows = np.arange(len(unsure))
+    lower, upper = np.zeros(len(rows)), np.ones(len(rows))
+
+    def value(axis, t):
+        a, b, c, d = (coefficients[rows, k, axis] for k in range(4))
+        return ((a * t + b) * t + c) * t + d
+
+    for _ in range(_LEVEL_STEPS):
+        right_of_lower, right_of_upper = value(0, lower) > x[rows], value(0, upper) > x[rows]
+        decided = right_of_lower == right_of_upper
+        crossed[unsure[rows[decided]]] = right_of_lower[decided]
+        rows, lower, upper = rows[~decided], lower[~decided], upper[~decided]
+        if len(rows) == 0:
+            break
+        middle = 0.5 * (lower + upper)
+        below = (value(1, middle) < level[rows]) == upward[rows]
+        lower = np.where(below, middle, lower)
+        upper = np.where(below, upper, middle)
+    crossed[unsure[rows]] = value(0, 0.5 * (lower + upper)) > x[rows]
+    return crossed
+
+
+def winding_numbers(controls: np.ndarray, points) -> np.ndarray:
+    """
+    Winding numbers of closed contours around points.
+
+    Points outside the bounding box of the contours are not cast, and rays stop
+    at its edge.
+
+    Args:
+        controls: (S, 4, 2) control points of the segments of closed contours,
+                  in any order, see boolean.contour.
+        points: (M, 2) points.
+
+    Returns:
+        Length M integer array, positive where the contours run counterclockwise
+        around a point.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    windings = np.zeros(len(points), dtype=np.int64)
+    pieces = monotone_pieces(np.asarray(controls, dtype=np.float64).reshape(-1, 4, 2))[0]
+    if len(pieces) == 0 or len(points) == 0:
+        return windings
+    piece_bounds = np.stack([pieces.min(axis=1), pieces.max(axis=1)], axis=1)
+    for group, turned_points, turned, turned_bounds in quarter_turns(points, pieces, piece_bounds):
+        lower, upper = turned_bounds[:, 0].min(axis=0), turned_bounds[:, 1].max(axis=0)
+        inside = np.all((turned_points >= lower) & (turned_points <= upper), axis=1)
+        reach = np.where(inside, upper[0], -np.inf)
+        point_index, piece_index, rising = ray_candidates(turned_points, reach, turned, turned_bounds)
+        crossed = ray_crossings(turned_points, turned, turned_bounds, point_index, piece_index, rising)
+        np.add.at(windings, group[point_index[crossed]], np.where(rising[crossed], 1, -1))
+    return windings
+
+
+def nearest(controls: np.ndarray, points) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Closest points on segments to given points.
+
+    Segments are searched down a hierarchy of bounding boxes around runs of
+    segments taken along a Z-order curve, halving the runs at every level. The start of each run
+    met on the way is a point on the curves, so the nearest of them bounds the
+    distance of every point from above, and runs whose boxes lie further away
+    than that can't hold the closest point and are dropped with all their
+    segments. The closest point on the curve is only searched for on the segments
+    left at the bottom. Points are searched in chunks of at most `_CHUNK` so the
+    pairs held at once stay bounded.
+
+    Args:
+        controls: (S, 4, 2) control points, S > 0.
+        points: (M, 2) points.
+
+    Returns:
+        (segments, t, distances) length M arrays with the segment index and local
+        parameter of the closest point and the distance to it.
+    """
+    controls = np.asarray(controls, dtype=np.float64).reshape(-1, 4, 2)
+    if len(controls) == 0:
+        raise ValueError("Cannot evaluate a path with no segments.")
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    count = len(points)
+    segments = np.zeros(count, dtype=np.intp)
+    t = np.zeros(count)
+    distances = np.full(count, np.inf)
+
+    # Runs of segments along a Z-order curve through their boxes stay close together
+    segment_bounds = cubic.bounds(controls)
+    order = _z_order(segment_bounds.mean(axis=1))
+    ordered = controls[order]
+
+    # Boxes of the runs at every level, from single segments up to one run of them all
+    levels = [segment_bounds[order]]
+    while len(levels[-1]) > 1:
+        boxes = levels[-1]
+        pairs = len(boxes) // 2
+        merged = np.concatenate([boxes[:2 * pairs:2], boxes[2 * pairs:]])
+        merged[:pairs, 0] = np.minimum(boxes[:2 * pairs:2, 0], boxes[1:2 * pairs:2, 0])
+        merged[:pairs, 1] = np.maximum(boxes[:2 * pairs:2, 1], boxes[1:2 * pairs:2, 1])
+        levels.append(merged)
+
+    for chunk in range(0, count, _CHUNK):
+        searched = points[chunk:chunk + _CHUNK]
+        bound = np.hypot(*(ordered[0, 0] - searched).T)
+        point_index, run_index = np.arange(len(searched)), np.zeros(len(searched), dtype=np.intp)
+        for level in range(len(levels) - 2, -1, -1):
+            boxes = levels[level]
+            point_index = np.repeat(point_index, 2)
+            run_index = (2 * run_index[:, np.newaxis] + [0, 1]).reshape(-1)
+            kept = run_index < len(boxes)
+            point_index, run_index = point_index[kept], run_index[kept]
+
+            # Runs start at segment run << level, whose start is on the curves
+            pair_points = searched[point_index]
+            starts = np.hypot(*(ordered[run_index << level, 0] - pair_points).T)
+            if level == 0:
+                starts = np.minimum(starts, np.hypot(*(ordered[run_index, 3] - pair_points).T))
+            np.minimum.at(bound, point_index, starts)
+            gaps = np.maximum(np.maximum(boxes[run_index, 0] - pair_points, pair_points - boxes[run_index, 1]), 0)
+            near = np.hypot(*gaps.T) <= bound[point_index]
+            point_index, run_index = point_index[near], run_index[near]
+
+        segment_index = order[run_index]
+        pair_t, pair_distances = cubic.closest(controls, segment_index, searched[point_index])
+        # Keep the closest pair of every point, taking the lowest segment on ties
+        best = np.lexsort((segment_index, pair_distances, point_index))
+        first = best[np.r_[True, point_index[best[1:]] != point_index[best[:-1]]]]
+        found = chunk + point_index[first]
+        segments[found], t[found], distances[found] = segment_index[first], pair_t[first], pair_distances[first]
+    return segments, t, distances
+
+
+def _z_order(points: np.ndarray) -> np.ndarray:
+    """
+    Order of points along a Z-order curve through their bounding box, found by
+    interleaving the bits of their coordinates scaled to 16 bit integers.
+    """
+    lower, upper = points.min(axis=0), points.max(axis=0)
+    scaled = (points - lower) / np.where(upper > lower, upper - lower, 1) * 0xFFFF
+    spread = scaled.astype(np.uint64)
+    for shift, mask in ((8, 0x00FF00FF), (4, 0x0F0F0F0F), (2, 0x33333333), (1, 0x55555555)):
+        spread = (spread | (spread << np.uint64(shift))) & np.uint64(mask)
+    return np.argsort(spread[:, 0] | (spread[:, 1] << np.uint64(1)), kind="stable")
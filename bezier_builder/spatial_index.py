@@ -0,0 +1,204 @@
+"""
+Uniform grid spatial index over a list of BezierShapes.
+
+Shapes are bucketed by their exact bounding boxes into square grid cells, so
+rectangle and point queries only test the shapes registered in the cells they
+touch. Shapes that cover too many cells are kept in a separate list and
+tested directly instead of filling the grid.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+from bezier_builder.bezier_path import BezierShape
+
+# Shapes covering more cells than this are not added to the grid
+_MAX_CELLS = 256
+
+
+class SpatialIndex:
+    """
+    Grid index answering which shapes' bounding boxes overlap a rectangle or point.
+
+    Shapes are identified by the index they were inserted at, which for an index
+    built from a list (e.g. the result of parse_svg_file) is their position in
+    that list. Anchors edited in place are picked up by calling `update` for the
+    changed shapes or `refresh` to check all of them.
+    """
+    def __init__(self, shapes: Iterable[BezierShape] = (), cell_size: Optional[float] = None):
+        """
+        Args:
+            shapes: Shapes to index.
+            cell_size: Width and height of the grid cells. Defaults to the median
+                       bounding box extent of `shapes`.
+        """
+        self._shapes = []
+        self._bounds = np.full((0, 2, 2), np.nan)
+        self._cells = {}
+        self._ranges = []
+        self._large = set()
+
+        shapes = list(shapes)
+        bounds = [shape.bounds() for shape in shapes]
+        if cell_size is None:
+            extents = [np.max(b[1] - b[0]) for b in bounds if b is not None]
+            cell_size = float(np.median(extents)) if extents else 1.0
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+
+        for shape, shape_bounds in zip(shapes, bounds):
+            self._add(shape, shape_bounds)
+
+    def __len__(self) -> int:
+        return sum(shape is not None for shape in self._shapes)
+
+    def __getitem__(self, index: int) -> BezierShape:
+        return self._shapes[index]
+
+    def bounds(self, index: int) -> np.ndarray:
+        """
+        Bounding box the index holds for shape `index`, as a (2, 2) array of [min, max] corners.
+        """
+        return self._bounds[index].copy()
+
+    def insert(self, shape: BezierShape) -> int:
+        """
+        Add a shape to the index and return its index.
+        """
+        return self._add(shape, shape.bounds())
+
+    def remove(self, index: int):
+        """
+        Remove shape `index`, the indices of other shapes don't change.
+        """
+        if self._shapes[index] is None:
+            raise KeyError(f"Shape {index} was removed from the index.")
+        self._unregister(index)
+        self._shapes[index] = None
+        self._bounds[index] = np.nan
+
+    def update(self, index: int) -> bool:
+        """
+        Recompute the bounding box of shape `index` after its anchors changed.
+
+        Returns:
+            True if the bounding box moved.
+        """
+        shape = self._shapes[index]
+        if shape is None:
+            raise KeyError(f"Shape {index} was removed from the index.")
+        bounds = shape.bounds()
+        if bounds is None:
+            bounds = np.full((2, 2), np.nan)
+        if np.array_equal(bounds, self._bounds[index], equal_nan=True):
+            return False
+        self._unregister(index)
+        self._bounds[index] = bounds
+        self._register(index)
+        return True
+
+    def refresh(self) -> list[int]:
+        """
+        Update every shape in the index.
+
+        Returns:
+            Indices of the shapes whose bounding boxes moved.
+        """
+        return [index for index, shape in enumerate(self._shapes) if shape is not None and self.update(index)]
+
+    def query_rect(self, bounds) -> np.ndarray:
+        """
+        Indices of the shapes whose bounding boxes overlap a rectangle.
+
+        Args:
+            bounds: (2, 2) array-like of the rectangle's [min, max] corners.
+
+        Returns:
+            Sorted array of shape indices.
+        """
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(2, 2)
+        candidates = set(self._large)
+        if not np.isfinite(bounds).all():
+            for members in self._cells.values():
+                candidates.update(members)
+            return self._filter(candidates, bounds)
+
+        low, high = self._cell(bounds[0]), self._cell(bounds[1])
+        if (high[0] - low[0] + 1) * (high[1] - low[1] + 1) > len(self._cells):
+            for cell, members in self._cells.items():
+                if low[0] <= cell[0] <= high[0] and low[1] <= cell[1] <= high[1]:
+                    candidates.update(members)
+        else:
+            for x in range(low[0], high[0] + 1):
+                for y in range(low[1], high[1] + 1):
+                    candidates.update(self._cells.get((x, y), ()))
+        return self._filter(candidates, bounds)
+
+    def query_point(self, point, tolerance: float = 0.0) -> np.ndarray:
+        """
+        Indices of the shapes whose bounding boxes contain a point.
+
+        Args:
+            point: (x, y) of the point.
+            tolerance: Distance the bounding boxes are grown by before testing.
+
+        Returns:
+            Sorted array of shape indices.
+        """
+        point = np.asarray(point, dtype=np.float64).reshape(2)
+        return self.query_rect([point - tolerance, point + tolerance])
+
+    def _filter(self, candidates: set, bounds: np.ndarray) -> np.ndarray:
+        """
+        Keep the candidates whose bounding boxes overlap `bounds`.
+        """
+        indices = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        indices.sort()
+        boxes = self._bounds[indices]
+        overlap = np.all((boxes[:, 0] <= bounds[1]) & (boxes[:, 1] >= bounds[0]), axis=1)
+        return indices[overlap]
+
+    def _cell(self, point: np.ndarray) -> tuple[int, int]:
+        x, y = np.floor(point / self.cell_size).tolist()
+        return int(x), int(y)
+
+    def _add(self, shape: BezierShape, bounds: Optional[np.ndarray]) -> int:
+        index = len(self._shapes)
+        if index == len(self._bounds):
+            grown = np.full((max(2 * index, 8), 2, 2), np.nan)
+            grown[:index] = self._bounds[:index]
+            self._bounds = grown
+        self._shapes.append(shape)
+        self._ranges.append(None)
+        if bounds is not None:
+            self._bounds[index] = bounds
+        self._register(index)
+        return index
+
+    def _register(self, index: int):
+        bounds = self._bounds[index]
+        if np.isnan(bounds).any():
+            # Shapes without anchors are never returned by queries
+            return
+        low, high = self._cell(bounds[0]), self._cell(bounds[1])
+        if (high[0] - low[0] + 1) * (high[1] - low[1] + 1) > _MAX_CELLS:
+            self._large.add(index)
+            return
+        for x in range(low[0], high[0] + 1):
+            for y in range(low[1], high[1] + 1):
+                self._cells.setdefault((x, y), set()).add(index)
+        self._ranges[index] = (low, high)
+
+    def _unregister(self, index: int):
+        self._large.discard(index)
+        cell_range = self._ranges[index]
+        self._ranges[index] = None
+        if cell_range is None:
+            return
+        low, high = cell_range
+        for x in range(low[0], high[0] + 1):
+            for y in range(low[1], high[1] + 1):
+                members = self._cells[(x, y)]
+                members.discard(index)
+                if not members:
+                    del self._cells[(x, y)]
@@ -0,0 +1,109 @@
+"""
+Incremental fitting of smooth paths to points as they arrive, e.g. from a pen or mouse.
+
+Only the tail of the stroke since the last finalized anchor is refitted when a
+point is added. Whenever the tail needs more than one segment, all but its last
+segment are finalized, and tails that grow too long are finalized outright, so
+the work per point stays bounded however long the stroke gets.
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+from bezier_builder import fitting
+from bezier_builder.bezier_path import BezierPath
+
+
+class StrokeFitter:
+    """
+    Fits a smooth BezierPath to a stroke one point at a time.
+
+    Finalized segments never change, the last segment is refitted to the points
+    after the last finalized anchor, keeping its start tangent so the path stays
+    smooth across the join.
+    """
+    def __init__(self, error: float, max_tail: int = 256):
+        """
+        Args:
+            error: Maximum distance between the points and the path.
+            max_tail: Most points refitted per added point.
+        """
+        if error <= 0:
+            raise ValueError(f"Invalid error: {error}. Must be greater than 0.")
+        if max_tail < 3:
+            raise ValueError(f"Invalid max_tail: {max_tail}. Must be at least 3.")
+        self.error = error
+        self.max_tail = max_tail
+        self._finalized = []
+        self._tail = []
+        self._tangent = None
+        self._tail_controls = np.empty((0, 4, 2))
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._finalized) + len(self._tail_controls)
+
+    def add_point(self, point):
+        """
+        Add the next point of the stroke and refit the tail.
+        """
+        point = np.asarray(point, dtype=np.float64).reshape(2)
+        if self._tail and np.array_equal(point, self._tail[-1]):
+            return
+        self._tail.append(point)
+        if len(self._tail) < 2:
+            return
+
+        controls, anchors = fitting.fit_points(np.array(self._tail), self.error, tangent_start=self._tangent)
+        if len(controls) > 1:
+            # Every split but the last is final, only the last segment can still change
+            self._finalize(controls[:-1], anchors[-2])
+            controls = controls[-1:]
+        elif len(self._tail) >= self.max_tail:
+            self._finalize(controls, anchors[-1])
+            controls = np.empty((0, 4, 2))
+        self._tail_controls = controls
+
+    def extend(self, points: Iterable):
+        """
+        Add several points of the stroke in order.
+        """
+        for point in points:
+            self.add_point(point)
+
+    @property
+    def path(self) -> BezierPath:
+        """
+        Path through the stroke so far.
+        """
+        controls = self._controls()
+        if len(controls) == 0:
+            return BezierPath.from_arrays(np.array(self._tail).reshape(-1, 2))
+        return BezierPath.from_arrays(*fitting.smooth_anchors(controls))
+
+    def finish(self) -> BezierPath:
+        """
+        Return the path through the whole stroke and start a new stroke.
+        """
+        path = self.path
+        self._finalized = []
+        self._tail = []
+        self._tangent = None
+        self._tail_controls = np.empty((0, 4, 2))
+        return path
+
+    def _controls(self) -> np.ndarray:
+        return np.concatenate([np.reshape(self._finalized, (-1, 4, 2)), self._tail_controls])
+
+    def _finalize(self, controls: np.ndarray, anchor: int):
+        """
+        Keep `controls` as final segments and start the tail at tail point `anchor`.
+        """
+        self._finalized.extend(controls)
+        self._tail = self._tail[anchor:]
+        end = controls[-1]
+        # The next segment leaves in the direction the last one arrived
+        direction = end[3] - end[2]
+        length = np.hypot(*direction)
+        self._tangent = direction / length if length > 0 else None
@@ -0,0 +1,141 @@
+"""
+Subdivision of cubic bezier paths at segment parameters.
+
+Anchors are inserted by splitting segments with de Casteljau's algorithm, so the
+path keeps its shape and parameterization: a new anchor takes the inner control
+points of the split as its handles, and the handles of the anchors on either side
+shrink to match. All the splits of a call are made in one batch, every segment
+being cut at all of its parameters at once by cubic.trim.
+
+Straight segments without handles stay that way, their pieces are lines between
+the split points.
+"""
+
+import numpy as np
+
+from bezier_builder import cubic
+from bezier_builder.anchor_point import ALIGNED, CORNER, SYMMETRIC, detect_handle_types
+
+
+def insert(positions: np.ndarray, handles_in: np.ndarray, handles_out: np.ndarray, handle_types: np.ndarray,
+           is_closed: bool, segments, t) -> tuple:
+    """
+    Insert anchors at local parameters of segments.
+
+    New anchors on curves are symmetric when they halve their segment and aligned
+    otherwise, new anchors on lines are corners. Symmetric anchors next to a split
+    have one handle shortened and become aligned, unless both are shortened alike.
+    Parameters of 0 or 1 fall on existing anchors and repeated parameters on the
+    same anchor, neither inserts anything.
+
+    Args:
+        positions, handles_in, handles_out, handle_types: Anchor arrays of the path, see BezierPath.from_arrays.
+        is_closed: Whether the path is closed.
+        segments: Length K array of segment indices, all in range.
+        t: Scalar or length K array of local parameters in [0, 1].
+
+    Returns:
+        (positions, handles_in, handles_out, handle_types, anchors) with the new
+        anchor arrays and the index of the anchor at every parameter. Closed paths
+        index the anchor at the end of their closing segment as one past the last.
+    """
+    segments = np.asarray(segments, dtype=np.intp).reshape(-1)
+    t = np.broadcast_to(np.asarray(t, dtype=np.float64), segments.shape)
+    if np.any(~((t >= 0) & (t <= 1))):
+        raise ValueError(f"Invalid t: {t[~((t >= 0) & (t <= 1))][0]}. Must be between 0 and 1.")
+    controls = cubic.segment_controls(positions, handles_in, handles_out, is_closed)
+    count, size = len(controls), len(positions)
+
+    # Distinct cuts inside segments, sorted along the path
+    inside = np.flatnonzero((t > 0) & (t < 1))
+    order = inside[np.lexsort((t[inside], segments[inside]))]
+    distinct = np.r_[True, (segments[order[1:]] != segments[order[:-1]]) | (t[order[1:]] != t[order[:-1]])] if len(order) else np.zeros(0, dtype=bool)
+    cut_segments, cut_t = segments[order[distinct]], t[order[distinct]]
+    cuts = len(cut_t)
+
+    # Original anchors move up by the cuts before them, cut j lands after them and the cuts before it
+    cuts_before = np.searchsorted(cut_segments, np.arange(size + 1))
+    moved = np.arange(size + 1) + cuts_before
+    cut_anchors = cut_segments + np.arange(cuts) + 1
+
+    # Piece a runs from anchor a to the next, only segments with cuts are split into several
+    piece_segments = np.repeat(np.arange(count), np.diff(cuts_before[:count + 1]) + 1)
+    lower, upper = np.zeros(len(piece_segments)), np.ones(len(piece_segments))
+    lower[cut_anchors], upper[cut_anchors - 1] = cut_t, cut_t
+    split = np.flatnonzero((lower > 0) | (upper < 1))
+    split_controls = controls[piece_segments[split]]
+    pieces = cubic.trim(split_controls, lower[split], upper[split])
+    # Pieces running to the end of their segment end on it exactly
+    last = upper[split] == 1
+    pieces[last] = cubic.split(split_controls[last], lower[split][last])[1]
+    lines = np.all(split_controls[:, 1] == split_controls[:, 0], axis=1) & np.all(split_controls[:, 2] == split_controls[:, 3], axis=1)
+    pieces[lines, 1], pieces[lines, 2] = pieces[lines, 0], pieces[lines, 3]
+
+    total = size + cuts
+    new_positions = np.empty((total, 2))
+    new_handles_in = np.empty((total, 2))
+    new_handles_out = np.empty((total, 2))
+    new_types = np.empty(total, dtype=np.uint8)
+    is_cut = np.zeros(total, dtype=bool)
+    is_cut[cut_anchors] = True
+    new_positions[~is_cut] = positions
+    new_handles_in[~is_cut] = handles_in
+    new_handles_out[~is_cut] = handles_out
+    new_types[~is_cut] = handle_types
+
+    # Each split piece gives the outgoing handle of the anchor it starts at and the incoming one of the anchor it ends at
+    cut_pieces = np.searchsorted(split, cut_anchors)
+    new_positions[cut_anchors] = pieces[cut_pieces, 0]
+    ending = (split + 1) % total if is_closed else split + 1
+    new_handles_out[split] = pieces[:, 1] - new_positions[split]
+    new_handles_in[ending] = pieces[:, 2] - new_positions[ending]
+
+    new_types[cut_anchors] = np.where(lines[cut_pieces], CORNER, detect_handle_types(new_handles_in[cut_anchors], new_handles_out[cut_anchors]))
+    touched = np.unique(np.concatenate([split, ending]))
+    touched = touched[~is_cut[touched] & (new_types[touched] == SYMMETRIC)]
+    new_types[touched[detect_handle_types(new_handles_in[touched], new_handles_out[touched]) != SYMMETRIC]] = ALIGNED
+
+    anchors = np.empty(len(segments), dtype=np.intp)
+    anchors[t <= 0] = moved[segments[t <= 0]]
+    anchors[t >= 1] = moved[segments[t >= 1] + 1]
+    anchors[order] = cut_anchors[np.cumsum(distinct) - 1]
+    return new_positions, new_handles_in, new_handles_out, new_types, anchors
+
+
+def subdivide(positions: np.ndarray, handles_in: np.ndarray, handles_out: np.ndarray, handle_types: np.ndarray,
+              is_closed: bool, n: int) -> tuple:
+    """
+    Split every segment into `n` pieces at even steps of its parameter, see `insert`.
+
+    Returns:
+        (positions, handles_in, handles_out, handle_types) of the refined path.
+    """
+    if n < 1:
+        raise ValueError(f"Invalid n: {n}. Must be at least 1.")
+    count = cubic.segment_count(len(positions), is_closed)
+    segments = np.repeat(np.arange(count), n - 1)
+    t = np.tile(np.arange(1, n) / n, count)
+    return insert(positions, handles_in, handles_out, handle_types, is_closed, segments, t)[:4]
+
+
+def span(positions: np.ndarray, handles_in: np.ndarray, handles_out: np.ndarray, handle_types: np.ndarray,
+         is_closed: bool, first: int, last: int) -> tuple:
+    """
+    Anchor arrays of the open path from anchor `first` to anchor `last`.
+
+    Closed paths wrap around past their last anchor, with an index one past the
+    last meaning the first anchor again, see `insert`. The end anchors become
+    corners with no handles outside the path.
+
+    Returns:
+        (positions, handles_in, handles_out, handle_types) of the anchors.
+    """
+    size = len(positions)
+    if is_closed and last < first:
+        last += size
+    index = np.arange(first, last + 1) % size if size else np.zeros(0, dtype=np.intp)
+    positions, handles_in, handles_out, handle_types = positions[index], handles_in[index], handles_out[index], handle_types[index]
+    if len(index):
+        handles_in[0], handles_out[-1] = 0, 0
+        handle_types[[0, -1]] = CORNER
+    return positions, handles_in, handles_out, handle_types
@@ -1,31 +1,67 @@
 # svg_converter.py
 
-from typing import List
+from typing import Iterator, List, Optional
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import quoteattr
 import re
 import math
-from svgelements import SVG, Shape, Path, Move, Line, CubicBezier, QuadraticBezier, Arc, Close
+import numpy as np
+from svgelements import SVG, Shape, Path, Matrix, Move, Line, CubicBezier, QuadraticBezier, Arc, Close
+from svgelements import Rect, Circle, Ellipse, SimpleLine, Polyline, Polygon, DEFAULT_PPI
 
 from bezier_builder.bezier_path import BezierPath, BezierShape
 from bezier_builder.anchor_point import AnchorPoint
-from bezier_builder.vector import Vector
+from bezier_builder.vector import Vec2
+from bezier_builder.path_parser import parse_path_data, close_subpath
+from bezier_builder.parse_cache import ParseCache, get_parse_cache
+from bezier_builder.instancing import InstancedShapes
 
+# Element classes used to read the geometry of SVG shape elements
+_SHAPE_ELEMENTS = {
+    "path": Path, "rect": Rect, "circle": Circle, "ellipse": Ellipse,
+    "line": SimpleLine, "polyline": Polyline, "polygon": Polygon,
+}
 
-def parse_path_string(d_string: str) -> BezierShape:
+# Containers whose content is only drawn when referenced by <use>
+_DEFINITION_ELEMENTS = {"defs", "symbol", "clipPath", "mask", "marker", "pattern"}
+
+# Strip trailing zeros and negative zeros from numbers formatted with a fixed precision
+_TRAILING_ZEROS = re.compile(r"\.?0+(?=[ ,]|$)")
+_NEGATIVE_ZERO = re.compile(r"(?<![\d.])-0(?=[ ,]|$)")
+
+def parse_path_string(d_string: str, fast: bool = False, cache: Optional[ParseCache] = None) -> BezierShape:
     """
     Parses an SVG path 'd' attribute string into a list of BezierPath objects
     using the 'svgelements' library.
 
     Args:
         d_string: The string from the 'd' attribute of an SVG <path> element.
+        fast: Use the native parser from path_parser, which reads the string
+              straight into anchor arrays without svgelements.
+        cache: Cache of parsed shapes to look the string up in, defaults to the
+               process-wide cache if enable_parse_cache was called.
 
     Returns:
         A list of BezierPath objects.
     """
+    if cache is None:
+        cache = get_parse_cache()
+    if cache is not None:
+        return cache.get(d_string, fast, parse_path_data if fast else _parse_with_svgelements)
+    if fast:
+        return parse_path_data(d_string)
+    return _parse_with_svgelements(d_string)
+
+def _parse_with_svgelements(d_string: str) -> BezierShape:
+
     shape = BezierShape()
     svg_path = Path(d_string)
 
     for subpath in svg_path.as_subpaths():
         current_path = BezierPath()
+        is_closed = False
+        # Anchors followed by a curve, their handle types are detected once the subpath is complete
+        curve_starts = []
 
         if not subpath:
             continue
@@ -39,177 +75,502 @@ def parse_path_string(d_string: str) -> BezierShape:
                 current_path.append(current_point)
             elif isinstance(segment, CubicBezier):
                 # Get coordinates from the segment
-                start = Vector.as_vector(segment.start)
-                end = Vector.as_vector(segment.end)
+                start = Vec2.as_vec2(segment.start)
+                end = Vec2.as_vec2(segment.end)
 
+                curve_starts.append(len(current_path) - 1)
                 append_segment_to_path(
-                    handle_1=Vector.as_vector(segment.control1) - start,
-                    handle_2=Vector.as_vector(segment.control2) - end,
+                    handle_1=Vec2.as_vec2(segment.control1) - start,
+                    handle_2=Vec2.as_vec2(segment.control2) - end,
                     end=end,
-                    path=current_path
+                    path=current_path,
+                    detect_handle_type=False
                     )
             elif isinstance(segment, QuadraticBezier):
-                start = Vector.as_vector(segment.start)
-                control = Vector.as_vector(segment.control)
-                end = Vector.as_vector(segment.end)
+                start = Vec2.as_vec2(segment.start)
+                control = Vec2.as_vec2(segment.control)
+                end = Vec2.as_vec2(segment.end)
 
+                curve_starts.append(len(current_path) - 1)
                 append_segment_to_path(
                     handle_1=(2/3) * (control - start), 
                     handle_2=(2/3) * (control - end), 
                     end=end, 
-                    path=current_path
+                    path=current_path,
+                    detect_handle_type=False
                     )
             elif isinstance(segment, Arc):
+                if segment.start == segment.end:
+                    # Arcs ending at their start point are omitted
+                    continue
+                if segment.sweep == 0:
+                    # Arcs without a radius are straight lines
+                    current_path.append(AnchorPoint(segment.end.x, segment.end.y))
+                    continue
+
                 # Calculate number of segments based on angle approximatly 1 per 90 degrees
                 sweep = abs(segment.sweep)
                 num_segments = 1
                 if sweep > math.tau / 4.0000:
                     num_segments = int(math.floor(sweep / (math.tau / 4.0000)))
 
-                print(num_segments,abs(segment.sweep) )
                 for bezier in segment.as_cubic_curves(arc_required=num_segments):
-                    start = Vector.as_vector(bezier.start)
-                    end = Vector.as_vector(bezier.end)
+                    start = Vec2.as_vec2(bezier.start)
+                    end = Vec2.as_vec2(bezier.end)
 
+                    curve_starts.append(len(current_path) - 1)
                     append_segment_to_path(
-                        handle_1=Vector.as_vector(bezier.control1) - start,
-                        handle_2=Vector.as_vector(bezier.control2) - end,
+                        handle_1=Vec2.as_vec2(bezier.control1) - start,
+                        handle_2=Vec2.as_vec2(bezier.control2) - end,
                         end=end,
-                        path=current_path
+                        path=current_path,
+                        detect_handle_type=False
                         )
-            elif isinstance(segment, (Line, Close)):
+            elif isinstance(segment, Line):
                 current_point = AnchorPoint(segment.end.x, segment.end.y)
                 current_path.append(current_point)
+            elif isinstance(segment, Close):
+                is_closed = True
 
-            if isinstance(segment, Close):
-                current_path.is_closed = True
-
-            if len(current_path.anchor_points) > 1:
-                start = current_path.start
-                end = current_path.end
-
-                # If start and end points are the same remove extra point and mark is closed
-                if start.pos.x == end.pos.x and start.pos.y == end.pos.y:
-                    if(start.handle_out.mirrors(end.handle_in)):
-                        current_path.start.handle_type = "symmetric"
-                    elif(start.handle_out.is_continuous_with(end.handle_in)):
-                        current_path.start.handle_type = "aligned"
-
-                    current_path.start.handle_in = end.handle_in
-                    current_path.anchor_points.pop()
-                    current_path.is_closed = True
-
+        current_path.detect_handle_types(indices=curve_starts)
+        # If start and end points are the same the extra point is merged and the path closed
+        close_subpath(current_path, is_closed)
         shape.append(current_path)
     return shape
 
-def append_segment_to_path(handle_1: AnchorPoint, handle_2: AnchorPoint, end: AnchorPoint, path: BezierPath):
+def append_segment_to_path(handle_1: Vec2, handle_2: Vec2, end: Vec2, path: BezierPath, detect_handle_type: bool = True):
     """
     Appends a bezier curve to the given path object.
 
     Args:
-        handle_1 (AnchorPoint): The relative handle point at the start of the bezier curve.
-        handle_2 (AnchorPoint): The relative handle point at the end of the bezier curve.
-        end (AnchorPoint): The end point of the bezier curve.
+        handle_1 (Vec2): The relative handle point at the start of the bezier curve.
+        handle_2 (Vec2): The relative handle point at the end of the bezier curve.
+        end (Vec2): The end point of the bezier curve.
         path (BezierPath): The path object to which the bezier curve will be appended.
+        detect_handle_type (bool): Detect the handle type of the previous anchor, callers
+            appending many segments can leave this to one BezierPath.detect_handle_types call.
     """
     # Set previous anchors handle_out 
     path.end.handle_out = handle_1
     # Check if handles are aligned or symmetric
-    path.end.detect_handle_type()
+    if detect_handle_type:
+        path.end.detect_handle_type()
 
     current_point = AnchorPoint(end.x, end.y)
     current_point.handle_in = handle_2 
     path.append(current_point)
 
-def create_path_string(shape: BezierShape) -> str:
+def create_path_string(shape: BezierShape, precision: int = 5, relative: bool = False) -> str:
     """
     Builds an SVG path 'd' attribute string from a list of BezierPath objects.
 
+    Coordinates of each path are selected and formatted in bulk from the path
+    arrays rather than one segment at a time.
+
     Args:
-        paths: A list of BezierPath objects.
+        shape: A BezierShape or list of BezierPath objects.
+        precision: Maximum number of decimal places, trailing zeros are removed.
+        relative: Write segments as relative 'c' and 'l' commands to shorten the output.
 
     Returns:
         str: A string suitable for use in an SVG <path> 'd' attribute.
     """
+    number = f"%.{precision}f"
+    point = f"{number},{number}"
+    move = f"M {point}"
+    line = f"{'l' if relative else 'L'} {point}"
+    curve = f"{'c' if relative else 'C'} {point} {point} {point}"
 
-    svg_string = ""
-    
-    for path in shape:
-        svg_string += f"M {nf(path.start.pos.x)},{nf(path.start.pos.y)} "
-        previous = path.start
+    commands = []
+    values = []
 
-        for i in range(1, len(path.anchor_points)):
-            current = path.anchor_points[i]
-            svg_string += bezier_string(previous, current)
-            previous = current
+    for path in shape:
+        if len(path) == 0:
+            continue
 
+        controls, is_line = _path_segments(path)
+        commands.append(move)
+        commands.extend([line if segment_is_line else curve for segment_is_line in is_line.tolist()])
         if path.is_closed:
-            if not (path.end.handle_out.is_close_to_zero() and path.start.handle_in.is_close_to_zero()):
-                svg_string += bezier_string(path.end, path.start)
-            svg_string += "Z"
+            commands.append("Z")
 
-        svg_string += " "
-            
-    return svg_string.rstrip()
+        # Each segment writes both handles and its end point, lines only the end point
+        coordinates = controls[:, 1:]
+        if relative:
+            # Work from rounded absolute points so rounding errors don't accumulate along the path
+            controls = np.round(controls, precision)
+            coordinates = controls[:, 1:] - controls[:, :1]
+        selected = np.ones((len(controls), 3), dtype=bool)
+        selected[is_line, :2] = False
 
-def nf(value):
+        values.append(path.positions[0])
+        values.append(coordinates[selected].ravel())
+
+    if not commands:
+        return ""
+
+    svg_string = " ".join(commands) % tuple(np.concatenate(values).tolist())
+    if precision > 0:
+        svg_string = _TRAILING_ZEROS.sub("", svg_string)
+    return _NEGATIVE_ZERO.sub("0", svg_string)
+
+def _path_segments(path: BezierPath) -> tuple[np.ndarray, np.ndarray]:
     """
-    Format numbers to 5 decimal places, but remove trailing zeros.
+    Segments of a path to write and whether each one can be written as a line.
+    The closing segment of a closed path is only written when it has handles,
+    otherwise 'Z' draws it.
     """
-    s = f"{value:.5f}"
-    s = re.sub("\.?0+$", "", s)
-    return s
+    controls = path.segments()
+    start = np.arange(len(controls))
+    end = (start + 1) % len(path)
+    is_line = ~(path.handles_out[start].any(axis=1) | path.handles_in[end].any(axis=1))
+
+    if path.is_closed:
+        closing_handles = np.stack([path.handles_out[-1], path.handles_in[0]])
+        if np.all(np.hypot(closing_handles[:, 0], closing_handles[:, 1]) < 1e-6):
+            controls, is_line = controls[:-1], is_line[:-1]
 
-def bezier_string(prev, curr):
+    return controls, is_line
+
+def nf(value, precision=5):
     """
-    Generate a Bezier curve string for the given two points.
-    If the handles are both zero, then we're just drawing a line.
+    Format numbers to `precision` decimal places, but remove trailing zeros.
     """
-    str = ""
-    
-    if prev.handle_out.magnitude() == 0 and curr.handle_in.magnitude() == 0:
-        str += f"L {nf(curr.pos.x)},{nf(curr.pos.y)} "
-    else:
-        c1 = prev.pos + prev.handle_out
-        c2 = curr.pos + curr.handle_in
-        str += f"C {nf(c1.x)},{nf(c1.y)} "
-        str += f"{nf(c2.x)},{nf(c2.y)} "
-        str += f"{nf(curr.pos.x)},{nf(curr.pos.y)} "
-
-    return str
+    s = f"{value:.{precision}f}"
+    if precision > 0:
+        s = s.rstrip("0").rstrip(".")
+    return "0" if s == "-0" else s
 
-def parse_svg_file(file_path: str) -> List[BezierShape]:
+def parse_svg_file(file_path: str, fast: bool = False) -> List[BezierShape]:
     """
     Parse all shapes and paths in an SVG file and return a list of lists of BezierPaths.
+    `fast` selects the native path data parser, see parse_path_string.
     """
     svg = SVG.parse(file_path)
     shapes = []
     
     for element in svg.elements():
         if isinstance(element, Path) or isinstance(element, Shape):
-            shapes.append(parse_path_string(element.d(relative=False, transformed=True)))
+            shapes.append(parse_path_string(element.d(relative=False, transformed=True), fast=fast))
 
     return shapes
 
-def create_svg_string(shapes: List[BezierShape]) -> str:
+def iter_svg_file(file_path: str, fast: bool = False) -> Iterator[BezierShape]:
+    """
+    Parse the shapes in an SVG file one element at a time.
+
+    Uses incremental XML parsing and frees each element once its shape has been
+    yielded, so memory use is bounded by the largest element rather than the file.
+    Shapes are yielded in document order with group and viewport transforms
+    applied, like parse_svg_file. <use> elements are resolved against any element
+    with the referenced id, before or after them and whether rendered or not. A
+    first pass over the file finds the referenced elements, and only those are
+    kept in memory. Nested <svg> elements, and <svg> and <symbol> elements placed
+    by <use>, map their viewBox onto their viewport as the SVG spec describes,
+    where parse_svg_file moves nested <svg> content by their x and y repeatedly
+    and ignores the viewBox of <symbol>.
+    `fast` selects the native path data parser, see parse_path_string.
+    """
+    def expand_use(use, transform: str, definitions: dict, viewport: tuple[float, float]):
+        return _iter_use_shapes(use, transform, definitions, viewport, fast)
+
+    return _iter_svg(file_path, fast, expand_use)
+
+def parse_svg_instances(file_path: str, fast: bool = False) -> InstancedShapes:
+    """
+    Parse an SVG file keeping each definition referenced by <use> elements once.
+
+    Shapes drawn directly are parsed as in iter_svg_file, while every <use> becomes
+    an instance: the index of a shared shape holding the geometry of the referenced
+    definition, in the definition's own coordinates, and the affine transform placing it.
+    Definitions are parsed the first time they are used. Their shapes, including any
+    nested <use>, are merged into one BezierShape per definition.
+    `fast` selects the native path data parser, see parse_path_string.
+    """
+    drawing = InstancedShapes()
+    # Index of each parsed definition by id, None for definitions without geometry
+    parsed = {}
+    indices, transforms = [], []
+
+    def record_instance(use, transform: str, definitions: dict, viewport: tuple[float, float]):
+        attributes = _element_attributes(use)
+        definition_id = attributes.get("href", "").lstrip("#")
+        referenced = definitions.get(definition_id)
+        if referenced is None:
+            return ()
+        placement, inner_viewport = _use_viewport(referenced, attributes, viewport)
+        if definition_id not in parsed:
+            paths = [path for shape in _iter_definition_shapes(referenced, "", definitions, inner_viewport, fast) for path in shape]
+            parsed[definition_id] = len(drawing.definitions) if paths else None
+            if paths:
+                drawing.definitions.append(BezierShape(paths))
+                drawing.definition_ids.append(definition_id)
+        if parsed[definition_id] is None:
+            return ()
+
+        matrix = Matrix(f"{transform} {_use_transform(attributes)} {placement}")
+        indices.append(parsed[definition_id])
+        transforms.append([[matrix.a, matrix.c, matrix.e], [matrix.b, matrix.d, matrix.f]])
+        return ()
+
+    drawing.shapes = list(_iter_svg(file_path, fast, record_instance))
+    drawing.indices = np.array(indices, dtype=np.intp)
+    drawing.transforms = np.array(transforms, dtype=np.float64).reshape(-1, 2, 3)
+    return drawing
+
+def _iter_svg(file_path: str, fast: bool, expand_use):
+    """
+    Incrementally parse the shapes of an SVG file, see iter_svg_file.
+    `expand_use(use, transform, definitions, viewport)` returns the shapes of each rendered <use> element.
+    """
+    definitions = _referenced_elements(file_path)
+    # Open elements as (element, transform, is_rendered, viewport)
+    stack = []
+
+    for event, element in iterparse(file_path, events=("start", "end")):
+        tag = _local_name(element.tag)
+
+        if event == "start":
+            attributes = _element_attributes(element)
+            transform, is_rendered, viewport = stack[-1][1:] if stack else ("", True, (1000.0, 1000.0))
+
+            if not stack and tag == "svg":
+                transform, viewport = _viewport_transform(attributes)
+            elif tag == "svg":
+                placement, viewport = _nested_viewport(attributes, viewport)
+                transform = f"{transform} {placement}"
+            elif "transform" in attributes:
+                transform = f"{transform} {attributes['transform']}"
+
+            if tag in _DEFINITION_ELEMENTS or attributes.get("display", "").lower() == "none":
+                is_rendered = False
+
+            stack.append((element, transform, is_rendered, viewport))
+            continue
+
+        _, transform, is_rendered, viewport = stack.pop()
+        if is_rendered and tag in _SHAPE_ELEMENTS:
+            shape = _parse_shape_element(element, transform, viewport, fast)
+            if shape is not None:
+                yield shape
+        elif is_rendered and tag == "use":
+            yield from expand_use(element, stack[-1][1] if stack else "", definitions, viewport)
+
+        # Referenced elements were collected by their own pass, everything here is freed
+        element.clear()
+        if stack:
+            stack[-1][0].remove(element)
+
+def _referenced_elements(file_path: str) -> dict:
+    """
+    Elements of an SVG file referenced by <use> elements, by id, with their content.
+
+    One incremental pass collects the referenced ids and, if there are any, a
+    second keeps the elements with them and frees everything else.
+    """
+    referenced = set()
+    stack = []
+    for event, element in iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            stack.append(element)
+            continue
+        stack.pop()
+        if _local_name(element.tag) == "use":
+            referenced.add(_element_attributes(element).get("href", "").lstrip("#"))
+        element.clear()
+        if stack:
+            stack[-1].remove(element)
+    if not referenced:
+        return {}
+
+    definitions = {}
+    # Open elements as (element, is_kept)
+    stack = []
+    for event, element in iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            is_referenced = element.get("id") in referenced
+            if is_referenced:
+                definitions[element.get("id")] = element
+            stack.append((element, is_referenced or (bool(stack) and stack[-1][1])))
+            continue
+        _, is_kept = stack.pop()
+        if not is_kept:
+            element.clear()
+            if stack:
+                stack[-1][0].remove(element)
+    return definitions
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+def _element_attributes(element) -> dict:
+    """
+    Attributes of an element without namespaces, with style properties merged in.
+    """
+    attributes = {_local_name(key): value for key, value in element.attrib.items()}
+    for declaration in attributes.get("style", "").split(";"):
+        key, _, value = declaration.partition(":")
+        if value:
+            attributes[key.strip()] = value.strip()
+    return attributes
+
+def _viewport_transform(attributes: dict) -> tuple[str, tuple[float, float]]:
+    """
+    Transform and viewport size of the root <svg> element, mapping its viewBox onto its width and height.
+    """
+    svg = SVG(attributes)
+    width = svg.viewbox.width if svg.viewbox is not None else 1000
+    height = svg.viewbox.height if svg.viewbox is not None else 1000
+    svg.render(ppi=DEFAULT_PPI, width=width, height=height, viewbox=svg.viewbox)
+
+    transform = attributes.get("transform", "")
+    if svg.viewbox is None:
+        return transform, (svg.width, svg.height)
+    return f"{transform} {svg.viewbox_transform}", (svg.viewbox.width, svg.viewbox.height)
+
+def _nested_viewport(attributes: dict, viewport: tuple[float, float]) -> tuple[str, tuple[float, float]]:
+    """
+    Transform and viewport size of a nested <svg>, or of an <svg> or <symbol> placed
+    by <use>, mapping its viewBox onto its position and size. Lengths in percent
+    are of the enclosing `viewport`.
+    """
+    svg = SVG({key: attributes[key] for key in ("x", "y", "width", "height", "viewBox", "preserveAspectRatio") if key in attributes})
+    svg.render(ppi=DEFAULT_PPI, width=viewport[0], height=viewport[1])
+
+    transform = attributes.get("transform", "")
+    if svg.viewbox is None:
+        return f"{transform} translate({svg.x}, {svg.y})", (svg.width, svg.height)
+    return f"{transform} {svg.viewbox_transform}", (svg.viewbox.width, svg.viewbox.height)
+
+def _parse_shape_element(element, transform: str, viewport: tuple[float, float], fast: bool):
+    """
+    Parse a single SVG shape element with its accumulated transform, None if it is degenerate.
+    """
+    values = _element_attributes(element)
+    values["transform"] = transform
+    # Written by svgelements' own output, it would stop the path data from being read
+    values.pop("pathd_loaded", None)
+    tag = _local_name(element.tag)
+    try:
+        shape = _SHAPE_ELEMENTS[tag](values)
+    except ValueError:
+        return None
+    shape.render(ppi=DEFAULT_PPI, width=viewport[0], height=viewport[1])
+    if shape.is_degenerate():
+        return None
+    return parse_path_string(shape.d(relative=False, transformed=True), fast=fast)
+
+def _iter_use_shapes(use, transform: str, definitions: dict, viewport: tuple[float, float], fast: bool, depth=0):
+    """
+    Yield the shapes of the definition referenced by a <use> element.
+    """
+    attributes = _element_attributes(use)
+    referenced = definitions.get(attributes.get("href", "").lstrip("#"))
+    if referenced is None or depth > 32:
+        return
+
+    placement, viewport = _use_viewport(referenced, attributes, viewport)
+    transform = f"{transform} {_use_transform(attributes)} {placement}"
+    yield from _iter_definition_shapes(referenced, transform, definitions, viewport, fast, depth)
+
+def _use_transform(attributes: dict) -> str:
+    """
+    Transform a <use> element applies to its definition, including its x and y offset.
+    """
+    return f"{attributes.get('transform', '')} translate({attributes.get('x', 0)}, {attributes.get('y', 0)})"
+
+def _use_viewport(referenced, use_attributes: dict, viewport: tuple[float, float]) -> tuple[str, tuple[float, float]]:
+    """
+    Transform and viewport a <use> element places an <svg> or <symbol> with, whose
+    width and height it may set. Other elements are placed as they are.
+    """
+    if _local_name(referenced.tag) not in ("svg", "symbol"):
+        return "", viewport
+    attributes = _element_attributes(referenced)
+    attributes.update({key: use_attributes[key] for key in ("width", "height") if key in use_attributes})
+    return _nested_viewport(attributes, viewport)
+
+def _iter_definition_shapes(referenced, transform: str, definitions: dict, viewport: tuple[float, float], fast: bool, depth=0):
+    """
+    Yield the shapes inside a definition element with `transform` applied.
+    A referenced <svg> or <symbol> is expected to be placed by `transform` and
+    `viewport` already, see _use_viewport.
+    """
+    def walk(element, transform, viewport, is_top=False):
+        tag = _local_name(element.tag)
+        attributes = _element_attributes(element)
+        if attributes.get("display", "").lower() == "none" or tag in ("clipPath", "mask", "marker", "pattern"):
+            return
+        if tag == "symbol" and not is_top:
+            return
+        if tag in _SHAPE_ELEMENTS:
+            shape = _parse_shape_element(element, f"{transform} {attributes.get('transform', '')}", viewport, fast)
+            if shape is not None:
+                yield shape
+        elif tag == "use":
+            yield from _iter_use_shapes(element, transform, definitions, viewport, fast, depth + 1)
+        else:
+            if tag == "svg" and not is_top:
+                placement, viewport = _nested_viewport(attributes, viewport)
+                transform = f"{transform} {placement}"
+            elif tag not in ("svg", "symbol"):
+                transform = f"{transform} {attributes.get('transform', '')}"
+            for child in element:
+                yield from walk(child, transform, viewport)
+
+    yield from walk(referenced, transform, viewport, is_top=True)
+
+def create_svg_string(shapes: List[BezierShape], precision: int = 5, relative: bool = False, instances: Optional[InstancedShapes] = None) -> str:
     """
     Convert a list of lists of BezierPaths to an SVG string.
+    `precision` and `relative` are passed on to create_path_string.
+
+    The definitions of `instances` are written once inside <defs>, followed by a
+    <use> element per instance, e.g. create_svg_string(drawing.shapes, instances=drawing)
+    for the result of parse_svg_instances.
     """
     svg = SVG()
     
     for object in shapes:
-        print(type(object))
-        d_string = create_path_string(object)
+        d_string = create_path_string(object, precision=precision, relative=relative)
         path = Path(d=d_string, fill="none", stroke="#000")
         svg.append(path)
 
-    return svg.string_xml()
+    svg_string = svg.string_xml()
+    if instances is None or not instances.definitions:
+        return svg_string
+    # An <svg> without shapes is written as an empty element
+    opening = svg_string[:-len("</svg>")] if svg_string.endswith("</svg>") else svg_string[:-len("/>")].rstrip() + ">"
+    return opening + _instances_string(instances, precision, relative) + "</svg>"
 
-def save_svg_file(filepath: str, shapes: List[BezierShape]) -> None:
+def _instances_string(instances: InstancedShapes, precision: int, relative: bool) -> str:
+    """
+    <defs> with the definitions of `instances` followed by their <use> elements.
+    """
+    # Ids can hold any text, they're quoted and escaped as attribute values
+    ids = [quoteattr(definition_id) for definition_id in instances.definition_ids]
+    references = [quoteattr(f"#{definition_id}") for definition_id in instances.definition_ids]
+    definitions = "".join(
+        f'<path id={definition_id} d="{create_path_string(shape, precision=precision, relative=relative)}" '
+        'stroke="#000000" stroke-width="1.0" fill="none" />'
+        for definition_id, shape in zip(ids, instances.definitions)
+        )
+    # Matrix values in SVG order a, b, c, d, e, f
+    values = instances.transforms.transpose(0, 2, 1).reshape(-1)
+    numbers = (" ".join([f"%.{precision}f"] * len(values)) % tuple(values.tolist()))
+    if precision > 0:
+        numbers = _TRAILING_ZEROS.sub("", numbers)
+    numbers = _NEGATIVE_ZERO.sub("0", numbers).split(" ")
+    uses = "".join(
+        f'<use xlink:href={references[index]} transform="matrix({",".join(numbers[6 * i:6 * i + 6])})" />'
+        for i, index in enumerate(instances.indices.tolist())
+        )
+    return f"<defs>{definitions}</defs>{uses}"
+
+def save_svg_file(filepath: str, shapes: List[BezierShape], precision: int = 5, relative: bool = False, instances: Optional[InstancedShapes] = None) -> None:
     """
     Save a list of lists of BezierPaths to an SVG file.
+    `precision`, `relative` and `instances` are passed on to create_svg_string.
     """
-    pass
-
-#     with open(filepath, "w") as f:
-#         f.write(create_svg_string(objects))
\ No newline at end of file
+    with open(filepath, "w") as f:
+        f.write(create_svg_string(shapes, precision=precision, relative=relative, instances=instances))
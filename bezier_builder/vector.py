@@ -1,3 +1,5 @@
+import math
+import numbers
 import numpy as np
 
 
@@ -59,3 +61,103 @@ class Vector(np.ndarray):
     def is_close_to_zero(self, tolerance=1e-6) -> bool:
         return self.magnitude() < tolerance
     
+
+
+class Vec2:
+    """
+    Lightweight 2D vector of two Python floats with the same interface as Vector.
+
+    Vector goes through NumPy dispatch for every operation, which dominates the cost
+    of per-point math. Vec2 is used for that math internally, use `to_vector()` or
+    np.asarray() when the ndarray form is needed.
+    """
+    __slots__ = ("x", "y")
+
+    def __init__(self, x=0.0, y=0.0):
+        self.x = float(x)
+        self.y = float(y)
+
+    @classmethod
+    def as_vec2(cls, obj: object) -> 'Vec2':
+        if hasattr(obj, 'x') and hasattr(obj, 'y'):
+            return cls(obj.x, obj.y)
+        x, y = obj
+        return cls(x, y)
+
+    def to_vector(self) -> Vector:
+        return Vector(self.x, self.y)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array((self.x, self.y), dtype=dtype or np.float64)
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, index):
+        return (self.x, self.y)[index]
+
+    def __add__(self, other):
+        if isinstance(other, Vec2):
+            return Vec2(self.x + other.x, self.y + other.y)
+        return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, Vec2):
+            return Vec2(self.x - other.x, self.y - other.y)
+        return NotImplemented
+
+    def __mul__(self, scalar):
+        if isinstance(scalar, numbers.Real):
+            return Vec2(self.x * scalar, self.y * scalar)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        if isinstance(scalar, numbers.Real):
+            return Vec2(self.x / scalar, self.y / scalar)
+        return NotImplemented
+
+    def __neg__(self):
+        return Vec2(-self.x, -self.y)
+
+    def __eq__(self, other):
+        if isinstance(other, Vec2):
+            return self.x == other.x and self.y == other.y
+        return NotImplemented
+
+    __hash__ = None
+
+    def magnitude(self) -> float:
+        return math.hypot(self.x, self.y)
+
+    def normalize(self) -> 'Vec2':
+        magnitude = self.magnitude()
+        return self / magnitude if magnitude != 0 else Vec2(self.x, self.y)
+
+    def is_parallel_to(self, other: 'Vec2', tolerance=1e-6) -> bool:
+        cross_product = self.x * other.y - self.y * other.x
+        return abs(cross_product) <= tolerance
+
+    def is_continuous_with(self, other: 'Vec2', tolerance=1e-6) -> bool:
+        sum = self.normalize() + other.normalize()
+        return sum.magnitude() < tolerance
+
+    def mirrors(self, other: 'Vec2', tolerance=1e-6) -> bool:
+        sum = self + other
+        return sum.magnitude() < tolerance
+
+    def is_close(self, other: 'Vec2', tolerance=1e-6) -> bool:
+        # Same test as np.allclose with its default relative tolerance
+        return (abs(self.x - other.x) <= tolerance + 1e-5 * abs(other.x)
+                and abs(self.y - other.y) <= tolerance + 1e-5 * abs(other.y))
+
+    def is_close_to_zero(self, tolerance=1e-6) -> bool:
+        return self.magnitude() < tolerance
+
+    def __repr__(self):
+        return f"Vec2({self.x}, {self.y})"
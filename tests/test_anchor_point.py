@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 
-from bezier_builder.anchor_point import AnchorPoint
+from bezier_builder.anchor_point import AnchorPoint, CORNER, ALIGNED, SYMMETRIC, constrained_handles, detect_handle_types
 from bezier_builder.vector import Vector
 
 @pytest.fixture
@@ -128,3 +128,49 @@ def test_reset_handles(anchor):
     
     np.testing.assert_array_equal(anchor._handle_in, Vector(0, 0))
     np.testing.assert_array_equal(anchor._handle_out, Vector(0, 0))
+
+def test_setting_handles_keeps_constraint(anchor):
+    anchor._handle_in = Vector(10, 0)
+    anchor._handle_out = Vector(-5, 0)
+    anchor._handle_type = "aligned"
+
+    anchor.handle_in = Vector(0, 3)
+    np.testing.assert_allclose(anchor.handle_out, Vector(0, -5))
+    anchor.handle_out = Vector(4, 0)
+    np.testing.assert_allclose(anchor.handle_in, Vector(-3, 0))
+    # A zero handle leaves the opposite handle of an aligned anchor alone
+    anchor.handle_in = Vector(0, 0)
+    np.testing.assert_allclose(anchor.handle_out, Vector(4, 0))
+
+    anchor.handle_type = "symmetric"
+    anchor.handle_out = Vector(1, 2)
+    np.testing.assert_allclose(anchor.handle_in, Vector(-1, -2))
+
+    anchor.handle_type = "corner"
+    anchor.handle_in = Vector(7, 7)
+    np.testing.assert_allclose(anchor.handle_out, Vector(1, 2))
+
+def test_constrained_handles():
+    handles = np.array([[3.0, 4.0], [3.0, 4.0], [3.0, 4.0], [0.0, 0.0]])
+    opposite = np.array([[1.0, 1.0], [0.0, 10.0], [1.0, 1.0], [1.0, 1.0]])
+    result = constrained_handles(handles, opposite, np.array([CORNER, ALIGNED, SYMMETRIC, ALIGNED]))
+    np.testing.assert_allclose(result, [[1, 1], [-6, -8], [-3, -4], [1, 1]])
+
+def test_detect_handle_types_matches_anchors():
+    rng = np.random.default_rng(0)
+    handles_in = rng.normal(size=(6, 2))
+    handles_out = rng.normal(size=(6, 2))
+    handles_out[1] = -handles_in[1]
+    handles_out[2] = -3 * handles_in[2]
+    handles_in[3] = handles_out[3] = 0
+    handles_in[4] = 0
+    expected = []
+    for handle_in, handle_out in zip(handles_in, handles_out):
+        anchor = AnchorPoint()
+        anchor._handle_in = handle_in
+        anchor._handle_out = handle_out
+        anchor.detect_handle_type()
+        expected.append(anchor._store._handle_types[0])
+    handle_types = detect_handle_types(handles_in, handles_out)
+    np.testing.assert_array_equal(handle_types, expected)
+    np.testing.assert_array_equal(handle_types, [CORNER, SYMMETRIC, ALIGNED, SYMMETRIC, CORNER, CORNER])
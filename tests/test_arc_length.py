@@ -0,0 +1,127 @@
+import pytest
+import numpy as np
+
+from bezier_builder import arc_length, cubic
+from bezier_builder.bezier_path import BezierPath, BezierShape
+
+@pytest.fixture
+def curve():
+    """
+    Open path of two curved segments and a straight one.
+    """
+    return BezierPath.from_arrays(
+        [[0, 0], [30, 0], [30, -30], [60, -30]],
+        [[0, 0], [0, 10], [-5, 10], [0, 0]],
+        [[0, 10], [0, -10], [0, 0], [0, 0]],
+    )
+
+def polyline_lengths(controls: np.ndarray, samples: int = 100001) -> np.ndarray:
+    t = np.linspace(0, 1, samples)
+    segments = np.repeat(np.arange(len(controls)), samples).reshape(len(controls), samples)
+    points = cubic.evaluate(controls, segments, np.broadcast_to(t, segments.shape))
+    return np.linalg.norm(np.diff(points, axis=1), axis=2).sum(axis=1)
+
+def test_segment_lengths():
+    rng = np.random.default_rng(0)
+    controls = rng.normal(0, 10, (20, 4, 2))
+    np.testing.assert_allclose(arc_length.segment_lengths(controls), polyline_lengths(controls), rtol=1e-3)
+
+def test_straight_segment_length():
+    # Handles along the line change the speed but not the length
+    controls = np.array([[[0, 0], [1, 0], [2, 0], [10, 0]]], dtype=np.float64)
+    np.testing.assert_allclose(arc_length.segment_lengths(controls), [10])
+
+def test_length(curve: BezierPath):
+    expected = polyline_lengths(curve.segments()).sum()
+    assert curve.length() == pytest.approx(expected, rel=1e-6)
+    assert BezierPath().length() == 0
+
+def test_length_closed():
+    path = BezierPath.from_arrays([[0, 0], [10, 0], [10, 10], [0, 10]], is_closed=True)
+    assert path.length() == pytest.approx(40)
+
+def test_point_at_distance(curve: BezierPath):
+    np.testing.assert_allclose(curve.point_at_distance(0), [0, 0])
+    np.testing.assert_allclose(curve.point_at_distance(curve.length()), [60, -30])
+    # Distances past the ends are clipped
+    np.testing.assert_allclose(curve.point_at_distance([-1, 1e9]), [[0, 0], [60, -30]])
+
+    # The last segment is a straight line, 30 long
+    end = curve.length()
+    np.testing.assert_allclose(curve.point_at_distance(end - 10), [50, -30], atol=1e-9)
+
+def test_point_at_distance_matches_partial_lengths(curve: BezierPath):
+    distances = np.linspace(0, curve.length(), 50)
+    table = curve._arc_length_table()
+    segments, t = table.locate(distances)
+    # Integrate from the segment starts to t in many small pieces
+    knots = t[:, np.newaxis] * np.linspace(0, 1, 65)
+    pieces = arc_length.integrate(cubic.power_coefficients(table.controls[segments]), knots[:, :-1], knots[:, 1:])
+    np.testing.assert_allclose(table.cumulative[segments] + pieces.sum(axis=1), distances, atol=1e-9)
+
+def test_point_at_distance_empty():
+    with pytest.raises(ValueError):
+        BezierPath.from_arrays([[0, 0]]).point_at_distance(0)
+
+def test_resample():
+    path = BezierPath.from_arrays([[0, 0], [10, 0], [10, 5]])
+    np.testing.assert_allclose(path.resample(5), [[0, 0], [5, 0], [10, 0], [10, 5]], atol=1e-9)
+    np.testing.assert_allclose(path.resample(4), [[0, 0], [4, 0], [8, 0], [10, 2]], atol=1e-9)
+    with pytest.raises(ValueError):
+        path.resample(0)
+
+def test_resample_closed():
+    # Closed paths don't repeat their first anchor
+    path = BezierPath.from_arrays([[0, 0], [10, 0], [10, 10], [0, 10]], is_closed=True)
+    assert len(path.resample(10)) == 4
+    assert len(path.resample(15)) == 3
+
+def test_resample_spacing(curve: BezierPath):
+    points = curve.resample(0.5)
+    segments, t = curve._arc_length_table().locate(np.arange(len(points)) * 0.5)
+    np.testing.assert_allclose(points, cubic.evaluate(curve.segments(), segments, t))
+    # Chords are never longer than the arcs between points and only shorter around the corner
+    chords = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    assert np.all(chords <= 0.5 + 1e-9)
+    assert np.median(chords) == pytest.approx(0.5, rel=1e-3)
+
+def test_table_updates_changed_segments(curve: BezierPath, monkeypatch):
+    curve.length()
+    integrated = []
+    knot_lengths = arc_length.knot_lengths
+    monkeypatch.setattr(arc_length, "knot_lengths", lambda controls: integrated.append(len(controls)) or knot_lengths(controls))
+
+    # Nothing changed
+    curve.length()
+    assert integrated == []
+
+    # Moving the last anchor only changes the last segment
+    curve.positions[3] = (70, -30)
+    assert curve.length() == pytest.approx(polyline_lengths(curve.segments()).sum(), rel=1e-6)
+    assert integrated == [1]
+
+    # Moving a handle changes the segment it belongs to
+    curve.anchor_points[1].handle_out[:] = (0, -20)
+    curve.length()
+    assert integrated == [1, 1]
+
+    # Appending adds one segment, closing adds the closing segment
+    curve.create(pos=np.array([70, 0.0]))
+    curve.length()
+    curve.is_closed = True
+    curve.length()
+    assert integrated == [1, 1, 1, 1]
+
+def test_shape_arc_length():
+    shape = BezierShape([
+        BezierPath.from_arrays([[0, 0], [10, 0]]),
+        BezierPath.from_arrays([[5, 5]]),
+        BezierPath.from_arrays([[0, 5], [0, 25]]),
+    ])
+    assert shape.length() == pytest.approx(30)
+    # Distances where paths meet select the start of the next path
+    np.testing.assert_allclose(shape.point_at_distance([0, 5, 10, 15, 30]), [[0, 0], [5, 0], [0, 5], [0, 10], [0, 25]], atol=1e-9)
+
+    resampled = shape.resample(10)
+    assert [len(points) for points in resampled] == [2, 1, 3]
+    np.testing.assert_allclose(resampled[2], [[0, 5], [0, 15], [0, 25]], atol=1e-9)
@@ -0,0 +1,114 @@
+import pytest
+import numpy as np
+import os
+import pickle
+
+from bezier_builder.batch import BatchError, process_svg_files, convert_svg_files, find_svg_files, main
+from bezier_builder.bezier_path import BezierPath, BezierShape
+from bezier_builder.svg_converter import parse_svg_file, parse_path_string
+
+DATA = os.path.join(os.path.dirname(__file__), "data")
+
+def reverse_shapes(shapes):
+    return shapes[::-1]
+
+@pytest.fixture
+def svg_files():
+    return find_svg_files([os.path.join(DATA, "shapes.svg"), os.path.join(DATA, "triangle.svg"), os.path.join(DATA, "groups_and_uses.svg")])
+
+def test_find_svg_files():
+    files = find_svg_files([DATA])
+    assert os.path.join(DATA, "shapes.svg") in files
+    assert all(file.endswith(".svg") for file in files)
+
+def test_shape_pickle_round_trip():
+    shape = parse_path_string("M 0 0 C 10 -10 20 -10 30 0 C 20 10 -10 10 0 0 Z M 5 5 L 6 6")
+    restored = pickle.loads(pickle.dumps(shape))
+    assert isinstance(restored, BezierShape)
+    assert len(restored) == 2
+    for path, expected in zip(restored, shape):
+        assert path.is_closed == expected.is_closed
+        np.testing.assert_array_equal(path.positions, expected.positions)
+        np.testing.assert_array_equal(path.handles_in, expected.handles_in)
+        np.testing.assert_array_equal(path.handles_out, expected.handles_out)
+        np.testing.assert_array_equal(path.handle_types, expected.handle_types)
+
+def test_anchor_pickle_copies_row():
+    path = BezierPath.from_arrays(np.arange(2000).reshape(1000, 2))
+    data = pickle.dumps(path.anchor_points[500])
+    assert len(data) < 1000
+    anchor = pickle.loads(data)
+    np.testing.assert_array_equal(anchor.pos, [1000, 1001])
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_svg_files(svg_files, workers):
+    results = list(process_svg_files(svg_files, edit=reverse_shapes, workers=workers))
+    assert [file_path for file_path, _ in results] == svg_files
+    for file_path, shapes in results:
+        expected = parse_svg_file(file_path)[::-1]
+        assert len(shapes) == len(expected)
+        for shape, expected_shape in zip(shapes, expected):
+            np.testing.assert_allclose(shape[0].positions, expected_shape[0].positions)
+
+def test_process_svg_files_unordered(svg_files):
+    results = list(process_svg_files(svg_files, workers=2, chunk_size=2, ordered=False))
+    assert sorted(file_path for file_path, _ in results) == sorted(svg_files)
+
+def test_convert_svg_files(svg_files, tmp_path):
+    results = list(convert_svg_files(svg_files, str(tmp_path), workers=2, precision=2))
+    assert len(results) == len(svg_files)
+    for input_path, output_path in results:
+        assert os.path.exists(output_path)
+        assert len(parse_svg_file(output_path)) == len(parse_svg_file(input_path))
+
+def test_convert_keeps_relative_paths(tmp_path):
+    # Files of the same name in different directories don't overwrite each other
+    triangle = open(os.path.join(DATA, "triangle.svg")).read()
+    inputs = []
+    for name in ("a", "b"):
+        os.makedirs(tmp_path / "in" / name)
+        (tmp_path / "in" / name / "drawing.svg").write_text(triangle)
+        inputs.append(str(tmp_path / "in" / name / "drawing.svg"))
+    results = list(convert_svg_files(inputs, str(tmp_path / "out"), workers=1))
+    assert [output_path for _, output_path in results] == [str(tmp_path / "out" / name / "drawing.svg") for name in ("a", "b")]
+    assert all(os.path.exists(output_path) for _, output_path in results)
+
+    with pytest.raises(ValueError):
+        list(convert_svg_files(inputs + inputs[:1], str(tmp_path / "out"), workers=1))
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failures_are_collected(svg_files, tmp_path, workers):
+    broken = tmp_path / "broken.svg"
+    broken.write_text("<svg")
+    files = [svg_files[0], str(broken), svg_files[1]]
+    converted = []
+    with pytest.raises(BatchError) as error:
+        for input_path, _ in convert_svg_files(files, str(tmp_path / "out"), workers=workers):
+            converted.append(input_path)
+    # The other files are converted before the failures are raised
+    assert converted == [svg_files[0], svg_files[1]]
+    assert [file_path for file_path, _ in error.value.failures] == [str(broken)]
+    assert "ParseError" in error.value.failures[0][1]
+
+    with pytest.raises(BatchError):
+        list(process_svg_files(files, workers=workers))
+
+def test_command_line_reports_failures(tmp_path, capsys):
+    broken = tmp_path / "broken.svg"
+    broken.write_text("<svg")
+    with pytest.raises(SystemExit) as exit:
+        main([os.path.join(DATA, "triangle.svg"), str(broken), "-o", str(tmp_path / "out"), "-j", "1"])
+    assert exit.value.code == 1
+    captured = capsys.readouterr()
+    assert "triangle.svg" in captured.out
+    assert "broken.svg" in captured.err
+
+def test_invalid_chunk_size(svg_files):
+    with pytest.raises(ValueError):
+        list(process_svg_files(svg_files, chunk_size=0))
+
+def test_command_line(svg_files, tmp_path, capsys):
+    main([DATA, "-o", str(tmp_path), "-j", "1", "--edit", "tests.test_batch:reverse_shapes", "--relative"])
+    output = capsys.readouterr().out
+    assert "shapes.svg" in output
+    assert os.path.exists(tmp_path / "triangle.svg")
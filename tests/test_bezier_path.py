@@ -97,3 +97,267 @@ def test_initialize_shape(shape: BezierShape, path: BezierPath):
     assert shape != None
     shape.append(path)
     assert len(shape) == 1
+
+def test_from_arrays():
+    positions = np.array([[0, 0], [10, 0], [10, 10]])
+    handles_out = np.array([[5, 0], [0, 0], [0, 0]])
+    path = BezierPath.from_arrays(positions, handles_out=handles_out, is_closed=True)
+    assert len(path) == 3
+    assert path.is_closed == True
+    assert path.positions.dtype == np.float64
+    assert path.handle_types.dtype == np.uint8
+    np.testing.assert_array_equal(path.positions, positions)
+    np.testing.assert_array_equal(path.handles_in, np.zeros((3, 2)))
+    np.testing.assert_array_equal(path.start.handle_out, Vector(5, 0))
+    assert path.end.handle_type == "corner"
+
+def test_anchor_points_are_views(path: BezierPath):
+    path.create(pos=Vector(1, 2))
+    path.create(pos=Vector(3, 4))
+
+    # Writing through an anchor updates the arrays
+    path.end.pos = Vector(30, 40)
+    path.end.handle_in = Vector(-1, 0)
+    np.testing.assert_array_equal(path.positions[1], [30, 40])
+    np.testing.assert_array_equal(path.handles_in[1], [-1, 0])
+
+    # Bulk array operations are visible through the anchors
+    path.positions[:] += 10
+    np.testing.assert_array_equal(path.start.pos, Vector(11, 12))
+    np.testing.assert_array_equal(path.end.pos, Vector(40, 50))
+
+def test_appended_anchor_is_bound(path: BezierPath):
+    point = AnchorPoint(5, 6)
+    point.handle_out = Vector(1, 1)
+    path.append(point)
+    assert path.anchor_points[-1] is point
+    point.pos = Vector(7, 8)
+    np.testing.assert_array_equal(path.positions[0], [7, 8])
+    np.testing.assert_array_equal(path.handles_out[0], [1, 1])
+
+def test_arrays_grow(path: BezierPath):
+    for i in range(100):
+        path.create(pos=Vector(i, -i))
+    assert len(path) == 100
+    assert len(path.anchor_points) == 100
+    np.testing.assert_array_equal(path.positions[:, 0], np.arange(100))
+    np.testing.assert_array_equal(path.anchor_points[57].pos, Vector(57, -57))
+
+def test_anchors_follow_grown_arrays(path: BezierPath):
+    # Anchors keep tracking their row after the arrays are reallocated, read vectors are read again
+    path.create(pos=Vector(1, 2))
+    anchor = path.start
+    for i in range(100):
+        path.create(pos=Vector(i, -i))
+    anchor.pos = Vector(5, 6)
+    np.testing.assert_array_equal(path.positions[0], [5, 6])
+    np.testing.assert_array_equal(anchor.pos, Vector(5, 6))
+
+def test_pop_detaches_anchor(path: BezierPath):
+    path.create(pos=Vector(0, 0))
+    path.create(pos=Vector(1, 1))
+    path.create(pos=Vector(2, 2))
+    middle = path.anchor_points[1]
+    last = path.end
+
+    popped = path.anchor_points.pop(1)
+    assert popped is middle
+    assert len(path) == 2
+    np.testing.assert_array_equal(path.positions, [[0, 0], [2, 2]])
+    assert path.end is last
+    np.testing.assert_array_equal(last.pos, Vector(2, 2))
+
+    # The removed anchor keeps its values but no longer writes into the path
+    popped.pos = Vector(9, 9)
+    np.testing.assert_array_equal(popped.pos, Vector(9, 9))
+    np.testing.assert_array_equal(path.positions, [[0, 0], [2, 2]])
+
+def test_anchor_list_mutations(path: BezierPath):
+    path.create(pos=Vector(0, 0))
+    path.create(pos=Vector(1, 1))
+    path.anchor_points.insert(0, AnchorPoint(-1, -1))
+    np.testing.assert_array_equal(path.positions, [[-1, -1], [0, 0], [1, 1]])
+
+    path.anchor_points.reverse()
+    np.testing.assert_array_equal(path.positions, [[1, 1], [0, 0], [-1, -1]])
+
+    del path.anchor_points[0]
+    np.testing.assert_array_equal(path.positions, [[0, 0], [-1, -1]])
+    path.start.pos = Vector(4, 4)
+    np.testing.assert_array_equal(path.positions[0], [4, 4])
+
+    path.anchor_points = [AnchorPoint(7, 7)]
+    assert len(path) == 1
+    np.testing.assert_array_equal(path.positions, [[7, 7]])
+
+def test_segments():
+    path = BezierPath()
+    path.create(pos=Vector(0, 0), handle_out=Vector(10, 0))
+    path.create(pos=Vector(30, 0), handle_in=Vector(-10, 0))
+    path.create(pos=Vector(30, 30))
+    assert path.segment_count == 2
+    np.testing.assert_array_equal(path.segments(), [
+        [[0, 0], [10, 0], [20, 0], [30, 0]],
+        [[30, 0], [30, 0], [30, 30], [30, 30]],
+    ])
+
+    path.is_closed = True
+    assert path.segment_count == 3
+    np.testing.assert_array_equal(path.segments()[2], [[30, 30], [30, 30], [0, 0], [0, 0]])
+
+def test_evaluate():
+    path = BezierPath()
+    path.create(pos=Vector(0, 0), handle_out=Vector(0, 10))
+    path.create(pos=Vector(30, 0), handle_in=Vector(0, 10))
+    path.create(pos=Vector(30, -30))
+
+    np.testing.assert_allclose(path.evaluate(0), [0, 0])
+    np.testing.assert_allclose(path.evaluate(0.5), [15, 7.5])
+    np.testing.assert_allclose(path.evaluate([1, 1.5, 2]), [[30, 0], [30, -15], [30, -30]])
+
+    # Compare against the Bernstein form for many parameters
+    t = np.linspace(0, 1, 101)
+    p0, p1, p2, p3 = path.segments()[0]
+    expected = ((1 - t) ** 3)[:, None] * p0 + (3 * (1 - t) ** 2 * t)[:, None] * p1 \
+        + (3 * (1 - t) * t ** 2)[:, None] * p2 + (t ** 3)[:, None] * p3
+    np.testing.assert_allclose(path.evaluate(t), expected, atol=1e-9)
+
+def test_evaluate_closed():
+    path = BezierPath.from_arrays([[0, 0], [10, 0], [10, 10]], is_closed=True)
+    np.testing.assert_allclose(path.evaluate([2.5, 3]), [[5, 5], [0, 0]])
+
+def test_evaluate_empty(path: BezierPath):
+    path.create()
+    with pytest.raises(ValueError):
+        path.evaluate(0)
+
+def test_shape_evaluate(shape: BezierShape):
+    shape.append(BezierPath.from_arrays([[0, 0], [10, 0]]))
+    shape.append(BezierPath.from_arrays([[0, 5], [10, 5], [10, 15]]))
+    assert shape.segment_count == 3
+    np.testing.assert_allclose(shape.evaluate([0.5, 1.5, 2.5, 3]), [[5, 0], [5, 5], [10, 10], [10, 15]])
+
+def test_bounds(path: BezierPath, shape: BezierShape):
+    assert path.bounds() is None
+    path.create(pos=Vector(5, 5))
+    np.testing.assert_array_equal(path.bounds(), [[5, 5], [5, 5]])
+
+    path = BezierPath.from_arrays([[0, 0], [30, 0], [30, -30]], [[0, 0], [0, 10], [0, 0]], [[0, 10], [0, 0], [0, 0]])
+    np.testing.assert_allclose(path.segment_bounds(), [[[0, 0], [30, 7.5]], [[30, -30], [30, 0]]])
+    np.testing.assert_allclose(path.bounds(), [[0, -30], [30, 7.5]])
+
+    assert shape.bounds() is None
+    shape.append(BezierPath())
+    shape.append(path)
+    shape.append(BezierPath.from_arrays([[-10, 0], [-5, 0]]))
+    np.testing.assert_allclose(shape.bounds(), [[-10, -30], [30, 7.5]])
+    assert shape.segment_bounds().shape == (3, 2, 2)
+
+def test_flatten():
+    path = BezierPath.from_arrays([[0, 0], [30, 0], [30, -30]], [[0, 0], [0, 10], [0, 0]], [[0, 10], [0, 0], [0, 0]])
+    for tolerance in (1, 0.1, 0.01):
+        vertices = path.flatten(tolerance)
+        np.testing.assert_array_equal(vertices[[0, -1]], [[0, 0], [30, -30]])
+
+        # Every point on the curve lies within tolerance of the polyline
+        t = np.linspace(0, 1, 2001)
+        curve = path.evaluate(t)
+        a, b = vertices[:-1], vertices[1:]
+        direction = b - a
+        u = np.clip(np.einsum("pmk,mk->pm", curve[:, None] - a, direction) / np.sum(direction ** 2, axis=1), 0, 1)
+        distances = np.linalg.norm(curve[:, None] - (a + u[..., None] * direction), axis=2).min(axis=1)
+        assert distances.max() <= tolerance
+
+    # The straight segment is a single line
+    np.testing.assert_array_equal(path.flatten(0.1)[-2], [30, 0])
+
+def test_flatten_closed():
+    path = BezierPath.from_arrays([[0, 0], [10, 0], [10, 10]], is_closed=True)
+    np.testing.assert_array_equal(path.flatten(0.1), [[0, 0], [10, 0], [10, 10], [0, 0]])
+
+def test_shape_flatten(shape: BezierShape):
+    vertices, offsets = shape.flatten(0.1)
+    assert vertices.shape == (0, 2)
+    assert offsets.tolist() == [0]
+
+    shape.append(BezierPath.from_arrays([[0, 0], [10, 0]]))
+    shape.append(BezierPath())
+    shape.append(BezierPath.from_arrays([[5, 5]]))
+    shape.append(BezierPath.from_arrays([[0, 0], [30, 0], [30, -30]], [[0, 0], [0, 10], [0, 0]], [[0, 10], [0, 0], [0, 0]]))
+    vertices, offsets = shape.flatten(0.1)
+    assert offsets[:4].tolist() == [0, 2, 2, 3]
+    np.testing.assert_array_equal(vertices[:3], [[0, 0], [10, 0], [5, 5]])
+    np.testing.assert_array_equal(vertices[offsets[3]:], shape[3].flatten(0.1))
+
+def test_transform():
+    path = BezierPath.from_arrays([[0, 0], [10, 0]], [[0, 0], [-2, 3]], [[4, 1], [0, 0]], [0, 2])
+    matrix = [[2, 0, 5], [0, -1, 1]]
+    transformed = path.transform(matrix)
+    np.testing.assert_array_equal(transformed.positions, [[5, 1], [25, 1]])
+    np.testing.assert_array_equal(transformed.handles_in, [[0, 0], [-4, -3]])
+    np.testing.assert_array_equal(transformed.handles_out, [[8, -1], [0, 0]])
+    np.testing.assert_array_equal(transformed.handle_types, [0, 2])
+    np.testing.assert_array_equal(path.positions, [[0, 0], [10, 0]])
+    # Transforming the segments is the same as transforming the curve
+    t = np.linspace(0, 1, 9)
+    np.testing.assert_allclose(transformed.evaluate(t), path.evaluate(t) @ np.array(matrix)[:, :2].T + [5, 1])
+
+    anchor = path.anchor_points[1]
+    assert path.transform(matrix, in_place=True) is path
+    np.testing.assert_array_equal(anchor.pos, [25, 1])
+    with pytest.raises(ValueError):
+        path.transform(np.eye(2))
+
+def test_shape_transform():
+    shape = BezierShape([
+        BezierPath.from_arrays([[0, 0], [10, 0]], None, [[0, 5], [0, 0]]),
+        BezierPath.from_arrays([[1, 1], [2, 2], [3, 1]], is_closed=True),
+        ])
+    matrices = np.array([[[1, 0, 10], [0, 1, 0]], [[0, -1, 0], [1, 0, 0]]])
+    first, second = shape.transform_many(matrices)
+    np.testing.assert_array_equal(first[1].positions, [[11, 1], [12, 2], [13, 1]])
+    np.testing.assert_array_equal(second[0].handles_out, [[-5, 0], [0, 0]])
+    assert second[1].is_closed
+    np.testing.assert_array_equal(shape.transform(matrices[1])[1].positions, second[1].positions)
+    assert shape.transform(matrices[0], in_place=True) is shape
+    np.testing.assert_array_equal(shape[0].positions, [[10, 0], [20, 0]])
+
+def test_move_anchors():
+    path = BezierPath.from_arrays([[0, 0], [10, 0], [20, 0]], [[0, 0], [-2, 0], [0, 0]], [[1, 0], [2, 0], [0, 0]])
+    anchor = path.anchor_points[1]
+    path.move_anchors([1, 2], [5, 5])
+    np.testing.assert_array_equal(path.positions, [[0, 0], [15, 5], [25, 5]])
+    np.testing.assert_array_equal(path.handles_in[1], [-2, 0])
+    np.testing.assert_array_equal(anchor.pos, [15, 5])
+    path.move_anchors([0, 0], [[1, 0], [0, 1]])
+    np.testing.assert_array_equal(path.positions[0], [1, 1])
+
+def test_move_handles():
+    path = BezierPath.from_arrays(
+        [[0, 0], [10, 0], [20, 0]], [[0, 0], [-2, 0], [-3, 0]], [[1, 0], [4, 0], [3, 0]], [0, 1, 2]
+        )
+    path.move_handles([0, 1, 2], [0, 3], side="out")
+    np.testing.assert_array_equal(path.handles_out, [[1, 3], [4, 3], [3, 3]])
+    np.testing.assert_array_equal(path.handles_in[0], [0, 0])
+    np.testing.assert_allclose(path.handles_in[1], [-1.6, -1.2])
+    np.testing.assert_array_equal(path.handles_in[2], [-3, -3])
+    path.move_handles([-1], [[1, 0]], side="in")
+    np.testing.assert_array_equal(path.handles_out[2], [2, 3])
+    path.move_handles([], [1, 1])
+    with pytest.raises(ValueError):
+        path.move_handles([0], [1, 1], side="both")
+
+def test_detect_handle_types():
+    path = BezierPath.from_arrays(
+        [[0, 0], [10, 0], [20, 0], [30, 0]],
+        [[0, 0], [-2, 1], [-1, 0], [0, 0]],
+        [[0, 0], [2, -1], [3, 1e-9], [0, 0]],
+        )
+    path.detect_handle_types(indices=[1, 2])
+    np.testing.assert_array_equal(path.handle_types, [0, 2, 1, 0])
+    # Aligned outgoing handles are straightened, keeping their length
+    np.testing.assert_allclose(path.handles_out[2], [3, 0])
+    path.detect_handle_types()
+    np.testing.assert_array_equal(path.handle_types, [2, 2, 1, 2])
+    path.detect_handle_types(indices=np.array([True, False, False, False]))
+    path.detect_handle_types(indices=[])
@@ -0,0 +1,78 @@
+import pytest
+import numpy as np
+
+from bezier_builder import binary
+from bezier_builder.bezier_path import BezierPath, BezierShape
+from bezier_builder.svg_converter import parse_path_string
+
+@pytest.fixture
+def shape():
+    return parse_path_string("M 0.1,0 C 10,10 20,10 30,0 S 50,-10 60,0 Z M 100,100 L 110,120 L 90,130 M 5,5", fast=True)
+
+def assert_same_shape(shape, expected, **tolerance):
+    assert len(shape) == len(expected)
+    for path, expected_path in zip(shape, expected):
+        assert path.is_closed == expected_path.is_closed
+        np.testing.assert_allclose(path.positions, expected_path.positions, **tolerance)
+        np.testing.assert_allclose(path.handles_in, expected_path.handles_in, **tolerance)
+        np.testing.assert_allclose(path.handles_out, expected_path.handles_out, **tolerance)
+        np.testing.assert_array_equal(path.handle_types, expected_path.handle_types)
+
+def test_round_trip(shape):
+    data = binary.to_bytes(shape)
+    assert len(data) == binary.encoded_size(shape)
+    assert data[:4] == binary.MAGIC
+    loaded = binary.from_bytes(data)
+    assert_same_shape(loaded, shape, rtol=0, atol=0)
+    # Paths view the buffer, which is read-only for bytes
+    assert not loaded[0].positions.flags.owndata
+    with pytest.raises(ValueError):
+        loaded[0].positions[0] = 1
+
+def test_float32(shape):
+    data = binary.to_bytes(shape, float32=True)
+    assert len(data) < len(binary.to_bytes(shape))
+    loaded = binary.from_bytes(data)
+    assert loaded[0].positions.dtype == np.float64
+    assert_same_shape(loaded, shape, atol=1e-5)
+
+def test_empty_shapes():
+    for shape in (BezierShape(), BezierShape([BezierPath()])):
+        assert_same_shape(binary.from_bytes(binary.to_bytes(shape)), shape)
+
+def test_invalid_data(shape):
+    data = bytearray(binary.to_bytes(shape))
+    with pytest.raises(ValueError):
+        binary.from_bytes(b"XXXX" + data[4:])
+    data[4] = binary.VERSION + 1
+    with pytest.raises(ValueError):
+        binary.from_bytes(data)
+
+def test_concatenated_shapes(shape):
+    first = binary.to_bytes(shape)
+    data = first + binary.to_bytes(BezierShape([shape[1]]))
+    loaded, end = binary.from_buffer(data)
+    assert end == len(first)
+    second, end = binary.from_buffer(data, end)
+    assert end == len(data)
+    assert_same_shape(second, BezierShape([shape[1]]))
+
+@pytest.mark.parametrize("mmap_mode", ["c", "r", None])
+def test_save_and_load(shape, tmp_path, mmap_mode):
+    file_path = tmp_path / "shape.bzs"
+    binary.save_shape(file_path, shape)
+    loaded = binary.load_shape(file_path, mmap_mode=mmap_mode)
+    assert_same_shape(loaded, shape, rtol=0, atol=0)
+    if mmap_mode != "r":
+        # Copy-on-write and fully read shapes can be edited without touching the file
+        loaded[0].positions[0] = (-1, -1)
+        loaded[1].create()
+        assert_same_shape(binary.load_shape(file_path), shape, rtol=0, atol=0)
+
+def test_load_writes_through(shape, tmp_path):
+    file_path = tmp_path / "shape.bzs"
+    binary.save_shape(file_path, shape)
+    loaded = binary.load_shape(file_path, mmap_mode="r+")
+    loaded[0].move_anchors([0], [1, 1])
+    del loaded
+    np.testing.assert_array_equal(binary.load_shape(file_path)[0].positions[0], [1.1, 1])
@@ -0,0 +1,206 @@
+import pytest
+import numpy as np
+
+from bezier_builder import boolean
+from bezier_builder.bezier_path import BezierPath, BezierShape
+from tests.test_intersection import circle, polyline
+
+def square(x0, y0, x1, y1):
+    return polyline([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], is_closed=True)
+
+def area(shape):
+    # Shoelace over the flattened paths, positive for paths with the filled area on their left
+    vertices, offsets = shape.flatten(1e-6)
+    total = 0.0
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        x, y = vertices[start:end].T
+        total += 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+    return total
+
+def test_squares():
+    a, b = BezierShape([square(0, 0, 2, 2)]), BezierShape([square(1, 1, 3, 3)])
+    for operation, expected, paths in [("union", 7, 1), ("intersect", 1, 1), ("difference", 3, 1), ("xor", 6, 2)]:
+        result = getattr(a, operation)(b)
+        assert len(result) == paths
+        assert all(path.is_closed for path in result)
+        assert area(result) == pytest.approx(expected)
+    np.testing.assert_allclose(a.intersect(b)[0].bounds(), [[1, 1], [2, 2]])
+
+def test_circles_stay_cubic():
+    a, b = BezierShape([circle(0, 0, 1)]), BezierShape([circle(1, 0, 1)])
+    lens = 2 * np.pi / 3 - np.sqrt(3) / 2
+    result = a.intersect(b)
+    # The two crossings and the anchor of each circle inside the other
+    assert len(result[0]) == 4
+    assert area(result) == pytest.approx(lens, abs=1e-3)
+    assert area(a.union(b)) == pytest.approx(2 * np.pi - lens, abs=5e-3)
+
+    # Pieces of the circles are exact sub-curves, so the lens boundary lies on both circles
+    points = result.evaluate(np.linspace(0, result.segment_count, 101))
+    gaps = np.minimum(np.abs(np.hypot(*points.T) - 1), np.abs(np.hypot(*(points - [1, 0]).T) - 1))
+    np.testing.assert_allclose(gaps, 0, atol=1e-3)
+    # Handles of the circle anchors inside the other circle stay symmetric
+    assert np.count_nonzero(result[0].handle_types == 2) == 2
+
+def test_result_has_filled_area_on_left():
+    # A clockwise square comes back counterclockwise
+    a = BezierShape([polyline([[0, 0], [0, 1], [1, 1], [1, 0]], is_closed=True)])
+    result = a.union(BezierShape())
+    assert area(result) == pytest.approx(1)
+
+def test_fill_rules():
+    ring = BezierShape([square(0, 0, 4, 4), square(1, 1, 3, 3)])
+    assert area(ring.union(BezierShape())) == pytest.approx(16)
+    result = ring.union(BezierShape(), fill_rule="evenodd")
+    assert len(result) == 2
+    assert area(result) == pytest.approx(12)
+
+    # An inner path running the other way is a hole under either rule
+    hole = BezierShape([square(0, 0, 4, 4), polyline([[1, 1], [1, 3], [3, 3], [3, 1]], is_closed=True)])
+    assert area(hole.union(BezierShape())) == pytest.approx(12)
+
+    # Under the positive rule only area wound counterclockwise is filled
+    clockwise = BezierShape([polyline([[0, 0], [0, 1], [1, 1], [1, 0]], is_closed=True)])
+    assert len(clockwise.union(BezierShape(), fill_rule="positive")) == 0
+    assert area(hole.union(BezierShape(), fill_rule="positive")) == pytest.approx(12)
+    np.testing.assert_array_equal(BezierShape([square(0, 0, 2, 2), square(0, 0, 2, 2)]).contains([[1, 1], [3, 3]], "positive"), [True, False])
+
+def test_self_intersecting_path():
+    # The two lobes of a figure eight wind opposite ways, both are filled
+    eight = BezierShape([polyline([[0, 0], [2, 2], [2, 0], [0, 2]], is_closed=True)])
+    result = eight.union(BezierShape())
+    assert len(result) == 2
+    assert area(result) == pytest.approx(2)
+
+def test_open_paths_are_closed():
+    a = BezierShape([polyline([[0, 0], [2, 0], [2, 2], [0, 2]])])
+    assert area(a.union(BezierShape())) == pytest.approx(4)
+
+def test_touching_and_identical_shapes():
+    a = BezierShape([square(0, 0, 1, 1)])
+    assert area(a.union(a)) == pytest.approx(1)
+    assert len(a.intersect(a)[0]) == 4
+    assert len(a.difference(a)) == 0
+    # Squares touching at a corner stay two paths
+    result = a.union(BezierShape([square(1, 1, 2, 2)]))
+    assert len(result) == 2
+    assert area(result) == pytest.approx(2)
+
+def test_union_of_tiles():
+    tiles = [BezierShape([square(x, y, x + 1, y + 1)]) for x in range(10) for y in range(10)]
+    result = BezierShape.combine(tiles)
+    assert len(result) == 1
+    assert area(result) == pytest.approx(100)
+    np.testing.assert_allclose(result.bounds(), [[0, 0], [10, 10]])
+
+    # Rows of bricks offset by half a brick meet in T junctions
+    bricks = [BezierShape([square(x + 0.5 * (y % 2), y, x + 1 + 0.5 * (y % 2), y + 1)]) for x in range(5) for y in range(4)]
+    result = BezierShape.combine(bricks)
+    assert len(result) == 1
+    assert area(result) == pytest.approx(20)
+
+def test_union_many_circles():
+    rng = np.random.default_rng(0)
+    centers = rng.uniform(0, 60, (500, 2))
+    result = BezierShape.combine([BezierShape([circle(x, y, 1)]) for x, y in centers])
+
+    # Compare coverage of a grid of points with the distance to the nearest center
+    grid = np.stack(np.meshgrid(np.linspace(0, 60, 121), np.linspace(0, 60, 121)), axis=-1).reshape(-1, 2)
+    nearest = np.min(np.hypot(*(grid[:, np.newaxis] - centers[np.newaxis]).transpose(2, 0, 1)), axis=1)
+    clear = np.abs(nearest - 1) > 1e-2
+    inside = np.zeros(len(grid), dtype=bool)
+    vertices, offsets = result.flatten(1e-4)
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        x0, y0 = vertices[start:end].T
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+        for k in range(len(x0)):
+            crossing = (y0[k] <= grid[:, 1]) != (y1[k] <= grid[:, 1])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x = x0[k] + (grid[:, 1] - y0[k]) * (x1[k] - x0[k]) / (y1[k] - y0[k])
+            inside ^= crossing & (x > grid[:, 0])
+    np.testing.assert_array_equal(inside[clear], nearest[clear] < 1)
+
+def spiked_stroke(points, half):
+    # Butt capped stroke outline with bevels outside corners and spikes to the corner inside them
+    def side(points):
+        directions = np.diff(points, axis=0)
+        directions /= np.hypot(*directions.T)[:, np.newaxis]
+        right = half * np.column_stack([directions[:, 1], -directions[:, 0]])
+        chain = [points[0] + right[0], points[1] + right[0]]
+        for k in range(1, len(directions)):
+            if directions[k - 1, 0] * directions[k, 1] - directions[k - 1, 1] * directions[k, 0] < 0:
+                chain.append(points[k])
+            chain += [points[k] + right[k], points[k + 1] + right[k]]
+        return chain
+    ring = np.array(side(points) + side(points[::-1]))
+    following = np.roll(ring, -1, axis=0)
+    return np.stack([ring, ring, following, following], axis=1)
+
+def test_overlapping_spikes_keep_area():
+    # Nearly collinear spikes leave slivers thinner than the tolerance, a misjudged
+    # edge there must not lose the contour it lies on
+    rng = np.random.default_rng(0)
+    points = np.cumsum(rng.normal(0, 1, (50, 2)) + [3, 0], axis=0)
+    result = BezierShape.from_arrays(*boolean.combine([spiked_stroke(points, 0.5)], [0], "union", "positive"))
+    assert len(result) > 0
+
+    path = polyline(points)
+    lower, upper = path.bounds()
+    samples = rng.uniform(lower - 1, upper + 1, (4000, 2))
+    segments, t, distances = path.nearest(samples)
+    ends = ((segments == 0) & (t == 0)) | ((segments == path.segment_count - 1) & (t == 1))
+    inside = result.contains(samples)
+    assert np.all(inside[(distances < 0.45) & ~ends])
+    assert not np.any(inside[distances > 0.55])
+
+def test_bridges_stay_short(monkeypatch):
+    # Lines closing broken chains only ever span gaps of a few tolerances
+    lengths = []
+    bridge = boolean._bridge
+    def measured(edges, edge_vertices, *args):
+        vertices, tolerance = args[-2:]
+        result = bridge(edges, edge_vertices, *args)
+        lines = result[1][len(edges):]
+        lengths.extend(np.hypot(*(vertices[lines[:, 1]] - vertices[lines[:, 0]]).T) / tolerance)
+        return result
+    monkeypatch.setattr(boolean, "_bridge", measured)
+    rng = np.random.default_rng(0)
+    points = np.cumsum(rng.normal(0, 1, (50, 2)) + [3, 0], axis=0)
+    boolean.combine([spiked_stroke(points, 0.5)], [0], "union", "positive")
+    for seed in range(20):
+        rng = np.random.default_rng(seed)
+        path = polyline(np.cumsum(rng.normal(0, 1, (30, 2)) + [1, 0], axis=0))
+        for join in ("miter", "round", "bevel"):
+            path.stroke_to_outline(1, join)
+    assert np.all(np.array(lengths) <= boolean._BRIDGE)
+
+def test_wide_gaps_are_not_bridged():
+    # A chain broken wider than the bridge limit fails instead of linking unrelated edges
+    vertices = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]])
+    edge_vertices = np.array([[0, 1], [1, 2], [2, 3]])
+    a, b = vertices[edge_vertices[:, 0]], vertices[edge_vertices[:, 1]]
+    edges = np.stack([a, a, b, b], axis=1)
+    following = np.array([1, 2, -1])
+    with pytest.raises(ValueError):
+        boolean._bridge(edges, edge_vertices, np.arange(3), np.zeros((3, 2)), np.zeros(3, dtype=bool), following, vertices, 1e-6)
+    edges, *_, following = boolean._bridge(
+        edges, edge_vertices, np.arange(3), np.zeros((3, 2)), np.zeros(3, dtype=bool), following, vertices, 0.1
+        )
+    assert len(edges) == 4 and following[2] == 3 and following[3] == 0
+
+def test_invalid_arguments():
+    a = BezierShape([square(0, 0, 1, 1)])
+    with pytest.raises(ValueError):
+        a.union(a, fill_rule="winding")
+    with pytest.raises(ValueError):
+        BezierShape.combine([a, a], "subtract")
+    with pytest.raises(ValueError):
+        a.union(a, tolerance=0)
+
+def test_empty():
+    assert len(BezierShape().union(BezierShape())) == 0
+    assert len(BezierShape([square(0, 0, 1, 1)]).intersect(BezierShape())) == 0
+    assert len(BezierShape([BezierPath()]).union(BezierShape())) == 0
+    positions, handles_in, handles_out, handle_types, offsets, closed = boolean.combine([], [])
+    assert len(positions) == 0
+    np.testing.assert_array_equal(offsets, [0])
@@ -0,0 +1,125 @@
+import pytest
+import numpy as np
+
+from bezier_builder import cubic
+
+def test_segment_count():
+    assert cubic.segment_count(0, False) == 0
+    assert cubic.segment_count(0, True) == 0
+    assert cubic.segment_count(1, False) == 0
+    assert cubic.segment_count(4, False) == 3
+    assert cubic.segment_count(4, True) == 4
+
+def test_locate():
+    segments, t = cubic.locate([0, 0.25, 1, 2.5, 3], 3)
+    np.testing.assert_array_equal(segments, [0, 0, 1, 2, 2])
+    np.testing.assert_allclose(t, [0, 0.25, 0, 0.5, 1])
+
+def test_power_coefficients_match_controls():
+    controls = np.array([[[0, 0], [1, 3], [4, 3], [5, 0]]], dtype=np.float64)
+    a, b, c, d = cubic.power_coefficients(controls)[0]
+    np.testing.assert_array_equal(d, controls[0, 0])
+    np.testing.assert_array_equal(a + b + c + d, controls[0, 3])
+    # Derivative at the ends is three times the handles
+    np.testing.assert_array_equal(c, 3 * (controls[0, 1] - controls[0, 0]))
+    np.testing.assert_array_equal(3 * a + 2 * b + c, 3 * (controls[0, 3] - controls[0, 2]))
+
+def test_evaluate_keeps_input_shape():
+    controls = np.array([[[0, 0], [0, 0], [10, 10], [10, 10]]], dtype=np.float64)
+    points = cubic.evaluate(controls, np.zeros((2, 3), dtype=np.intp), np.full((2, 3), 0.5))
+    assert points.shape == (2, 3, 2)
+    np.testing.assert_allclose(points, 5.0)
+
+def test_bounds():
+    controls = np.array([
+        # Arch reaching y = 7.5 at t = 0.5
+        [[0, 0], [0, 10], [30, 10], [30, 0]],
+        # Straight line with handles on the line
+        [[0, 0], [1, 0], [2, 0], [3, 0]],
+        # S curve overshooting both ends in x
+        [[0, 0], [-10, 0], [20, 10], [10, 10]],
+    ], dtype=np.float64)
+    bounds = cubic.bounds(controls)
+    np.testing.assert_allclose(bounds[0], [[0, 0], [30, 7.5]])
+    np.testing.assert_allclose(bounds[1], [[0, 0], [3, 0]])
+
+    # Matches dense sampling
+    t = np.linspace(0, 1, 100001)
+    points = cubic.evaluate(controls, np.full(t.shape, 2), t)
+    np.testing.assert_allclose(bounds[2], [points.min(axis=0), points.max(axis=0)], atol=1e-8)
+    assert bounds[2, 0, 0] < 0 and bounds[2, 1, 0] > 10
+
+def test_subdivisions():
+    controls = np.array([
+        # Straight lines take one step however long their handles
+        [[0, 0], [0, 0], [100, 0], [100, 0]],
+        [[0, 0], [1, 0], [50, 0], [100, 0]],
+        # Handles past the end of the chord
+        [[0, 0], [150, 0], [100, 0], [100, 0]],
+        [[0, 0], [0, 100], [100, 100], [100, 0]],
+    ], dtype=np.float64)
+    steps = cubic.subdivisions(controls, 0.1)
+    assert steps[:2].tolist() == [1, 1]
+    assert steps[2] > 1
+    assert steps[3] > cubic.subdivisions(controls, 1.0)[3] > 1
+    with pytest.raises(ValueError):
+        cubic.subdivisions(controls, 0)
+
+def test_derivative_matches_differences():
+    controls = np.array([[[0, 0], [0, 10], [30, 10], [30, 0]], [[0, 0], [-10, 0], [20, 10], [10, 10]]], dtype=np.float64)
+    t = np.array([[0.1, 0.5, 0.9], [0.2, 0.4, 0.6]])
+    segments = np.array([[0, 0, 0], [1, 1, 1]])
+    step = 1e-6
+    differences = (cubic.evaluate(controls, segments, t + step) - cubic.evaluate(controls, segments, t - step)) / (2 * step)
+    np.testing.assert_allclose(cubic.derivative(controls, segments, t), differences, atol=1e-5)
+
+def test_extrema():
+    controls = np.array([
+        # Arch turning around in y at t = 0.5
+        [[0, 0], [0, 10], [30, 10], [30, 0]],
+        # Straight line
+        [[0, 0], [1, 0], [2, 0], [3, 0]],
+    ], dtype=np.float64)
+    extrema = cubic.extrema(controls)
+    assert extrema.shape == (2, 4)
+    np.testing.assert_allclose(extrema[0, 0], 0.5)
+    assert np.all(np.isnan(extrema[0, 1:])) and np.all(np.isnan(extrema[1]))
+
+def test_split_and_trim():
+    controls = np.array([[[0, 0], [0, 10], [30, 10], [30, 0]], [[0, 0], [-10, 0], [20, 10], [10, 10]]], dtype=np.float64)
+    t = np.linspace(0, 1, 11)
+    segments = np.repeat([[0], [1]], 11, axis=1)
+
+    left, right = cubic.split(controls, [0.25, 0.6])
+    np.testing.assert_allclose(cubic.evaluate(left, segments, t), cubic.evaluate(controls, segments, t * [[0.25], [0.6]]))
+    np.testing.assert_allclose(cubic.evaluate(right, segments, t), cubic.evaluate(controls, segments, 0.25 + t * [[0.75], [0.4]] + [[0], [0.35]]))
+
+    part = cubic.trim(controls, [0.2, 0], [0.7, 0])
+    np.testing.assert_allclose(cubic.evaluate(part[:1], segments[:1], t), cubic.evaluate(controls, segments[:1], 0.2 + 0.5 * t))
+    # Empty parts collapse to a point
+    np.testing.assert_allclose(part[1], np.zeros((4, 2)))
+
+def test_closest():
+    controls = np.array([[[0, 0], [0, 10], [30, 10], [30, 0]], [[0, 0], [0, 0], [3, 0], [3, 0]]], dtype=np.float64)
+    points = np.array([[15, 20], [1, -1], [-1, 1]], dtype=np.float64)
+    t, distances = cubic.closest(controls, np.array([0, 1, 1]), points)
+    np.testing.assert_allclose(t[0], 0.5)
+    np.testing.assert_allclose(distances[0], 12.5)
+    # Lines without handles, one point beside the line and one past its start
+    np.testing.assert_allclose(cubic.evaluate(controls, np.array([1]), t[1:2]), [[1, 0]], atol=1e-6)
+    np.testing.assert_allclose(t[2], 0)
+    np.testing.assert_allclose(distances[1:], [1, np.sqrt(2)], atol=1e-6)
+
+def test_closest_finds_global_minimum():
+    # Looping segments have up to three local minima, some close to a maximum
+    rng = np.random.default_rng(0)
+    controls = rng.uniform(0, 10, (100, 4, 2))
+    points = rng.uniform(-2, 12, (50, 2))
+    segments = np.tile(np.arange(len(controls)), len(points))
+    t, distances = cubic.closest(controls, segments, np.repeat(points, len(controls), axis=0))
+    np.testing.assert_allclose(np.hypot(*(cubic.evaluate(controls, segments, t) - np.repeat(points, len(controls), axis=0)).T), distances)
+    steps = np.linspace(0, 1, 5001)
+    dense = cubic.evaluate(controls, np.repeat(np.arange(len(controls)), len(steps)), np.tile(steps, len(controls))).reshape(len(controls), -1, 2)
+    sampled = np.hypot(*np.moveaxis(dense[np.newaxis] - points[:, np.newaxis, np.newaxis], -1, 0)).min(axis=-1).reshape(-1)
+    assert np.all(distances <= sampled + 1e-9)
+    np.testing.assert_allclose(distances, sampled, atol=1e-3)
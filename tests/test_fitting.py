@@ -0,0 +1,138 @@
+import pytest
+import numpy as np
+
+from bezier_builder import fitting
+from bezier_builder.anchor_point import CORNER, ALIGNED, SYMMETRIC
+from bezier_builder.bezier_path import BezierPath
+
+def circle(count: int) -> BezierPath:
+    """
+    Closed circle of radius 100 with `count` symmetric anchors.
+    """
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    positions = np.column_stack([np.cos(angles), np.sin(angles)]) * 100
+    tangents = np.column_stack([-np.sin(angles), np.cos(angles)]) * 100 * (4 / 3) * np.tan(np.pi / (2 * count))
+    return BezierPath.from_arrays(positions, -tangents, tangents, np.full(count, SYMMETRIC), is_closed=True)
+
+def distances_to(path: BezierPath, points: np.ndarray) -> np.ndarray:
+    """
+    Distances from points to a densely flattened path.
+    """
+    vertices = path.flatten(1e-4)
+    a, direction = vertices[:-1], np.diff(vertices, axis=0)
+    lengths = np.maximum(np.sum(direction ** 2, axis=1), 1e-300)
+    u = np.clip(np.einsum("pek,ek->pe", points[:, None] - a, direction) / lengths, 0, 1)
+    return np.linalg.norm(points[:, None] - (a + u[..., None] * direction), axis=2).min(axis=1)
+
+def test_fit_cubics_recovers_curves():
+    controls = np.array([
+        [[0, 0], [10, 20], [40, 20], [50, 0]],
+        [[50, 0], [50, -10], [70, -10], [70, 0]],
+    ], dtype=np.float64)
+    u = np.linspace(0, 1, 50)
+    points = fitting.cubic.evaluate(controls, np.repeat([0, 1], 50), np.tile(u, 2))
+    runs = fitting.Runs(points, [0, 50], [49, 99])
+    tangents_start, tangents_end = fitting.segment_tangents(controls)
+    np.testing.assert_allclose(fitting.fit_cubics(runs, np.tile(u, 2), tangents_start, tangents_end), controls, atol=1e-9)
+
+    # From chord length parameters the fits converge within a tolerance
+    distances = fitting.cumulative_distances(points)
+    fitted, within, farthest = fitting.fit_runs(runs, runs.chord_parameters(distances), tangents_start, tangents_end, 0.05)
+    assert within.tolist() == [True, True]
+    assert 0 <= farthest[0] <= 49 and 50 <= farthest[1] <= 99
+    np.testing.assert_allclose(fitted, controls, atol=0.5)
+
+    # Tangents pointing the wrong way can't fit
+    _, within, _ = fitting.fit_runs(runs, runs.chord_parameters(distances), -tangents_start, tangents_end, 0.05)
+    assert within.tolist() == [False, False]
+
+def test_segment_tangents():
+    controls = np.array([[[0, 0], [0, 0], [10, 5], [10, 0]]], dtype=np.float64)
+    start, end = fitting.segment_tangents(controls)
+    np.testing.assert_allclose(start, [[10 / np.sqrt(125), 5 / np.sqrt(125)]])
+    np.testing.assert_allclose(end, [[0, 1]])
+
+def test_simplify_circle():
+    path = circle(1000)
+    simplified = path.simplify(0.01)
+    assert simplified.is_closed
+    assert 4 <= len(simplified) <= 20
+    np.testing.assert_array_equal(simplified.positions[0], path.positions[0])
+    radii = np.hypot(*simplified.flatten(1e-4).T)
+    assert np.abs(radii - 100).max() <= 0.02
+
+    # Tangent directions at kept anchors are unchanged, so they stay smooth
+    assert set(simplified.handle_types.tolist()) <= {ALIGNED, SYMMETRIC}
+    handles_in, handles_out = simplified.handles_in, simplified.handles_out
+    cross = handles_in[:, 0] * handles_out[:, 1] - handles_in[:, 1] * handles_out[:, 0]
+    np.testing.assert_allclose(cross / np.hypot(*handles_in.T), 0, atol=1e-9)
+
+def test_simplify_keeps_corners():
+    # Quarter circle polyline turning sharply into a straight line
+    angles = np.linspace(0, np.pi / 2, 51)
+    arc = np.column_stack([np.cos(angles), np.sin(angles)]) * 100
+    line = np.column_stack([np.zeros(50), np.linspace(102, 200, 50)])
+    path = BezierPath.from_arrays(np.concatenate([arc, line]))
+    simplified = path.simplify(0.5)
+    assert len(simplified) < 10
+    np.testing.assert_array_equal(simplified.positions[[0, -1]], path.positions[[0, -1]])
+    assert np.any(np.all(np.isclose(simplified.positions, [0, 100]), axis=1))
+    assert distances_to(simplified, path.positions).max() <= 0.5
+
+def test_simplify_lines_only():
+    x = np.linspace(0, 100, 101)
+    positions = np.column_stack([x, np.where(x <= 50, 0, x - 50)])
+    path = BezierPath.from_arrays(positions)
+    simplified = path.simplify(0.01, lines_only=True)
+    np.testing.assert_array_equal(simplified.positions, [[0, 0], [50, 0], [100, 50]])
+    assert np.all(simplified.handles_out == 0) and np.all(simplified.handles_in == 0)
+    assert np.all(simplified.handle_types == CORNER)
+
+    # Curved segments are left alone
+    path.handles_out[60] = (1, 1)
+    simplified = path.simplify(0.01, lines_only=True)
+    np.testing.assert_array_equal(simplified.positions, [[0, 0], [50, 0], [60, 10], [61, 11], [100, 50]])
+
+def test_simplify_lines_only_within_tolerance():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 1000, 10000)
+    path = BezierPath.from_arrays(np.column_stack([x, 50 * np.sin(x / 50) + rng.normal(0, 0.01, len(x))]))
+    simplified = path.simplify(0.1, lines_only=True)
+    assert len(simplified) < len(path) / 10
+    assert distances_to(simplified, path.positions).max() <= 0.1 + 1e-9
+
+def test_simplify_short_paths():
+    path = BezierPath.from_arrays([[0, 0], [10, 0]])
+    np.testing.assert_array_equal(path.simplify(1).positions, path.positions)
+    assert len(BezierPath().simplify(1)) == 0
+    with pytest.raises(ValueError):
+        path.simplify(-1)
+
+def test_fit_points():
+    t = np.linspace(0, 4 * np.pi, 400)
+    points = np.column_stack([t * 20, 50 * np.sin(t)])
+    controls, anchors = fitting.fit_points(points, 0.5)
+    assert anchors[0] == 0 and anchors[-1] == len(points) - 1
+    np.testing.assert_array_equal(controls[:, 0], points[anchors[:-1]])
+    np.testing.assert_array_equal(controls[:, 3], points[anchors[1:]])
+    with pytest.raises(ValueError):
+        fitting.fit_points(points, 0)
+
+def test_from_points():
+    t = np.linspace(0, 4 * np.pi, 400)
+    points = np.column_stack([t * 20, 50 * np.sin(t)])
+    path = BezierPath.from_points(points, 0.5)
+    assert 2 < len(path) < 40
+    assert distances_to(path, points[::4]).max() <= 0.5
+    assert path.handle_types[0] == CORNER and path.handle_types[-1] == CORNER
+    assert np.all(np.isin(path.handle_types[1:-1], [ALIGNED, SYMMETRIC]))
+    # Interior handles are collinear
+    handles_in, handles_out = path.handles_in[1:-1], path.handles_out[1:-1]
+    cross = handles_in[:, 0] * handles_out[:, 1] - handles_in[:, 1] * handles_out[:, 0]
+    np.testing.assert_allclose(cross, 0, atol=1e-6)
+
+def test_from_points_short():
+    path = BezierPath.from_points([[0, 0], [0, 0], [10, 0]], 0.1)
+    np.testing.assert_array_equal(path.positions, [[0, 0], [10, 0]])
+    assert len(BezierPath.from_points([[5, 5], [5, 5]], 0.1)) == 1
+    assert len(BezierPath.from_points(np.empty((0, 2)), 0.1)) == 0
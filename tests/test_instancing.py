@@ -0,0 +1,75 @@
+import os
+import pytest
+import numpy as np
+
+from bezier_builder.bezier_path import BezierPath, BezierShape
+from bezier_builder.instancing import InstancedShapes
+from bezier_builder.svg_converter import parse_svg_instances, iter_svg_file, create_svg_string, save_svg_file
+
+FILE_PATH = os.path.join(os.path.dirname(__file__), "data", "groups_and_uses.svg")
+
+def paths_of(shapes):
+    return [path for shape in shapes for path in shape]
+
+def assert_same_paths(paths, expected_paths):
+    assert len(paths) == len(expected_paths)
+    for path, expected_path in zip(paths, expected_paths):
+        assert path.is_closed == expected_path.is_closed
+        np.testing.assert_allclose(path.positions, expected_path.positions, atol=1e-4)
+        np.testing.assert_allclose(path.handles_in, expected_path.handles_in, atol=1e-4)
+        np.testing.assert_allclose(path.handles_out, expected_path.handles_out, atol=1e-4)
+
+@pytest.fixture
+def drawing():
+    return parse_svg_instances(FILE_PATH, fast=True)
+
+def test_parse_svg_instances(drawing: InstancedShapes):
+    assert drawing.definition_ids == ["tri", "pair"]
+    assert [len(shape) for shape in drawing.definitions] == [1, 2]
+    np.testing.assert_array_equal(drawing.indices, [0, 1])
+    # The viewBox halves everything, the use elements add their own transforms and offsets
+    np.testing.assert_allclose(drawing.transforms, [[[0.75, 0, 37.5], [0, 0.75, 45]], [[0.5, 0, 50], [0, 0.5, 0]]])
+    # The definition keeps its own transform
+    np.testing.assert_allclose(drawing.definitions[0][0].positions, [[0, 0], [20, 0], [10, 16]])
+    assert len(drawing.shapes) == 4
+
+def test_expand_matches_iter_svg_file(drawing: InstancedShapes):
+    expanded = drawing.expand()
+    expected = list(iter_svg_file(FILE_PATH, fast=True))
+    # Directly drawn shapes come first, the polygon is drawn after the uses
+    expected = expected[:3] + expected[-1:] + expected[3:-1]
+    assert_same_paths(paths_of(expanded), paths_of(expected))
+
+def test_write_instances(drawing: InstancedShapes, tmp_path):
+    svg_string = create_svg_string(drawing.shapes, instances=drawing)
+    assert svg_string.count("<use ") == 2
+    assert '<use xlink:href="#tri" transform="matrix(0.75,0,0,0.75,37.5,45)" />' in svg_string
+
+    file_path = tmp_path / "instances.svg"
+    save_svg_file(file_path, drawing.shapes, instances=drawing)
+    assert_same_paths(paths_of(iter_svg_file(file_path, fast=True)), paths_of(drawing.expand()))
+
+    reparsed = parse_svg_instances(file_path, fast=True)
+    np.testing.assert_allclose(reparsed.transforms, drawing.transforms)
+    assert_same_paths(paths_of(reparsed.definitions), paths_of(drawing.definitions))
+
+def test_write_instances_escapes_ids(tmp_path):
+    square = BezierShape([BezierPath.from_arrays([[0, 0], [1, 0], [1, 1], [0, 1]], is_closed=True)])
+    definition_id = 'a"<b>&\'c'
+    drawing = InstancedShapes(definitions=[square], definition_ids=[definition_id], indices=[0], transforms=[[[1, 0, 5], [0, 1, 0]]])
+    file_path = tmp_path / "escaped.svg"
+    save_svg_file(file_path, [], instances=drawing)
+    # The file stays well formed and the id reads back as written
+    reparsed = parse_svg_instances(file_path, fast=True)
+    assert reparsed.definition_ids == [definition_id]
+    np.testing.assert_allclose(reparsed.transforms, drawing.transforms)
+
+def test_instanced_shapes():
+    square = BezierShape([BezierPath.from_arrays([[0, 0], [1, 0], [1, 1], [0, 1]], is_closed=True)])
+    drawing = InstancedShapes(definitions=[square], indices=[0, 0], transforms=[[[1, 0, 5], [0, 1, 0]], [[2, 0, 0], [0, 2, 0]]])
+    assert drawing.instance_count == 2 and drawing.definition_ids == ["shape0"]
+    assert drawing.instances(0).shape == (2, 2, 3)
+    np.testing.assert_array_equal(drawing.expand()[1][0].positions[2], [2, 2])
+    assert create_svg_string([]) == create_svg_string([], instances=InstancedShapes())
+    with pytest.raises(ValueError):
+        InstancedShapes(definitions=[square], indices=[0], transforms=np.zeros((2, 2, 3)))
@@ -0,0 +1,171 @@
+import pytest
+import numpy as np
+
+from bezier_builder import cubic
+from bezier_builder.bezier_path import BezierPath
+from bezier_builder.intersection import intersections, overlapping_pairs
+
+# Handle length of a four segment circle
+KAPPA = 0.5522847498
+
+def circle(cx, cy, r):
+    positions = np.array([[cx + r, cy], [cx, cy + r], [cx - r, cy], [cx, cy - r]], dtype=np.float64)
+    tangents = np.array([[0, 1], [-1, 0], [0, -1], [1, 0]], dtype=np.float64) * r * KAPPA
+    return BezierPath.from_arrays(positions, -tangents, tangents, np.full(4, 2), is_closed=True)
+
+def polyline(points, is_closed=False):
+    return BezierPath.from_arrays(np.array(points, dtype=np.float64), is_closed=is_closed)
+
+def random_walk(count, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = np.cumsum(rng.normal(0, 10, (count, 2)), axis=0)
+    handles = rng.normal(0, 3, (count, 2))
+    return BezierPath.from_arrays(positions, -handles, handles, np.full(count, 1))
+
+def brute_force_pairs(bounds_a, bounds_b):
+    overlap = np.all(
+        (bounds_a[:, np.newaxis, 0] <= bounds_b[np.newaxis, :, 1]) & (bounds_b[np.newaxis, :, 0] <= bounds_a[:, np.newaxis, 1]),
+        axis=2,
+        )
+    return set(zip(*np.nonzero(overlap)))
+
+def test_overlapping_pairs_match_brute_force():
+    rng = np.random.default_rng(1)
+    lower = rng.uniform(0, 100, (300, 2))
+    bounds = np.stack([lower, lower + rng.uniform(0, 10, (300, 2))], axis=1)
+    lower = rng.uniform(0, 100, (200, 2))
+    others = np.stack([lower, lower + rng.uniform(0, 10, (200, 2))], axis=1)
+    # Shared edges still overlap
+    others[0] = bounds[0]
+
+    i, j = overlapping_pairs(bounds, others)
+    assert len(i) == len(set(zip(i, j)))
+    assert set(zip(i, j)) == brute_force_pairs(bounds, others)
+
+    i, j = overlapping_pairs(bounds)
+    assert np.all(i < j)
+    assert set(zip(i, j)) == {(a, b) for a, b in brute_force_pairs(bounds, bounds) if a < b}
+
+def test_overlapping_pairs_empty():
+    i, j = overlapping_pairs(np.zeros((0, 2, 2)))
+    assert len(i) == len(j) == 0
+
+def test_line_through_circle():
+    line = polyline([[-2, 0.5], [2, 0.5]])
+    (segments_a, t_a), (segments_b, t_b) = intersections(line, circle(0, 0, 1))
+    assert len(segments_a) == 2
+    points = line.evaluate(segments_a + t_a)
+    np.testing.assert_allclose(points, circle(0, 0, 1).evaluate(segments_b + t_b), atol=1e-9)
+    # Sorted along the line
+    assert points[0, 0] < points[1, 0]
+    np.testing.assert_allclose(points[:, 1], 0.5)
+
+def test_circles():
+    a, b = circle(0, 0, 1), circle(1, 0, 1)
+    (segments_a, t_a), (segments_b, t_b) = intersections(a, b)
+    assert len(segments_a) == 2
+    points = a.evaluate(segments_a + t_a)
+    np.testing.assert_allclose(points, b.evaluate(segments_b + t_b), atol=1e-9)
+    np.testing.assert_allclose(points[:, 0], 0.5, atol=1e-9)
+    np.testing.assert_allclose(np.abs(points[:, 1]), 0.866, atol=1e-3)
+
+def test_crossing_at_anchor_reported_once():
+    # The line passes through the anchor at the right of the circle and its closing anchor
+    line = polyline([[2, 0], [-2, 0]])
+    (segments_a, t_a), (segments_b, t_b) = intersections(line, circle(0, 0, 1))
+    assert len(segments_a) == 2
+    # Anchors are the start of the following segment, wrapping around closed paths
+    np.testing.assert_array_equal(segments_b, [0, 2])
+    np.testing.assert_allclose(t_b, 0)
+    np.testing.assert_allclose(line.evaluate(segments_a + t_a), [[1, 0], [-1, 0]], atol=1e-9)
+
+def test_tangent_touch():
+    line = polyline([[-2, 1], [2, 1]])
+    (segments_a, t_a), (segments_b, t_b) = intersections(line, circle(0, 0, 1))
+    assert len(segments_a) == 1
+    np.testing.assert_array_equal(segments_b, [1])
+    np.testing.assert_allclose(t_b, [0], atol=1e-9)
+
+def test_disjoint_and_empty_paths():
+    result = intersections(circle(0, 0, 1), circle(5, 0, 1))
+    assert all(len(array) == 0 for side in result for array in side)
+    result = intersections(BezierPath(), circle(0, 0, 1))
+    assert all(len(array) == 0 for side in result for array in side)
+
+def test_invalid_tolerance():
+    with pytest.raises(ValueError):
+        intersections(circle(0, 0, 1), circle(1, 0, 1), tolerance=0)
+
+def test_self_intersections_of_simple_paths():
+    (segments_a, _), _ = circle(0, 0, 1).self_intersections()
+    assert len(segments_a) == 0
+    (segments_a, _), _ = polyline([[0, 0], [1, 0], [1, 1]]).self_intersections()
+    assert len(segments_a) == 0
+
+def test_self_intersections_figure_eight():
+    path = polyline([[0, 0], [1, 1], [1, 0], [0, 1]], is_closed=True)
+    (segments_a, t_a), (segments_b, t_b) = path.self_intersections()
+    np.testing.assert_array_equal(segments_a, [0])
+    np.testing.assert_array_equal(segments_b, [2])
+    np.testing.assert_allclose(t_a, [0.5])
+    np.testing.assert_allclose(t_b, [0.5])
+
+def test_self_intersections_at_anchor():
+    # The closing segment passes through the first anchor
+    path = polyline([[0, 0], [1, 1], [1, -1], [-1, 1], [-1, -1]], is_closed=True)
+    (segments_a, t_a), (segments_b, t_b) = path.self_intersections()
+    np.testing.assert_array_equal(segments_a, [0])
+    np.testing.assert_allclose(t_a, [0])
+    np.testing.assert_array_equal(segments_b, [2])
+    np.testing.assert_allclose(t_b, [0.5])
+
+def test_self_intersections_loop_in_one_segment():
+    # Handles crossing over each other tie a loop into the segment
+    path = BezierPath.from_arrays(
+        np.array([[0, 0], [1, 0]], dtype=np.float64),
+        np.array([[0, 0], [-2, 2]], dtype=np.float64),
+        np.array([[2, 2], [0, 0]], dtype=np.float64),
+        )
+    (segments_a, t_a), (segments_b, t_b) = path.self_intersections()
+    np.testing.assert_array_equal(segments_a, [0])
+    np.testing.assert_array_equal(segments_b, [0])
+    assert t_a[0] < t_b[0]
+    np.testing.assert_allclose(path.evaluate(t_a), path.evaluate(t_b), atol=1e-9)
+    # Symmetric loop
+    np.testing.assert_allclose(t_a + t_b, 1)
+
+def test_self_intersections_random_walk():
+    path = random_walk(100)
+    (segments_a, t_a), (segments_b, t_b) = path.self_intersections()
+    assert len(segments_a) > 0
+    points_a, points_b = path.evaluate(segments_a + t_a), path.evaluate(segments_b + t_b)
+    np.testing.assert_allclose(points_a, points_b, atol=1e-6)
+    assert np.all(segments_a + t_a < segments_b + t_b)
+
+    # Every crossing of the flattened path is found
+    controls = path.segments()
+    steps = 32
+    t = np.linspace(0, 1, steps + 1)
+    polylines = cubic.evaluate(controls, np.repeat(np.arange(len(controls)), steps + 1).reshape(-1, steps + 1), t[np.newaxis].repeat(len(controls), axis=0))
+    starts, ends = polylines[:, :-1].reshape(-1, 2), polylines[:, 1:].reshape(-1, 2)
+    crossings = 0
+    for k in range(len(starts)):
+        # Skip the neighbouring line, which shares an end point
+        d, e = ends[k] - starts[k], ends[k + 2:] - starts[k + 2:]
+        offset = starts[k + 2:] - starts[k]
+        determinant = d[0] * e[:, 1] - d[1] * e[:, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u = (offset[:, 0] * e[:, 1] - offset[:, 1] * e[:, 0]) / determinant
+            v = (offset[:, 0] * d[1] - offset[:, 1] * d[0]) / determinant
+        crossings += np.count_nonzero((u > 0) & (u < 1) & (v > 0) & (v < 1))
+    assert len(segments_a) == crossings
+
+def test_intersections_scale():
+    # Two long waves crossing twice per period
+    x = np.linspace(0, 20000, 20001)
+    a = polyline(np.column_stack([x, 50 * np.sin(x / 3)]))
+    b = polyline(np.column_stack([x, 50 * np.cos(x / 3)]))
+    (segments_a, t_a), (segments_b, t_b) = intersections(a, b)
+    # sin(x / 3) = cos(x / 3) at x = 3 pi / 4 + 3 k pi
+    assert len(segments_a) == int((20000 - 0.75 * np.pi) // (3 * np.pi)) + 1
+    np.testing.assert_allclose(a.evaluate(segments_a + t_a), b.evaluate(segments_b + t_b), atol=1e-6)
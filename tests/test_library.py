@@ -0,0 +1,63 @@
+import pickle
+import pytest
+import numpy as np
+
+from bezier_builder.bezier_path import BezierPath, BezierShape
+from bezier_builder.library import ShapeLibrary, write_library
+from bezier_builder.svg_converter import parse_path_string
+from tests.test_binary import assert_same_shape
+
+@pytest.fixture
+def shapes():
+    return [
+        parse_path_string(f"M {i},0 C {i},10 {i + 10},10 {i + 10},0 L {i + 5},-5 Z M 0,{i} L 5,{i}", fast=True)
+        for i in range(20)
+    ] + [BezierShape(), BezierShape([BezierPath()])]
+
+@pytest.fixture
+def library(shapes, tmp_path):
+    file_path = tmp_path / "shapes.bzl"
+    assert write_library(file_path, iter(shapes)) == len(shapes)
+    return ShapeLibrary(file_path)
+
+def test_random_access(library: ShapeLibrary, shapes):
+    assert len(library) == len(shapes)
+    for index in (5, 0, 21, 20, -22, 13):
+        assert_same_shape(library[index], shapes[index], rtol=0, atol=0)
+    with pytest.raises(IndexError):
+        library[len(shapes)]
+    assert sum(library.nbytes(i) for i in range(len(library))) < library._map.nbytes
+    assert library.nbytes(-1) == library.nbytes(len(library) - 1)
+    with pytest.raises(IndexError):
+        library.nbytes(len(shapes))
+    with pytest.raises(IndexError):
+        library.nbytes(-len(shapes) - 1)
+
+def test_shapes_view_the_file(library: ShapeLibrary):
+    shape = library[3]
+    assert np.shares_memory(shape[0].positions, library._map)
+    with pytest.raises(ValueError):
+        shape[0].positions[0] = 0
+
+def test_copy_on_write(shapes, tmp_path):
+    file_path = tmp_path / "shapes.bzl"
+    write_library(file_path, shapes, float32=True)
+    library = ShapeLibrary(file_path, mmap_mode="c")
+    shape = library[2]
+    assert_same_shape(shape, shapes[2], atol=1e-5)
+    shape[0].positions[0] = (-1, -1)
+    assert_same_shape(ShapeLibrary(file_path)[2], shapes[2], atol=1e-5)
+    with pytest.raises(ValueError):
+        ShapeLibrary(file_path, mmap_mode="r+")
+
+def test_pickle(library: ShapeLibrary, shapes):
+    unpickled = pickle.loads(pickle.dumps(library))
+    assert len(pickle.dumps(library)) < 200
+    assert_same_shape(unpickled[7], shapes[7])
+    assert [len(shape) for shape in unpickled] == [len(shape) for shape in shapes]
+
+def test_invalid_file(tmp_path):
+    file_path = tmp_path / "invalid.bzl"
+    file_path.write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        ShapeLibrary(file_path)
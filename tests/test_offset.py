@@ -0,0 +1,175 @@
+import pytest
+import numpy as np
+
+from bezier_builder import cubic, offset
+from bezier_builder.bezier_path import BezierPath, BezierShape
+from tests.test_boolean import area, square
+from tests.test_intersection import circle, polyline, random_walk
+
+def test_square_joins():
+    path = square(0, 0, 4, 4)
+    # Round joins are cubic arcs, a little outside the exact circle
+    for join, expected in [("miter", 36), ("round", 32 + np.pi), ("bevel", 34)]:
+        result = path.offset(1, join)
+        assert len(result) == 1
+        assert area(result) == pytest.approx(expected, abs=2e-3)
+    # Miters continue the offset sides, so the corners are the only anchors left
+    result = path.offset(1)
+    assert len(result[0]) == 4
+    np.testing.assert_allclose(result.bounds(), [[-1, -1], [5, 5]])
+
+    # Inner corners are sharp whatever the join
+    for join in offset.JOINS:
+        result = path.offset(-1, join)
+        assert area(result) == pytest.approx(4)
+        np.testing.assert_allclose(result.bounds(), [[1, 1], [3, 3]])
+
+def test_miter_limit():
+    # A miter at a right angle is sqrt(2) times the distance
+    path = square(0, 0, 4, 4)
+    assert area(path.offset(1, miter_limit=1.5)) == pytest.approx(36)
+    assert area(path.offset(1, miter_limit=1.4)) == pytest.approx(34)
+
+def test_offset_of_clockwise_path_grows_outwards():
+    path = polyline([[0, 0], [0, 4], [4, 4], [4, 0]], is_closed=True)
+    assert area(path.offset(1)) == pytest.approx(36)
+
+def test_circle_offsets_within_tolerance():
+    path = circle(0, 0, 1)
+    for distance in (0.5, -0.5, 3):
+        result = path.offset(distance, tolerance=1e-4)
+        points = result.evaluate(np.linspace(0, result.segment_count, 1001))
+        # The circle itself is a cubic approximation off by about 3e-4
+        np.testing.assert_allclose(np.hypot(*points.T), 1 + distance, atol=1e-3)
+    # Offsetting inwards past the radius turns the offset inside out, it's dropped
+    for distance in (-1.5, -2, -3):
+        assert len(path.offset(distance)) == 0
+    # A stroke wider than the circle leaves no hole
+    result = path.stroke_to_outline(4)
+    assert len(result) == 1
+    assert area(result) == pytest.approx(9 * np.pi, abs=1e-2)
+
+def test_fitted_pieces_follow_exact_offset():
+    rng = np.random.default_rng(0)
+    controls = rng.uniform(0, 10, (50, 4, 2))
+    distance, tolerance = 0.5, 1e-3
+    curves, segments = offset.offset_segments(controls, distance, tolerance)
+    assert np.all(np.diff(segments) >= 0)
+    assert set(segments) == set(range(len(controls)))
+
+    # Offset ends of each segment are kept exact
+    index = np.arange(len(controls))
+    tangents = np.stack([cubic.derivative(controls, index, np.zeros(len(index))), cubic.derivative(controls, index, np.ones(len(index)))], axis=1)
+    heads = np.flatnonzero(np.r_[True, segments[1:] != segments[:-1]])
+    tails = np.r_[heads[1:], len(segments)] - 1
+    normal = tangents[:, 0] / np.hypot(*tangents[:, 0].T)[:, np.newaxis]
+    np.testing.assert_allclose(curves[heads, 0], controls[:, 0] + distance * np.column_stack([-normal[:, 1], normal[:, 0]]), atol=1e-9)
+    normal = tangents[:, 1] / np.hypot(*tangents[:, 1].T)[:, np.newaxis]
+    np.testing.assert_allclose(curves[tails, 3], controls[:, 3] + distance * np.column_stack([-normal[:, 1], normal[:, 0]]), atol=1e-9)
+
+def test_stroke_caps():
+    path = polyline([[0, 0], [10, 0], [10, 10]])
+    # Two 10 by 2 legs overlapping in a unit square, with a quarter disc round the corner
+    corner = 39 + np.pi / 4
+    for cap, expected in [("butt", corner), ("round", corner + np.pi), ("square", corner + 4)]:
+        result = path.stroke_to_outline(2, "round", cap)
+        assert len(result) == 1
+        assert area(result) == pytest.approx(expected, abs=2e-3)
+    np.testing.assert_allclose(path.stroke_to_outline(2, cap="square").bounds(), [[-1, -1], [11, 11]])
+
+def test_stroke_of_closed_path_is_ring():
+    result = square(0, 0, 4, 4).stroke_to_outline(2)
+    assert [len(path) for path in result] == [4, 4]
+    assert area(result) == pytest.approx(36 - 4)
+    np.testing.assert_array_equal(result.contains([[2, 2], [0, 2], [-0.5, -0.5], [6, 2]]), [False, True, True, False])
+
+def test_stroke_covers_points_within_half_width():
+    path = random_walk(50, seed=1)
+    result = path.stroke_to_outline(4, "round", "round", tolerance=1e-3)
+    rng = np.random.default_rng(2)
+    lower, upper = result.bounds()
+    points = rng.uniform(lower, upper, (3000, 2))
+    _, _, distances = path.nearest(points)
+    clear = np.abs(distances - 2) > 1e-2
+    np.testing.assert_array_equal(result.contains(points)[clear], distances[clear] < 2)
+    # Overlaps are resolved, so every point is wound around at most once
+    assert result.winding(points).max() <= 1
+
+def test_stroke_of_random_polylines():
+    # Nearly collinear inner corners used to leave spikes that thinned the stroke away
+    for seed in range(2):
+        rng = np.random.default_rng(seed)
+        for points in (rng.uniform(0, 10, (100, 2)), np.cumsum(rng.normal(0, 1, (100, 2)) + [3, 0], axis=0)):
+            path = polyline(points)
+            for join in offset.JOINS:
+                assert len(path.stroke_to_outline(1, join)) > 0
+            result = path.stroke_to_outline(1, "round", "round")
+            samples = np.concatenate([outline.evaluate(np.linspace(0, outline.segment_count, 20 * outline.segment_count)) for outline in result])
+            _, _, distances = path.nearest(samples)
+            np.testing.assert_allclose(distances, 0.5, atol=1e-3)
+
+def stroke_reference(points, anchors, half, join):
+    """
+    Whether points lie in the butt capped stroke of a polyline, as the union of a
+    rectangle per segment and the outer side of a round or bevel join per corner.
+    """
+    inside = np.zeros(len(points), dtype=bool)
+    directions = np.diff(anchors, axis=0)
+    lengths = np.hypot(*directions.T)
+    directions = directions / lengths[:, np.newaxis]
+    for start, direction, length in zip(anchors[:-1], directions, lengths):
+        relative = points - start
+        along = relative @ direction
+        across = relative @ [-direction[1], direction[0]]
+        inside |= (along >= 0) & (along <= length) & (np.abs(across) <= half)
+    for pivot, incoming, outgoing in zip(anchors[1:-1], directions[:-1], directions[1:]):
+        # Joins fill the wedge between the ends of the rectangles on the side the path turns away from
+        side = -np.sign(incoming[0] * outgoing[1] - incoming[1] * outgoing[0])
+        a = side * half * np.array([-incoming[1], incoming[0]])
+        b = side * half * np.array([-outgoing[1], outgoing[0]])
+        relative = points - pivot
+        turn = np.sign(a[0] * b[1] - a[1] * b[0])
+        wedge = (turn * (a[0] * relative[:, 1] - a[1] * relative[:, 0]) >= 0) & (turn * (relative[:, 0] * b[1] - relative[:, 1] * b[0]) >= 0)
+        if join == "round":
+            inside |= wedge & (np.hypot(*relative.T) <= half)
+        else:
+            # Up to the chord from one rectangle corner to the other
+            chord = (b[0] - a[0]) * (relative[:, 1] - a[1]) - (b[1] - a[1]) * (relative[:, 0] - a[0])
+            inside |= wedge & (turn * chord >= 0)
+    return inside
+
+def test_stroke_with_short_segments_matches_reference():
+    # Segments shorter than the half width keep their own stroke where the inner join passes them
+    np.testing.assert_array_equal(polyline([[0, 0], [10, 0], [10, 0.5]]).stroke_to_outline(2).contains([[9.9, 0.6]]), [True])
+    for seed in range(10):
+        rng = np.random.default_rng(seed)
+        angles = np.cumsum(rng.uniform(-2.5, 2.5, 12))
+        steps = rng.uniform(0.2, 3, 12)[:, np.newaxis] * np.column_stack([np.cos(angles), np.sin(angles)])
+        anchors = np.concatenate([[[0, 0]], np.cumsum(steps, axis=0)])
+        path = polyline(anchors)
+        points = rng.uniform(anchors.min(axis=0) - 1.5, anchors.max(axis=0) + 1.5, (4000, 2))
+        for join in ("round", "bevel"):
+            # Points within a small margin of the boundary are left out
+            clear = stroke_reference(points, anchors, 1 - 1e-3, join) == stroke_reference(points, anchors, 1 + 1e-3, join)
+            expected = stroke_reference(points, anchors, 1, join)
+            np.testing.assert_array_equal(path.stroke_to_outline(2, join).contains(points)[clear], expected[clear])
+
+def test_invalid_arguments():
+    path = square(0, 0, 1, 1)
+    with pytest.raises(ValueError):
+        path.offset(1, join="sharp")
+    with pytest.raises(ValueError):
+        path.stroke_to_outline(1, cap="flat")
+    with pytest.raises(ValueError):
+        path.offset(1, miter_limit=0.5)
+    with pytest.raises(ValueError):
+        path.offset(1, tolerance=0)
+
+def test_empty_and_degenerate_paths():
+    assert len(BezierPath().offset(1)) == 0
+    assert len(BezierPath.from_arrays(np.array([[1, 1]], dtype=np.float64)).stroke_to_outline(2)) == 0
+    assert len(polyline([[0, 0], [1, 0]]).stroke_to_outline(0)) == 0
+    # Zero length segments are skipped
+    result = polyline([[0, 0], [1, 0], [1, 0], [2, 0]]).stroke_to_outline(2)
+    assert area(result) == pytest.approx(4)
+    assert area(BezierShape([square(0, 0, 2, 2)]).union(BezierShape())) == pytest.approx(area(square(0, 0, 2, 2).offset(0)))
@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+
+from bezier_builder.parse_cache import ParseCache, enable_parse_cache, disable_parse_cache, get_parse_cache
+from bezier_builder.svg_converter import parse_path_string
+
+D_STRING = "M 0,0 C 10,10 20,10 30,0 L 30,30 Z M 50,50 L 60,60"
+
+@pytest.fixture
+def cache():
+    return ParseCache()
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_cached_shapes_match(cache, fast):
+    expected = parse_path_string(D_STRING, fast=fast)
+    for _ in range(2):
+        shape = parse_path_string(D_STRING, fast=fast, cache=cache)
+        for path, expected_path in zip(shape, expected, strict=True):
+            np.testing.assert_array_equal(path.positions, expected_path.positions)
+            np.testing.assert_array_equal(path.handles_in, expected_path.handles_in)
+            np.testing.assert_array_equal(path.handles_out, expected_path.handles_out)
+            np.testing.assert_array_equal(path.handle_types, expected_path.handle_types)
+            assert path.is_closed == expected_path.is_closed
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_results_are_copies(cache):
+    first = parse_path_string(D_STRING, fast=True, cache=cache)
+    first[0].positions[:] = 100
+    second = parse_path_string(D_STRING, fast=True, cache=cache)
+    second[0].positions[:] = 200
+    third = parse_path_string(D_STRING, fast=True, cache=cache)
+    np.testing.assert_array_equal(third[0].positions[0], [0, 0])
+
+def test_fast_and_svgelements_entries_are_separate(cache):
+    parse_path_string(D_STRING, fast=True, cache=cache)
+    parse_path_string(D_STRING, fast=False, cache=cache)
+    assert len(cache) == 2 and cache.misses == 2
+
+def test_memory_budget():
+    d_strings = [f"M {i},0 L {i},10 L {i + 5},10" for i in range(20)]
+    cache = ParseCache(max_bytes=2000)
+    for d_string in d_strings:
+        parse_path_string(d_string, fast=True, cache=cache)
+    assert 0 < len(cache) < 20
+    assert cache.nbytes <= 2000
+    assert cache.evictions == 20 - len(cache)
+
+    # Least recently used entries go first
+    parse_path_string(d_strings[-1], fast=True, cache=cache)
+    assert cache.hits == 1
+    parse_path_string(d_strings[0], fast=True, cache=cache)
+    assert cache.misses == 21
+
+    stats = cache.stats()
+    assert stats["entries"] == len(cache) and stats["hit_rate"] == pytest.approx(1 / 22)
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+def test_process_wide_cache():
+    assert get_parse_cache() is None
+    cache = enable_parse_cache()
+    try:
+        parse_path_string(D_STRING)
+        parse_path_string(D_STRING)
+        assert cache.hits == 1
+    finally:
+        disable_parse_cache()
+    assert get_parse_cache() is None
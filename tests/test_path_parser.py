@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+
+from bezier_builder.path_parser import parse_path_data
+from bezier_builder.svg_converter import parse_path_string
+from bezier_builder.bezier_path import BezierShape
+
+PATHS = [
+    "M 10 20 L 30 40",
+    "M 10 20 l 20 20",
+    "M 100 100 C 120 80, 180 80, 200 100",
+    "M 100 100 c 20 -20, 80 -20, 100 0",
+    "M 40 70 Q 70 91, 100 70",
+    "M 150, 225 A 100, 100, 0, 0, 1, 194, 119",
+    "M 0,0 A 100,100 0 0 0 100,100",
+    "M 100 100 A 100 100 0 1 1 300 100 A 100 100 0 1 1 100 100",
+    "M 0 0 a 50 25 30 1 0 80 40",
+    "M 0 0 L 10 0 L 10 10 Z",
+    "M 0 0 L 10 10 M 50 50 L 60 60",
+    "M 10 6 C 12 10, 17 20, 20 18 C 23 16, 24 8, 28 8",
+    "M 10 6 C 12 10, 14 22, 20 18 C 23 16, 24 8, 28 8",
+    "M 190, 0 L 100, 110 L 200, 210 L 280, 100 L 190, 0",
+    "M 95 0 C 75 10, 80 100, 100 105 C 120 110, 140 65, 140 50 C 140 35, 115 -10, 95 0",
+    "M -50 0 Q -60 30 0 50 Q 30, 60 50 0 Q 60 -30 0 -50 Q -30 -60 -50 0",
+    "M 99,40 C 92,70 50,100 50,100 C 50,100 8,70 1,40 C -6,10 15,0 25,0 C 35,0 46,4 50,20 C 54,4 65,0 75,0 C 85,0 106,10 99,40 Z",
+    "M 0 0 Q 5 5 10 0 T 20 0 L 30 0 C 30 5 35 5 40 0 S 50 -5 50 0",
+    "m 5 5 h 10 v 10 H 0 V 5 z m 20 0 c 0 5 5 5 5 0 s 5 -5 5 0 q 5 5 10 0 t 10 0 z",
+    "M1-2L3.5.5l-1e1,2E0",
+    "M 10 10 L 20 20 L 30 10 L 20 0 z",
+    "M 0 0 C 0 0 5 5 10 10",
+]
+
+def assert_shapes_equal(actual: BezierShape, expected: BezierShape):
+    assert len(actual) == len(expected)
+    for path, expected_path in zip(actual, expected):
+        assert path.is_closed == expected_path.is_closed
+        np.testing.assert_allclose(path.positions, expected_path.positions, atol=1e-9)
+        np.testing.assert_allclose(path.handles_in, expected_path.handles_in, atol=1e-9)
+        np.testing.assert_allclose(path.handles_out, expected_path.handles_out, atol=1e-9)
+        np.testing.assert_array_equal(path.handle_types, expected_path.handle_types)
+
+@pytest.mark.parametrize("d", PATHS)
+def test_matches_svgelements_parser(d):
+    assert_shapes_equal(parse_path_data(d), parse_path_string(d))
+
+def test_fast_option():
+    d = PATHS[-5]
+    assert_shapes_equal(parse_path_string(d, fast=True), parse_path_string(d))
+
+def test_implicit_commands():
+    shape = parse_path_data("M 0 0 10 0 10 10 C 10 15 5 20 0 20 0 25 5 30 10 30")
+    np.testing.assert_array_equal(shape[0].positions, [[0, 0], [10, 0], [10, 10], [0, 20], [10, 30]])
+    np.testing.assert_array_equal(shape[0].handles_out[2], [0, 5])
+
+def test_compact_arc_flags():
+    expected = parse_path_data("M 0 0 a 5 5 0 0 1 10 10")
+    assert_shapes_equal(parse_path_data("M0 0a5 5 0 0110 10"), expected)
+
+def test_drawing_after_close_starts_new_subpath():
+    shape = parse_path_data("M 0 0 L 10 0 L 10 10 Z L 20 20")
+    assert len(shape) == 2
+    assert shape[0].is_closed == True
+    np.testing.assert_array_equal(shape[1].positions, [[0, 0], [20, 20]])
+
+def test_closing_keeps_start_handles():
+    shape = parse_path_data("M 0 0 C 10 -10 20 -10 30 0 C 20 10 -10 10 0 0 Z")
+    path = shape[0]
+    assert len(path) == 2
+    assert path.is_closed == True
+    np.testing.assert_allclose(path.handles_out[0], [10, -10])
+    np.testing.assert_allclose(path.handles_in[0], [-10, 10])
+    assert path.start.handle_type == "symmetric"
+
+def test_smooth_cubic_after_quadratic():
+    # The first control point of S only reflects a previous C or S
+    path = parse_path_data("M 0 0 Q 5 5 10 0 T 20 0 S 30 10 40 0")[0]
+    np.testing.assert_array_equal(path.handles_out[2], [0, 0])
+
+def test_degenerate_arcs():
+    path = parse_path_data("M 100, 100 A 100, 100, 0, 0, 1, 100, 100")[0]
+    assert len(path) == 1
+    path = parse_path_data("M 0 0 A 0 5 0 0 1 10 10")[0]
+    np.testing.assert_array_equal(path.positions, [[0, 0], [10, 10]])
+    np.testing.assert_array_equal(path.handles_out, np.zeros((2, 2)))
+
+def test_empty_string():
+    assert len(parse_path_data("")) == 0
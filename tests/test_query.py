@@ -0,0 +1,140 @@
+import pytest
+import numpy as np
+
+from bezier_builder import cubic, query
+from bezier_builder.bezier_path import BezierPath, BezierShape
+from tests.test_intersection import circle, polyline, random_walk
+
+def test_winding_of_circle():
+    shape = BezierShape([circle(0, 0, 1)])
+    points = np.array([[0, 0], [0.9, 0], [0, -0.9], [1.1, 0], [5, 5], [-2, 0]], dtype=np.float64)
+    np.testing.assert_array_equal(shape.winding(points), [1, 1, 1, 0, 0, 0])
+    # Rays through anchors count the segments meeting there once
+    np.testing.assert_array_equal(shape.winding([[-0.5, 0], [0, 0.5]]), [1, 1])
+
+    reversed_circle = BezierPath.from_arrays(circle(0, 0, 1).positions[::-1], circle(0, 0, 1).handles_out[::-1], circle(0, 0, 1).handles_in[::-1], is_closed=True)
+    np.testing.assert_array_equal(BezierShape([reversed_circle]).winding([[0, 0]]), [-1])
+
+def test_contains_fill_rules():
+    outer = polyline([[0, 0], [4, 0], [4, 4], [0, 4]], is_closed=True)
+    inner = polyline([[1, 1], [3, 1], [3, 3], [1, 3]], is_closed=True)
+    shape = BezierShape([outer, inner])
+    points = np.array([[2, 2], [0.5, 0.5], [5, 2]], dtype=np.float64)
+    np.testing.assert_array_equal(shape.winding(points), [2, 1, 0])
+    np.testing.assert_array_equal(shape.contains(points), [True, True, False])
+    np.testing.assert_array_equal(shape.contains(points, "evenodd"), [False, True, False])
+    with pytest.raises(ValueError):
+        shape.contains(points, "winding")
+
+def test_contains_open_path_and_empty():
+    # Open paths are filled as if closed by a straight line
+    shape = BezierShape([polyline([[0, 0], [2, 0], [2, 2], [0, 2]])])
+    np.testing.assert_array_equal(shape.contains([[1, 1], [3, 1]]), [True, False])
+    assert BezierShape().contains(np.zeros((3, 2))).tolist() == [False] * 3
+    assert len(shape.contains(np.zeros((0, 2)))) == 0
+
+def test_contains_matches_flattened_polygon():
+    # A closed random walk crosses itself many times, compare with windings around its polyline
+    path = random_walk(200, seed=3)
+    path.is_closed = True
+    shape = BezierShape([path])
+    rng = np.random.default_rng(4)
+    lower, upper = shape.bounds()
+    points = rng.uniform(lower, upper, (2000, 2))
+
+    vertices = path.flatten(1e-4)
+    x0, y0 = vertices[:-1].T
+    x1, y1 = vertices[1:].T
+    crossing = (y0 <= points[:, 1:2]) != (y1 <= points[:, 1:2])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = x0 + (points[:, 1:2] - y0) * (x1 - x0) / (y1 - y0)
+    direction = np.where(y1 > y0, 1, -1)
+    expected = np.sum(np.where(crossing & (x > points[:, 0:1]), direction, 0), axis=1)
+
+    # Points right next to the curve may fall either side of the polyline
+    _, _, distances = path.nearest(points)
+    clear = distances > 1e-3
+    np.testing.assert_array_equal(shape.winding(points)[clear], expected[clear])
+
+def test_winding_of_wide_shape():
+    # Rays cross shapes wider than they are tall the short way, the windings don't change
+    x = np.linspace(0, 1000, 2001)
+    wave = np.column_stack([x, np.sin(x)])
+    path = polyline(np.concatenate([wave, wave[::-1] + [0, 1]]), is_closed=True)
+    points = np.array([[10, np.sin(10) + 0.5], [500.25, np.sin(500.25) - 0.5], [700, 5], [-1, 0]])
+    np.testing.assert_array_equal(BezierShape([path]).winding(points), [1, 0, 0, 0])
+
+    # Each point is turned until the edge of the box nearest it is on the right
+    pieces = np.array([[[0, 0], [1, 0], [2, 0], [3, 1]]], dtype=np.float64)
+    points = np.array([[2.5, 0.5], [1.0, 0.1], [0.1, 0.5], [1.0, 0.9]])
+    turns = list(query.quarter_turns(points, pieces, np.array([[[0, 0], [3, 1]]], dtype=np.float64)))
+    assert [list(group) for group, _, _, _ in turns] == [[0], [1], [2], [3]]
+    group, turned_points, turned, bounds = turns[3]
+    np.testing.assert_array_equal(turned_points, [[0.9, -1]])
+    np.testing.assert_array_equal(turned[0, 3], [1, -3])
+    np.testing.assert_array_equal(bounds, [[[0, -3], [1, 0]]])
+
+def test_winding_of_spiral():
+    # Rays from the middle of a spiral leave it the short way, across the fewest turns
+    angle = np.linspace(0, 20 * np.pi, 2001)
+    inner = np.column_stack([np.cos(angle), np.sin(angle)]) * (1 + angle)[:, np.newaxis]
+    path = polyline(np.concatenate([inner, inner[::-1] * 1.2]), is_closed=True)
+    rng = np.random.default_rng(3)
+    points = rng.uniform(-80, 80, (500, 2))
+    expected = np.array([np.sum(np.diff(np.unwrap(np.arctan2(*(path.positions[np.r_[:len(path), 0]] - point).T[::-1])))) for point in points]) / (2 * np.pi)
+    np.testing.assert_array_equal(BezierShape([path]).winding(points), np.round(expected))
+
+def test_nearest_on_line_and_circle():
+    line = polyline([[0, 0], [10, 0], [10, 10]])
+    segments, t, distances = line.nearest([[3, 2], [12, 5], [-1, -1]])
+    np.testing.assert_array_equal(segments, [0, 1, 0])
+    np.testing.assert_allclose(line.evaluate(segments + t), [[3, 0], [10, 5], [0, 0]], atol=1e-9)
+    np.testing.assert_allclose(distances, [2, 2, np.sqrt(2)], atol=1e-9)
+
+    path = circle(0, 0, 1)
+    angles = np.linspace(0, 2 * np.pi, 50, endpoint=False)
+    points = 3 * np.column_stack([np.cos(angles), np.sin(angles)])
+    segments, t, distances = path.nearest(points)
+    np.testing.assert_allclose(distances, 2, atol=1e-3)
+    closest = path.evaluate(segments + t)
+    np.testing.assert_allclose(np.arctan2(closest[:, 1], closest[:, 0]) % (2 * np.pi), angles, atol=1e-3)
+
+def test_nearest_matches_brute_force():
+    path = random_walk(300, seed=5)
+    rng = np.random.default_rng(6)
+    lower, upper = path.bounds()
+    points = rng.uniform(lower - 50, upper + 50, (500, 2))
+    segments, t, distances = path.nearest(points)
+    np.testing.assert_allclose(np.hypot(*(path.evaluate(segments + t) - points).T), distances)
+
+    # Densely sampled points on the path are never nearer, and only a little further
+    dense = path.evaluate(np.linspace(0, path.segment_count, 200 * path.segment_count + 1))
+    sampled = np.array([np.hypot(*(dense - point).T).min() for point in points])
+    assert np.all(distances <= sampled + 1e-9)
+    assert np.all(sampled - distances <= 0.5 * np.hypot(*np.diff(dense, axis=0).T).max())
+
+def test_nearest_of_shuffled_segments_and_far_points():
+    # Segments in any order and points far beyond them find the same closest points
+    controls = random_walk(500, seed=7).segments()
+    shuffle = np.random.default_rng(8).permutation(len(controls))
+    lower, upper = controls.min(axis=(0, 1)), controls.max(axis=(0, 1))
+    points = np.random.default_rng(9).uniform(lower - 20 * (upper - lower), upper + 20 * (upper - lower), (5000, 2))
+    segments, t, distances = query.nearest(controls, points)
+    shuffled_segments, shuffled_t, shuffled_distances = query.nearest(controls[shuffle], points)
+    np.testing.assert_allclose(shuffled_distances, distances)
+    np.testing.assert_allclose(cubic.evaluate(controls[shuffle], shuffled_segments, shuffled_t), cubic.evaluate(controls, segments, t), atol=1e-9)
+
+def test_nearest_errors():
+    path = BezierPath.from_arrays(np.array([[0, 0]], dtype=np.float64))
+    with pytest.raises(ValueError):
+        path.nearest([[1, 1]])
+    segments, t, distances = polyline([[0, 0], [1, 0]]).nearest(np.zeros((0, 2)))
+    assert len(segments) == len(t) == len(distances) == 0
+
+def test_far_points_fall_back_to_growing_radius():
+    # Two tiny segments far apart, the point between them is far from both
+    points = np.array([[0, 0], [1000, 0], [0, 0.5]], dtype=np.float64)
+    controls = np.array([[p, p, p + 0.01, p + 0.01] for p in np.array([[0, 0], [1000, 1000]])], dtype=np.float64)
+    segments, t, distances = query.nearest(controls, points)
+    np.testing.assert_array_equal(segments, [0, 0, 0])
+    np.testing.assert_allclose(distances[1], np.hypot(999.99, 0.01))
@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+
+from bezier_builder.bezier_path import BezierPath, BezierShape
+from bezier_builder.spatial_index import SpatialIndex
+
+def square(x: float, y: float, size: float = 10) -> BezierShape:
+    return BezierShape([BezierPath.from_arrays([[x, y], [x + size, y], [x + size, y + size], [x, y + size]], is_closed=True)])
+
+@pytest.fixture
+def shapes():
+    """
+    A 10 x 10 grid of squares 20 apart plus one large square covering all of them.
+    """
+    shapes = [square(x, y) for x in range(0, 200, 20) for y in range(0, 200, 20)]
+    shapes.append(square(-10, -10, 500))
+    return shapes
+
+@pytest.fixture
+def index(shapes):
+    return SpatialIndex(shapes, cell_size=15)
+
+def brute_force(shapes, bounds) -> list:
+    bounds = np.asarray(bounds, dtype=np.float64)
+    return [
+        i for i, shape in enumerate(shapes)
+        if np.all(shape.bounds()[0] <= bounds[1]) and np.all(shape.bounds()[1] >= bounds[0])
+    ]
+
+def test_default_cell_size(shapes):
+    assert SpatialIndex(shapes).cell_size == 10
+    assert SpatialIndex().cell_size == 1
+
+def test_query_rect(index: SpatialIndex, shapes):
+    assert len(index) == 101
+    for bounds in ([[5, 5], [25, 25]], [[11, 11], [19, 19]], [[-100, -100], [1000, 1000]], [[600, 600], [700, 700]]):
+        assert index.query_rect(bounds).tolist() == brute_force(shapes, bounds)
+
+def test_query_rect_unbounded(index: SpatialIndex):
+    assert len(index.query_rect([[-np.inf, -np.inf], [np.inf, np.inf]])) == 101
+
+def test_query_point(index: SpatialIndex):
+    assert index.query_point((25, 45)).tolist() == [12, 100]
+    assert index.query_point((15, 5)).tolist() == [100]
+    assert index.query_point((15, 5), tolerance=5).tolist() == [0, 10, 100]
+
+def test_update_after_anchors_move(index: SpatialIndex, shapes):
+    shapes[0][0].positions[:] += 1000
+    # Queries use the indexed bounds until the shape is updated
+    assert index.query_point((1005, 1005)).tolist() == []
+    assert index.update(0)
+    assert not index.update(0)
+    assert index.query_point((1005, 1005)).tolist() == [0]
+    assert 0 not in index.query_point((5, 5)).tolist()
+
+def test_refresh(index: SpatialIndex, shapes):
+    shapes[3][0].anchor_points[1].handle_out[:] = (0, -20)
+    shapes[7][0].positions[0] = (-50, -50)
+    assert index.refresh() == [3, 7]
+    np.testing.assert_allclose(index.bounds(3), shapes[3].bounds())
+    assert 7 in index.query_point((-50, -50)).tolist()
+
+def test_insert_and_remove(index: SpatialIndex):
+    i = index.insert(square(1000, 1000))
+    assert i == 101
+    assert index.query_point((1005, 1005)).tolist() == [101]
+    index.remove(101)
+    assert index.query_point((1005, 1005)).tolist() == []
+    index.remove(100)
+    assert index.query_point((15, 5)).tolist() == []
+    assert len(index) == 100
+    with pytest.raises(KeyError):
+        index.update(100)
+
+def test_empty_shapes():
+    index = SpatialIndex([BezierShape(), square(0, 0)])
+    assert index.query_rect([[-1e9, -1e9], [1e9, 1e9]]).tolist() == [1]
@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+
+from bezier_builder.bezier_path import BezierPath
+from bezier_builder.stroke import StrokeFitter
+from tests.test_fitting import distances_to
+
+@pytest.fixture
+def points():
+    t = np.linspace(0, 6 * np.pi, 600)
+    return np.column_stack([t * 20, 50 * np.sin(t) + 5 * np.sin(5 * t)])
+
+def test_stroke_fitter(points):
+    fitter = StrokeFitter(0.5)
+    fitter.extend(points)
+    path = fitter.path
+    assert distances_to(path, points[::4]).max() <= 0.5
+    np.testing.assert_array_equal(path.positions[[0, -1]], points[[0, -1]])
+    handles_in, handles_out = path.handles_in[1:-1], path.handles_out[1:-1]
+    cross = handles_in[:, 0] * handles_out[:, 1] - handles_in[:, 1] * handles_out[:, 0]
+    np.testing.assert_allclose(cross, 0, atol=1e-6)
+
+def test_stroke_fitter_keeps_finalized_segments(points):
+    fitter = StrokeFitter(0.5)
+    fitter.extend(points[:300])
+    finalized = fitter.path.segments()[:-1]
+    fitter.extend(points[300:])
+    np.testing.assert_array_equal(fitter.path.segments()[:len(finalized)], finalized)
+
+def test_stroke_fitter_bounds_tail(points):
+    fitter = StrokeFitter(100.0, max_tail=50)
+    fitter.extend(points)
+    assert len(fitter._tail) <= 50
+    assert fitter.segment_count >= len(points) // 50
+
+def test_stroke_fitter_finish(points):
+    fitter = StrokeFitter(0.5)
+    fitter.extend(points[:3])
+    fitter.add_point(points[2])
+    path = fitter.finish()
+    assert isinstance(path, BezierPath)
+    np.testing.assert_array_equal(path.positions[[0, -1]], points[[0, 2]])
+    assert len(fitter.path) == 0
+    fitter.add_point(points[0])
+    assert len(fitter.path) == 1
+    with pytest.raises(ValueError):
+        StrokeFitter(0)
@@ -0,0 +1,139 @@
+import pytest
+import numpy as np
+
+from bezier_builder import subdivision
+from bezier_builder.anchor_point import ALIGNED, CORNER, SYMMETRIC
+from bezier_builder.bezier_path import BezierPath
+from tests.test_intersection import circle, polyline, random_walk
+
+def smooth_walk(count, seed=0):
+    path = random_walk(count, seed)
+    path.handle_types[:] = SYMMETRIC
+    return path
+
+def test_subdivide_keeps_shape_and_parameters():
+    for path in (smooth_walk(20), circle(0, 0, 1)):
+        refined = path.subdivide(4)
+        assert refined.segment_count == 4 * path.segment_count
+        assert refined.is_closed == path.is_closed
+        t = np.linspace(0, path.segment_count, 501)
+        np.testing.assert_allclose(refined.evaluate(4 * t), path.evaluate(t), atol=1e-12)
+        # Original anchors keep their positions, every fourth anchor
+        np.testing.assert_array_equal(refined.positions[::4], path.positions)
+
+    path = smooth_walk(5)
+    np.testing.assert_array_equal(path.subdivide(1).segments(), path.segments())
+    with pytest.raises(ValueError):
+        path.subdivide(0)
+
+def test_subdivide_handle_types():
+    # Even steps shorten both handles of inner anchors alike, they stay symmetric
+    refined = smooth_walk(6).subdivide(3)
+    assert np.all(refined.handle_types[1:-1] == SYMMETRIC)
+    # The ends of an open path only lose their outgoing or incoming handle length
+    assert refined.handle_types[0] == refined.handle_types[-1] == ALIGNED
+    np.testing.assert_allclose(np.hypot(*refined.handles_in[1:-1].T), np.hypot(*refined.handles_out[1:-1].T))
+
+def test_insert_anchor_handles():
+    path = smooth_walk(4)
+    original = path.segments()[1]
+    index = path.insert_anchor(1, 0.3)
+    assert index == 2 and len(path) == 5
+    assert path.handle_types[index] == ALIGNED
+    # Handles are the inner points of the de Casteljau split, in proportion to the parameters either side
+    np.testing.assert_allclose(np.hypot(*path.handles_in[index]) / np.hypot(*path.handles_out[index]), 0.3 / 0.7)
+    np.testing.assert_array_equal(path.segments()[1, 0], original[0])
+    np.testing.assert_array_equal(path.segments()[2, 3], original[3])
+    # Anchors either side had one handle shortened
+    assert path.handle_types[1] == path.handle_types[3] == ALIGNED
+    assert path.handle_types[0] == path.handle_types[4] == SYMMETRIC
+
+    index = path.insert_anchor(0, 0.5)
+    assert path.handle_types[index] == SYMMETRIC
+
+def test_insert_anchor_on_line_and_existing_anchors():
+    path = polyline([[0, 0], [4, 0], [4, 4]])
+    index = path.insert_anchor(1, 0.5)
+    assert index == 2
+    np.testing.assert_array_equal(path.positions[index], [4, 2])
+    # Lines stay lines without handles
+    assert not np.any(path.handles_in) and not np.any(path.handles_out)
+    assert path.handle_types[index] == CORNER
+
+    assert path.insert_anchor(0, 0) == 0
+    assert path.insert_anchor(-1, 1) == 3
+    assert len(path) == 4
+    with pytest.raises(ValueError):
+        path.insert_anchor(0, 1.5)
+    with pytest.raises(IndexError):
+        path.insert_anchor(5, 0.5)
+
+def test_insert_anchor_keeps_anchor_views():
+    path = polyline([[0, 0], [4, 0], [4, 4]])
+    anchors = list(path.anchor_points)
+    path.insert_anchor(0, 0.5)
+    assert [anchor._index for anchor in path.anchor_points] == [0, 1, 2, 3]
+    assert path.anchor_points[2] is anchors[1] and path.anchor_points[3] is anchors[2]
+    assert anchors[2]._store is path
+
+def test_insert_many_cuts():
+    path = smooth_walk(5)
+    segments = np.array([2, 0, 2, 2, 3, 0])
+    t = np.array([0.75, 0.5, 0.25, 0.75, 1.0, 0.0])
+    positions, handles_in, handles_out, handle_types, anchors = subdivision.insert(
+        path.positions, path.handles_in, path.handles_out, path.handle_types, False, segments, t
+        )
+    # Repeated and end parameters don't insert anything
+    assert len(positions) == 8
+    np.testing.assert_array_equal(anchors, [5, 1, 4, 5, 7, 0])
+    np.testing.assert_allclose(positions[anchors], path.evaluate(segments + t), atol=1e-12)
+    refined = BezierPath.from_arrays(positions, handles_in, handles_out, handle_types)
+    np.testing.assert_allclose(refined.evaluate([1, 4, 5]), path.evaluate([0.5, 2.25, 2.75]), atol=1e-12)
+
+def test_split_at():
+    path = smooth_walk(10)
+    before, after = path.split_at(4, 0.25)
+    assert len(before) == 6 and len(after) == 6
+    assert not before.is_closed and not after.is_closed
+    np.testing.assert_allclose(before.evaluate(before.segment_count), path.evaluate(4.25), atol=1e-12)
+    np.testing.assert_array_equal(before.evaluate(before.segment_count), after.evaluate(0))
+    assert before.length() + after.length() == pytest.approx(path.length())
+    # The ends of the parts are corners without outside handles
+    assert before.handle_types[-1] == after.handle_types[0] == CORNER
+    assert not np.any(before.handles_out[-1]) and not np.any(after.handles_in[0])
+
+    # Closed paths end where they started
+    before, after = circle(0, 0, 1).split_at(1, 0.5)
+    np.testing.assert_allclose(after.evaluate(after.segment_count), [1, 0], atol=1e-12)
+    assert before.segment_count + after.segment_count == 5
+
+def test_trim():
+    path = smooth_walk(10)
+    trimmed = path.trim(2.5, 6.25)
+    assert trimmed.segment_count == 5
+    t = np.linspace(2.5, 6.25, 101)
+    np.testing.assert_allclose(trimmed.evaluate(np.interp(t, [2.5, 3, 4, 5, 6, 6.25], np.arange(6))), path.evaluate(t), atol=1e-12)
+    assert len(path.trim(3, 3)) == 1
+
+    # Trimming between distances along the path
+    s0, s1 = 0.2 * path.length(), 0.7 * path.length()
+    assert path.trim(*path.parameter_at_distance([s0, s1])).length() == pytest.approx(s1 - s0)
+
+def test_trim_closed_path_wraps():
+    path = circle(0, 0, 1)
+    trimmed = path.trim(3.5, 0.5)
+    assert trimmed.segment_count == 2
+    np.testing.assert_allclose(trimmed.evaluate([0, 1, 2]), path.evaluate([3.5, 4, 0.5]), atol=1e-12)
+    whole = path.trim(0, 4)
+    assert len(whole) == 5
+    np.testing.assert_array_equal(whole.positions[0], whole.positions[-1])
+
+def test_trim_errors():
+    path = polyline([[0, 0], [1, 0], [2, 0]])
+    with pytest.raises(ValueError):
+        path.trim(1.5, 0.5)
+    with pytest.raises(ValueError):
+        path.trim(0, 3)
+    with pytest.raises(ValueError):
+        BezierPath().trim(0, 0)
+    assert len(BezierPath().subdivide(3)) == 0
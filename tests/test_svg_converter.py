@@ -3,7 +3,7 @@ import numpy as np
 import os
 from filecmp import cmp
 
-from bezier_builder.svg_converter import parse_path_string, create_path_string, parse_svg_file, create_svg_string, save_svg_file
+from bezier_builder.svg_converter import parse_path_string, create_path_string, parse_svg_file, iter_svg_file, create_svg_string, save_svg_file
 from bezier_builder.bezier_path import BezierPath, BezierShape
 from bezier_builder.vector import Vector
 
@@ -349,6 +349,55 @@ def test_parse_svg_file_shapes():
     assert len(shapes[1][0].anchor_points) == 4
     assert len(shapes[2][0].anchor_points) == 3
 
+@pytest.mark.parametrize("file_name", ["triangle.svg", "shapes.svg", "groups_and_uses.svg", "rendered_uses.svg"])
+def test_iter_svg_file_matches_parse_svg_file(file_name):
+    file_path = os.path.join(os.path.dirname(__file__), "data", file_name)
+    shapes = iter_svg_file(file_path)
+    assert not isinstance(shapes, list)
+    shapes = list(shapes)
+    expected = parse_svg_file(file_path)
+
+    assert len(shapes) == len(expected)
+    for shape, expected_shape in zip(shapes, expected):
+        assert isinstance(shape, BezierShape)
+        assert len(shape) == len(expected_shape)
+        for path, expected_path in zip(shape, expected_shape):
+            assert path.is_closed == expected_path.is_closed
+            np.testing.assert_allclose(path.positions, expected_path.positions, atol=1e-9)
+            np.testing.assert_allclose(path.handles_in, expected_path.handles_in, atol=1e-9)
+            np.testing.assert_allclose(path.handles_out, expected_path.handles_out, atol=1e-9)
+
+def test_iter_svg_file_skips_hidden_and_definitions():
+    file_path = os.path.join(os.path.dirname(__file__), "data", "groups_and_uses.svg")
+    shapes = list(iter_svg_file(file_path, fast=True))
+    # Ellipse, polyline, line, used triangle, used rect and circle, polygon
+    assert [len(shape[0]) for shape in shapes] == [4, 3, 2, 3, 4, 4, 3]
+
+def test_iter_svg_file_uses_rendered_and_later_elements():
+    file_path = os.path.join(os.path.dirname(__file__), "data", "rendered_uses.svg")
+    shapes = list(iter_svg_file(file_path, fast=True))
+    # Used path ahead of its element, group, used rect, used group, path, used hidden polygon
+    assert [len(shape[0]) for shape in shapes] == [2, 4, 4, 4, 4, 4, 2, 3]
+    # The used rect leaves the transform of its group behind, the viewBox halves everything
+    np.testing.assert_allclose(shapes[3].bounds(), [[10, 0], [15, 5]])
+    np.testing.assert_allclose(shapes[-1].bounds(), [[90, 0], [93, 2.5]])
+
+def test_iter_svg_file_viewports(tmp_path):
+    file_path = tmp_path / "viewports.svg"
+    file_path.write_text(
+        '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="200" height="200" viewBox="0 0 200 200">'
+        '<svg x="50" y="50" width="20" height="20" viewBox="0 0 10 10"><rect width="10" height="10"/></svg>'
+        '<svg x="10" y="10" width="30" height="30"><rect width="50%" height="5"/></svg>'
+        '<symbol id="sym" viewBox="0 0 10 10"><rect width="10" height="10"/></symbol>'
+        '<use xlink:href="#sym" x="100" y="100" width="40" height="40"/>'
+        '<use xlink:href="#sym" x="20" y="120" width="40" height="20"/>'
+        '</svg>'
+        )
+    shapes = list(iter_svg_file(str(file_path), fast=True))
+    # The viewBox is scaled to fit and centred, percentages are of the nested viewport
+    expected = [[[50, 50], [70, 70]], [[10, 10], [25, 15]], [[100, 100], [140, 140]], [[30, 120], [50, 140]]]
+    np.testing.assert_allclose([shape.bounds() for shape in shapes], expected, atol=1e-9)
+
 def test_create_svg_string(heart_path, triangle_path): 
     heart = BezierShape([heart_path])
     triangle = BezierShape([triangle_path])
@@ -362,3 +411,37 @@ def test_create_svg_string(heart_path, triangle_path):
 <path d="M 50,0 L 100,86.6 L 0,86.6 Z" pathd_loaded="True" stroke="#000000" stroke-width="1.0" fill="none" />\
 </svg>"""
 
+
+def test_build_string_precision():
+    path = BezierPath()
+    path.create(pos=Vector(0.123456, -0.0000001))
+    path.create(pos=Vector(10.5, 20.25))
+    assert create_path_string([path]) == "M 0.12346,0 L 10.5,20.25"
+    assert create_path_string([path], precision=2) == "M 0.12,0 L 10.5,20.25"
+    assert create_path_string([path], precision=0) == "M 0,0 L 10,20"
+
+def test_build_relative_string(heart_path, triangle_path):
+    svg_string = create_path_string([triangle_path], relative=True)
+    assert svg_string == "M 50,0 l 50,86.6 l -100,0 Z"
+
+    svg_string = create_path_string([heart_path], relative=True)
+    assert svg_string.startswith("M 99,40 c -7,30 -49,60 -49,60 c 0,0 -42,-30 -49,-60")
+
+    # Relative output describes the same geometry as absolute output
+    absolute = parse_path_string(create_path_string([heart_path]))[0]
+    relative = parse_path_string(svg_string)[0]
+    np.testing.assert_allclose(relative.positions, absolute.positions, atol=1e-9)
+    np.testing.assert_allclose(relative.handles_in, absolute.handles_in, atol=1e-9)
+    np.testing.assert_allclose(relative.handles_out, absolute.handles_out, atol=1e-9)
+
+def test_build_open_paths_string():
+    path_1 = BezierPath.from_arrays([[0, 0], [10, 10]])
+    path_2 = BezierPath.from_arrays([[50, 50], [60, 60]])
+    assert create_path_string([path_1, BezierPath(), path_2]) == "M 0,0 L 10,10 M 50,50 L 60,60"
+    assert create_path_string([]) == ""
+
+def test_save_svg_file(heart_path, triangle_path, tmp_path):
+    shapes = [BezierShape([heart_path]), BezierShape([triangle_path])]
+    file_path = tmp_path / "saved.svg"
+    save_svg_file(str(file_path), shapes)
+    assert file_path.read_text() == create_svg_string(shapes)
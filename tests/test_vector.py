@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 
-from bezier_builder.vector import Vector
+from bezier_builder.vector import Vector, Vec2
 
 @pytest.fixture
 def vector():
@@ -86,4 +86,54 @@ def test_isclose():
     vector2.y = 6.9998
     assert not vector1.is_close(vector2)
 
-    assert vector1.is_close(vector2, tolerance = 0.0002)
\ No newline at end of file
+    assert vector1.is_close(vector2, tolerance = 0.0002)
+
+def test_vec2_initialize():
+    vector = Vec2()
+    assert vector.x == 0.0
+    assert vector.y == 0.0
+    vector = Vec2(1, 2)
+    assert isinstance(vector.x, float)
+    assert (vector.x, vector.y) == (1.0, 2.0)
+    vector.x = 3
+    assert vector[0] == 3
+
+def test_vec2_arithmetic():
+    vector = Vec2(1, 2) + Vec2(5, 6)
+    assert vector == Vec2(6, 8)
+    assert Vec2(6, 8) - Vec2(1, 2) == Vec2(5, 6)
+    assert 2 * Vec2(1, 2) == Vec2(2, 4)
+    assert Vec2(1, 2) * 2 == Vec2(2, 4)
+    assert Vec2(2, 4) / 2 == Vec2(1, 2)
+    assert -Vec2(1, 2) == Vec2(-1, -2)
+
+def test_vec2_numpy_scalars():
+    for scalar in (np.int64(2), np.float32(2), np.float64(2)):
+        assert type(Vec2(1, 2) * scalar) is Vec2
+        assert Vec2(1, 2) * scalar == Vec2(2, 4)
+        assert Vec2(2, 4) / scalar == Vec2(1, 2)
+
+def test_vec2_magnitude_normalize():
+    vector = Vec2(3, 4)
+    assert vector.magnitude() == 5.0
+    assert vector.normalize().is_close(Vec2(3 / 5, 4 / 5))
+    assert Vec2().normalize() == Vec2()
+    assert Vec2(1e-7, 0).is_close_to_zero()
+
+def test_vec2_matches_vector():
+    pairs = [((4, 6), (6, 9)), ((4, 6), (5, 9)), ((4, 6), (-8, -12)), ((4, 6), (-4, -6)), ((3, 7), (3.00001, 6.999997))]
+    for a, b in pairs:
+        assert Vec2(*a).is_parallel_to(Vec2(*b)) == Vector(*a).is_parallel_to(Vector(*b))
+        assert Vec2(*a).is_continuous_with(Vec2(*b)) == Vector(*a).is_continuous_with(Vector(*b))
+        assert Vec2(*a).mirrors(Vec2(*b)) == Vector(*a).mirrors(Vector(*b))
+        assert Vec2(*a).is_close(Vec2(*b)) == Vector(*a).is_close(Vector(*b))
+
+def test_vec2_interop():
+    vector = Vec2(1, 2)
+    np.testing.assert_array_equal(np.asarray(vector), [1.0, 2.0])
+    assert isinstance(vector.to_vector(), Vector)
+    assert Vec2.as_vec2(Vector(3, 4)) == Vec2(3, 4)
+    assert Vec2.as_vec2((5, 6)) == Vec2(5, 6)
+    result = Vector(1, 1) + vector
+    assert isinstance(result, Vector)
+    np.testing.assert_array_equal(result, [2.0, 3.0])